@@ -61,6 +61,7 @@ from .endpoints import (
     DeviceServerEndpoint,
 )
 from .messages import (
+    ClientCapability,
     ClientMessage,
     ClientMessageType,
     ClientType,
@@ -90,6 +91,7 @@ __all__.extend(
         "ClientMessageType",
         "ServerMessageType",
         "ClientType",
+        "ClientCapability",
         "TaskStatus",
         "Command",
         "Result",
@@ -64,3 +64,16 @@ class AIPExtension(ABC):
         :param context: Context where error occurred
         """
         pass
+
+    def on_compression(
+        self, direction: str, raw_size: int, wire_size: int, cpu_time: float
+    ) -> None:
+        """
+        Called when a message is compressed before sending or decompressed after receiving.
+
+        :param direction: "sent" for compressed messages, "received" for decompressed ones
+        :param raw_size: Size of the encoded message in bytes
+        :param wire_size: Size of the compressed message in bytes
+        :param cpu_time: Time spent compressing or decompressing, in seconds
+        """
+        pass
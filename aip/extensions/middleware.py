@@ -67,6 +67,7 @@ class MetricsExtension(AIPExtension):
             "errors": 0,
             "message_types": {},
             "latencies": [],
+            "compression": self._empty_compression_metrics(),
         }
         self._message_timestamps: Dict[str, float] = {}
 
@@ -94,6 +95,20 @@ class MetricsExtension(AIPExtension):
             self.metrics["latencies"].append(latency)
             del self._message_timestamps[msg_id]
 
+    def on_compression(
+        self, direction: str, raw_size: int, wire_size: int, cpu_time: float
+    ) -> None:
+        """Track message compression."""
+        compression = self.metrics["compression"]
+        if direction == "sent":
+            compression["messages_compressed"] += 1
+            compression["compress_time"] += cpu_time
+        else:
+            compression["messages_decompressed"] += 1
+            compression["decompress_time"] += cpu_time
+        compression["raw_bytes"] += raw_size
+        compression["wire_bytes"] += wire_size
+
     async def on_connection_established(self, endpoint_id: str) -> None:
         """Track connection establishment."""
         self.metrics["connections_established"] += 1
@@ -119,8 +134,29 @@ class MetricsExtension(AIPExtension):
             )
             metrics["max_latency"] = max(metrics["latencies"])
             metrics["min_latency"] = min(metrics["latencies"])
+
+        compression = dict(metrics["compression"])
+        if compression["raw_bytes"]:
+            compression["ratio"] = compression["wire_bytes"] / compression["raw_bytes"]
+        metrics["compression"] = compression
         return metrics
 
+    @staticmethod
+    def _empty_compression_metrics() -> Dict[str, Any]:
+        """
+        Create the initial compression metrics.
+
+        :return: Compression metrics dictionary
+        """
+        return {
+            "messages_compressed": 0,
+            "messages_decompressed": 0,
+            "raw_bytes": 0,
+            "wire_bytes": 0,
+            "compress_time": 0.0,
+            "decompress_time": 0.0,
+        }
+
     def reset_metrics(self) -> None:
         """Reset all metrics."""
         self.metrics = {
@@ -131,5 +167,6 @@ class MetricsExtension(AIPExtension):
             "errors": 0,
             "message_types": {},
             "latencies": [],
+            "compression": self._empty_compression_metrics(),
         }
         self._message_timestamps.clear()
@@ -291,6 +291,20 @@ class ClientType(str, Enum):
     CONSTELLATION = "constellation"
 
 
+class ClientCapability(str, Enum):
+    """
+    Optional protocol features advertised under the "capabilities" metadata key, by the
+    client in its registration message and by the server in the registration confirmation.
+    A feature is only used if the peer advertised it.
+
+    OBSERVE: The client runs the composite "observe" data collection command
+    BINARY_ATTACHMENTS: The server accepts large data URLs in command results as binary frames
+    """
+
+    OBSERVE = "observe"
+    BINARY_ATTACHMENTS = "binary_attachments"
+
+
 # ============================================================================
 # Core Message Classes
 # ============================================================================
@@ -318,6 +332,7 @@ class ServerMessage(BaseModel):
         timestamp: ISO 8601 timestamp
         response_id: Unique response identifier for correlation
         result: Result payload for TASK_END or DEVICE_INFO_RESPONSE
+        metadata: Additional metadata (e.g., server capabilities)
     """
 
     type: ServerMessageType = Field(..., description="Type of server message")
@@ -338,6 +353,9 @@ class ServerMessage(BaseModel):
     timestamp: Optional[str] = Field(default=None, description="ISO 8601 timestamp")
     response_id: Optional[str] = Field(default=None, description="Unique response ID")
     result: Optional[Any] = Field(default=None, description="Result payload")
+    metadata: Optional[Dict[str, Any]] = Field(
+        default=None, description="Additional metadata"
+    )
 
 
 class ClientMessage(BaseModel):
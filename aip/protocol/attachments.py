@@ -0,0 +1,220 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Binary Attachments
+
+Large base64 data URLs (e.g. screenshots) inside command results are moved out of the
+JSON message and sent as binary WebSocket frames. In the JSON message, each of them is
+replaced with a reference string of the form ``aip-attachment://<attachment_id>``,
+which the receiver resolves back into the original data URL.
+
+Wire format per attachment (see AIPProtocol.send_binary_message):
+1. Text frame with BinaryMetadata, carrying ``attachment_id`` and ``mime_type``
+2. Binary frame with the raw (decoded) bytes
+
+All attachments of a message are sent before the message referencing them.
+"""
+
+import base64
+import json
+import logging
+import re
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+ATTACHMENT_URI_PREFIX = "aip-attachment://"
+
+# Data URLs shorter than this (in characters) stay inline in the JSON message.
+DEFAULT_ATTACHMENT_MIN_SIZE = 16 * 1024
+
+_DATA_URL_PATTERN = re.compile(r"^data:(?P<mime_type>[\w.+-]+/[\w.+-]+);base64,")
+
+
+@dataclass
+class Attachment:
+    """
+    A binary attachment extracted from a message payload.
+    """
+
+    attachment_id: str
+    mime_type: str
+    data: bytes
+
+    def to_data_url(self) -> str:
+        """
+        Encode the attachment back into a base64 data URL.
+        :return: The data URL.
+        """
+        encoded = base64.b64encode(self.data).decode("ascii")
+        return f"data:{self.mime_type};base64,{encoded}"
+
+
+def extract_attachments(
+    payload: Any, min_size: int = DEFAULT_ATTACHMENT_MIN_SIZE
+) -> Tuple[Any, List[Attachment]]:
+    """
+    Replace large base64 data URLs in a payload with attachment references.
+    The payload is not modified in place.
+    :param payload: The payload (nested dicts, lists and strings).
+    :param min_size: The minimum length of a data URL to be extracted.
+    :return: The payload with references, and the extracted attachments.
+    """
+    attachments: List[Attachment] = []
+
+    def _extract(value: Any) -> Any:
+        if isinstance(value, str):
+            if len(value) < min_size:
+                return value
+            match = _DATA_URL_PATTERN.match(value)
+            if match is None:
+                return value
+            try:
+                data = base64.b64decode(value[match.end() :], validate=True)
+            except ValueError:
+                return value
+            attachment = Attachment(
+                attachment_id=str(uuid.uuid4()),
+                mime_type=match.group("mime_type"),
+                data=data,
+            )
+            attachments.append(attachment)
+            return f"{ATTACHMENT_URI_PREFIX}{attachment.attachment_id}"
+        if isinstance(value, dict):
+            return {key: _extract(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [_extract(item) for item in value]
+        return value
+
+    return _extract(payload), attachments
+
+
+def has_attachment_references(payload: Any) -> bool:
+    """
+    Check whether a payload contains attachment references.
+    :param payload: The payload (nested dicts, lists and strings).
+    :return: True if at least one attachment reference is found.
+    """
+    if isinstance(payload, str):
+        return payload.startswith(ATTACHMENT_URI_PREFIX)
+    if isinstance(payload, dict):
+        return any(has_attachment_references(item) for item in payload.values())
+    if isinstance(payload, list):
+        return any(has_attachment_references(item) for item in payload)
+    return False
+
+
+def resolve_attachments(
+    payload: Any, lookup: "AttachmentStore"
+) -> Tuple[Any, List[str]]:
+    """
+    Replace attachment references in a payload with the original data URLs.
+    :param payload: The payload (nested dicts, lists and strings).
+    :param lookup: The store holding the received attachments.
+    :return: The resolved payload, and the ids of references that could not be resolved.
+    """
+    missing: List[str] = []
+
+    def _resolve(value: Any) -> Any:
+        if isinstance(value, str):
+            if not value.startswith(ATTACHMENT_URI_PREFIX):
+                return value
+            attachment_id = value[len(ATTACHMENT_URI_PREFIX) :]
+            attachment = lookup.pop(attachment_id)
+            if attachment is None:
+                missing.append(attachment_id)
+                return value
+            return attachment.to_data_url()
+        if isinstance(value, dict):
+            return {key: _resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [_resolve(item) for item in value]
+        return value
+
+    return _resolve(payload), missing
+
+
+def parse_binary_metadata(frame: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse the text frame announcing a binary frame.
+    :param frame: The text frame.
+    :return: The binary metadata, or None if the frame is a regular message.
+    """
+    # Metadata frames are small; avoid parsing large messages twice.
+    if len(frame) > 4096 or '"binary_data"' not in frame:
+        return None
+    try:
+        data = json.loads(frame)
+    except ValueError:
+        return None
+    if isinstance(data, dict) and data.get("type") == "binary_data":
+        return data
+    return None
+
+
+class AttachmentStore:
+    """
+    Bounded store of received attachments waiting for the message referencing them.
+    The oldest attachments are evicted first, so attachments of dropped messages
+    cannot accumulate.
+    """
+
+    def __init__(self, max_attachments: int = 256) -> None:
+        """
+        Initialize the store.
+        :param max_attachments: The maximum number of attachments kept.
+        """
+        self.max_attachments = max_attachments
+        self._attachments: "OrderedDict[str, Attachment]" = OrderedDict()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def add(self, metadata: Dict[str, Any], data: bytes) -> Optional[Attachment]:
+        """
+        Store a received binary frame using its metadata.
+        :param metadata: The BinaryMetadata of the frame.
+        :param data: The raw bytes of the frame.
+        :return: The stored attachment, or None if the frame is not an attachment.
+        """
+        attachment_id = metadata.get("attachment_id")
+        if not attachment_id:
+            self.logger.warning("Ignoring binary frame without attachment_id.")
+            return None
+
+        size = metadata.get("size")
+        if size is not None and size != len(data):
+            self.logger.warning(
+                f"Ignoring attachment {attachment_id}: expected {size} bytes, got {len(data)}."
+            )
+            return None
+
+        attachment = Attachment(
+            attachment_id=attachment_id,
+            mime_type=metadata.get("mime_type") or "application/octet-stream",
+            data=data,
+        )
+        self._attachments[attachment_id] = attachment
+
+        while len(self._attachments) > self.max_attachments:
+            evicted_id, _ = self._attachments.popitem(last=False)
+            self.logger.warning(f"Evicted unclaimed attachment {evicted_id}.")
+
+        return attachment
+
+    def pop(self, attachment_id: str) -> Optional[Attachment]:
+        """
+        Remove and return an attachment.
+        :param attachment_id: The attachment id.
+        :return: The attachment, or None if unknown.
+        """
+        return self._attachments.pop(attachment_id, None)
+
+    def clear(self) -> None:
+        """
+        Drop all stored attachments.
+        """
+        self._attachments.clear()
+
+    def __len__(self) -> int:
+        return len(self._attachments)
@@ -7,17 +7,71 @@ Base Protocol Implementation
 Provides the core AIP protocol abstractions and message handling infrastructure.
 """
 
+import asyncio
 import logging
+import time
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, Awaitable, Callable, Dict, List, Optional
-
-from aip.messages import ServerMessage
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Union,
+)
+
+from aip.messages import BinaryMetadata, ServerMessage
+from aip.protocol.attachments import (
+    DEFAULT_ATTACHMENT_MIN_SIZE,
+    AttachmentStore,
+    extract_attachments,
+    resolve_attachments,
+)
+from aip.protocol.codecs import JsonCodec, MessageCodec
+from aip.protocol.compression import (
+    DEFAULT_COMPRESSION_THRESHOLD,
+    DEFAULT_MAX_DECOMPRESSED_SIZE,
+    PayloadCompressor,
+)
 from aip.transport import Transport
 
+if TYPE_CHECKING:
+    from aip.extensions.base import AIPExtension
+
 # Type aliases for clarity
 MessageHandler = Callable[[Any], Awaitable[None]]
 ProtocolHandler = Callable[[Any], Awaitable[Optional[Any]]]
 
+# Binary send lock of each connection, shared by all the protocols and transports
+# sending on it
+_binary_send_locks: "weakref.WeakKeyDictionary[Any, asyncio.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_binary_send_lock(transport: Transport) -> asyncio.Lock:
+    """
+    Get the lock held while sending binary frames on a transport.
+
+    The receiver takes the binary frame following an attachment metadata frame as
+    the attachment data. Every binary frame of a transport, whichever protocol sends
+    it (codec-encoded and compressed messages, attachments, files), is sent under
+    this lock, so that none lands between the metadata and data frames of another.
+
+    :param transport: The transport
+    :return: The lock of the connection wrapped by the transport
+    """
+    # Several transports may wrap the same WebSocket connection
+    connection = getattr(transport, "_ws", None) or transport
+    lock = _binary_send_locks.get(connection)
+    if lock is None:
+        lock = _binary_send_locks[connection] = asyncio.Lock()
+    return lock
+
 
 class AIPProtocol:
     """
@@ -47,6 +101,16 @@ class AIPProtocol:
         self.transport = transport
         self.message_handlers: Dict[str, List[MessageHandler]] = {}
         self.middleware_chain: List["ProtocolMiddleware"] = []
+        # Capabilities advertised by the peer during registration
+        self.peer_capabilities: Set[str] = set()
+        # Binary attachments received ahead of the messages referencing them
+        self.attachment_store = AttachmentStore()
+        # Wire codec, negotiated during registration (JSON text frames by default)
+        self.codec: MessageCodec = JsonCodec()
+        # Message compression, negotiated during registration (disabled by default)
+        self.compression: Optional[PayloadCompressor] = None
+        self.compression_threshold = DEFAULT_COMPRESSION_THRESHOLD
+        self.extensions: List["AIPExtension"] = []
         self.logger = logging.getLogger(f"{__name__}.AIPProtocol")
 
     async def send_message(self, msg: Any) -> None:
@@ -67,7 +131,22 @@ class AIPProtocol:
             # Serialize message
             if hasattr(msg, "model_dump_json"):
                 # Pydantic model
-                serialized = msg.model_dump_json().encode("utf-8")
+                serialized = self.codec.encode(msg)
+                if (
+                    self.compression is not None
+                    and len(serialized) >= self.compression_threshold
+                ):
+                    serialized = self._compress(serialized)
+                    binary = True
+                else:
+                    binary = self.codec.binary
+                if binary:
+                    # Binary codecs hand their bytes to the transport without a str round trip
+                    async with get_binary_send_lock(self.transport):
+                        await self.transport.send_binary(serialized)
+                    self.logger.debug(f"Sent message: {msg.__class__.__name__}")
+                    await self._notify_extensions("on_message_sent", msg)
+                    return
             elif isinstance(msg, str):
                 serialized = msg.encode("utf-8")
             elif isinstance(msg, bytes):
@@ -78,6 +157,7 @@ class AIPProtocol:
             # Send via transport
             await self.transport.send(serialized)
             self.logger.debug(f"Sent message: {msg.__class__.__name__}")
+            await self._notify_extensions("on_message_sent", msg)
 
         except (ConnectionError, IOError, OSError) as e:
             # Connection closed or I/O error - this is common during disconnection
@@ -105,15 +185,15 @@ class AIPProtocol:
         """
         try:
             # Receive via transport
-            data = await self.transport.receive()
+            if self.codec.binary or self.compression is not None:
+                data = await self.transport.receive_auto()
+            else:
+                data = await self.transport.receive()
 
             # Deserialize message
-            if isinstance(data, bytes):
-                data = data.decode("utf-8")
-
             if hasattr(message_type, "model_validate_json"):
                 # Pydantic model
-                msg = message_type.model_validate_json(data)
+                msg = self.decode_message(data, message_type)
             else:
                 raise ValueError(f"Unsupported message type: {message_type}")
 
@@ -122,6 +202,7 @@ class AIPProtocol:
                 msg = await middleware.process_incoming(msg)
 
             self.logger.debug(f"Received message: {msg.__class__.__name__}")
+            await self._notify_extensions("on_message_received", msg)
             return msg
 
         except (ConnectionError, IOError, OSError) as e:
@@ -136,6 +217,118 @@ class AIPProtocol:
             self.logger.error(f"Error receiving message: {e}")
             raise
 
+    def decode_message(self, data: Union[bytes, str], message_type: type) -> Any:
+        """
+        Decode a received frame into a message.
+
+        Text frames are always JSON; binary frames use the negotiated codec,
+        after decompression if they were compressed.
+
+        :param data: Frame data (str for text frames, bytes otherwise)
+        :param message_type: Expected message type (ClientMessage or ServerMessage)
+        :return: Deserialized message
+        """
+        if isinstance(data, str):
+            return message_type.model_validate_json(data)
+        if self.compression is not None and self.compression.is_compressed(data):
+            data = self._decompress(data)
+        return self.codec.decode(data, message_type)
+
+    def _compress(self, data: bytes) -> bytes:
+        """
+        Compress an encoded message and report it to the extensions.
+
+        :param data: Encoded message
+        :return: Compressed message
+        """
+        start = time.perf_counter()
+        compressed = self.compression.compress(data)
+        self._notify_compression(
+            "sent", len(data), len(compressed), time.perf_counter() - start
+        )
+        return compressed
+
+    def _decompress(self, data: bytes) -> bytes:
+        """
+        Decompress a received message and report it to the extensions.
+
+        The decompressed size is bounded by the maximum message size of the transport,
+        so a small frame cannot expand into an arbitrarily large message.
+
+        :param data: Compressed message
+        :return: Encoded message
+        :raises ValueError: If the message expands beyond the maximum message size
+        """
+        max_size = (
+            getattr(self.transport, "max_size", None) or DEFAULT_MAX_DECOMPRESSED_SIZE
+        )
+        start = time.perf_counter()
+        try:
+            decompressed = self.compression.decompress(data, max_size)
+        except ValueError as e:
+            self.logger.warning(
+                f"Rejected compressed message of {len(data)} bytes: {e}"
+            )
+            raise
+        self._notify_compression(
+            "received", len(decompressed), len(data), time.perf_counter() - start
+        )
+        return decompressed
+
+    def _notify_compression(
+        self, direction: str, raw_size: int, wire_size: int, cpu_time: float
+    ) -> None:
+        """
+        Report a compressed or decompressed message to the extensions.
+
+        :param direction: "sent" or "received"
+        :param raw_size: Size of the encoded message in bytes
+        :param wire_size: Size of the compressed message in bytes
+        :param cpu_time: Time spent in the compressor, in seconds
+        """
+        for extension in self.extensions:
+            try:
+                extension.on_compression(direction, raw_size, wire_size, cpu_time)
+            except Exception as e:
+                self.logger.error(f"Error in extension {extension}: {e}")
+
+    async def _notify_extensions(self, event: str, msg: Any) -> None:
+        """
+        Call a message hook of all extensions.
+
+        :param event: Hook name ("on_message_sent" or "on_message_received")
+        :param msg: The message
+        """
+        for extension in self.extensions:
+            try:
+                await getattr(extension, event)(msg)
+            except Exception as e:
+                self.logger.error(f"Error in extension {extension}: {e}")
+
+    def add_extension(self, extension: "AIPExtension") -> None:
+        """
+        Add an extension notified of the messages sent and received.
+
+        :param extension: Extension to add (e.g. MetricsExtension)
+        """
+        self.extensions.append(extension)
+        self.logger.info(f"Added extension: {extension.__class__.__name__}")
+
+    def set_compression(
+        self,
+        compression: Optional[PayloadCompressor],
+        threshold: Optional[int] = None,
+    ) -> None:
+        """
+        Set the message compression negotiated for the connection.
+
+        :param compression: Compressor, or None to disable compression
+        :param threshold: Minimum size (bytes) of the messages to compress
+        """
+        self.compression = compression
+        if threshold is not None:
+            self.compression_threshold = threshold
+
     def add_middleware(self, middleware: "ProtocolMiddleware") -> None:
         """
         Add middleware to the protocol pipeline.
@@ -182,6 +375,15 @@ class AIPProtocol:
         """Check if protocol transport is connected."""
         return self.transport.is_connected
 
+    def supports_capability(self, capability: str) -> bool:
+        """
+        Check if the peer advertised a capability during registration.
+
+        :param capability: Capability name (see ClientCapability)
+        :return: True if the peer supports the capability
+        """
+        return str(getattr(capability, "value", capability)) in self.peer_capabilities
+
     async def send_error(
         self, error_msg: str, response_id: Optional[str] = None
     ) -> None:
@@ -247,7 +449,8 @@ class AIPProtocol:
         2. Binary frame with actual file data
 
         This approach allows receivers to prepare for incoming binary data
-        and validate it after reception.
+        and validate it after reception. Both frames are sent under the binary
+        send lock of the transport, so no other binary frame lands in between.
 
         :param data: Binary data to send (image, file, etc.)
         :param metadata: Optional metadata dict with fields like:
@@ -292,11 +495,12 @@ class AIPProtocol:
             )
 
             meta_json = json.dumps(meta)
-            await self.transport.send(meta_json.encode("utf-8"))
-            self.logger.debug(f"Sent binary metadata: {meta}")
+            async with get_binary_send_lock(self.transport):
+                await self.transport.send(meta_json.encode("utf-8"))
+                self.logger.debug(f"Sent binary metadata: {meta}")
 
-            # 2. Send actual data as binary frame
-            await self.transport.send_binary(data)
+                # 2. Send actual data as binary frame
+                await self.transport.send_binary(data)
             self.logger.debug(f"Sent {len(data)} bytes of binary data")
 
         except Exception as e:
@@ -542,6 +746,65 @@ class AIPProtocol:
             "checksum": completion.get("checksum"),
         }
 
+    # ========================================================================
+    # Binary Attachments
+    # ========================================================================
+
+    async def send_attachments(
+        self, payload: Any, min_size: int = DEFAULT_ATTACHMENT_MIN_SIZE
+    ) -> Any:
+        """
+        Send the large base64 data URLs of a payload as binary frames.
+
+        Each data URL is decoded and sent with send_binary_message, and replaced
+        in the returned payload with an attachment reference. The payload must be
+        sent after this call, so that the receiver gets the attachments first.
+
+        :param payload: The payload (nested dicts, lists and strings)
+        :param min_size: The minimum length of a data URL to be sent as binary
+        :return: The payload with attachment references
+        """
+        payload, attachments = extract_attachments(payload, min_size)
+
+        for attachment in attachments:
+            metadata = BinaryMetadata(
+                size=len(attachment.data),
+                mime_type=attachment.mime_type,
+                attachment_id=attachment.attachment_id,
+            ).model_dump(exclude_none=True)
+
+            # The metadata and data frames are kept adjacent by the binary send lock
+            await self.send_binary_message(attachment.data, metadata)
+
+        if attachments:
+            self.logger.debug(
+                f"Sent {len(attachments)} attachment(s), "
+                f"{sum(len(a.data) for a in attachments)} bytes as binary frames"
+            )
+
+        return payload
+
+    def store_attachment(self, metadata: Dict[str, Any], data: bytes) -> None:
+        """
+        Store a received binary frame until the message referencing it arrives.
+
+        :param metadata: BinaryMetadata received in the preceding text frame
+        :param data: Binary frame data
+        """
+        self.attachment_store.add(metadata, data)
+
+    def resolve_attachments(self, payload: Any) -> Any:
+        """
+        Replace the attachment references of a payload with the received data.
+
+        :param payload: The payload (nested dicts, lists and strings)
+        :return: The payload with attachment references resolved to data URLs
+        """
+        payload, missing = resolve_attachments(payload, self.attachment_store)
+        if missing:
+            self.logger.warning(f"Missing binary attachments: {missing}")
+        return payload
+
 
 class ProtocolMiddleware(ABC):
     """
@@ -0,0 +1,181 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Wire Codecs
+
+Pluggable serializers for AIP messages. The codec of a connection is negotiated during
+registration: the client lists the codecs it can use under the "codecs" metadata key,
+and the server picks one and returns it under the "codec" key of the confirmation.
+
+- json: pydantic JSON in text frames (default, used by peers that do not negotiate)
+- orjson: orjson-backed JSON in binary frames (requires ``orjson``)
+- msgpack: MessagePack in binary frames (requires ``msgpack``)
+
+Registration messages are always JSON. Text frames are always decoded as JSON, so a
+peer may keep sending JSON text frames after a binary codec was negotiated.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Type, TypeVar, Union
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class MessageCodec(ABC):
+    """
+    Serializer of AIP messages.
+    """
+
+    # Name used during negotiation
+    name: str = ""
+
+    # Whether encoded messages are sent as binary frames (text frames otherwise)
+    binary: bool = False
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """
+        Whether the dependencies of the codec are installed.
+        :return: True if the codec can be used.
+        """
+        return True
+
+    @abstractmethod
+    def encode(self, msg: BaseModel) -> bytes:
+        """
+        Encode a message.
+        :param msg: The message.
+        :return: The encoded message.
+        """
+        pass
+
+    @abstractmethod
+    def decode(self, data: Union[bytes, str], message_type: Type[ModelT]) -> ModelT:
+        """
+        Decode a message.
+        :param data: The encoded message.
+        :param message_type: The expected message type.
+        :return: The decoded message.
+        """
+        pass
+
+
+class JsonCodec(MessageCodec):
+    """
+    pydantic JSON in text frames.
+    """
+
+    name = "json"
+    binary = False
+
+    def encode(self, msg: BaseModel) -> bytes:
+        # Serialize straight to bytes, skipping the intermediate str of model_dump_json
+        return msg.__pydantic_serializer__.to_json(msg)
+
+    def decode(self, data: Union[bytes, str], message_type: Type[ModelT]) -> ModelT:
+        return message_type.model_validate_json(data)
+
+
+class OrjsonCodec(MessageCodec):
+    """
+    orjson-backed JSON in binary frames.
+    """
+
+    name = "orjson"
+    binary = True
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return orjson is not None
+
+    def encode(self, msg: BaseModel) -> bytes:
+        return orjson.dumps(msg.model_dump(mode="json"))
+
+    def decode(self, data: Union[bytes, str], message_type: Type[ModelT]) -> ModelT:
+        return message_type.model_validate(orjson.loads(data))
+
+
+class MsgpackCodec(MessageCodec):
+    """
+    MessagePack in binary frames.
+    """
+
+    name = "msgpack"
+    binary = True
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return msgpack is not None
+
+    def encode(self, msg: BaseModel) -> bytes:
+        return msgpack.packb(msg.model_dump(mode="json"), use_bin_type=True)
+
+    def decode(self, data: Union[bytes, str], message_type: Type[ModelT]) -> ModelT:
+        if isinstance(data, str):
+            # Text frames are always JSON
+            return message_type.model_validate_json(data)
+        return message_type.model_validate(msgpack.unpackb(data, raw=False))
+
+
+CODECS: Dict[str, Type[MessageCodec]] = {
+    JsonCodec.name: JsonCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    MsgpackCodec.name: MsgpackCodec,
+}
+
+# Server-side preference order during negotiation. pydantic's own JSON is the cheapest
+# on the CPU (see tests/benchmarks/benchmark_aip_codecs.py), while msgpack messages are
+# about a quarter smaller, which pays off on slow links.
+DEFAULT_CODEC_PREFERENCE = [JsonCodec.name]
+
+
+def get_codec(name: Optional[str]) -> MessageCodec:
+    """
+    Create a codec by name.
+    :param name: The codec name, or None for the default JSON codec.
+    :return: The codec.
+    :raises ValueError: If the codec is unknown or its dependencies are missing.
+    """
+    codec_class = CODECS.get(name or JsonCodec.name)
+    if codec_class is None:
+        raise ValueError(f"Unknown AIP codec: {name}")
+    if not codec_class.is_available():
+        raise ValueError(f"AIP codec {name} is not available, install its package")
+    return codec_class()
+
+
+def available_codecs() -> List[str]:
+    """
+    List the names of the codecs whose dependencies are installed.
+    :return: The codec names.
+    """
+    return [name for name, codec in CODECS.items() if codec.is_available()]
+
+
+def negotiate_codec(
+    offered: Optional[List[str]], preference: Optional[List[str]] = None
+) -> MessageCodec:
+    """
+    Pick the codec of a connection from the codecs offered by the peer.
+    :param offered: The codec names offered by the peer, or None for peers that do not negotiate.
+    :param preference: The local preference order (default: DEFAULT_CODEC_PREFERENCE).
+    :return: The first preferred codec available on both sides, JSON otherwise.
+    """
+    offered_names = set(offered or [])
+    for name in preference or DEFAULT_CODEC_PREFERENCE:
+        if name in offered_names and name in CODECS and CODECS[name].is_available():
+            return CODECS[name]()
+    return JsonCodec()
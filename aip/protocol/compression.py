@@ -0,0 +1,230 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Message Compression
+
+Application-level compression of encoded AIP messages, negotiated per connection during
+registration: the client lists the algorithms it supports under the "compression"
+metadata key, and the server returns the chosen algorithm and size threshold under the
+"compression" and "compression_threshold" keys of the confirmation.
+
+Messages smaller than the threshold are sent as before. Larger messages are compressed
+and sent as binary frames. Compressed frames are recognized by the magic bytes of the
+algorithm, which never start a JSON or MessagePack message.
+
+- zstd: Zstandard (requires ``zstandard``)
+- deflate: zlib (standard library)
+
+Unlike WebSocket permessage-deflate, small messages (heartbeats, acks) and binary
+attachments are never compressed.
+
+Decompression is bounded: a frame that would expand beyond the maximum message size
+of the transport is rejected instead of being inflated in memory.
+"""
+
+import zlib
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Type
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Messages smaller than this (in bytes) are sent uncompressed.
+DEFAULT_COMPRESSION_THRESHOLD = 16 * 1024
+
+# Maximum decompressed size (in bytes) when the transport does not define one,
+# matching the default max_size of WebSocketTransport.
+DEFAULT_MAX_DECOMPRESSED_SIZE = 100 * 1024 * 1024
+
+
+class PayloadCompressor(ABC):
+    """
+    Compressor of encoded messages.
+    """
+
+    # Name used during negotiation
+    name: str = ""
+
+    # Leading bytes of every compressed payload
+    magic: bytes = b""
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """
+        Whether the dependencies of the compressor are installed.
+        :return: True if the compressor can be used.
+        """
+        return True
+
+    def is_compressed(self, data: bytes) -> bool:
+        """
+        Whether a received frame was compressed by this compressor.
+        :param data: The frame data.
+        :return: True if the frame is compressed.
+        """
+        return data[: len(self.magic)] == self.magic
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """
+        Compress an encoded message.
+        :param data: The encoded message.
+        :return: The compressed message.
+        """
+        pass
+
+    @abstractmethod
+    def decompress(
+        self, data: bytes, max_size: int = DEFAULT_MAX_DECOMPRESSED_SIZE
+    ) -> bytes:
+        """
+        Decompress a received message.
+        :param data: The compressed message.
+        :param max_size: The maximum size of the decompressed message in bytes.
+        :return: The encoded message.
+        :raises ValueError: If the message decompresses to more than max_size bytes.
+        """
+        pass
+
+
+class ZstdCompressor(PayloadCompressor):
+    """
+    Zstandard compression.
+    """
+
+    name = "zstd"
+    magic = b"\x28\xb5\x2f\xfd"
+
+    def __init__(self, level: int = 3) -> None:
+        """
+        Initialize the compressor.
+        :param level: The zstd compression level.
+        """
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return zstandard is not None
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def decompress(
+        self, data: bytes, max_size: int = DEFAULT_MAX_DECOMPRESSED_SIZE
+    ) -> bytes:
+        # A declared content size is allocated as is, so check it before decompressing
+        content_size = zstandard.frame_content_size(data)
+        if content_size > max_size:
+            raise ValueError(
+                f"Compressed message expands to {content_size} bytes, above the limit of {max_size}"
+            )
+        try:
+            # Frames without a content size are bounded by max_output_size
+            return self._decompressor.decompress(data, max_output_size=max_size)
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Cannot decompress message: {e}") from e
+
+
+class DeflateCompressor(PayloadCompressor):
+    """
+    zlib (deflate) compression.
+    """
+
+    name = "deflate"
+
+    # zlib header with 32K window: 0x78, followed by the level-dependent flag byte
+    magic = b"\x78"
+
+    def __init__(self, level: int = 1) -> None:
+        """
+        Initialize the compressor.
+        :param level: The zlib compression level.
+        """
+        self.level = level
+
+    def is_compressed(self, data: bytes) -> bool:
+        return (
+            len(data) >= 2
+            and data[0] == 0x78
+            and ((data[0] << 8) | data[1]) % 31 == 0
+        )
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(
+        self, data: bytes, max_size: int = DEFAULT_MAX_DECOMPRESSED_SIZE
+    ) -> bytes:
+        decompressor = zlib.decompressobj()
+        decompressed = decompressor.decompress(data, max_size)
+        if decompressor.unconsumed_tail:
+            raise ValueError(
+                f"Compressed message expands beyond the limit of {max_size} bytes"
+            )
+        return decompressed
+
+
+COMPRESSORS: Dict[str, Type[PayloadCompressor]] = {
+    ZstdCompressor.name: ZstdCompressor,
+    DeflateCompressor.name: DeflateCompressor,
+}
+
+# Server-side preference order during negotiation
+DEFAULT_COMPRESSION_PREFERENCE = [ZstdCompressor.name, DeflateCompressor.name]
+
+
+def get_compressor(name: Optional[str]) -> Optional[PayloadCompressor]:
+    """
+    Create a compressor by name.
+    :param name: The compressor name, or None for no compression.
+    :return: The compressor, or None.
+    :raises ValueError: If the compressor is unknown or its dependencies are missing.
+    """
+    if not name:
+        return None
+    compressor_class = COMPRESSORS.get(name)
+    if compressor_class is None:
+        raise ValueError(f"Unknown AIP compression: {name}")
+    if not compressor_class.is_available():
+        raise ValueError(
+            f"AIP compression {name} is not available, install its package"
+        )
+    return compressor_class()
+
+
+def available_compressors() -> List[str]:
+    """
+    List the names of the compressors whose dependencies are installed.
+    :return: The compressor names.
+    """
+    return [
+        name
+        for name, compressor in COMPRESSORS.items()
+        if compressor.is_available()
+    ]
+
+
+def negotiate_compressor(
+    offered: Optional[List[str]], preference: Optional[List[str]] = None
+) -> Optional[PayloadCompressor]:
+    """
+    Pick the compressor of a connection from the compressors offered by the peer.
+    :param offered: The compressor names offered by the peer.
+    :param preference: The local preference order (default: DEFAULT_COMPRESSION_PREFERENCE).
+    :return: The first preferred compressor available on both sides, or None.
+    """
+    offered_names = set(offered or [])
+    if preference is None:
+        preference = DEFAULT_COMPRESSION_PREFERENCE
+    for name in preference:
+        if (
+            name in offered_names
+            and name in COMPRESSORS
+            and COMPRESSORS[name].is_available()
+        ):
+            return COMPRESSORS[name]()
+    return None
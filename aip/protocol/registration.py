@@ -9,7 +9,7 @@ Handles agent registration and capability advertisement in the AIP system.
 
 import datetime
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from aip.messages import (
     ClientMessage,
@@ -20,6 +20,8 @@ from aip.messages import (
     TaskStatus,
 )
 from aip.protocol.base import AIPProtocol
+from aip.protocol.codecs import JsonCodec, MessageCodec, get_codec
+from aip.protocol.compression import PayloadCompressor, get_compressor
 
 
 class RegistrationProtocol(AIPProtocol):
@@ -84,6 +86,17 @@ class RegistrationProtocol(AIPProtocol):
             response = await self.receive_message(ServerMessage)
 
             if response.status == TaskStatus.OK:
+                response_metadata = response.metadata or {}
+                self.peer_capabilities = set(
+                    response_metadata.get("capabilities") or []
+                )
+                self.codec = self._get_negotiated_codec(response_metadata.get("codec"))
+                self.set_compression(
+                    self._get_negotiated_compressor(
+                        response_metadata.get("compression")
+                    ),
+                    response_metadata.get("compression_threshold"),
+                )
                 self.logger.info(f"Device {device_id} registered successfully")
                 return True
             else:
@@ -169,18 +182,38 @@ class RegistrationProtocol(AIPProtocol):
             return False
 
     async def send_registration_confirmation(
-        self, response_id: Optional[str] = None
+        self,
+        response_id: Optional[str] = None,
+        capabilities: Optional[List[str]] = None,
+        codec: Optional[str] = None,
+        compression: Optional[str] = None,
+        compression_threshold: Optional[int] = None,
     ) -> None:
         """
         Send registration confirmation (server-side).
 
         :param response_id: Optional response ID for correlation
+        :param capabilities: Optional protocol features supported by the server
+        :param codec: Optional wire codec chosen for the connection
+        :param compression: Optional message compression chosen for the connection
+        :param compression_threshold: Minimum size (bytes) of the messages to compress
         """
+        metadata = {}
+        if capabilities:
+            metadata["capabilities"] = capabilities
+        if codec:
+            metadata["codec"] = codec
+        if compression:
+            metadata["compression"] = compression
+            if compression_threshold is not None:
+                metadata["compression_threshold"] = compression_threshold
+
         confirmation = ServerMessage(
             type=ServerMessageType.HEARTBEAT,
             status=TaskStatus.OK,
             timestamp=datetime.datetime.now(datetime.timezone.utc).isoformat(),
             response_id=response_id or self._generate_response_id(),
+            metadata=metadata or None,
         )
         await self.send_message(confirmation)
 
@@ -202,6 +235,34 @@ class RegistrationProtocol(AIPProtocol):
         )
         await self.send_message(error_msg)
 
+    def _get_negotiated_codec(self, name: Optional[str]) -> MessageCodec:
+        """
+        Get the wire codec chosen by the server (client-side).
+
+        :param name: The codec name from the registration confirmation
+        :return: The codec, or the JSON codec if none was chosen
+        """
+        try:
+            return get_codec(name)
+        except ValueError as e:
+            self.logger.warning(f"{e}, falling back to JSON")
+            return JsonCodec()
+
+    def _get_negotiated_compressor(
+        self, name: Optional[str]
+    ) -> Optional[PayloadCompressor]:
+        """
+        Get the message compression chosen by the server (client-side).
+
+        :param name: The compression name from the registration confirmation
+        :return: The compressor, or None if no compression was chosen
+        """
+        try:
+            return get_compressor(name)
+        except ValueError as e:
+            self.logger.warning(f"{e}, sending messages uncompressed")
+            return None
+
     @staticmethod
     def _generate_response_id() -> str:
         """Generate a unique response ID."""
@@ -13,6 +13,7 @@ from typing import Any, List, Optional
 from uuid import uuid4
 
 from aip.messages import (
+    ClientCapability,
     ClientMessage,
     ClientMessageType,
     ClientType,
@@ -180,6 +181,15 @@ class TaskExecutionProtocol(AIPProtocol):
         :param prev_response_id: Previous response ID
         :param status: Task status
         """
+        if self.supports_capability(ClientCapability.BINARY_ATTACHMENTS):
+            # Large data URLs (e.g. screenshots) travel as binary frames ahead of the message
+            action_results = [
+                result.model_copy(
+                    update={"result": await self.send_attachments(result.result)}
+                )
+                for result in action_results
+            ]
+
         result_msg = ClientMessage(
             type=ClientMessageType.COMMAND_RESULTS,
             action_results=action_results,
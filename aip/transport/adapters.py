@@ -12,10 +12,12 @@ Uses the Adapter pattern to abstract away differences between:
 Supports both text and binary frame transmission for efficient file transfer.
 """
 
+import inspect
 from abc import ABC, abstractmethod
 from typing import Union
 
 from websockets import WebSocketClientProtocol
+from websockets.protocol import State
 
 
 class WebSocketAdapter(ABC):
@@ -85,6 +87,30 @@ class WebSocketAdapter(ABC):
         """
         pass
 
+    async def send_encoded_text(self, data: bytes) -> None:
+        """
+        Send UTF-8 encoded text as a text frame.
+
+        Adapters whose library accepts bytes for text frames send them as is;
+        the others decode them first.
+
+        :param data: UTF-8 encoded text
+        :raises: Exception if send fails
+        """
+        await self.send(data.decode("utf-8"))
+
+    async def receive_encoded_text(self) -> bytes:
+        """
+        Receive a text frame as UTF-8 encoded bytes.
+
+        Adapters whose library can return text frames undecoded return them as is;
+        the others encode the received text.
+
+        :return: Received UTF-8 encoded text
+        :raises: Exception if receive fails
+        """
+        return (await self.receive()).encode("utf-8")
+
     @abstractmethod
     async def close(self) -> None:
         """
@@ -153,9 +179,9 @@ class FastAPIWebSocketAdapter(WebSocketAdapter):
         the appropriate data type.
         """
         message = await self._ws.receive()
-        if "text" in message:
+        if message.get("text") is not None:
             return message["text"]
-        elif "bytes" in message:
+        elif message.get("bytes") is not None:
             return message["bytes"]
         else:
             raise ValueError(f"Unknown WebSocket message type: {message}")
@@ -186,11 +212,32 @@ class WebSocketsLibAdapter(WebSocketAdapter):
         :param websocket: websockets library WebSocket instance
         """
         self._ws: WebSocketClientProtocol = websocket
+        # The connections of websockets >= 13 send bytes as text frames and return
+        # text frames undecoded on request, sparing a str round trip per message
+        self._encoded_text = _accepts_keyword(
+            websocket.send, "text"
+        ) and _accepts_keyword(websocket.recv, "decode")
 
     async def send(self, data: str) -> None:
         """Send text data via websockets library."""
         await self._ws.send(data)
 
+    async def send_encoded_text(self, data: bytes) -> None:
+        """Send UTF-8 encoded text as a text frame, without decoding it if supported."""
+        if self._encoded_text:
+            await self._ws.send(data, text=True)
+        else:
+            await self._ws.send(data.decode("utf-8"))
+
+    async def receive_encoded_text(self) -> bytes:
+        """Receive a frame as bytes, without decoding text frames if supported."""
+        if self._encoded_text:
+            return await self._ws.recv(decode=False)
+        received = await self._ws.recv()
+        if isinstance(received, str):
+            return received.encode("utf-8")
+        return received
+
     async def receive(self) -> str:
         """Receive data via websockets library (handles both text and bytes)."""
         received = await self._ws.recv()
@@ -237,7 +284,25 @@ class WebSocketsLibAdapter(WebSocketAdapter):
 
     def is_open(self) -> bool:
         """Check if websockets library connection is still open."""
-        return not self._ws.closed
+        closed = getattr(self._ws, "closed", None)
+        if closed is None:
+            # The connections of websockets >= 14 expose their state instead
+            return self._ws.state is State.OPEN
+        return not closed
+
+
+def _accepts_keyword(method, name: str) -> bool:
+    """
+    Check whether a method declares a keyword parameter.
+
+    :param method: The method
+    :param name: The name of the parameter
+    :return: True if the parameter is declared explicitly
+    """
+    try:
+        return name in inspect.signature(method).parameters
+    except (TypeError, ValueError):
+        return False
 
 
 def create_adapter(websocket) -> WebSocketAdapter:
@@ -11,6 +11,7 @@ while maintaining a consistent protocol layer.
 
 from abc import ABC, abstractmethod
 from enum import Enum
+from typing import Union
 
 
 class TransportState(str, Enum):
@@ -94,6 +95,30 @@ class Transport(ABC):
         """
         pass
 
+    async def send_binary(self, data: bytes) -> None:
+        """
+        Send data as a binary frame.
+
+        Transports without frame types send the bytes as a regular message.
+
+        :param data: Bytes to send
+        :raises: ConnectionError if not connected
+        :raises: IOError if send fails
+        """
+        await self.send(data)
+
+    async def receive_auto(self) -> Union[bytes, str]:
+        """
+        Receive data without converting between text and bytes.
+
+        Transports without frame types return the result of receive().
+
+        :return: Received data (str for text frames, bytes for binary frames)
+        :raises: ConnectionError if connection closed
+        :raises: IOError if receive fails
+        """
+        return await self.receive()
+
     @abstractmethod
     async def close(self) -> None:
         """
@@ -145,16 +145,17 @@ class WebSocketTransport(Transport):
             raise ConnectionError("WebSocket connection is closed")
 
         try:
-            # Convert bytes to text for consistent transport (JSON messages are text-based)
-            text_data = data.decode("utf-8") if isinstance(data, bytes) else data
-
             adapter_type = type(self._adapter).__name__
-            self.logger.debug(f"Sending {len(text_data)} chars via {adapter_type}")
+            self.logger.debug(f"Sending {len(data)} bytes via {adapter_type}")
 
-            # Use adapter to send (abstracts away FastAPI vs websockets library)
-            await self._adapter.send(text_data)
+            # Use adapter to send (abstracts away FastAPI vs websockets library).
+            # Messages are sent as text frames, decoded only if the library needs str.
+            if isinstance(data, bytes):
+                await self._adapter.send_encoded_text(data)
+            else:
+                await self._adapter.send(data)
 
-            self.logger.debug(f"✅ Sent {len(text_data)} chars successfully")
+            self.logger.debug(f"✅ Sent {len(data)} bytes successfully")
         except ConnectionClosed as e:
             self._state = TransportState.DISCONNECTED
             self.logger.debug(f"Connection closed during send: {e}")
@@ -190,9 +191,9 @@ class WebSocketTransport(Transport):
             adapter_type = type(self._adapter).__name__
             self.logger.debug(f"🔍 Attempting to receive data via {adapter_type}...")
 
-            # Use adapter to receive (abstracts away FastAPI vs websockets library)
-            text_data = await self._adapter.receive()
-            data = text_data.encode("utf-8")
+            # Use adapter to receive (abstracts away FastAPI vs websockets library),
+            # without a str round trip if the library returns text frames undecoded
+            data = await self._adapter.receive_encoded_text()
 
             self.logger.debug(f"✅ Received {len(data)} bytes successfully")
             return data
@@ -171,6 +171,9 @@ class RAGConfig:
     experience_retrieved_topk: int = 5
     demonstration: bool = False
     demonstration_retrieved_topk: int = 5
+    index_cache_size: int = 8
+    index_mmap: bool = False
+    retrieval_cache_ttl: float = 300
 
     # ========== Dynamic Fields ==========
     _extras: Dict[str, Any] = field(default_factory=dict, repr=False)
@@ -232,6 +235,9 @@ class RAGConfig:
             "RAG_EXPERIENCE_RETRIEVED_TOPK": "experience_retrieved_topk",
             "RAG_DEMONSTRATION": "demonstration",
             "RAG_DEMONSTRATION_RETRIEVED_TOPK": "demonstration_retrieved_topk",
+            "RAG_INDEX_CACHE_SIZE": "index_cache_size",
+            "RAG_INDEX_MMAP": "index_mmap",
+            "RAG_RETRIEVAL_CACHE_TTL": "retrieval_cache_ttl",
         }
 
         kwargs = {}
@@ -265,6 +271,12 @@ class SystemConfig:
     top_p: float = 0.0
     timeout: int = 60
 
+    # ========== LLM Response Cache ==========
+    llm_cache_mode: str = "off"
+    llm_cache_path: str = "cache/llm_responses.db"
+    llm_cache_ttl: float = 0
+    llm_cache_max_entries: int = 10000
+
     # ========== Control Backend ==========
     control_backend: List[str] = field(default_factory=lambda: ["uia"])
     iou_threshold_for_merge: float = 0.1
@@ -274,6 +286,7 @@ class SystemConfig:
     max_round: int = 1
     sleep_time: int = 1
     rectangle_time: int = 1
+    concurrent_strategies: bool = False
 
     # ========== Action Configuration ==========
     action_sequence: bool = False
@@ -334,18 +347,29 @@ class SystemConfig:
     log_xml: bool = False
     log_to_markdown: bool = True
     screenshot_to_memory: bool = True
+    async_log_write: bool = True
+    log_queue_size: int = 256
+    log_compression: str = "none"
+    deduplicate_log_images: bool = True
 
     # ========== Image Performance ==========
     default_png_compress_level: int = 1
+    async_screenshot_save: bool = True
+    llm_image_format: str = "png"
+    llm_image_quality: int = 85
 
     # ========== Save Options ==========
     save_ui_tree: bool = False
+    ui_tree_keyframe_interval: int = 10
     save_full_screen: bool = False
 
     # ========== Task Management ==========
     task_status: bool = True
     task_status_file: Optional[str] = None
     save_experience: str = "always_not"
+    max_concurrent_sessions: int = 4
+    session_timeout: float = 0
+    client_max_concurrent_tasks: int = 1
 
     # ========== Evaluation ==========
     eva_session: bool = True
@@ -478,6 +502,11 @@ class SystemConfig:
             "TEMPERATURE": "temperature",
             "TOP_P": "top_p",
             "TIMEOUT": "timeout",
+            # LLM Response Cache
+            "LLM_CACHE_MODE": "llm_cache_mode",
+            "LLM_CACHE_PATH": "llm_cache_path",
+            "LLM_CACHE_TTL": "llm_cache_ttl",
+            "LLM_CACHE_MAX_ENTRIES": "llm_cache_max_entries",
             # Control Backend
             "CONTROL_BACKEND": "control_backend",
             "IOU_THRESHOLD_FOR_MERGE": "iou_threshold_for_merge",
@@ -486,6 +515,7 @@ class SystemConfig:
             "MAX_ROUND": "max_round",
             "SLEEP_TIME": "sleep_time",
             "RECTANGLE_TIME": "rectangle_time",
+            "CONCURRENT_STRATEGIES": "concurrent_strategies",
             # Action Configuration
             "ACTION_SEQUENCE": "action_sequence",
             "SHOW_VISUAL_OUTLINE_ON_SCREEN": "show_visual_outline_on_screen",
@@ -515,15 +545,26 @@ class SystemConfig:
             "LOG_XML": "log_xml",
             "LOG_TO_MARKDOWN": "log_to_markdown",
             "SCREENSHOT_TO_MEMORY": "screenshot_to_memory",
+            "ASYNC_LOG_WRITE": "async_log_write",
+            "LOG_QUEUE_SIZE": "log_queue_size",
+            "LOG_COMPRESSION": "log_compression",
+            "DEDUPLICATE_LOG_IMAGES": "deduplicate_log_images",
             # Image Performance
             "DEFAULT_PNG_COMPRESS_LEVEL": "default_png_compress_level",
+            "ASYNC_SCREENSHOT_SAVE": "async_screenshot_save",
+            "LLM_IMAGE_FORMAT": "llm_image_format",
+            "LLM_IMAGE_QUALITY": "llm_image_quality",
             # Save Options
             "SAVE_UI_TREE": "save_ui_tree",
+            "UI_TREE_KEYFRAME_INTERVAL": "ui_tree_keyframe_interval",
             "SAVE_FULL_SCREEN": "save_full_screen",
             # Task Management
             "TASK_STATUS": "task_status",
             "TASK_STATUS_FILE": "task_status_file",
             "SAVE_EXPERIENCE": "save_experience",
+            "MAX_CONCURRENT_SESSIONS": "max_concurrent_sessions",
+            "SESSION_TIMEOUT": "session_timeout",
+            "CLIENT_MAX_CONCURRENT_TASKS": "client_max_concurrent_tasks",
             # Evaluation
             "EVA_SESSION": "eva_session",
             "EVA_ROUND": "eva_round",
@@ -67,6 +67,7 @@ class ConstellationProcessorContext(BasicProcessorContext):
             "cost",  # Cost
             "results",  # Results
             "execution_times",  # time_cost (mapped to execution_times)
+            "strategy_timings",
             "total_time",
             "device_info",
             "constellation_before",
@@ -8,8 +8,6 @@ This module provides base classes for different types of constellation processin
 containing shared logic while allowing for mode-specific customization.
 """
 
-import asyncio
-import json
 import time
 import traceback
 from abc import abstractmethod
@@ -165,7 +163,7 @@ class ConstellationLLMInteractionStrategy(BaseProcessingStrategy):
             constellation_json = constellation.to_json() if constellation else ""
 
             # Log request data for debugging
-            self._log_request_data(
+            await self._log_request_data(
                 session_step=session_step,
                 device_info=device_info,
                 constellation_json=constellation_json,
@@ -182,7 +180,7 @@ class ConstellationLLMInteractionStrategy(BaseProcessingStrategy):
                 f"Failed to build prompt message: {str(traceback.format_exc())}"
             )
 
-    def _log_request_data(
+    async def _log_request_data(
         self,
         session_step: int,
         device_info: Dict[str, AgentProfile],
@@ -205,14 +203,9 @@ class ConstellationLLMInteractionStrategy(BaseProcessingStrategy):
                 prompt=prompt_message,
             )
 
-            # Log request data as JSON
-            request_log_str = json.dumps(
-                asdict(request_data), ensure_ascii=False, default=str
-            )
-
-            # Use request logger if available
+            # Log request data as JSON, serialized by the background log writer
             if request_logger:
-                request_logger.write(request_log_str)
+                await request_logger.awrite_record(asdict(request_data))
 
         except Exception as e:
             self.logger.warning(f"Failed to log request data: {str(e)}")
@@ -229,10 +222,7 @@ class ConstellationLLMInteractionStrategy(BaseProcessingStrategy):
         for retry_count in range(max_retries):
             try:
                 # Get response from LLM
-                loop = asyncio.get_event_loop()
-                response_text, cost = await loop.run_in_executor(
-                    None,  # Use default ThreadPoolExecutor
-                    agent.get_response,
+                response_text, cost = await agent.aget_response(
                     prompt_message,
                     AgentType.CONSTELLATION,
                     True,  # use_backup_engine
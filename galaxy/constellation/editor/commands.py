@@ -82,6 +82,7 @@ class BaseConstellationCommand(IUndoableCommand):
             self._constellation._state = restored._state
             self._constellation._metadata = restored._metadata
             self._constellation._updated_at = restored._updated_at
+            self._constellation.rebuild_indexes()
 
         except KeyError as e:
             raise CommandUndoError(self, f"Missing required data in backup: {e}") from e
@@ -900,6 +901,7 @@ class LoadConstellationCommand(BaseConstellationCommand):
             self._constellation._state = loaded_constellation._state
             self._constellation._metadata = loaded_constellation._metadata
             self._constellation._name = loaded_constellation._name
+            self._constellation.rebuild_indexes()
 
             # Validate constellation after loading
             is_valid, validation_errors = self._constellation.validate_dag()
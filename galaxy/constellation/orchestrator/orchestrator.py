@@ -10,9 +10,11 @@ Delegates device/state management to ConstellationManager.
 """
 
 import asyncio
+import functools
 import logging
+import statistics
 import time
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
 
 from galaxy.client.device_manager import ConstellationDeviceManager
 
@@ -66,6 +68,20 @@ class TaskConstellationOrchestrator:
         # Track active execution tasks
         self._execution_tasks: Dict[str, asyncio.Task] = {}
 
+        # Set when a task finishes, the constellation is modified or execution is
+        # cancelled, to wake the execution loop
+        self._wakeup = asyncio.Event()
+        self._last_wakeup_time: Optional[float] = None
+
+        # Tasks dispatched in this run, the only ones whose execution state the
+        # orchestrator changes and has to merge into agent modifications
+        self._dispatched_task_ids: Set[str] = set()
+
+        # Scheduling latency: when each task became ready (monotonic time), and the
+        # delays from ready to dispatched, per constellation
+        self._ready_times: Dict[str, Dict[str, float]] = {}
+        self._scheduling_latencies: Dict[str, List[float]] = {}
+
         # Cancellation support
         self._cancellation_requested = False
         self._cancelled_constellations: Dict[str, bool] = {}
@@ -84,6 +100,14 @@ class TaskConstellationOrchestrator:
         self._device_manager = device_manager
         self._constellation_manager.set_device_manager(device_manager)
 
+    def notify_constellation_modified(self) -> None:
+        """
+        Wake the execution loop after a constellation modification, so that tasks
+        made ready by the modification are dispatched without waiting for a task
+        to finish.
+        """
+        self._wakeup.set()
+
     def set_modification_synchronizer(
         self, synchronizer: "ConstellationModificationSynchronizer"
     ) -> None:
@@ -113,6 +137,7 @@ class TaskConstellationOrchestrator:
         # Mark this constellation as cancelled
         self._cancellation_requested = True
         self._cancelled_constellations[constellation_id] = True
+        self._wakeup.set()
 
         # Cancel all running execution tasks
         if self._execution_tasks:
@@ -371,6 +396,8 @@ class TaskConstellationOrchestrator:
         :return: The published constellation started event
         """
         constellation.start_execution()
+        self._dispatched_task_ids = set()
+        self._scheduling_latencies[constellation.constellation_id] = []
 
         # Create and publish constellation started event
         start_event = ConstellationEvent(
@@ -397,9 +424,12 @@ class TaskConstellationOrchestrator:
 
         Continuously processes ready tasks until constellation is complete.
         Handles dynamic constellation modifications via synchronizer.
+        Between iterations, the loop sleeps until a task finishes, the
+        constellation is modified or execution is cancelled.
 
         :param constellation: TaskConstellation to execute
         """
+        self._last_wakeup_time = time.monotonic()
         while not constellation.is_complete():
             # Check for cancellation at the beginning of each iteration
             if self._cancellation_requested or self._cancelled_constellations.get(
@@ -443,20 +473,23 @@ class TaskConstellationOrchestrator:
         :param constellation: Current orchestrator's constellation
         :return: Updated constellation with merged state
         """
-        if self._logger:
+        debug = self._logger and self._logger.isEnabledFor(logging.DEBUG)
+        if debug:
             old_ready = [t.task_id for t in constellation.get_ready_tasks()]
             self._logger.debug(f"⚠️ Old Ready tasks: {old_ready}")
 
         if self._modification_synchronizer:
             await self._modification_synchronizer.wait_for_pending_modifications()
 
+            # Only the dispatched tasks can be ahead of the agent's copy
             constellation = (
                 self._modification_synchronizer.merge_and_sync_constellation_states(
                     orchestrator_constellation=constellation,
+                    task_ids=self._dispatched_task_ids,
                 )
             )
 
-        if self._logger:
+        if debug:
             self._logger.debug(
                 f"🆕 Task ID for constellation after editing: {list(constellation.tasks.keys())}"
             )
@@ -474,43 +507,95 @@ class TaskConstellationOrchestrator:
         :param ready_tasks: List of tasks ready to execute
         :param constellation: Parent constellation
         """
+        now = time.monotonic()
+        ready_times = self._ready_times.setdefault(constellation.constellation_id, {})
+        latencies = self._scheduling_latencies.setdefault(
+            constellation.constellation_id, []
+        )
+
         for task in ready_tasks:
             if task.task_id not in self._execution_tasks:
+                # Tasks not made ready by a completion, such as the roots or tasks
+                # freed by a modification, count from the wakeup that found them
+                ready_at = ready_times.pop(
+                    task.task_id, self._last_wakeup_time or now
+                )
+                latencies.append(max(0.0, now - ready_at))
+
                 task_future = asyncio.create_task(
                     self._execute_task_with_events(task, constellation)
                 )
+                task_future.add_done_callback(
+                    functools.partial(self._on_task_execution_done, task.task_id)
+                )
                 self._execution_tasks[task.task_id] = task_future
+                self._dispatched_task_ids.add(task.task_id)
 
     async def _wait_for_task_completion(self) -> None:
         """
-        Wait for at least one task to complete and clean up.
+        Wait until a task finishes, the constellation is modified or execution is
+        cancelled.
         """
-        if self._execution_tasks:
-            done, _ = await asyncio.wait(
-                self._execution_tasks.values(), return_when=asyncio.FIRST_COMPLETED
-            )
+        await self._wakeup.wait()
+        self._wakeup.clear()
+        self._last_wakeup_time = time.monotonic()
 
-            # Clean up completed tasks
-            await self._cleanup_completed_tasks(done)
-        else:
-            # No running tasks, wait briefly
-            await asyncio.sleep(0.1)
+    def _on_task_execution_done(self, task_id: str, future: asyncio.Task) -> None:
+        """
+        Stop tracking a finished task execution and wake the execution loop.
 
-    async def _cleanup_completed_tasks(self, done_futures: set) -> None:
+        :param task_id: ID of the task executed
+        :param future: The finished task execution
         """
-        Clean up completed task futures from tracking.
+        if self._execution_tasks.get(task_id) is future:
+            del self._execution_tasks[task_id]
+
+        # Failures are already handled and logged by _execute_task_with_events
+        if not future.cancelled():
+            future.exception()
+
+        self._wakeup.set()
 
-        :param done_futures: Set of completed task futures
+    def _record_ready_tasks(
+        self, constellation: TaskConstellation, tasks: List[TaskStar]
+    ) -> None:
         """
-        completed_task_ids = []
-        for task_future in done_futures:
-            for task_id, future in self._execution_tasks.items():
-                if future == task_future:
-                    completed_task_ids.append(task_id)
-                    break
+        Record when tasks had their dependencies satisfied, for the scheduling latency.
 
-        for task_id in completed_task_ids:
-            del self._execution_tasks[task_id]
+        :param constellation: The constellation of the tasks
+        :param tasks: The tasks made ready
+        """
+        now = time.monotonic()
+        ready_times = self._ready_times.setdefault(constellation.constellation_id, {})
+        for task in tasks:
+            ready_times.setdefault(task.task_id, now)
+
+    def get_scheduling_metrics(self, constellation_id: str) -> Dict[str, Any]:
+        """
+        Get the scheduling latency of a constellation: the time from the dependencies
+        of a task being satisfied to the task being dispatched, in seconds.
+
+        :param constellation_id: ID of the constellation
+        :return: Number of dispatched tasks, and the average, median, 95th
+            percentile and maximum latency
+        """
+        latencies = sorted(self._scheduling_latencies.get(constellation_id, []))
+        if not latencies:
+            return {
+                "dispatched_tasks": 0,
+                "average_latency": 0.0,
+                "p50_latency": 0.0,
+                "p95_latency": 0.0,
+                "max_latency": 0.0,
+            }
+
+        return {
+            "dispatched_tasks": len(latencies),
+            "average_latency": statistics.fmean(latencies),
+            "p50_latency": statistics.median(latencies),
+            "p95_latency": latencies[int((len(latencies) - 1) * 0.95)],
+            "max_latency": latencies[-1],
+        }
 
     async def _wait_for_all_tasks(self) -> None:
         """Wait for all remaining tasks to complete."""
@@ -546,6 +631,9 @@ class TaskConstellationOrchestrator:
         :return: Orchestration results and statistics
         """
         constellation.complete_execution()
+        scheduling_metrics = self.get_scheduling_metrics(
+            constellation.constellation_id
+        )
 
         # Publish constellation completed event
         completion_event = ConstellationEvent(
@@ -556,6 +644,7 @@ class TaskConstellationOrchestrator:
                 "total_tasks": len(constellation.tasks),
                 "statistics": constellation.get_statistics(),
                 "execution_duration": time.time() - start_event.timestamp,
+                "scheduling_latency": scheduling_metrics,
                 "constellation": constellation,
             },
             constellation_id=constellation.constellation_id,
@@ -567,6 +656,12 @@ class TaskConstellationOrchestrator:
             self._logger.info(
                 f"Completed orchestration of constellation {constellation.constellation_id}"
             )
+            self._logger.info(
+                f"Scheduling latency of {scheduling_metrics['dispatched_tasks']} tasks: "
+                f"average {scheduling_metrics['average_latency'] * 1000:.1f} ms, "
+                f"p95 {scheduling_metrics['p95_latency'] * 1000:.1f} ms, "
+                f"max {scheduling_metrics['max_latency'] * 1000:.1f} ms"
+            )
 
         # Note: results is initialized as {} in original code
         results = {}
@@ -575,6 +670,7 @@ class TaskConstellationOrchestrator:
             "status": "completed",
             "total_tasks": len(results),
             "statistics": constellation.get_statistics(),
+            "scheduling_latency": scheduling_metrics,
         }
 
     async def _handle_orchestration_failure(
@@ -599,6 +695,7 @@ class TaskConstellationOrchestrator:
         self._constellation_manager.unregister_constellation(
             constellation.constellation_id
         )
+        self._ready_times.pop(constellation.constellation_id, None)
 
     async def _execute_task_with_events(
         self,
@@ -641,6 +738,7 @@ class TaskConstellationOrchestrator:
             newly_ready = constellation.mark_task_completed(
                 task.task_id, success=is_success, result=result
             )
+            self._record_ready_tasks(constellation, newly_ready)
 
             # Publish task completed event
             completed_event = TaskEvent(
@@ -672,6 +770,7 @@ class TaskConstellationOrchestrator:
             newly_ready = constellation.mark_task_completed(
                 task.task_id, success=False, error=e
             )
+            self._record_ready_tasks(constellation, newly_ready)
 
             # Publish task failed event
 
@@ -9,10 +9,11 @@ dynamic modification, and advanced dependency handling capabilities.
 """
 
 
+import heapq
 import uuid
 from collections import defaultdict, deque
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
 
 from galaxy.constellation.enums import ConstellationState
 from galaxy.visualization.dag_visualizer import DAGVisualizer
@@ -64,6 +65,17 @@ class TaskConstellation(IConstellation):
         self._tasks: Dict[str, TaskStar] = {}
         self._dependencies: Dict[str, TaskStarLine] = {}
 
+        # Scheduling indexes, maintained as tasks and dependencies change:
+        # the dependencies into and out of each task, the insertion order of the
+        # tasks (the tie-break between ready tasks of the same priority), and a
+        # heap of (-priority, order, task_id) candidates for the ready tasks.
+        self._in_lines: Dict[str, Dict[str, TaskStarLine]] = {}
+        self._out_lines: Dict[str, Dict[str, TaskStarLine]] = {}
+        self._task_order: Dict[str, int] = {}
+        self._next_task_order: int = 0
+        self._ready_heap: List[Tuple[int, int, str]] = []
+        self._ready_ids: Set[str] = set()
+
         # Tracking
         self._created_at: datetime = datetime.now(timezone.utc)
         self._updated_at: datetime = self._created_at
@@ -164,6 +176,7 @@ class TaskConstellation(IConstellation):
             raise ValueError(f"Task with ID {task.task_id} already exists")
 
         self._tasks[task.task_id] = task
+        self._index_task(task)
         self._updated_at = datetime.now(timezone.utc)
 
         # Update constellation state as task composition changed
@@ -184,15 +197,17 @@ class TaskConstellation(IConstellation):
             raise ValueError(f"Cannot remove running task {task_id}")
 
         # Remove all dependencies involving this task
-        dependencies_to_remove = []
-        for dep_id, dep in self._dependencies.items():
-            if dep.from_task_id == task_id or dep.to_task_id == task_id:
-                dependencies_to_remove.append(dep_id)
+        dependencies_to_remove = list(self._in_lines.get(task_id, {}))
+        dependencies_to_remove += list(self._out_lines.get(task_id, {}))
 
         for dep_id in dependencies_to_remove:
             self.remove_dependency(dep_id)
 
         del self._tasks[task_id]
+        self._in_lines.pop(task_id, None)
+        self._out_lines.pop(task_id, None)
+        self._task_order.pop(task_id, None)
+        self._ready_ids.discard(task_id)
         self._updated_at = datetime.now(timezone.utc)
 
         # Update constellation state as task composition changed
@@ -228,6 +243,7 @@ class TaskConstellation(IConstellation):
 
         # Add the dependency
         self._dependencies[dependency.line_id] = dependency
+        self._index_dependency(dependency)
 
         # Update task references
         from_task = self._tasks[dependency.from_task_id]
@@ -260,8 +276,11 @@ class TaskConstellation(IConstellation):
         if dependency.to_task_id in self._tasks:
             to_task = self._tasks[dependency.to_task_id]
             to_task.remove_dependency(dependency.from_task_id)
+            self._push_ready(to_task)
 
         del self._dependencies[dependency_id]
+        self._in_lines.get(dependency.to_task_id, {}).pop(dependency_id, None)
+        self._out_lines.get(dependency.from_task_id, {}).pop(dependency_id, None)
         self._updated_at = datetime.now(timezone.utc)
 
         # Update constellation state as dependencies changed
@@ -280,18 +299,36 @@ class TaskConstellation(IConstellation):
         """
         Get all tasks that are ready to execute.
 
-        :return: List of TaskStar instances ready for execution
-        """
-        ready_tasks = []
-        for task in self._tasks.values():
-            if task.is_ready_to_execute:
-                # Double-check dependencies are satisfied
-                if self._are_dependencies_satisfied(task.task_id):
-                    ready_tasks.append(task)
+        Only the candidates of the ready heap are checked, not every task: a task
+        enters the heap when it is added or loses its last pending dependency, and
+        leaves it once it is no longer pending.
 
-        # Sort by priority (higher priority first)
-        ready_tasks.sort(key=lambda t: t.priority.value, reverse=True)
-        return ready_tasks
+        :return: List of TaskStar instances ready for execution, the highest
+            priority first, then in the order the tasks were added
+        """
+        candidates = []
+        for _, order, task_id in self._ready_heap:
+            task = self._tasks.get(task_id)
+            # Drop the entries of tasks removed, re-added or started since
+            if (
+                task is not None
+                and self._task_order.get(task_id) == order
+                and task.is_ready_to_execute
+            ):
+                # Priorities can change while queued, so refresh the keys
+                candidates.append((-task.priority.value, order, task_id))
+
+        # A sorted list is a valid heap
+        candidates.sort()
+        self._ready_heap = candidates
+        self._ready_ids = {task_id for _, _, task_id in candidates}
+
+        # Double-check dependencies are satisfied
+        return [
+            self._tasks[task_id]
+            for _, _, task_id in candidates
+            if self._are_dependencies_satisfied(task_id)
+        ]
 
     def get_running_tasks(self) -> List[TaskStar]:
         """Get all currently running tasks."""
@@ -327,7 +364,7 @@ class TaskConstellation(IConstellation):
 
     def get_task_dependencies(self, task_id: str) -> List[TaskStarLine]:
         """Get dependencies for a specific task."""
-        return [dep for dep in self._dependencies.values() if dep.to_task_id == task_id]
+        return list(self._in_lines.get(task_id, {}).values())
 
     def get_modifiable_tasks(self) -> List[TaskStar]:
         """
@@ -394,16 +431,16 @@ class TaskConstellation(IConstellation):
             self._state = ConstellationState.CREATED
             return
 
-        all_terminal = all(task.is_terminal for task in self._tasks.values())
-        has_running = any(
-            task.status == TaskStatus.RUNNING for task in self._tasks.values()
-        )
-        has_failed = any(
-            task.status == TaskStatus.FAILED for task in self._tasks.values()
-        )
-        has_completed = any(
-            task.status == TaskStatus.COMPLETED for task in self._tasks.values()
-        )
+        # One pass over the tasks, as this runs on every task change
+        statuses = {task.status for task in self._tasks.values()}
+        all_terminal = statuses <= {
+            TaskStatus.COMPLETED,
+            TaskStatus.FAILED,
+            TaskStatus.CANCELLED,
+        }
+        has_running = TaskStatus.RUNNING in statuses
+        has_failed = TaskStatus.FAILED in statuses
+        has_completed = TaskStatus.COMPLETED in statuses
 
         if all_terminal:
             if has_failed and has_completed:
@@ -462,18 +499,18 @@ class TaskConstellation(IConstellation):
 
         # Update dependent tasks
         newly_ready = []
-        for dependency in self._dependencies.values():
-            if dependency.from_task_id == task_id:
-                # This completed task is a prerequisite for the dependent task
-                dependent_task = self._tasks.get(dependency.to_task_id)
-                if dependent_task and dependent_task.status == TaskStatus.PENDING:
-                    # Evaluate the dependency condition
-                    if dependency.evaluate_condition(result if success else error):
-                        dependent_task.remove_dependency(task_id)
-
-                        # Check if dependent task is now ready
-                        if self._are_dependencies_satisfied(dependent_task.task_id):
-                            newly_ready.append(dependent_task)
+        for dependency in list(self._out_lines.get(task_id, {}).values()):
+            # This completed task is a prerequisite for the dependent task
+            dependent_task = self._tasks.get(dependency.to_task_id)
+            if dependent_task and dependent_task.status == TaskStatus.PENDING:
+                # Evaluate the dependency condition
+                if dependency.evaluate_condition(result if success else error):
+                    dependent_task.remove_dependency(task_id)
+                    self._push_ready(dependent_task)
+
+                    # Check if dependent task is now ready
+                    if self._are_dependencies_satisfied(dependent_task.task_id):
+                        newly_ready.append(dependent_task)
 
         self.update_state()
         self._updated_at = datetime.now(timezone.utc)
@@ -948,6 +985,8 @@ class TaskConstellation(IConstellation):
             dependency = TaskStarLine.from_dict(dep_data)
             constellation._dependencies[dep_id] = dependency
 
+        constellation.rebuild_indexes()
+
         return constellation
 
     def to_json(self, save_path: Optional[str] = None) -> str:
@@ -1130,53 +1169,107 @@ class TaskConstellation(IConstellation):
         data = self.to_dict()
         return TaskConstellationSchema(**data)
 
+    def rebuild_indexes(self) -> None:
+        """
+        Rebuild the scheduling indexes from the tasks and dependencies.
+
+        Needed after ``_tasks`` or ``_dependencies`` are replaced directly, as when
+        loading or restoring a constellation, instead of through add_task and
+        add_dependency.
+        """
+        self._in_lines = {}
+        self._out_lines = {}
+        self._task_order = {}
+        self._next_task_order = 0
+        self._ready_heap = []
+        self._ready_ids = set()
+
+        for task in self._tasks.values():
+            self._index_task(task)
+        for dependency in self._dependencies.values():
+            self._index_dependency(dependency)
+
+    def _index_task(self, task: TaskStar) -> None:
+        """
+        Add a task to the scheduling indexes.
+
+        :param task: The task added
+        """
+        self._in_lines[task.task_id] = {}
+        self._out_lines[task.task_id] = {}
+        self._task_order[task.task_id] = self._next_task_order
+        self._next_task_order += 1
+        self._push_ready(task)
+
+    def _index_dependency(self, dependency: TaskStarLine) -> None:
+        """
+        Add a dependency to the scheduling indexes.
+
+        :param dependency: The dependency added
+        """
+        self._in_lines.setdefault(dependency.to_task_id, {})[
+            dependency.line_id
+        ] = dependency
+        self._out_lines.setdefault(dependency.from_task_id, {})[
+            dependency.line_id
+        ] = dependency
+
+    def _push_ready(self, task: TaskStar) -> None:
+        """
+        Queue a task as a ready candidate if it has no pending dependency left.
+
+        :param task: The task whose dependencies changed
+        """
+        if task.task_id in self._ready_ids or not task.is_ready_to_execute:
+            return
+        order = self._task_order.get(task.task_id)
+        if order is None:
+            return
+        heapq.heappush(self._ready_heap, (-task.priority.value, order, task.task_id))
+        self._ready_ids.add(task.task_id)
+
     def _are_dependencies_satisfied(self, task_id: str) -> bool:
         """Check if all dependencies for a task are satisfied."""
         task = self._tasks.get(task_id)
         if not task:
             return False
 
-        for dependency in self._dependencies.values():
-            if dependency.to_task_id == task_id:
-                prerequisite_task = self._tasks.get(dependency.from_task_id)
-                if not prerequisite_task or not prerequisite_task.is_terminal:
-                    return False
+        for dependency in self._in_lines.get(task_id, {}).values():
+            prerequisite_task = self._tasks.get(dependency.from_task_id)
+            if not prerequisite_task or not prerequisite_task.is_terminal:
+                return False
 
-                # Check if dependency condition is satisfied
-                if not dependency.is_satisfied:
-                    # Try to evaluate the condition
-                    result = (
-                        prerequisite_task.result
-                        if prerequisite_task.status == TaskStatus.COMPLETED
-                        else prerequisite_task.error
-                    )
-                    if not dependency.evaluate_condition(result):
-                        return False
+            # Check if dependency condition is satisfied
+            if not dependency.is_satisfied:
+                # Try to evaluate the condition
+                result = (
+                    prerequisite_task.result
+                    if prerequisite_task.status == TaskStatus.COMPLETED
+                    else prerequisite_task.error
+                )
+                if not dependency.evaluate_condition(result):
+                    return False
 
         return True
 
     def _would_create_cycle(self, from_task_id: str, to_task_id: str) -> bool:
         """Check if adding a dependency would create a cycle."""
-        # Use DFS to check if there's already a path from to_task_id to from_task_id
-        visited = set()
-
-        def has_path(current: str, target: str) -> bool:
-            if current == target:
+        # Use DFS to check if there's already a path from to_task_id to from_task_id,
+        # visiting each task and each of its outgoing dependencies at most once
+        visited = {to_task_id}
+        stack = [to_task_id]
+
+        while stack:
+            current = stack.pop()
+            if current == from_task_id:
                 return True
-            if current in visited:
-                return False
-
-            visited.add(current)
 
-            # Check all dependencies where current is the source
-            for dependency in self._dependencies.values():
-                if dependency.from_task_id == current:
-                    if has_path(dependency.to_task_id, target):
-                        return True
-
-            return False
+            for dependency in self._out_lines.get(current, {}).values():
+                if dependency.to_task_id not in visited:
+                    visited.add(dependency.to_task_id)
+                    stack.append(dependency.to_task_id)
 
-        return has_path(to_task_id, from_task_id)
+        return False
 
     def has_cycle(self) -> bool:
         """Check if the DAG has any cycles."""
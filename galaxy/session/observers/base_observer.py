@@ -256,6 +256,7 @@ class SessionMetricsObserver(IEventObserver):
                     "final_statistics": (
                         constellation.get_statistics() if constellation else {}
                     ),
+                    "scheduling_latency": event.data.get("scheduling_latency"),
                 }
             )
 
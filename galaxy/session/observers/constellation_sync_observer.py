@@ -26,7 +26,7 @@ Example:
 
 import asyncio
 import logging
-from typing import TYPE_CHECKING, Dict, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
 
 from galaxy.constellation.task_constellation import TaskConstellation
 
@@ -202,6 +202,9 @@ class ConstellationModificationSynchronizer(IEventObserver):
                         f"but no pending modification was registered"
                     )
 
+            # Let the orchestrator schedule the tasks the modification made ready
+            self._wake_orchestrator()
+
         except AttributeError as e:
             self.logger.error(
                 f"Attribute error handling constellation event in synchronizer: {e}",
@@ -236,6 +239,7 @@ class ConstellationModificationSynchronizer(IEventObserver):
                 future.set_result(False)
                 if task_id in self._pending_modifications:
                     del self._pending_modifications[task_id]
+                self._wake_orchestrator()
         except asyncio.CancelledError:
             self.logger.debug(f"Auto-complete timeout cancelled for task '{task_id}'")
             raise
@@ -310,6 +314,14 @@ class ConstellationModificationSynchronizer(IEventObserver):
             self._pending_modifications.clear()
             return False
 
+    def _wake_orchestrator(self) -> None:
+        """
+        Wake the execution loop of the orchestrator, if it supports it.
+        """
+        notify = getattr(self.orchestrator, "notify_constellation_modified", None)
+        if callable(notify):
+            notify()
+
     def get_current_constellation(self) -> Optional[TaskConstellation]:
         """
         Get the ID of the constellation currently being modified.
@@ -384,6 +396,7 @@ class ConstellationModificationSynchronizer(IEventObserver):
     def merge_and_sync_constellation_states(
         self,
         orchestrator_constellation: TaskConstellation,
+        task_ids: Optional[Iterable[str]] = None,
     ) -> TaskConstellation:
         """
         Merge constellation states: structural changes from agent + execution state from orchestrator.
@@ -394,8 +407,11 @@ class ConstellationModificationSynchronizer(IEventObserver):
         - Direct replacement would lose Task A's COMPLETED status
 
         Uses self._current_constellation as the agent's constellation with structural changes.
+        Nothing is merged while it is the orchestrator's constellation itself.
 
         :param orchestrator_constellation: Orchestrator's constellation with execution state
+        :param task_ids: IDs of the tasks whose execution state the orchestrator changed,
+            the only ones merged (all tasks if None)
         :return: Merged constellation
         """
         if not self._current_constellation:
@@ -405,17 +421,24 @@ class ConstellationModificationSynchronizer(IEventObserver):
                 )
             return orchestrator_constellation
 
+        # No modification since the last merge: the constellations are the same
+        if self._current_constellation is orchestrator_constellation:
+            return orchestrator_constellation
+
         if self.logger:
             self.logger.info("🔄 Merging constellation states...")
 
         # Use agent's constellation as base (has structural modifications)
         merged = self._current_constellation
 
-        # Preserve execution state from orchestrator for existing tasks
-        for task_id, orchestrator_task in orchestrator_constellation.tasks.items():
-            if task_id in merged.tasks:
-                agent_task = merged.tasks[task_id]
+        if task_ids is None:
+            task_ids = orchestrator_constellation.tasks.keys()
 
+        # Preserve execution state from orchestrator for existing tasks
+        for task_id in task_ids:
+            orchestrator_task = orchestrator_constellation.get_task(task_id)
+            agent_task = merged.get_task(task_id)
+            if orchestrator_task is not None and agent_task is not None:
                 # ✅ Key: If orchestrator's task state is more advanced, preserve it
                 # State priority: COMPLETED/FAILED > RUNNING > WAITING_DEPENDENCY > PENDING
                 if self._is_state_more_advanced(
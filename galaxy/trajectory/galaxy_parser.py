@@ -23,6 +23,8 @@ from rich.console import Console
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "../.."))
 
+from ufo.trajectory.image_blobs import load_request_log
+
 logger = logging.getLogger(__name__)
 console = Console()
 
@@ -41,6 +43,7 @@ class GalaxyTrajectory:
 
     _response_file = "response.log"
     _evaluation_file = "evaluation.log"
+    _request_file = "request.log"
 
     def __init__(self, folder_path: str) -> None:
         """
@@ -58,6 +61,7 @@ class GalaxyTrajectory:
 
         self._step_log = self._load_response_data()
         self._evaluation_log = self._load_evaluation_data()
+        self._request_log: Optional[List[Dict[str, Any]]] = None
         self.logger = logging.getLogger(__name__)
 
     def _load_response_data(self) -> List[Dict[str, Any]]:
@@ -107,6 +111,13 @@ class GalaxyTrajectory:
         """Get evaluation results."""
         return self._evaluation_log
 
+    @property
+    def request_log(self) -> List[Dict[str, Any]]:
+        """Get request logs, loaded on first access, with the stored images resolved."""
+        if self._request_log is None:
+            self._request_log = load_request_log(str(self.folder_path))
+        return self._request_log
+
     @property
     def request(self) -> Optional[str]:
         """Get the original user request."""
@@ -0,0 +1,216 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Versioned constellation updates for Galaxy Web UI.
+
+Instead of the full task and dependency map on every event, each constellation is
+sent to the clients as a JSON-patch style delta from the previous version, with a
+sequence number per constellation. Clients get full snapshots on connect, and ask
+for a snapshot again when they detect a gap in the sequence numbers.
+"""
+
+import copy
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+class SerializedConstellation(dict):
+    """
+    A constellation serialized by EventSerializer.
+
+    Marks the constellations in serialized events, to be encoded as versioned
+    updates for the clients supporting them.
+    """
+
+
+class ConstellationPatchEncoder:
+    """
+    Encodes serialized constellations as versioned snapshots and patches.
+
+    The encoder keeps the last version sent of each constellation. A constellation
+    seen for the first time is encoded as a snapshot, and the following versions as
+    patches from the previous one:
+
+    - snapshot: ``{"encoding": "snapshot", "constellation_id", "seq", "constellation"}``
+    - patch: ``{"encoding": "patch", "constellation_id", "seq", "ops"}``, with
+      ``add``, ``remove`` and ``replace`` operations on JSON pointer paths, to be
+      applied to version ``seq - 1``
+    """
+
+    SNAPSHOT = "snapshot"
+    PATCH = "patch"
+
+    def __init__(self, max_constellations: int = 32) -> None:
+        """
+        Initialize the encoder.
+
+        :param max_constellations: Number of constellations whose last version is kept,
+            the least recently updated being forgotten first
+        """
+        self.logger: logging.Logger = logging.getLogger(__name__)
+        self.max_constellations = max_constellations
+        # Constellation ID -> (sequence number, last version sent)
+        self._versions: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def encode(self, constellation: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Encode a serialized constellation as the next version of it.
+
+        :param constellation: The constellation serialized by EventSerializer, kept as
+            the last version and so never modified afterwards
+        :return: The versioned snapshot or patch
+        """
+        constellation_id = constellation.get("constellation_id")
+        current = dict(constellation)
+
+        previous = self._versions.get(constellation_id)
+        if previous is None:
+            seq = 1
+            payload = self._snapshot_payload(constellation_id, seq, current)
+        else:
+            seq = previous[0] + 1
+            payload = {
+                "encoding": self.PATCH,
+                "constellation_id": constellation_id,
+                "seq": seq,
+                "ops": self.diff(previous[1], current),
+            }
+
+        self._versions[constellation_id] = (seq, current)
+        self._versions.move_to_end(constellation_id)
+        if len(self._versions) > self.max_constellations:
+            self._versions.popitem(last=False)
+
+        return payload
+
+    def encode_event(self, value: Any) -> Any:
+        """
+        Encode the serialized constellations of a serialized event as versions.
+
+        The constellations are encoded in the order of the event in JSON, which is
+        the order the clients apply their versions in.
+
+        :param value: The serialized event, or a value in it
+        :return: A copy of the value with its constellations versioned
+        """
+        if isinstance(value, SerializedConstellation):
+            return self.encode(value)
+        if isinstance(value, dict):
+            return {key: self.encode_event(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.encode_event(item) for item in value]
+        return value
+
+    def get_snapshot(self, constellation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the last version sent of a constellation as a snapshot.
+
+        :param constellation_id: ID of the constellation
+        :return: The versioned snapshot, or None if the constellation is unknown
+        """
+        version = self._versions.get(constellation_id)
+        if version is None:
+            return None
+        return self._snapshot_payload(constellation_id, *version)
+
+    @property
+    def constellation_ids(self) -> List[str]:
+        """Get the IDs of the constellations with a known version."""
+        return list(self._versions)
+
+    def _snapshot_payload(
+        self, constellation_id: str, seq: int, constellation: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Build a versioned snapshot.
+
+        :param constellation_id: ID of the constellation
+        :param seq: Sequence number of the version
+        :param constellation: The serialized constellation
+        :return: The versioned snapshot
+        """
+        return {
+            "encoding": self.SNAPSHOT,
+            "constellation_id": constellation_id,
+            "seq": seq,
+            "constellation": constellation,
+        }
+
+    @staticmethod
+    def diff(old: Dict[str, Any], new: Dict[str, Any], path: str = "") -> List[Dict]:
+        """
+        Compute the patch operations turning a JSON object into another.
+
+        Objects are compared key by key, and any other changed value is replaced.
+
+        :param old: The previous JSON object
+        :param new: The new JSON object
+        :param path: JSON pointer of the objects in the document
+        :return: List of add, remove and replace operations
+        """
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+
+        for key, value in new.items():
+            key_path = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": key_path, "value": value})
+                continue
+
+            old_value = old[key]
+            if old_value == value:
+                continue
+            if isinstance(old_value, dict) and isinstance(value, dict):
+                ops.extend(ConstellationPatchEncoder.diff(old_value, value, key_path))
+            else:
+                ops.append({"op": "replace", "path": key_path, "value": value})
+
+        return ops
+
+    @staticmethod
+    def apply_patch(document: Dict[str, Any], ops: List[Dict]) -> Dict[str, Any]:
+        """
+        Apply patch operations to a JSON object, as the Web UI clients do.
+
+        :param document: The JSON object, left unchanged
+        :param ops: The operations computed by diff
+        :return: The patched JSON object
+        """
+        document = copy.deepcopy(document)
+        for op in ops:
+            *parents, key = [_unescape(token) for token in op["path"].split("/")[1:]]
+            target = document
+            for parent in parents:
+                target = target[parent]
+            if op["op"] == "remove":
+                del target[key]
+            else:
+                target[key] = copy.deepcopy(op["value"])
+        return document
+
+
+def _escape(key: Any) -> str:
+    """
+    Escape an object key as a JSON pointer token.
+
+    :param key: The key, converted as json.dumps does if not a string
+    :return: The escaped token
+    """
+    if not isinstance(key, str):
+        key = json.dumps(key)
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    """
+    Unescape a JSON pointer token.
+
+    :param token: The escaped token
+    :return: The key
+    """
+    return token.replace("~1", "/").replace("~0", "~")
@@ -17,6 +17,8 @@ const statusUnsubscribe = wsClient.onStatusChange((status) => {
   const store = useGalaxyStore.getState();
   switch (status) {
     case 'connected':
+      // Versions restart with the snapshots sent on connect
+      store.resetConstellationVersions();
       store.setConnectionStatus('connected');
       break;
     case 'connecting':
@@ -540,6 +542,12 @@ const handleGenericEvent = (event: GalaxyEvent) => {
     return;
   }
 
+  // Handle constellation snapshots sent on connect and on resync
+  if (messageType === 'constellation_snapshot') {
+    updateConstellationFromPayload(event);
+    return;
+  }
+
   // Handle device events
   if (event.event_type?.startsWith('device_')) {
     handleDeviceEvent(event);
@@ -577,8 +585,10 @@ wsClient
     useGalaxyStore.getState().setConnectionStatus('disconnected');
   });
 
-wsClient.onEvent((event) => {
+wsClient.onEvent((message) => {
   const store = useGalaxyStore.getState();
+  // Constellations arrive as versioned snapshots and patches
+  const event = store.applyConstellationUpdates(message);
   store.addEventToLog(event);
   handleGenericEvent(event);
 });
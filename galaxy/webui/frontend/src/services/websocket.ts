@@ -49,7 +49,8 @@ export class WebSocketClient {
       const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
       const host = window.location.host;
       const apiKey = (window as any).__GALAXY_API_KEY__ || '';
-      this.url = `${protocol}//${host}/ws?token=${encodeURIComponent(apiKey)}`;
+      // Constellations are received as versioned patches, applied by the store
+      this.url = `${protocol}//${host}/ws?token=${encodeURIComponent(apiKey)}&updates=patch`;
     } else {
       this.url = url;
     }
@@ -136,6 +136,17 @@ export interface NotificationItem {
   actionPayload?: any;
 }
 
+export interface ConstellationVersion {
+  seq: number;
+  snapshot: Record<string, any>;
+}
+
+export interface ConstellationPatchOperation {
+  op: 'add' | 'remove' | 'replace';
+  path: string;
+  value?: any;
+}
+
 interface SessionState {
   id: string | null;
   displayName: string;
@@ -180,6 +191,10 @@ interface GalaxyStore {
   addEventToLog: (event: GalaxyEvent) => void;
   clearEventLog: () => void;
 
+  constellationVersions: Record<string, ConstellationVersion>;
+  applyConstellationUpdates: (event: GalaxyEvent) => GalaxyEvent;
+  resetConstellationVersions: () => void;
+
   constellations: Record<string, ConstellationSummary>;
   upsertConstellation: (constellation: Partial<ConstellationSummary> & { id: string }) => void;
   removeConstellation: (id: string) => void;
@@ -222,6 +237,7 @@ interface GalaxyStore {
 const MAX_MESSAGES = 500;
 const MAX_NOTIFICATIONS = 30;
 const MAX_EVENTS = 200;
+const RESYNC_INTERVAL_MS = 1000;
 
 const getNow = () => Date.now();
 
@@ -309,6 +325,69 @@ const computeConstellationStats = (
   return stats;
 };
 
+const isVersionedConstellation = (value: any) =>
+  value !== null &&
+  typeof value === 'object' &&
+  (value.encoding === 'snapshot' || value.encoding === 'patch') &&
+  typeof value.seq === 'number' &&
+  'constellation_id' in value;
+
+const unescapePointerToken = (token: string) =>
+  token.replace(/~1/g, '/').replace(/~0/g, '~');
+
+// Apply patch operations without mutating the document: only the objects on
+// the path of an operation are copied.
+export const applyConstellationPatch = (
+  document: Record<string, any>,
+  operations: ConstellationPatchOperation[],
+) => {
+  const root: Record<string, any> = { ...document };
+  const copied = new Set<any>([root]);
+
+  operations.forEach((operation) => {
+    const keys = operation.path.split('/').slice(1).map(unescapePointerToken);
+    const lastKey = keys.pop();
+    if (lastKey === undefined) {
+      return;
+    }
+
+    let target = root;
+    keys.forEach((key) => {
+      let child = target[key];
+      if (!copied.has(child)) {
+        child = Array.isArray(child) ? [...child] : { ...child };
+        target[key] = child;
+        copied.add(child);
+      }
+      target = child;
+    });
+
+    if (operation.op === 'remove') {
+      delete target[lastKey];
+    } else {
+      target[lastKey] = operation.value;
+    }
+  });
+
+  return root;
+};
+
+const lastResyncRequests: Record<string, number> = {};
+
+const requestConstellationResync = (constellationId: string) => {
+  const now = getNow();
+  if (now - (lastResyncRequests[constellationId] || 0) < RESYNC_INTERVAL_MS) {
+    return;
+  }
+  lastResyncRequests[constellationId] = now;
+  console.warn(`🔁 Missed updates of constellation ${constellationId}, requesting a snapshot`);
+  getWebSocketClient().send({
+    type: 'resync',
+    constellation_id: constellationId,
+    timestamp: now,
+  });
+};
+
 const defaultSessionState = (): SessionState => ({
   id: null,
   displayName: 'Galaxy Session',
@@ -415,6 +494,71 @@ export const useGalaxyStore = create<GalaxyStore>()((set, get) => ({
     })),
   clearEventLog: () => set({ eventLog: [] }),
 
+  constellationVersions: {},
+  applyConstellationUpdates: (event) => {
+    const versions = { ...get().constellationVersions };
+    let changed = false;
+
+    // Resolve a versioned snapshot or patch to the full constellation, or null
+    // when updates were missed
+    const resolve = (payload: any) => {
+      const constellationId: string = payload.constellation_id;
+      const current = versions[constellationId];
+
+      if (payload.encoding === 'snapshot') {
+        if (!current || payload.seq >= current.seq) {
+          versions[constellationId] = { seq: payload.seq, snapshot: payload.constellation };
+          changed = true;
+        }
+        return versions[constellationId].snapshot;
+      }
+
+      if (current && payload.seq <= current.seq) {
+        // Already included in a later snapshot
+        return current.snapshot;
+      }
+      if (current && payload.seq === current.seq + 1) {
+        versions[constellationId] = {
+          seq: payload.seq,
+          snapshot: applyConstellationPatch(current.snapshot, payload.ops || []),
+        };
+        changed = true;
+        return versions[constellationId].snapshot;
+      }
+
+      requestConstellationResync(constellationId);
+      return null;
+    };
+
+    // Versions are numbered in the order they appear in the message
+    const walk = (value: any): any => {
+      if (Array.isArray(value)) {
+        return value.map(walk);
+      }
+      if (value === null || typeof value !== 'object') {
+        return value;
+      }
+      if (isVersionedConstellation(value)) {
+        return resolve(value);
+      }
+      const result: Record<string, any> = {};
+      Object.entries(value).forEach(([key, child]) => {
+        result[key] = walk(child);
+      });
+      return result;
+    };
+
+    const resolved = walk(event) as GalaxyEvent;
+    if (changed) {
+      set({ constellationVersions: versions });
+    }
+    return resolved;
+  },
+  resetConstellationVersions: () => {
+    Object.keys(lastResyncRequests).forEach((id) => delete lastResyncRequests[id]);
+    set({ constellationVersions: {} });
+  },
+
   constellations: mockData ? { [mockData.constellation.id]: mockData.constellation } : {},
   upsertConstellation: (constellation) => {
     set((state) => {
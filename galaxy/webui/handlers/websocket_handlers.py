@@ -60,6 +60,8 @@ class WebSocketMessageHandler:
             await self._handle_next_session(websocket, data)
         elif message_type == WebSocketMessageType.STOP_TASK:
             await self._handle_stop_task(websocket, data)
+        elif message_type == WebSocketMessageType.RESYNC:
+            await self._handle_resync(websocket, data)
         else:
             await self._handle_unknown(websocket, message_type)
 
@@ -265,6 +267,35 @@ class WebSocketMessageHandler:
                 }
             )
 
+    async def _handle_resync(self, websocket: WebSocket, data: dict) -> None:
+        """
+        Handle a resync request of a client that missed constellation patches.
+
+        Queues a snapshot of the last version of the constellation, or of all of
+        them if no constellation ID is given, after the events already queued.
+
+        :param websocket: The WebSocket connection
+        :param data: The resync message data with an optional 'constellation_id' field
+        """
+        constellation_id = data.get("constellation_id")
+        self.logger.info(
+            f"Received resync request for constellation {constellation_id}"
+        )
+
+        websocket_observer = self.app_state.websocket_observer
+        if not websocket_observer:
+            await websocket.send_json(
+                {
+                    "type": WebSocketMessageType.ERROR,
+                    "message": "No event stream to resync",
+                }
+            )
+            return
+
+        websocket_observer.send_constellation_snapshots(
+            websocket, [constellation_id] if constellation_id else None
+        )
+
     async def _handle_unknown(self, websocket: WebSocket, message_type: str) -> None:
         """
         Handle unknown message types.
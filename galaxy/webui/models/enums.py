@@ -24,6 +24,7 @@ class WebSocketMessageType(str, Enum):
     RESET = "reset"
     NEXT_SESSION = "next_session"
     STOP_TASK = "stop_task"
+    RESYNC = "resync"
 
     # Server -> Client messages
     PONG = "pong"
@@ -34,6 +35,7 @@ class WebSocketMessageType(str, Enum):
     RESET_ACKNOWLEDGED = "reset_acknowledged"
     NEXT_SESSION_ACKNOWLEDGED = "next_session_acknowledged"
     STOP_ACKNOWLEDGED = "stop_acknowledged"
+    CONSTELLATION_SNAPSHOT = "constellation_snapshot"
     ERROR = "error"
 
 
@@ -45,6 +45,10 @@ class HealthResponse(BaseModel):
     status: str = Field(..., description="Health status of the server")
     connections: int = Field(..., description="Number of active WebSocket connections")
     events_sent: int = Field(..., description="Total number of events sent to clients")
+    delivery: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Event delivery counters: delivered, dropped, coalesced, pending and latencies",
+    )
 
 
 class DeviceAddResponse(BaseModel):
@@ -26,6 +26,7 @@ async def health_check() -> Dict[str, Any]:
     - Overall health status
     - Number of active WebSocket connections
     - Total number of events sent to clients
+    - Event delivery counters: events dropped or coalesced for slow clients, and latencies
 
     This endpoint can be used for monitoring and load balancer health checks.
 
@@ -42,4 +43,7 @@ async def health_check() -> Dict[str, Any]:
         "events_sent": (
             websocket_observer.total_events_sent if websocket_observer else 0
         ),
+        "delivery": (
+            websocket_observer.get_delivery_statistics() if websocket_observer else {}
+        ),
     }
@@ -27,11 +27,14 @@ WS_1008_POLICY_VIOLATION = 1008
 async def websocket_endpoint(
     websocket: WebSocket,
     token: str = Query(default=None),
+    updates: str = Query(default=None),
 ) -> None:
     """
     WebSocket endpoint for real-time event streaming.
 
     Requires a valid ``token`` query parameter that matches the server API key.
+    Clients passing ``updates=patch`` get constellations as versioned patches,
+    starting with a snapshot of each known constellation.
 
     This endpoint establishes a persistent connection with clients to:
     - Send welcome messages and initial state (device snapshots)
@@ -48,6 +51,7 @@ async def websocket_endpoint(
 
     :param websocket: The WebSocket connection from the client
     :param token: API key passed as a query parameter
+    :param updates: "patch" for versioned constellation patches, else full constellations
     """
     # Validate token before accepting the connection
     app_state = get_app_state()
@@ -77,7 +81,9 @@ async def websocket_endpoint(
     # Add connection to observer for event broadcasting
     websocket_observer = app_state.websocket_observer
     if websocket_observer:
-        websocket_observer.add_connection(websocket)
+        websocket_observer.add_connection(
+            websocket, patch_updates=updates == "patch"
+        )
 
     try:
         # Send welcome message and initial device snapshot
@@ -8,10 +8,15 @@ This observer subscribes to all Galaxy events and pushes them to connected WebSo
 Provides efficient event serialization and broadcasting capabilities.
 """
 
+import asyncio
+import itertools
+import json
 import logging
+import time
+from collections import OrderedDict
 from dataclasses import asdict, is_dataclass
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Set, Type
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Type
 
 from fastapi import WebSocket
 
@@ -20,9 +25,15 @@ from galaxy.core.events import (
     ConstellationEvent,
     DeviceEvent,
     Event,
+    EventType,
     IEventObserver,
     TaskEvent,
 )
+from galaxy.webui.constellation_patches import (
+    ConstellationPatchEncoder,
+    SerializedConstellation,
+)
+from galaxy.webui.models.enums import WebSocketMessageType
 
 
 class EventSerializer:
@@ -269,7 +280,7 @@ class EventSerializer:
                 except Exception as e:
                     self.logger.warning(f"Failed to get constellation statistics: {e}")
 
-            return constellation_dict
+            return SerializedConstellation(constellation_dict)
         except Exception as e:
             self.logger.warning(f"Failed to serialize TaskConstellation: {e}")
             return str(value)
@@ -300,7 +311,7 @@ class EventSerializer:
                     "input": self.serialize_value(getattr(task, "input", None)),
                     "output": self.serialize_value(getattr(task, "output", None)),
                     "tips": (
-                        task_tips if task_tips else []
+                        list(task_tips) if task_tips else []
                     ),  # Always send array, never null
                     "started_at": self._serialize_datetime(
                         getattr(task, "execution_start_time", None)
@@ -364,20 +375,149 @@ class EventSerializer:
         return dt.isoformat() if dt is not None else None
 
 
+class ClientEventQueue:
+    """
+    Bounded queue of encoded events for one WebSocket client.
+
+    The queue is drained by its own task, so a slow client only delays its own
+    events. Under backpressure, a queued event with the same coalescing key as a
+    new event is replaced by it, and the oldest event is dropped when the queue
+    is full.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_size: int,
+        on_send_failed: Callable[[WebSocket], None],
+        patch_updates: bool = False,
+    ) -> None:
+        """
+        Initialize the queue and start the task sending its events.
+
+        :param websocket: The WebSocket connection of the client
+        :param max_size: Maximum number of events waiting to be sent
+        :param on_send_failed: Called with the WebSocket when a send fails
+        :param patch_updates: Whether the client gets versioned constellation patches
+        """
+        self.logger: logging.Logger = logging.getLogger(__name__)
+        self.websocket = websocket
+        self.max_size = max_size
+        self.patch_updates = patch_updates
+        self._on_send_failed = on_send_failed
+
+        # Queued (message, enqueue time), keyed by coalescing key or sequence number
+        self._messages: "OrderedDict[Hashable, Tuple[str, float]]" = OrderedDict()
+        self._sequence = itertools.count()
+        self._not_empty = asyncio.Event()
+
+        self.sent_count: int = 0
+        self.dropped_count: int = 0
+        self.coalesced_count: int = 0
+        self.total_latency: float = 0.0
+        self.max_latency: float = 0.0
+
+        self._sender = asyncio.create_task(self._send_loop())
+
+    def put(self, message: str, coalesce_key: Optional[Hashable] = None) -> None:
+        """
+        Queue an encoded event without waiting for it to be sent.
+
+        :param message: The encoded event
+        :param coalesce_key: Key of the events superseding each other, None to always deliver
+        """
+        if coalesce_key is not None:
+            key = ("coalesce", coalesce_key)
+            if self._messages.pop(key, None) is not None:
+                self.coalesced_count += 1
+        else:
+            key = next(self._sequence)
+
+        if len(self._messages) >= self.max_size:
+            self._messages.popitem(last=False)
+            self.dropped_count += 1
+            if self.dropped_count == 1:
+                self.logger.warning(
+                    f"Event queue of client {self.websocket.client} is full, "
+                    f"dropping its oldest events"
+                )
+
+        self._messages[key] = (message, time.monotonic())
+        self._not_empty.set()
+
+    async def _send_loop(self) -> None:
+        """Send the queued events in order until the queue is closed or a send fails."""
+        while True:
+            if not self._messages:
+                self._not_empty.clear()
+                await self._not_empty.wait()
+                continue
+
+            _, (message, queued_at) = self._messages.popitem(last=False)
+            try:
+                await self.websocket.send_text(message)
+            except Exception as e:
+                self.logger.warning(
+                    f"Failed to send event to client: {e}, marking for removal"
+                )
+                self._on_send_failed(self.websocket)
+                return
+
+            latency = time.monotonic() - queued_at
+            self.sent_count += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def close(self) -> None:
+        """Stop sending events, discarding the queued ones."""
+        if self._sender is not asyncio.current_task():
+            self._sender.cancel()
+        self._messages.clear()
+
+    @property
+    def pending_count(self) -> int:
+        """Get the number of events waiting to be sent."""
+        return len(self._messages)
+
+
 class WebSocketObserver(IEventObserver):
     """
     Observer that forwards all Galaxy events to WebSocket clients.
 
     This observer maintains a set of active WebSocket connections and
-    broadcasts events to all connected clients in real-time.
+    broadcasts events to all connected clients in real-time. Each event is
+    serialized and encoded once, then queued for every client without waiting
+    for the sends, so a slow client never stalls the event bus.
+
+    Clients connecting with patch updates get each constellation as a patch from
+    its previous version, a snapshot of each constellation on connect, and a
+    snapshot again on resync requests. Other clients get full constellations.
     """
 
-    def __init__(self) -> None:
-        """Initialize the WebSocket observer."""
+    # Events whose full constellation supersedes the previous one
+    _coalesced_event_types = {EventType.CONSTELLATION_MODIFIED}
+
+    def __init__(self, max_queue_size: int = 256) -> None:
+        """
+        Initialize the WebSocket observer.
+
+        :param max_queue_size: Maximum number of events waiting to be sent to a client
+        """
         self.logger: logging.Logger = logging.getLogger(__name__)
-        self._connections: Set[WebSocket] = set()
+        self._connections: Dict[WebSocket, ClientEventQueue] = {}
         self._event_count: int = 0
         self._serializer: EventSerializer = EventSerializer()
+        self._patch_encoder = ConstellationPatchEncoder()
+        self._max_queue_size = max_queue_size
+
+        # Delivery counters of the clients already disconnected
+        self._closed_totals: Dict[str, float] = {
+            "sent": 0,
+            "dropped": 0,
+            "coalesced": 0,
+            "total_latency": 0.0,
+            "max_latency": 0.0,
+        }
 
     async def on_event(self, event: Event) -> None:
         """
@@ -390,36 +530,62 @@ class WebSocketObserver(IEventObserver):
 
             # Convert event to JSON-serializable format using the serializer
             event_data: Dict[str, Any] = self._serializer.serialize_event(event)
+            # Versions are numbered for every event, whichever clients are connected,
+            # so that clients connecting later start from the latest snapshots
+            patched_data = self._patch_encoder.encode_event(event_data)
+
+            if not self._connections:
+                return
 
             self.logger.debug(
                 f"Broadcasting event #{self._event_count}: {event.event_type.value} to {len(self._connections)} clients"
             )
 
-            # Broadcast to all connected clients
-            disconnected: Set[WebSocket] = set()
-            for connection in self._connections:
-                try:
-                    await connection.send_json(event_data)
-                    self.logger.debug(f"Successfully sent event to client")
-                except Exception as e:
-                    self.logger.warning(
-                        f"Failed to send event to client: {e}, marking for removal"
+            # Encode each variant once for all clients, as send_json would.
+            # Patches are never coalesced: a missing one forces a full resync.
+            messages: Dict[bool, Tuple[str, Optional[Hashable]]] = {}
+            for client_queue in self._connections.values():
+                patch_updates = client_queue.patch_updates
+                if patch_updates not in messages:
+                    coalesce_key = None
+                    if (
+                        not patch_updates
+                        and event.event_type in self._coalesced_event_types
+                    ):
+                        coalesce_key = (
+                            event.event_type,
+                            getattr(event, "constellation_id", None),
+                        )
+                    messages[patch_updates] = (
+                        json.dumps(
+                            patched_data if patch_updates else event_data,
+                            separators=(",", ":"),
+                            ensure_ascii=False,
+                        ),
+                        coalesce_key,
                     )
-                    disconnected.add(connection)
-
-            # Remove disconnected clients
-            self._connections -= disconnected
+                client_queue.put(*messages[patch_updates])
 
         except Exception as e:
             self.logger.error(f"Error broadcasting event: {e}")
 
-    def add_connection(self, websocket: WebSocket) -> None:
+    def add_connection(
+        self, websocket: WebSocket, patch_updates: bool = False
+    ) -> None:
         """
         Add a WebSocket connection to receive events.
 
         :param websocket: The WebSocket connection to add
+        :param patch_updates: Whether the client gets versioned constellation patches,
+            starting with a snapshot of each known constellation
         """
-        self._connections.add(websocket)
+        if websocket in self._connections:
+            return
+        self._connections[websocket] = ClientEventQueue(
+            websocket, self._max_queue_size, self.remove_connection, patch_updates
+        )
+        if patch_updates:
+            self.send_constellation_snapshots(websocket)
         self.logger.info(
             f"WebSocket client connected. Total connections: {len(self._connections)}"
         )
@@ -430,11 +596,57 @@ class WebSocketObserver(IEventObserver):
 
         :param websocket: The WebSocket connection to remove
         """
-        self._connections.discard(websocket)
+        client_queue = self._connections.pop(websocket, None)
+        if client_queue is None:
+            return
+        client_queue.close()
+
+        totals = self._closed_totals
+        totals["sent"] += client_queue.sent_count
+        totals["dropped"] += client_queue.dropped_count
+        totals["coalesced"] += client_queue.coalesced_count
+        totals["total_latency"] += client_queue.total_latency
+        totals["max_latency"] = max(totals["max_latency"], client_queue.max_latency)
         self.logger.info(
             f"WebSocket client disconnected. Total connections: {len(self._connections)}"
         )
 
+    def send_constellation_snapshots(
+        self, websocket: WebSocket, constellation_ids: Optional[List[str]] = None
+    ) -> None:
+        """
+        Queue snapshots of the last version sent of constellations for a client.
+
+        A queued snapshot of a constellation is replaced by a newer one.
+
+        :param websocket: The WebSocket connection of the client
+        :param constellation_ids: IDs of the constellations, None for all of them
+        """
+        client_queue = self._connections.get(websocket)
+        if client_queue is None or not client_queue.patch_updates:
+            return
+
+        if constellation_ids is None:
+            constellation_ids = self._patch_encoder.constellation_ids
+        for constellation_id in constellation_ids:
+            snapshot = self._patch_encoder.get_snapshot(constellation_id)
+            if snapshot is None:
+                self.logger.debug(f"No version of constellation {constellation_id}")
+                continue
+            message = {
+                "type": WebSocketMessageType.CONSTELLATION_SNAPSHOT.value,
+                "timestamp": time.time(),
+                "constellation_id": constellation_id,
+                "data": {"constellation": snapshot},
+            }
+            client_queue.put(
+                json.dumps(message, separators=(",", ":"), ensure_ascii=False),
+                coalesce_key=(
+                    WebSocketMessageType.CONSTELLATION_SNAPSHOT,
+                    constellation_id,
+                ),
+            )
+
     @property
     def connection_count(self) -> int:
         """Get the number of active connections."""
@@ -444,3 +656,29 @@ class WebSocketObserver(IEventObserver):
     def total_events_sent(self) -> int:
         """Get the total number of events sent."""
         return self._event_count
+
+    def get_delivery_statistics(self) -> Dict[str, Any]:
+        """
+        Get the delivery counters of the events, over all clients so far.
+
+        The latencies are from an event being queued for a client to it being sent.
+
+        :return: Dictionary of the events delivered, dropped, coalesced and pending,
+            and the average and maximum latency in seconds
+        """
+        totals = self._closed_totals
+        queues = list(self._connections.values())
+        delivered = int(totals["sent"]) + sum(q.sent_count for q in queues)
+        total_latency = totals["total_latency"] + sum(q.total_latency for q in queues)
+
+        return {
+            "delivered": delivered,
+            "dropped": int(totals["dropped"]) + sum(q.dropped_count for q in queues),
+            "coalesced": int(totals["coalesced"])
+            + sum(q.coalesced_count for q in queues),
+            "pending": sum(q.pending_count for q in queues),
+            "average_latency": total_latency / delivered if delivered else 0.0,
+            "max_latency": max(
+                [totals["max_latency"]] + [q.max_latency for q in queues]
+            ),
+        }
@@ -0,0 +1,189 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test AIP Wire Codecs
+
+Tests codec round trips, negotiation and the codec-aware protocol send/receive paths.
+"""
+
+import asyncio
+
+import pytest
+
+from aip.messages import (
+    ClientMessage,
+    ClientMessageType,
+    Command,
+    Result,
+    ResultStatus,
+    ServerMessage,
+    ServerMessageType,
+    TaskStatus,
+)
+from aip.protocol import AIPProtocol, RegistrationProtocol
+from aip.protocol.codecs import (
+    CODECS,
+    JsonCodec,
+    MsgpackCodec,
+    available_codecs,
+    get_codec,
+    negotiate_codec,
+)
+from aip.transport import Transport, TransportState
+
+
+class FramedMockTransport(Transport):
+    """Mock transport distinguishing text and binary frames."""
+
+    def __init__(self):
+        super().__init__()
+        self.text_frames = []
+        self.binary_frames = []
+        self.receive_queue = asyncio.Queue()
+        self._state = TransportState.CONNECTED
+
+    async def connect(self, url: str, **kwargs) -> None:
+        self._state = TransportState.CONNECTED
+
+    async def send(self, data: bytes) -> None:
+        self.text_frames.append(data)
+
+    async def send_binary(self, data: bytes) -> None:
+        self.binary_frames.append(data)
+
+    async def receive(self) -> bytes:
+        data = await self.receive_queue.get()
+        return data.encode() if isinstance(data, str) else data
+
+    async def receive_auto(self):
+        return await self.receive_queue.get()
+
+    async def close(self) -> None:
+        self._state = TransportState.DISCONNECTED
+
+    async def wait_closed(self) -> None:
+        pass
+
+
+def sample_messages():
+    return [
+        ServerMessage(
+            type=ServerMessageType.COMMAND,
+            status=TaskStatus.CONTINUE,
+            session_id="session",
+            actions=[
+                Command(
+                    tool_name="click_input",
+                    parameters={"id": "1", "button": "left"},
+                    tool_type="action",
+                    call_id="call_1",
+                )
+            ],
+        ),
+        ClientMessage(
+            type=ClientMessageType.COMMAND_RESULTS,
+            status=TaskStatus.CONTINUE,
+            client_id="device",
+            action_results=[
+                Result(
+                    status=ResultStatus.SUCCESS,
+                    result=[{"id": "1", "rect": [0, 0, 10, 10], "enabled": True}],
+                    call_id="call_1",
+                )
+            ],
+        ),
+    ]
+
+
+@pytest.mark.parametrize("name", list(CODECS))
+def test_codec_round_trip(name):
+    """Test that every available codec restores messages unchanged."""
+    if not CODECS[name].is_available():
+        pytest.skip(f"{name} is not installed")
+
+    codec = get_codec(name)
+    for msg in sample_messages():
+        data = codec.encode(msg)
+        assert isinstance(data, bytes)
+        assert codec.decode(data, type(msg)) == msg
+
+
+def test_json_codec_matches_legacy_encoding():
+    """Test that the JSON codec is wire compatible with model_dump_json."""
+    for msg in sample_messages():
+        assert JsonCodec().encode(msg) == msg.model_dump_json().encode("utf-8")
+
+
+class TestNegotiation:
+    """Test codec negotiation."""
+
+    def test_peers_without_codecs_use_json(self):
+        """Test that peers that do not negotiate stay on JSON."""
+        assert negotiate_codec(None).name == "json"
+        assert negotiate_codec(["unknown"], ["msgpack", "json"]).name == "json"
+
+    def test_preference_order(self):
+        """Test that the local preference order wins."""
+        if not MsgpackCodec.is_available():
+            pytest.skip("msgpack is not installed")
+
+        offered = ["json", "msgpack"]
+        assert negotiate_codec(offered, ["msgpack", "json"]).name == "msgpack"
+        assert negotiate_codec(offered, ["json", "msgpack"]).name == "json"
+
+    def test_unknown_codec(self):
+        """Test that unknown codecs are rejected."""
+        assert "json" in available_codecs()
+        with pytest.raises(ValueError):
+            get_codec("yaml")
+
+
+class TestCodecProtocol:
+    """Test the codec-aware protocol paths."""
+
+    @pytest.mark.asyncio
+    async def test_binary_codec_uses_binary_frames(self):
+        """Test that binary codecs send and receive binary frames."""
+        if not MsgpackCodec.is_available():
+            pytest.skip("msgpack is not installed")
+
+        transport = FramedMockTransport()
+        protocol = AIPProtocol(transport)
+        protocol.codec = MsgpackCodec()
+        msg = sample_messages()[0]
+
+        await protocol.send_message(msg)
+        assert transport.text_frames == []
+        assert len(transport.binary_frames) == 1
+
+        await transport.receive_queue.put(transport.binary_frames[0])
+        assert await protocol.receive_message(ServerMessage) == msg
+
+        # Text frames are always JSON, whatever the negotiated codec
+        await transport.receive_queue.put(msg.model_dump_json())
+        assert await protocol.receive_message(ServerMessage) == msg
+
+    @pytest.mark.asyncio
+    async def test_registration_applies_negotiated_codec(self):
+        """Test that the client adopts the codec chosen by the server."""
+        if not MsgpackCodec.is_available():
+            pytest.skip("msgpack is not installed")
+
+        transport = FramedMockTransport()
+        protocol = RegistrationProtocol(transport)
+        confirmation = ServerMessage(
+            type=ServerMessageType.HEARTBEAT,
+            status=TaskStatus.OK,
+            metadata={"codec": "msgpack"},
+        )
+        await transport.receive_queue.put(confirmation.model_dump_json())
+
+        success = await protocol.register_as_device(
+            device_id="device", metadata={"codecs": available_codecs()}
+        )
+
+        assert success is True
+        assert protocol.codec.name == "msgpack"
+        # The registration itself is always JSON
+        assert b'"codecs"' in transport.text_frames[0]
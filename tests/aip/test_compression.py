@@ -0,0 +1,265 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test AIP Message Compression
+
+Tests compressor round trips, bounded decompression, negotiation, the size threshold
+of the protocol send path and the compression metrics of MetricsExtension.
+"""
+
+import asyncio
+
+import pytest
+
+from aip.extensions import MetricsExtension
+from aip.messages import (
+    ClientMessage,
+    ClientMessageType,
+    Result,
+    ResultStatus,
+    ServerMessage,
+    ServerMessageType,
+    TaskStatus,
+)
+from aip.protocol import AIPProtocol, RegistrationProtocol
+from aip.protocol.codecs import MsgpackCodec
+from aip.protocol.compression import (
+    COMPRESSORS,
+    DeflateCompressor,
+    ZstdCompressor,
+    available_compressors,
+    get_compressor,
+    negotiate_compressor,
+)
+from aip.transport import Transport, TransportState
+
+
+class FramedMockTransport(Transport):
+    """Mock transport distinguishing text and binary frames."""
+
+    def __init__(self):
+        super().__init__()
+        self.text_frames = []
+        self.binary_frames = []
+        self.receive_queue = asyncio.Queue()
+        self._state = TransportState.CONNECTED
+
+    async def connect(self, url: str, **kwargs) -> None:
+        self._state = TransportState.CONNECTED
+
+    async def send(self, data: bytes) -> None:
+        self.text_frames.append(data)
+
+    async def send_binary(self, data: bytes) -> None:
+        self.binary_frames.append(data)
+
+    async def receive(self) -> bytes:
+        data = await self.receive_queue.get()
+        return data.encode() if isinstance(data, str) else data
+
+    async def receive_auto(self):
+        return await self.receive_queue.get()
+
+    async def close(self) -> None:
+        self._state = TransportState.DISCONNECTED
+
+    async def wait_closed(self) -> None:
+        pass
+
+
+def control_list_results(controls: int) -> ClientMessage:
+    return ClientMessage(
+        type=ClientMessageType.COMMAND_RESULTS,
+        status=TaskStatus.CONTINUE,
+        client_id="device",
+        action_results=[
+            Result(
+                status=ResultStatus.SUCCESS,
+                result=[
+                    {
+                        "id": str(i),
+                        "name": f"Control {i}",
+                        "control_type": "Button",
+                        "rectangle": [i, i * 2, i + 80, i * 2 + 24],
+                    }
+                    for i in range(controls)
+                ],
+                call_id="call_1",
+            )
+        ],
+    )
+
+
+@pytest.mark.parametrize("name", list(COMPRESSORS))
+def test_compressor_round_trip(name):
+    """Test that every available compressor restores payloads and recognizes its frames."""
+    if not COMPRESSORS[name].is_available():
+        pytest.skip(f"{name} is not installed")
+
+    compressor = get_compressor(name)
+    data = control_list_results(200).model_dump_json().encode("utf-8")
+    compressed = compressor.compress(data)
+
+    assert len(compressed) < len(data)
+    assert compressor.is_compressed(compressed)
+    assert compressor.decompress(compressed) == data
+    # Uncompressed JSON and MessagePack messages are never mistaken for compressed frames
+    assert not compressor.is_compressed(data)
+    if MsgpackCodec.is_available():
+        assert not compressor.is_compressed(
+            MsgpackCodec().encode(control_list_results(1))
+        )
+
+
+@pytest.mark.parametrize("name", list(COMPRESSORS))
+def test_decompression_is_bounded(name):
+    """Test that a frame expanding beyond the maximum size is rejected."""
+    if not COMPRESSORS[name].is_available():
+        pytest.skip(f"{name} is not installed")
+
+    compressor = get_compressor(name)
+    data = b"0" * 1024 * 1024
+    compressed = compressor.compress(data)
+
+    assert compressor.decompress(compressed, max_size=len(data)) == data
+    with pytest.raises(ValueError):
+        compressor.decompress(compressed, max_size=len(data) - 1)
+
+
+def test_zstd_decompression_without_content_size_is_bounded():
+    """Test that zstd frames not declaring their content size are bounded too."""
+    if not ZstdCompressor.is_available():
+        pytest.skip("zstandard is not installed")
+
+    import zstandard
+
+    stream = zstandard.ZstdCompressor().compressobj()
+    compressed = stream.compress(b"0" * 1024 * 1024) + stream.flush()
+
+    assert len(ZstdCompressor().decompress(compressed)) == 1024 * 1024
+    with pytest.raises(ValueError):
+        ZstdCompressor().decompress(compressed, max_size=1024)
+
+
+class TestNegotiation:
+    """Test compression negotiation."""
+
+    def test_peers_without_compression(self):
+        """Test that peers that do not offer compression send uncompressed messages."""
+        assert negotiate_compressor(None) is None
+        assert negotiate_compressor(["brotli"]) is None
+        assert get_compressor(None) is None
+
+    def test_preference_order(self):
+        """Test that the local preference order wins and can disable compression."""
+        if not ZstdCompressor.is_available():
+            pytest.skip("zstandard is not installed")
+
+        offered = available_compressors()
+        assert negotiate_compressor(offered).name == "zstd"
+        assert negotiate_compressor(offered, ["deflate", "zstd"]).name == "deflate"
+        assert negotiate_compressor(offered, []) is None
+
+    def test_unknown_compressor(self):
+        """Test that unknown compressors are rejected."""
+        assert "deflate" in available_compressors()
+        with pytest.raises(ValueError):
+            get_compressor("brotli")
+
+
+class TestCompressionProtocol:
+    """Test the compression-aware protocol paths."""
+
+    @pytest.mark.asyncio
+    async def test_threshold(self):
+        """Test that only messages above the threshold are compressed, into binary frames."""
+        transport = FramedMockTransport()
+        protocol = AIPProtocol(transport)
+        protocol.set_compression(DeflateCompressor(), threshold=4096)
+        metrics = MetricsExtension()
+        protocol.add_extension(metrics)
+
+        small = control_list_results(1)
+        large = control_list_results(300)
+        await protocol.send_message(small)
+        await protocol.send_message(large)
+
+        # Small messages keep their JSON text frame
+        assert transport.text_frames == [small.model_dump_json().encode("utf-8")]
+        assert len(transport.binary_frames) == 1
+        assert len(transport.binary_frames[0]) < len(large.model_dump_json())
+
+        await transport.receive_queue.put(transport.binary_frames[0])
+        assert await protocol.receive_message(ClientMessage) == large
+
+        compression = metrics.get_metrics()["compression"]
+        assert compression["messages_compressed"] == 1
+        assert compression["messages_decompressed"] == 1
+        assert compression["raw_bytes"] == 2 * len(large.model_dump_json())
+        assert 0 < compression["ratio"] < 1
+        assert compression["compress_time"] > 0
+        assert metrics.get_metrics()["messages_sent"] == 2
+        assert metrics.get_metrics()["messages_received"] == 1
+
+    @pytest.mark.asyncio
+    async def test_oversized_frame_is_rejected(self):
+        """Test that a frame expanding beyond the transport's max_size is not decoded."""
+        transport = FramedMockTransport()
+        transport.max_size = 64 * 1024
+        protocol = AIPProtocol(transport)
+        protocol.set_compression(DeflateCompressor())
+        metrics = MetricsExtension()
+        protocol.add_extension(metrics)
+
+        # A valid message, so only the size limit can reject it
+        encoded = control_list_results(2000).model_dump_json().encode("utf-8")
+        bomb = DeflateCompressor().compress(encoded)
+        assert len(bomb) < transport.max_size < len(encoded)
+        await transport.receive_queue.put(bomb)
+
+        with pytest.raises(ValueError):
+            await protocol.receive_message(ClientMessage)
+        assert metrics.get_metrics()["messages_received"] == 0
+
+    @pytest.mark.asyncio
+    async def test_compression_with_binary_codec(self):
+        """Test that compression applies on top of a binary codec."""
+        if not MsgpackCodec.is_available():
+            pytest.skip("msgpack is not installed")
+
+        transport = FramedMockTransport()
+        protocol = AIPProtocol(transport)
+        protocol.codec = MsgpackCodec()
+        protocol.set_compression(DeflateCompressor(), threshold=1024)
+        small = control_list_results(1)
+        large = control_list_results(300)
+
+        await protocol.send_message(small)
+        await protocol.send_message(large)
+        assert transport.text_frames == []
+
+        for frame in transport.binary_frames:
+            await transport.receive_queue.put(frame)
+        assert await protocol.receive_message(ClientMessage) == small
+        assert await protocol.receive_message(ClientMessage) == large
+
+    @pytest.mark.asyncio
+    async def test_registration_applies_negotiated_compression(self):
+        """Test that the client adopts the compression and threshold chosen by the server."""
+        transport = FramedMockTransport()
+        protocol = RegistrationProtocol(transport)
+        confirmation = ServerMessage(
+            type=ServerMessageType.HEARTBEAT,
+            status=TaskStatus.OK,
+            metadata={"compression": "deflate", "compression_threshold": 1024},
+        )
+        await transport.receive_queue.put(confirmation.model_dump_json())
+
+        success = await protocol.register_as_device(
+            device_id="device", metadata={"compression": available_compressors()}
+        )
+
+        assert success is True
+        assert protocol.compression.name == "deflate"
+        assert protocol.compression_threshold == 1024
@@ -137,6 +137,52 @@ class TestWebSocketTransport:
 
         assert transport.state == TransportState.DISCONNECTED
 
+    @pytest.mark.asyncio
+    async def test_websocket_text_frames_skip_str_round_trip(self):
+        """Test encoded messages are sent and received as bytes when supported."""
+
+        class FakeConnection:
+            closed = False
+
+            def __init__(self):
+                self.sent = []
+
+            async def send(self, message, *, text=None):
+                self.sent.append((message, text))
+
+            async def recv(self, decode=None):
+                return b'{"ok": true}' if decode is False else '{"ok": true}'
+
+        connection = FakeConnection()
+        transport = WebSocketTransport(websocket=connection)
+
+        await transport.send(b'{"ok": true}')
+        assert connection.sent == [(b'{"ok": true}', True)]
+        assert await transport.receive() == b'{"ok": true}'
+
+    @pytest.mark.asyncio
+    async def test_websocket_text_frames_fallback_to_str(self):
+        """Test connections without bytes text frames still receive str."""
+
+        class LegacyConnection:
+            closed = False
+
+            def __init__(self):
+                self.sent = []
+
+            async def send(self, message):
+                self.sent.append(message)
+
+            async def recv(self):
+                return '{"ok": true}'
+
+        connection = LegacyConnection()
+        transport = WebSocketTransport(websocket=connection)
+
+        await transport.send(b'{"ok": true}')
+        assert connection.sent == ['{"ok": true}']
+        assert await transport.receive() == b'{"ok": true}'
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,130 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Micro-benchmarks of the AIP wire codecs on ServerMessage/ClientMessage at realistic sizes:
+a heartbeat, a command dispatch and command results carrying a control list.
+
+"legacy" is the previous path: model_dump_json -> encode -> decode -> model_validate_json.
+
+Usage:
+    python tests/benchmarks/benchmark_aip_codecs.py [--iterations 2000] [--controls 300]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from aip.messages import (
+    ClientMessage,
+    ClientMessageType,
+    Command,
+    Result,
+    ResultStatus,
+    ServerMessage,
+    ServerMessageType,
+    TaskStatus,
+)
+from aip.protocol.codecs import CODECS
+
+
+def make_messages(controls: int) -> dict:
+    heartbeat = ClientMessage(
+        type=ClientMessageType.HEARTBEAT,
+        status=TaskStatus.OK,
+        client_id="device_001",
+        timestamp="2025-01-01T00:00:00+00:00",
+    )
+    command = ServerMessage(
+        type=ServerMessageType.COMMAND,
+        status=TaskStatus.CONTINUE,
+        session_id="session_001",
+        task_name="task",
+        agent_name="AppAgent",
+        root_name="WINWORD.EXE",
+        process_name="WINWORD.EXE",
+        actions=[
+            Command(
+                tool_name="click_input",
+                parameters={"id": str(i), "name": f"Button {i}", "button": "left"},
+                tool_type="action",
+                call_id=f"call_{i}",
+            )
+            for i in range(5)
+        ],
+        response_id="resp_001",
+    )
+    control_list = [
+        {
+            "id": str(i),
+            "name": f"Control {i}",
+            "control_type": "Button",
+            "class_name": "NetUIButton",
+            "rectangle": {"left": i, "top": i * 2, "right": i + 80, "bottom": i * 2 + 24},
+            "is_enabled": True,
+            "is_visible": True,
+        }
+        for i in range(controls)
+    ]
+    results = ClientMessage(
+        type=ClientMessageType.COMMAND_RESULTS,
+        status=TaskStatus.CONTINUE,
+        session_id="session_001",
+        client_id="device_001",
+        prev_response_id="resp_001",
+        action_results=[
+            Result(status=ResultStatus.SUCCESS, result=control_list, call_id="c1"),
+            Result(status=ResultStatus.SUCCESS, result={"title": "Document1"}, call_id="c2"),
+        ],
+    )
+    return {"heartbeat": heartbeat, "command": command, "results": results}
+
+
+def bench_legacy(msg, iterations: int) -> tuple:
+    message_type = type(msg)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        data = msg.model_dump_json().encode("utf-8")
+        text = data.decode("utf-8")  # transport send
+        received = text.encode("utf-8")  # transport receive
+        message_type.model_validate_json(received.decode("utf-8"))
+    return (time.perf_counter() - start) / iterations, len(data)
+
+
+def bench_codec(codec, msg, iterations: int) -> tuple:
+    message_type = type(msg)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        data = codec.encode(msg)
+        codec.decode(data, message_type)
+    return (time.perf_counter() - start) / iterations, len(data)
+
+
+def main(iterations: int, controls: int) -> None:
+    codecs = [cls() for cls in CODECS.values() if cls.is_available()]
+    missing = [name for name, cls in CODECS.items() if not cls.is_available()]
+    if missing:
+        print(f"Skipping unavailable codecs: {', '.join(missing)}")
+
+    for name, msg in make_messages(controls).items():
+        print(f"\n{name} ({type(msg).__name__})")
+        print("-" * 64)
+        baseline, size = bench_legacy(msg, iterations)
+        print(f"{'legacy':<10} {baseline * 1e6:10.1f} us  {size:9d} bytes  1.00x")
+        for codec in codecs:
+            elapsed, size = bench_codec(codec, msg, iterations)
+            print(
+                f"{codec.name:<10} {elapsed * 1e6:10.1f} us  {size:9d} bytes  "
+                f"{baseline / elapsed:.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--controls", type=int, default=300)
+    args = parser.parse_args()
+    main(args.iterations, args.controls)
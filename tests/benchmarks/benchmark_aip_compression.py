@@ -0,0 +1,140 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Micro-benchmarks of the AIP message compressors on encoded messages at realistic sizes:
+a heartbeat, command results carrying a control list and command results carrying a UI tree.
+
+Reports the wire size, compression ratio and CPU time per message, and the time saved on
+the wire at a given link bandwidth.
+
+Usage:
+    python tests/benchmarks/benchmark_aip_compression.py [--iterations 200] [--controls 300] [--mbps 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from aip.messages import (
+    ClientMessage,
+    ClientMessageType,
+    Result,
+    ResultStatus,
+    TaskStatus,
+)
+from aip.protocol.codecs import JsonCodec
+from aip.protocol.compression import COMPRESSORS, DEFAULT_COMPRESSION_THRESHOLD
+
+
+def make_tree(depth: int, breadth: int, prefix: str = "0") -> dict:
+    node = {
+        "id": prefix,
+        "name": f"Element {prefix}",
+        "control_type": "Pane" if depth else "Button",
+        "class_name": "NetUIHWND",
+        "rectangle": {"left": 0, "top": 0, "right": 1920, "bottom": 1080},
+        "children": [],
+    }
+    if depth:
+        node["children"] = [
+            make_tree(depth - 1, breadth, f"{prefix}.{i}") for i in range(breadth)
+        ]
+    return node
+
+
+def make_messages(controls: int) -> dict:
+    heartbeat = ClientMessage(
+        type=ClientMessageType.HEARTBEAT,
+        status=TaskStatus.OK,
+        client_id="device_001",
+        timestamp="2025-01-01T00:00:00+00:00",
+    )
+    control_list = [
+        {
+            "id": str(i),
+            "name": f"Control {i}",
+            "control_type": "Button",
+            "class_name": "NetUIButton",
+            "rectangle": {"left": i, "top": i * 2, "right": i + 80, "bottom": i * 2 + 24},
+            "is_enabled": True,
+            "is_visible": True,
+        }
+        for i in range(controls)
+    ]
+
+    def results(result) -> ClientMessage:
+        return ClientMessage(
+            type=ClientMessageType.COMMAND_RESULTS,
+            status=TaskStatus.CONTINUE,
+            session_id="session_001",
+            client_id="device_001",
+            prev_response_id="resp_001",
+            action_results=[
+                Result(status=ResultStatus.SUCCESS, result=result, call_id="c1")
+            ],
+        )
+
+    return {
+        "heartbeat": heartbeat,
+        "control_list": results(control_list),
+        "ui_tree": results(make_tree(depth=4, breadth=5)),
+    }
+
+
+def bench(compressor, data: bytes, iterations: int) -> tuple:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        compressed = compressor.compress(data)
+    compress_time = (time.perf_counter() - start) / iterations
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        compressor.decompress(compressed)
+    decompress_time = (time.perf_counter() - start) / iterations
+    return len(compressed), compress_time, decompress_time
+
+
+def main(iterations: int, controls: int, mbps: float) -> None:
+    compressors = [cls() for cls in COMPRESSORS.values() if cls.is_available()]
+    missing = [name for name, cls in COMPRESSORS.items() if not cls.is_available()]
+    if missing:
+        print(f"Skipping unavailable compressors: {', '.join(missing)}")
+
+    bytes_per_second = mbps * 1e6 / 8
+    codec = JsonCodec()
+    for name, msg in make_messages(controls).items():
+        data = codec.encode(msg)
+        below = " (below default threshold, sent uncompressed)"
+        print(
+            f"\n{name}: {len(data)} bytes"
+            f"{below if len(data) < DEFAULT_COMPRESSION_THRESHOLD else ''}"
+        )
+        print("-" * 78)
+        print(
+            f"{'':<10} {'wire':>9} {'ratio':>7} {'compress':>12} {'decompress':>12} "
+            f"{'net @' + str(mbps) + 'Mbps':>16}"
+        )
+        for compressor in compressors:
+            size, compress_time, decompress_time = bench(compressor, data, iterations)
+            saved = (len(data) - size) / bytes_per_second
+            net = saved - compress_time - decompress_time
+            print(
+                f"{compressor.name:<10} {size:9d} {size / len(data):7.2f} "
+                f"{compress_time * 1e6:9.1f} us {decompress_time * 1e6:9.1f} us "
+                f"{net * 1e3:+12.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--controls", type=int, default=300)
+    parser.add_argument(
+        "--mbps", type=float, default=20.0, help="Link bandwidth in Mbit/s"
+    )
+    args = parser.parse_args()
+    main(args.iterations, args.controls, args.mbps)
@@ -0,0 +1,119 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Benchmark end-to-end step latency of returning large screenshots from a device client
+to the server over a local WebSocket: base64 data URLs inline in the JSON command
+results versus binary attachment frames.
+
+A step is measured from the client sending its command results until the server has
+parsed the message, reassembled the results and acknowledged them.
+
+Usage:
+    python tests/benchmarks/benchmark_binary_attachments.py [--steps 20] [--sizes 1,4,8]
+"""
+
+import argparse
+import asyncio
+import base64
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import websockets
+
+from aip.messages import ClientCapability, ClientMessage, Result, ResultStatus
+from aip.protocol.attachments import (
+    AttachmentStore,
+    has_attachment_references,
+    parse_binary_metadata,
+    resolve_attachments,
+)
+from aip.protocol.task_execution import TaskExecutionProtocol
+from aip.transport.websocket import WebSocketTransport
+
+
+async def server_handler(websocket) -> None:
+    """Mimic the UFO server loop: store attachments, parse and reassemble results."""
+    store = AttachmentStore()
+    metadata = None
+    async for frame in websocket:
+        if isinstance(frame, bytes):
+            store.add(metadata, frame)
+            metadata = None
+            continue
+
+        parsed = parse_binary_metadata(frame)
+        if parsed is not None:
+            metadata = parsed
+            continue
+
+        message = ClientMessage.model_validate_json(frame)
+        for result in message.action_results:
+            if has_attachment_references(result.result):
+                result.result, _ = resolve_attachments(result.result, store)
+        await websocket.send("ack")
+
+
+def make_results(size_mb: int) -> list:
+    screenshot = "data:image/png;base64," + base64.b64encode(
+        os.urandom(size_mb * 1024 * 1024)
+    ).decode()
+    return [
+        Result(status=ResultStatus.SUCCESS, result=screenshot, call_id="screenshot"),
+        Result(status=ResultStatus.SUCCESS, result={"title": "app"}, call_id="info"),
+    ]
+
+
+async def bench(url: str, results: list, steps: int, binary: bool) -> list:
+    transport = WebSocketTransport()
+    await transport.connect(url)
+    protocol = TaskExecutionProtocol(transport)
+    if binary:
+        protocol.peer_capabilities = {ClientCapability.BINARY_ATTACHMENTS.value}
+
+    latencies = []
+    try:
+        for step in range(steps + 1):
+            start = time.perf_counter()
+            await protocol.send_command_results(results, "session", "client", "resp")
+            await transport.receive()
+            if step > 0:  # Skip warm-up
+                latencies.append(time.perf_counter() - start)
+    finally:
+        await transport.close()
+    return latencies
+
+
+def report(name: str, latencies: list) -> float:
+    mean = statistics.mean(latencies) * 1000
+    p95 = sorted(latencies)[int(len(latencies) * 0.95) - 1] * 1000
+    print(f"{name:<28} mean={mean:9.2f} ms  p95={p95:9.2f} ms")
+    return mean
+
+
+async def main(steps: int, sizes: list) -> None:
+    async with websockets.serve(
+        server_handler, "127.0.0.1", 0, max_size=100 * 1024 * 1024
+    ) as server:
+        port = server.sockets[0].getsockname()[1]
+        url = f"ws://127.0.0.1:{port}"
+
+        for size_mb in sizes:
+            results = make_results(size_mb)
+            print(f"Screenshot of {size_mb} MB, {steps} steps")
+            print("-" * 72)
+            inline = report("base64 in JSON", await bench(url, results, steps, False))
+            binary = report("binary attachments", await bench(url, results, steps, True))
+            print(f"Speed-up: {inline / binary:.2f}x\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--sizes", type=str, default="1,4,8")
+    args = parser.parse_args()
+    asyncio.run(main(args.steps, [int(size) for size in args.sizes.split(",")]))
@@ -0,0 +1,175 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Benchmark of the ready-task scheduling and cycle checks of TaskConstellation.
+
+Synthetic constellations are executed the way the orchestrator loop does: the ready
+tasks are queried, one is completed, and the loop repeats until every task ran. Each
+shape is run with:
+
+- scan: the ready tasks found by scanning every task and every dependency, and the
+  cycle checks scanning every dependency at each step, as TaskConstellation did before
+- indexed: TaskConstellation.get_ready_tasks and add_dependency, on the maintained
+  dependency indexes and ready heap
+
+Usage:
+    python tests/benchmarks/benchmark_constellation_scheduling.py [--tasks 1000] [--parents 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from galaxy.constellation import TaskConstellation, TaskStar, TaskStarLine
+from galaxy.constellation.enums import TaskPriority
+
+
+def layered_edges(tasks, parents, rng):
+    """Edges between layers of about the square root of the tasks."""
+    width = max(1, int(tasks**0.5))
+    edges = []
+    for i in range(width, tasks):
+        layer_start = (i // width - 1) * width
+        for parent in rng.sample(range(layer_start, layer_start + width), parents):
+            edges.append((parent, i))
+    return edges
+
+
+def random_edges(tasks, parents, rng):
+    """Edges to each task from random earlier tasks."""
+    edges = []
+    for i in range(1, tasks):
+        for parent in rng.sample(range(i), min(i, parents)):
+            edges.append((parent, i))
+    return edges
+
+
+def chain_edges(tasks, parents, rng):
+    """A single chain of tasks."""
+    return [(i - 1, i) for i in range(1, tasks)]
+
+
+SHAPES = {"layered": layered_edges, "random": random_edges, "chain": chain_edges}
+
+
+def scan_ready_tasks(constellation):
+    """The ready tasks, scanning every task and every dependency."""
+    tasks = constellation._tasks
+    ready = []
+    for task in tasks.values():
+        if not task.is_ready_to_execute:
+            continue
+        satisfied = True
+        for dependency in constellation._dependencies.values():
+            if dependency.to_task_id == task.task_id:
+                prerequisite = tasks.get(dependency.from_task_id)
+                if not prerequisite or not prerequisite.is_terminal:
+                    satisfied = False
+                    break
+        if satisfied:
+            ready.append(task)
+    ready.sort(key=lambda t: t.priority.value, reverse=True)
+    return ready
+
+
+def scan_would_create_cycle(constellation, from_task_id, to_task_id):
+    """The cycle check, scanning every dependency at each step of the search."""
+    visited = set()
+    stack = [to_task_id]
+    while stack:
+        current = stack.pop()
+        if current == from_task_id:
+            return True
+        if current in visited:
+            continue
+        visited.add(current)
+        for dependency in constellation._dependencies.values():
+            if dependency.from_task_id == current:
+                stack.append(dependency.to_task_id)
+    return False
+
+
+def build(tasks, edges, mode, seed):
+    """Build a constellation, returning it and the time spent in cycle checks."""
+    rng = random.Random(seed)
+    constellation = TaskConstellation(name="benchmark")
+    for i in range(tasks):
+        constellation.add_task(
+            TaskStar(
+                task_id=f"task_{i}",
+                description=f"Task {i}",
+                priority=rng.choice(list(TaskPriority)),
+            )
+        )
+
+    check_time = 0.0
+    for parent, child in edges:
+        line = TaskStarLine.create_unconditional(f"task_{parent}", f"task_{child}")
+        start = time.perf_counter()
+        if mode == "scan":
+            assert not scan_would_create_cycle(
+                constellation, line.from_task_id, line.to_task_id
+            )
+            check_time += time.perf_counter() - start
+        else:
+            assert not constellation._would_create_cycle(
+                line.from_task_id, line.to_task_id
+            )
+            check_time += time.perf_counter() - start
+        constellation.add_dependency(line)
+    return constellation, check_time
+
+
+def execute(constellation, mode):
+    """Run the tasks one per loop iteration, returning the iterations and query time."""
+    get_ready = (
+        (lambda: scan_ready_tasks(constellation))
+        if mode == "scan"
+        else constellation.get_ready_tasks
+    )
+    iterations = 0
+    query_time = 0.0
+    while True:
+        start = time.perf_counter()
+        ready = get_ready()
+        query_time += time.perf_counter() - start
+        if not ready:
+            break
+        task = ready[0]
+        constellation.start_task(task.task_id)
+        constellation.mark_task_completed(task.task_id, success=True, result="done")
+        iterations += 1
+    assert iterations == constellation.task_count
+    return iterations, query_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--parents", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{args.tasks} tasks, up to {args.parents} dependencies per task")
+    print(
+        f"{'shape':<10}{'mode':<9}{'edges':>7}{'cycle checks (s)':>18}"
+        f"{'ready queries (s)':>19}{'per query (ms)':>16}"
+    )
+    for shape, make_edges in SHAPES.items():
+        edges = make_edges(args.tasks, args.parents, random.Random(args.seed))
+        for mode in ("scan", "indexed"):
+            constellation, check_time = build(args.tasks, edges, mode, args.seed)
+            iterations, query_time = execute(constellation, mode)
+            print(
+                f"{shape:<10}{mode:<9}{len(edges):>7}{check_time:>18.3f}"
+                f"{query_time:>19.3f}{query_time / iterations * 1000:>16.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
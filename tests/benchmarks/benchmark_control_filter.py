@@ -0,0 +1,119 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Benchmark of the semantic control filter over a few steps of the same window:
+
+- per-control: one encode of the control text and one of the plans per control (previous path)
+- batched: one encode of the new control texts and plans per step, vectorised top-k,
+  embeddings cached across steps
+
+By default a stub model with a fixed cost per encode call and per item is used, so the
+benchmark runs without downloading a model. Pass --model to use a sentence-transformers model.
+
+Usage:
+    python tests/benchmarks/benchmark_control_filter.py [--controls 500] [--steps 3] [--model all-MiniLM-L6-v2]
+"""
+
+import argparse
+import heapq
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from ufo.automator.ui_control.control_filter import (
+    BasicControlFilter,
+    SemanticControlFilter,
+)
+
+PLANS = ["Click the Save button", "Type the file name", "Confirm the dialog"]
+
+
+class StubModel:
+    """Stub encoder with a fixed overhead per call and a small cost per item."""
+
+    def __init__(self, call_cost: float = 2e-3, item_cost: float = 5e-5, dim: int = 384):
+        self.call_cost = call_cost
+        self.item_cost = item_cost
+        self.dim = dim
+
+    def encode(self, contents):
+        single = isinstance(contents, str)
+        contents = [contents] if single else list(contents)
+        time.sleep(self.call_cost + self.item_cost * len(contents))
+        embeddings = np.stack(
+            [
+                np.random.default_rng(abs(hash(content)) % 2**32).standard_normal(
+                    self.dim
+                )
+                for content in contents
+            ]
+        )
+        return embeddings[0] if single else embeddings
+
+
+def per_control_filter(control_filter, control_dicts, plans, top_k):
+    """The previous implementation: re-embeds the control and the plans per control."""
+    scores = []
+    for label, control_item in control_dicts.items():
+        plan_embedding = control_filter.model.encode(plans)
+        control_embedding = control_filter.model.encode(control_item.name.lower())
+        score = control_filter.similarity_matrix(
+            control_embedding[None, :], plan_embedding
+        ).max()
+        scores.append((label, score))
+    topk_labels = {label for label, _ in heapq.nlargest(top_k, scores, key=lambda x: x[1])}
+    return {label: item for label, item in control_dicts.items() if label in topk_labels}
+
+
+def make_controls(count: int, step: int):
+    # Most controls stay the same between steps, a few change
+    names = [f"Control {i}" for i in range(count)]
+    for i in range(0, count, 25):
+        names[i] = f"Changed control {i} at step {step}"
+    return {str(i): SimpleNamespace(name=name) for i, name in enumerate(names)}
+
+
+def main(controls: int, steps: int, top_k: int, model_name: str) -> None:
+    if not model_name:
+        BasicControlFilter.load_model = staticmethod(lambda model_path: StubModel())
+    control_filter = SemanticControlFilter(model_name or "stub")
+
+    print(f"{controls} controls, {len(PLANS)} plans, {steps} steps, top {top_k}")
+    print("-" * 60)
+
+    steps_controls = [make_controls(controls, step) for step in range(steps)]
+
+    start = time.perf_counter()
+    expected = [
+        per_control_filter(control_filter, control_dicts, PLANS, top_k)
+        for control_dicts in steps_controls
+    ]
+    per_control = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [
+        control_filter.control_filter(control_dicts, PLANS, top_k)
+        for control_dicts in steps_controls
+    ]
+    batched = time.perf_counter() - start
+
+    print(f"{'per-control':<12} {per_control:8.3f} s  {per_control / steps * 1000:9.1f} ms/step")
+    print(f"{'batched':<12} {batched:8.3f} s  {batched / steps * 1000:9.1f} ms/step")
+    print(f"speed-up     {per_control / batched:8.1f}x")
+    print(f"same result  {[list(e) for e in expected] == [list(a) for a in actual]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--controls", type=int, default=500)
+    parser.add_argument("--steps", type=int, default=3)
+    parser.add_argument("--top-k", type=int, default=15)
+    parser.add_argument("--model", default="", help="sentence-transformers model name")
+    args = parser.parse_args()
+    main(args.controls, args.steps, args.top_k, args.model)
@@ -0,0 +1,98 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Benchmark of merging grounding controls into the UIA control list:
+
+- pairwise: target_info_iou for every pair of controls (previous path)
+- dense: one vectorised IoU matrix, computed in chunks
+- grid: only the controls sharing a grid cell are compared
+
+Usage:
+    python tests/benchmarks/benchmark_control_merge.py [--sizes 200 1000 3000] [--threshold 0.1]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from ufo.agents.processors.schemas.target import TargetInfo, TargetKind
+from ufo.automator.ui_control import spatial_index
+from ufo.automator.ui_control.screenshot import PhotographerFacade
+
+
+def make_targets(count: int, seed: int, width: int = 2560, height: int = 1440):
+    rng = random.Random(seed)
+    targets = []
+    for i in range(count):
+        left, top = rng.randint(0, width - 10), rng.randint(0, height - 10)
+        rect = [left, top, left + rng.randint(10, 160), top + rng.randint(10, 40)]
+        targets.append(TargetInfo(kind=TargetKind.CONTROL, name=f"c{i}", id=str(i), rect=rect))
+    return targets
+
+
+def pairwise_merge(main_targets, additional_targets, threshold):
+    merged = main_targets.copy()
+    for additional in additional_targets:
+        if not any(
+            PhotographerFacade.target_info_iou(additional, main) > threshold
+            for main in main_targets
+        ):
+            merged.append(additional)
+    return merged
+
+
+def path_merge(use_grid):
+    def merge(main_targets, additional_targets, threshold):
+        mask = spatial_index.overlapping_mask(
+            spatial_index.rect_array([t.rect for t in additional_targets]),
+            spatial_index.rect_array([t.rect for t in main_targets]),
+            threshold,
+            use_grid=use_grid,
+        )
+        return main_targets + [t for t, o in zip(additional_targets, mask) if not o]
+
+    return merge
+
+
+def timed(merge, main_targets, additional_targets, threshold, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        merged = merge(main_targets, additional_targets, threshold)
+    return (time.perf_counter() - start) / repeat, merged
+
+
+def main(sizes, threshold: float) -> None:
+    print(f"{'controls':>9} {'pairwise':>12} {'dense':>12} {'grid':>12} {'speed-up':>9}  same")
+    print("-" * 66)
+    for size in sizes:
+        main_targets = make_targets(size, seed=1)
+        additional_targets = make_targets(size, seed=2)
+        repeat = max(1, 2000 // size)
+
+        pairwise, expected = timed(
+            pairwise_merge, main_targets, additional_targets, threshold, 1
+        )
+        dense, dense_merged = timed(
+            path_merge(False), main_targets, additional_targets, threshold, repeat
+        )
+        grid, grid_merged = timed(
+            path_merge(True), main_targets, additional_targets, threshold, repeat
+        )
+        same = dense_merged == expected and grid_merged == expected
+        print(
+            f"{size:>9} {pairwise * 1000:>9.1f} ms {dense * 1000:>9.1f} ms "
+            f"{grid * 1000:>9.1f} ms {pairwise / min(dense, grid):>8.0f}x  {same}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 1000, 3000])
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+    main(args.sizes, args.threshold)
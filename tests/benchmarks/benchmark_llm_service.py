@@ -0,0 +1,93 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Throughput benchmark of concurrent LLM requests against a local stub LLM server:
+
+- executor: chat_completion pushed onto the default run_in_executor pool (previous path)
+- async: achat_completion on the pooled async client, bounded by the endpoint semaphore
+
+Usage:
+    python tests/benchmarks/benchmark_llm_service.py [--sessions 64] [--requests 4] [--latency 0.2]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from tests.integration.llm_stub_server import LLMStubServer
+from ufo.llm.connection_pool import close_async_http_client
+from ufo.llm.openai import OpenAIService
+
+MESSAGES = [{"role": "user", "content": "Hello"}]
+
+
+def make_service(url: str, max_concurrent: int) -> OpenAIService:
+    config = {
+        "APP_AGENT": {
+            "API_TYPE": "openai",
+            "API_BASE": url,
+            "API_KEY": "stub-key",
+            "API_MODEL": "stub-model",
+            "MAX_CONCURRENT_REQUESTS": max_concurrent,
+        },
+        "MAX_RETRY": 0,
+        "TIMEOUT": 60,
+        "PRICES": {},
+        "TEMPERATURE": 0.0,
+        "TOP_P": 0.0,
+        "MAX_TOKENS": 100,
+    }
+    return OpenAIService(config, "APP_AGENT")
+
+
+async def run_sessions(request, sessions: int, requests: int) -> float:
+    async def session() -> None:
+        for _ in range(requests):
+            await request()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session() for _ in range(sessions)))
+    return time.perf_counter() - start
+
+
+async def main(sessions: int, requests: int, latency: float, max_concurrent: int) -> None:
+    with LLMStubServer(latency=latency) as server:
+        service = make_service(server.url, max_concurrent)
+        loop = asyncio.get_running_loop()
+        total = sessions * requests
+
+        async def executor_request():
+            await loop.run_in_executor(None, service.chat_completion, MESSAGES, 1)
+
+        async def async_request():
+            await service.achat_completion(MESSAGES, 1)
+
+        print(
+            f"{sessions} sessions x {requests} requests, {latency * 1000:.0f} ms per completion, "
+            f"limit {max_concurrent} in flight"
+        )
+        print("-" * 72)
+        for name, request in (("executor", executor_request), ("async", async_request)):
+            server.reset_stats()
+            elapsed = await run_sessions(request, sessions, requests)
+            print(
+                f"{name:<10} {elapsed:7.2f} s  {total / elapsed:8.1f} req/s  "
+                f"max in flight {server.max_in_flight:4d}  connections {server.connections:4d}"
+            )
+
+        await close_async_http_client()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--max-concurrent", type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(main(args.sessions, args.requests, args.latency, args.max_concurrent))
@@ -0,0 +1,128 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Benchmark per-call MCP tool latency: a new event loop and client context per call
+(the previous Computer._run_action behaviour) versus a pooled persistent session.
+
+Usage:
+    python tests/benchmarks/benchmark_mcp_session_pool.py [--calls 200]
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from fastmcp import Client, FastMCP
+
+from ufo.client.mcp.mcp_server_manager import BaseMCPServer
+from ufo.client.mcp.mcp_session_pool import MCPSessionPool
+
+
+class InMemoryMCPServer(BaseMCPServer):
+    """In-memory MCP server wrapping a FastMCP instance."""
+
+    def __init__(self, server: FastMCP):
+        super().__init__({"namespace": "Bench"})
+        self._server = server
+
+    def start(self, *args, **kwargs) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def reset(self) -> None:
+        pass
+
+
+def make_server() -> InMemoryMCPServer:
+    mcp = FastMCP("Bench")
+
+    @mcp.tool()
+    def echo(text: str) -> str:
+        """Echo the text."""
+        return text
+
+    return InMemoryMCPServer(mcp)
+
+
+async def bench_per_call_client(server: FastMCP, calls: int) -> list:
+    """Previous behaviour: a thread, a new event loop and a new client per call."""
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=10)
+
+    def _call_tool_in_thread():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+
+            async def _do_call():
+                async with Client(server) as client:
+                    return await client.call_tool(
+                        name="echo", arguments={"text": "x"}, raise_on_error=False
+                    )
+
+            return loop.run_until_complete(_do_call())
+        finally:
+            loop.close()
+
+    latencies = []
+    loop = asyncio.get_running_loop()
+    for _ in range(calls):
+        start = time.perf_counter()
+        await loop.run_in_executor(executor, _call_tool_in_thread)
+        latencies.append(time.perf_counter() - start)
+
+    executor.shutdown()
+    return latencies
+
+
+async def bench_pooled_session(mcp_server: InMemoryMCPServer, calls: int) -> list:
+    """Pooled behaviour: one persistent session reused for every call."""
+    pool = MCPSessionPool()
+    latencies = []
+    try:
+        # Warm up the session so connection setup is excluded, as in steady state.
+        await pool.call_tool("Bench", mcp_server, "echo", {"text": "x"})
+        for _ in range(calls):
+            start = time.perf_counter()
+            await pool.call_tool("Bench", mcp_server, "echo", {"text": "x"})
+            latencies.append(time.perf_counter() - start)
+    finally:
+        pool.close()
+    return latencies
+
+
+def report(name: str, latencies: list) -> float:
+    latencies = sorted(latencies)
+    mean = statistics.mean(latencies) * 1000
+    p50 = latencies[len(latencies) // 2] * 1000
+    p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+    print(f"{name:<24} mean={mean:8.3f} ms  p50={p50:8.3f} ms  p95={p95:8.3f} ms")
+    return mean
+
+
+async def main(calls: int) -> None:
+    mcp_server = make_server()
+
+    print(f"MCP tool call latency over {calls} calls")
+    print("-" * 72)
+    per_call = report(
+        "per-call client", await bench_per_call_client(mcp_server.server, calls)
+    )
+    pooled = report("pooled session", await bench_pooled_session(mcp_server, calls))
+    print("-" * 72)
+    print(f"Speed-up: {per_call / pooled:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls))
@@ -0,0 +1,165 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Per-step wall-clock of the AppAgent screenshot pipeline:
+save the clean screenshot -> annotate -> concatenate -> encode for the LLM -> annotate
+the selected controls after the action.
+
+- disk: every image is written to PNG and read back from the log path (previous path)
+- memory: images stay in the screenshot store and are archived in the background
+
+The background writer shares the CPU with the pipeline, so on a single core the saving
+is smaller than with spare cores.
+
+Usage:
+    python tests/benchmarks/benchmark_screenshot_pipeline.py [--steps 5] [--controls 150] [--width 1920 --height 1080]
+"""
+
+import argparse
+import base64
+import os
+import random
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from PIL import Image, ImageDraw, ImageFont
+
+from ufo import utils
+from ufo.agents.processors.schemas.target import TargetInfo, TargetKind
+from ufo.automator.ui_control.screenshot import AnnotationDecorator, PhotographerFacade
+from ufo.automator.ui_control.screenshot_store import ScreenshotStore
+
+
+def use_available_font() -> None:
+    """Fall back to the default font where the annotation font is not installed."""
+    try:
+        AnnotationDecorator._get_font("arial.ttf", 22)
+    except OSError:
+        AnnotationDecorator._get_font = staticmethod(
+            lambda name, size: ImageFont.load_default(size)
+        )
+
+
+def make_screenshot(width: int, height: int) -> str:
+    """A window-like screenshot as the client sends it: a PNG data URL."""
+    rng = random.Random(0)
+    image = Image.new("RGB", (width, height), (240, 240, 240))
+    draw = ImageDraw.Draw(image)
+    for _ in range(400):
+        left, top = rng.randint(0, width - 100), rng.randint(0, height - 30)
+        color = tuple(rng.randint(0, 255) for _ in range(3))
+        draw.rectangle([left, top, left + rng.randint(20, 100), top + 25], fill=color)
+        draw.text((left + 2, top + 2), "Button", fill=(0, 0, 0))
+    buffered = BytesIO()
+    image.save(buffered, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buffered.getvalue()).decode()
+
+
+def make_targets(count: int, width: int, height: int):
+    rng = random.Random(1)
+    targets = []
+    for i in range(count):
+        left, top = rng.randint(0, width - 100), rng.randint(0, height - 30)
+        rect = [left, top, left + rng.randint(20, 100), top + 25]
+        targets.append(
+            TargetInfo(kind=TargetKind.CONTROL, name=f"c{i}", id=str(i + 1), type="Button", rect=rect)
+        )
+    return targets
+
+
+def disk_step(photographer, log_path, step, url, window, targets):
+    clean = f"{log_path}action_step{step}.png"
+    annotated = f"{log_path}action_step{step}_annotated.png"
+    concat = f"{log_path}action_step{step}_concat.png"
+    selected = f"{log_path}action_step{step}_selected_controls.png"
+    last = f"{log_path}action_step{step - 1}_selected_controls.png"
+
+    utils.save_image_string(url, clean)
+    photographer.capture_app_window_screenshot_with_target_list(
+        window, targets, path=clean, save_path=annotated, highlight_bbox=True
+    )
+    photographer.encode_image_from_path(annotated)
+    images = [photographer.encode_image_from_path(last)] if os.path.exists(last) else []
+    photographer.concat_screenshots(clean, annotated, concat)
+    images += [
+        photographer.encode_image_from_path(clean),
+        photographer.encode_image_from_path(annotated),
+    ]
+    photographer.capture_app_window_screenshot_with_target_list(
+        window, targets[:1], path=clean, save_path=selected, highlight_bbox=True
+    )
+    photographer.encode_image_from_path(selected)
+    return images
+
+
+def memory_step(photographer, store, log_path, step, url, window, targets):
+    clean = f"{log_path}action_step{step}.png"
+    annotated = f"{log_path}action_step{step}_annotated.png"
+    concat = f"{log_path}action_step{step}_concat.png"
+    selected = f"{log_path}action_step{step}_selected_controls.png"
+    last = f"{log_path}action_step{step - 1}_selected_controls.png"
+
+    store.put_image_string(url, clean)
+    store.put(
+        annotated,
+        photographer.capture_app_window_screenshot_with_target_list(
+            window, targets, image=store.get(clean), highlight_bbox=True
+        ),
+    )
+    store.encode(annotated)
+    images = [store.encode(last)] if store.exists(last) else []
+    store.put(concat, PhotographerFacade.concat_images(store.get(clean), store.get(annotated)))
+    images += [store.encode(clean), store.encode(annotated)]
+    store.put(
+        selected,
+        photographer.capture_app_window_screenshot_with_target_list(
+            window, targets[:1], image=store.get(clean), highlight_bbox=True
+        ),
+    )
+    # Encoded by the next step, when it includes the last screenshot
+    return images
+
+
+def main(steps: int, controls: int, width: int, height: int) -> None:
+    use_available_font()
+    photographer = PhotographerFacade()
+    url = make_screenshot(width, height)
+    window = TargetInfo(kind=TargetKind.WINDOW, name="window", rect=[0, 0, width, height])
+    targets = make_targets(controls, width, height)
+
+    print(f"{steps} steps, {width}x{height} screenshots, {controls} annotated controls")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as disk_dir, tempfile.TemporaryDirectory() as memory_dir:
+        start = time.perf_counter()
+        for step in range(1, steps + 1):
+            disk_step(photographer, disk_dir + os.sep, step, url, window, targets)
+        disk = (time.perf_counter() - start) / steps
+
+        store = ScreenshotStore()
+        start = time.perf_counter()
+        for step in range(1, steps + 1):
+            memory_step(photographer, store, memory_dir + os.sep, step, url, window, targets)
+        memory = (time.perf_counter() - start) / steps
+        store.flush()
+        written = time.perf_counter() - start
+
+        print(f"{'disk':<8} {disk * 1000:9.1f} ms/step")
+        print(f"{'memory':<8} {memory * 1000:9.1f} ms/step  (all files written after {written:.2f} s)")
+        print(f"saved    {(disk - memory) * 1000:9.1f} ms/step ({disk / memory:.1f}x)")
+        print(f"files    disk {len(os.listdir(disk_dir))}, memory {len(os.listdir(memory_dir))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--steps", type=int, default=5)
+    parser.add_argument("--controls", type=int, default=150)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    args = parser.parse_args()
+    main(args.steps, args.controls, args.width, args.height)
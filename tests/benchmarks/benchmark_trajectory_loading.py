@@ -0,0 +1,170 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Benchmark of loading a trajectory log folder with the Trajectory parser.
+
+A synthetic trajectory is written with a screenshot, an annotated screenshot and a
+selected control screenshot per step. Each mode runs in a fresh process, which reports
+its load time and its peak memory above the baseline of the process:
+
+- eager: every step kept in memory with all its screenshots decoded, as the parser
+  constructor did before (it even did it twice)
+- stream: iter_steps with the screenshots of each step decoded, then dropped
+- markdown: Trajectory.to_markdown, which does not need the screenshots
+- experience: ExperienceLogLoader, which encodes the screenshot files
+- random: one step loaded with get_step from the saved step index
+
+Usage:
+    python tests/benchmarks/benchmark_trajectory_loading.py [--steps 200] [--width 1280] [--height 720]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+SCREENSHOTS = {
+    "clean_screenshot_path": "action_step{step}.png",
+    "annotated_screenshot_path": "action_step{step}_annotated.png",
+    "selected_control_screenshot_path": "action_step{step}_selected_controls.png",
+}
+
+
+def write_trajectory(path, steps, width, height):
+    """Write a trajectory of app agent steps, with screenshots that look like windows."""
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+    templates = []
+    for i in range(len(SCREENSHOTS)):
+        pixels = np.full((height, width, 3), 240, dtype=np.uint8)
+        for _ in range(200):
+            top, left = rng.integers(0, height - 40), rng.integers(0, width - 120)
+            bottom, right = top + rng.integers(10, 40), left + rng.integers(30, 120)
+            pixels[top:bottom, left:right] = rng.integers(0, 255, 3)
+        template = os.path.join(path, f"template_{i}.png")
+        Image.fromarray(pixels).save(template, compress_level=1)
+        templates.append(template)
+
+    with open(os.path.join(path, "evaluation.log"), "w", encoding="utf-8") as f:
+        json.dump({"complete": "yes"}, f)
+
+    with open(os.path.join(path, "response.log"), "w", encoding="utf-8") as f:
+        for step in range(steps):
+            log = {
+                "agent_type": "AppAgent",
+                "request": "Fill in the quarterly report",
+                "Step": step,
+                "Round": 0,
+                "session_step": step,
+                "subtask": f"Subtask {step // 20}",
+                "Subtask": f"Subtask {step // 20}",
+                "Application": "EXCEL.EXE",
+                "thought": "Click the cell to enter the value. " * 10,
+                "action": [{"action_string": f"click(id={step})", "result": "ok"}],
+            }
+            for (key, name), template in zip(SCREENSHOTS.items(), templates):
+                log[key] = os.path.join("logs", "task", name.format(step=step))
+                shutil.copyfile(template, os.path.join(path, name.format(step=step)))
+            f.write(json.dumps(log) + "\n")
+
+
+def memory_kb(field):
+    """Read a memory field of /proc/self/status, in KB."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+def reset_peak_memory():
+    """Reset the peak memory of the process to its current memory, where supported."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def run_mode(mode, path, results):
+    """Run a mode in this process and report its time and peak memory."""
+    from ufo.experience.experience_parser import ExperienceLogLoader
+    from ufo.trajectory.parser import Trajectory
+
+    # Measure the peak above the memory of the imports
+    if reset_peak_memory():
+        baseline = memory_kb("VmRSS")
+    else:
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+
+    trajectory = Trajectory(path)
+    if mode == "eager":
+        steps = list(trajectory.iter_steps())
+        for step in steps:
+            for key in SCREENSHOTS:
+                step["ScreenshotImages"].get(key)
+    elif mode == "stream":
+        for step in trajectory.iter_steps():
+            for key in SCREENSHOTS:
+                step["ScreenshotImages"].get(key)
+    elif mode == "markdown":
+        trajectory.to_markdown(os.path.join(path, "output.md"))
+    elif mode == "experience":
+        ExperienceLogLoader(path)
+    elif mode == "random":
+        trajectory.get_step(trajectory.step_count * 3 // 4)["ScreenshotImages"].get(
+            "clean_screenshot_path"
+        )
+
+    elapsed = time.perf_counter() - start
+    # VmHWM and ru_maxrss are in KB on Linux
+    peak = memory_kb("VmHWM") or resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((mode, elapsed, (peak - baseline) / 1024))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    path = tempfile.mkdtemp(prefix="trajectory_benchmark_")
+    try:
+        write_trajectory(path, args.steps, args.width, args.height)
+
+        from ufo.trajectory.parser import Trajectory
+
+        Trajectory(path).save_step_index()
+
+        print(
+            f"{args.steps} steps, {args.steps * len(SCREENSHOTS)} screenshots of "
+            f"{args.width}x{args.height}"
+        )
+        print(f"{'mode':<12}{'time (s)':>10}{'peak (MB)':>12}")
+        for mode in ("eager", "stream", "markdown", "experience", "random"):
+            results = context.Queue()
+            process = context.Process(target=run_mode, args=(mode, path, results))
+            process.start()
+            _, elapsed, peak = results.get()
+            process.join()
+            print(f"{mode:<12}{elapsed:>10.3f}{peak:>12.1f}")
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
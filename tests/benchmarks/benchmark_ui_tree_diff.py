@@ -0,0 +1,160 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Benchmark of the UI tree transport over a few steps of the same window:
+
+- full: the full tree is sent and saved at every step (previous path)
+- positional: UITree.ui_tree_diff, children matched by position
+- keyed: UITree.keyed_ui_tree_diff, children matched by key and unchanged subtrees skipped
+
+Every step renames a few controls, inserts a list item near the top of a list and moves a
+dialog, like a typical step of an Office application. By default a synthetic tree is used;
+pass --tree to start from a recorded UI tree log (a ui_tree_step*.json file).
+
+Usage:
+    python tests/benchmarks/benchmark_ui_tree_diff.py [--nodes 20000] [--steps 10] [--tree ui_tree_step0.json]
+"""
+
+import argparse
+import copy
+import itertools
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from ufo.automator.ui_control.ui_tree import UITree
+
+CONTROL_TYPES = ["Button", "Text", "Edit", "ListItem", "MenuItem", "Pane", "Group"]
+
+
+def make_node(rng, level, left=0, top=0):
+    width, height = rng.randint(10, 200), rng.randint(10, 60)
+    return {
+        "id": None,
+        "name": f"Control {rng.randint(0, 10 ** 6)}",
+        "control_type": rng.choice(CONTROL_TYPES),
+        "rectangle": {"left": left, "top": top, "right": left + width, "bottom": top + height},
+        "adjusted_rectangle": {"left": left, "top": top, "right": left + width, "bottom": top + height},
+        "relative_rectangle": {"left": left / 2880, "top": top / 1600, "right": (left + width) / 2880, "bottom": (top + height) / 1600},
+        "level": level,
+        "children": [],
+    }
+
+
+def make_tree(rng, count):
+    """A random tree of about count nodes, with a branching factor of up to 8."""
+    root = make_node(rng, 0)
+    root["control_type"] = "Window"
+    nodes = [root]
+    while len(nodes) < count:
+        parent = rng.choice(nodes[-200:]) if rng.random() < 0.8 else rng.choice(nodes)
+        if len(parent["children"]) >= 8:
+            continue
+        child = make_node(rng, parent["level"] + 1, rng.randint(0, 2800), rng.randint(0, 1500))
+        parent["children"].append(child)
+        nodes.append(child)
+    return number(root)
+
+
+def number(tree):
+    counter = itertools.count()
+    stack = [tree]
+    while stack:
+        item = stack.pop()
+        item["id"] = f"node_{next(counter)}"
+        stack.extend(reversed(item["children"]))
+    return tree
+
+
+def mutate(rng, tree):
+    """The next step: a few renames, an inserted list item and a moved subtree."""
+    tree = copy.deepcopy(tree)
+    nodes = []
+    stack = [tree]
+    while stack:
+        item = stack.pop()
+        nodes.append(item)
+        stack.extend(item["children"])
+
+    for item in rng.sample(nodes, 5):
+        item["name"] = f"Renamed {rng.randint(0, 10 ** 6)}"
+
+    parent = rng.choice([item for item in nodes if item["children"]])
+    parent["children"].insert(0, make_node(rng, parent["level"] + 1))
+
+    moved = rng.choice([item for item in nodes if item["children"]])
+    stack = [moved]
+    while stack:
+        item = stack.pop()
+        item["rectangle"] = dict(item["rectangle"], left=item["rectangle"]["left"] + 40)
+        stack.extend(item["children"])
+
+    return number(tree)
+
+
+def size(value):
+    return len(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+
+
+def main(nodes: int, steps: int, tree_path: str) -> None:
+    rng = random.Random(0)
+    if tree_path:
+        with open(tree_path) as file:
+            base = number(json.load(file))
+    else:
+        base = make_tree(rng, nodes)
+
+    trees = [base]
+    for _ in range(steps):
+        trees.append(mutate(rng, trees[-1]))
+
+    count = sum(1 for _ in UITree.subtree_hashes(base))
+    print(f"{count} nodes, {steps} steps")
+    print("-" * 60)
+
+    full_bytes = sum(size(tree) for tree in trees[1:])
+
+    start = time.perf_counter()
+    positional = [UITree.ui_tree_diff(a, b) for a, b in zip(trees, trees[1:])]
+    positional_time = time.perf_counter() - start
+    positional_bytes = sum(size(diff) for diff in positional)
+
+    # The client hashes each tree once, and keeps the hashes of the previous versions
+    start = time.perf_counter()
+    hashes = [UITree.subtree_hashes(tree) for tree in trees]
+    hash_time = (time.perf_counter() - start) / len(trees) * steps
+
+    start = time.perf_counter()
+    keyed = [
+        UITree.keyed_ui_tree_diff(a, b, hashes_a, hashes_b)
+        for a, b, hashes_a, hashes_b in zip(trees, trees[1:], hashes, hashes[1:])
+    ]
+    keyed_time = time.perf_counter() - start
+    keyed_bytes = sum(size(diff) for diff in keyed)
+
+    start = time.perf_counter()
+    rebuilt = [UITree.apply_keyed_ui_tree_diff(a, diff) for a, diff in zip(trees, keyed)]
+    apply_time = time.perf_counter() - start
+
+    print(f"{'':<12} {'payload/step':>14} {'diff ms/step':>14}")
+    print(f"{'full':<12} {full_bytes / steps / 1024:11.1f} KB {'-':>14}")
+    print(f"{'positional':<12} {positional_bytes / steps / 1024:11.1f} KB {positional_time / steps * 1000:14.1f}")
+    print(f"{'keyed':<12} {keyed_bytes / steps / 1024:11.1f} KB {keyed_time / steps * 1000:14.1f}")
+    print(f"keyed hash   {hash_time / steps * 1000:26.1f} ms/step")
+    print(f"keyed apply  {apply_time / steps * 1000:26.1f} ms/step")
+    print(f"payload      {full_bytes / keyed_bytes:8.1f}x smaller than full")
+    print(f"same result  {rebuilt == trees[1:]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--tree", default="", help="recorded UI tree JSON file")
+    args = parser.parse_args()
+    main(args.nodes, args.steps, args.tree)
@@ -0,0 +1,116 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Benchmark of the constellation updates sent to the Web UI clients.
+
+A synthetic constellation is executed one task at a time, and a task event carrying
+the constellation is broadcast at each start and completion, as the orchestrator
+does. Each mode reports the bytes sent to a client per event and the time to
+serialize and encode the event:
+
+- full: the full task and dependency map in every event, as sent before
+- patch: a snapshot, then the changes from the previous version
+  (WebSocketObserver clients connecting with updates=patch)
+
+Usage:
+    python tests/benchmarks/benchmark_webui_constellation_updates.py [--tasks 500] [--parents 2]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from galaxy.constellation import TaskConstellation, TaskStar, TaskStarLine
+from galaxy.core.events import EventType, TaskEvent
+from galaxy.webui.constellation_patches import ConstellationPatchEncoder
+from galaxy.webui.websocket_observer import EventSerializer
+
+
+def build(tasks, parents, seed):
+    """Build a constellation whose tasks depend on random earlier tasks."""
+    rng = random.Random(seed)
+    constellation = TaskConstellation(name="benchmark")
+    for i in range(tasks):
+        constellation.add_task(
+            TaskStar(
+                task_id=f"task_{i}",
+                description=f"Collect the quarterly figures of region {i}",
+                tips=[f"Open the report of region {i}", "Export it as CSV"],
+            )
+        )
+        for parent in rng.sample(range(i), min(i, parents)):
+            constellation.add_dependency(
+                TaskStarLine.create_unconditional(f"task_{parent}", f"task_{i}")
+            )
+    return constellation
+
+
+def events(constellation):
+    """Execute the tasks, yielding the event published at each change."""
+    while True:
+        ready = constellation.get_ready_tasks()
+        if not ready:
+            return
+        task = ready[0]
+        for event_type in (EventType.TASK_STARTED, EventType.TASK_COMPLETED):
+            if event_type == EventType.TASK_STARTED:
+                constellation.start_task(task.task_id)
+            else:
+                constellation.mark_task_completed(
+                    task.task_id, success=True, result="Figures exported"
+                )
+            yield TaskEvent(
+                event_type=event_type,
+                source_id="orchestrator",
+                timestamp=time.time(),
+                data={"constellation": constellation},
+                task_id=task.task_id,
+                status=task.status.value,
+            )
+
+
+def run(mode, tasks, parents, seed):
+    """Broadcast the events of an execution, returning the events, bytes and time."""
+    serializer = EventSerializer()
+    encoder = ConstellationPatchEncoder()
+    count, total_bytes, elapsed = 0, 0, 0.0
+    for event in events(build(tasks, parents, seed)):
+        start = time.perf_counter()
+        event_data = serializer.serialize_event(event)
+        if mode == "patch":
+            event_data = encoder.encode_event(event_data)
+        message = json.dumps(event_data, separators=(",", ":"), ensure_ascii=False)
+        elapsed += time.perf_counter() - start
+        count += 1
+        total_bytes += len(message.encode("utf-8"))
+    return count, total_bytes, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--parents", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{args.tasks} tasks, up to {args.parents} dependencies per task")
+    print(
+        f"{'mode':<8}{'events':>8}{'total (MB)':>12}{'per event (KB)':>16}"
+        f"{'encode per event (ms)':>23}"
+    )
+    for mode in ("full", "patch"):
+        count, total_bytes, elapsed = run(mode, args.tasks, args.parents, args.seed)
+        print(
+            f"{mode:<8}{count:>8}{total_bytes / 2**20:>12.2f}"
+            f"{total_bytes / count / 1024:>16.2f}{elapsed / count * 1000:>23.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Local stub of the OpenAI-compatible and Anthropic chat APIs, answering every request
+with a fixed completion after a configurable latency. Used by the async LLM service
+tests and by tests/benchmarks/benchmark_llm_service.py.
+
+Like a model without structured output support, it rejects json_schema response
+formats, so the startup probe of the OpenAI services falls back to text mode.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+
+class _ThreadingServer(ThreadingHTTPServer):
+    # Accept bursts of concurrent connections (the default backlog is 5)
+    request_queue_size = 256
+    daemon_threads = True
+
+
+class LLMStubServer:
+    """
+    Stub LLM HTTP server running in a background thread.
+    """
+
+    def __init__(self, latency: float = 0.05, response_text: str = '{"ok": true}'):
+        """
+        Initialize the stub server.
+        :param latency: The time (seconds) spent on each completion request.
+        :param response_text: The completion returned for every request.
+        """
+        self.latency = latency
+        self.response_text = response_text
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = _ThreadingServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """
+        The base URL of the server.
+        """
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self) -> "LLMStubServer":
+        """
+        Start serving in the background.
+        :return: The server.
+        """
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop the server.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_stats(self) -> None:
+        """
+        Reset the request statistics.
+        """
+        with self._lock:
+            self.requests = 0
+            self.max_in_flight = 0
+            self.connections = 0
+
+    def __enter__(self) -> "LLMStubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _complete(self) -> None:
+        """
+        Simulate the latency of a completion, tracking the concurrent requests.
+        """
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _make_handler(self) -> type:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+
+                if self.path.endswith("/chat/completions"):
+                    response_format = body.get("response_format") or {}
+                    if response_format.get("type") == "json_schema":
+                        self._send_json(
+                            400,
+                            {
+                                "error": {
+                                    "message": "'response_format' of type 'json_schema' is not supported with this model",
+                                    "type": "invalid_request_error",
+                                }
+                            },
+                        )
+                        return
+                    stub._complete()
+                    if body.get("stream"):
+                        self._send_chat_stream(body)
+                    else:
+                        self._send_json(200, self._chat_completion(body))
+                elif self.path.endswith("/messages"):
+                    stub._complete()
+                    self._send_json(200, self._anthropic_message(body))
+                else:
+                    self._send_json(404, {"error": {"message": "Not found"}})
+
+            def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_chat_stream(self, body: Dict[str, Any]) -> None:
+                chunks = [
+                    {"choices": [{"index": 0, "delta": {"content": stub.response_text}}]},
+                    {
+                        "choices": [],
+                        "usage": {
+                            "prompt_tokens": 10,
+                            "completion_tokens": 5,
+                            "total_tokens": 15,
+                        },
+                    },
+                ]
+                events = "".join(
+                    "data: "
+                    + json.dumps(
+                        {
+                            "id": "chatcmpl-stub",
+                            "object": "chat.completion.chunk",
+                            "created": 0,
+                            "model": body.get("model", "stub"),
+                            **chunk,
+                        }
+                    )
+                    + "\n\n"
+                    for chunk in chunks
+                )
+                data = (events + "data: [DONE]\n\n").encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            @staticmethod
+            def _chat_completion(body: Dict[str, Any]) -> Dict[str, Any]:
+                return {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": body.get("model", "stub"),
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {
+                                "role": "assistant",
+                                "content": stub.response_text,
+                            },
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {
+                        "prompt_tokens": 10,
+                        "completion_tokens": 5,
+                        "total_tokens": 15,
+                    },
+                }
+
+            @staticmethod
+            def _anthropic_message(body: Dict[str, Any]) -> Dict[str, Any]:
+                return {
+                    "id": "msg_stub",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": body.get("model", "stub"),
+                    "content": [{"type": "text", "text": stub.response_text}],
+                    "stop_reason": "end_turn",
+                    "stop_sequence": None,
+                    "usage": {"input_tokens": 10, "output_tokens": 5},
+                }
+
+        return Handler
@@ -0,0 +1,154 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test the async LLM service layer against a local stub LLM server: completions through
+the async clients, the per-endpoint concurrency limit and connection reuse.
+"""
+
+import asyncio
+import threading
+import types
+
+import pytest
+
+from tests.integration.llm_stub_server import LLMStubServer
+from ufo.llm.base import BaseService
+from ufo.llm.claude import ClaudeService
+from ufo.llm.connection_pool import close_async_http_client
+from ufo.llm.ollama import OllamaService
+from ufo.llm.openai import OpenAIService
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    with LLMStubServer(latency=0.05, response_text='{"Status": "FINISH"}') as server:
+        yield server
+
+
+def make_config(api_type: str, api_base: str, **agent_config) -> dict:
+    return {
+        "APP_AGENT": {
+            "API_TYPE": api_type,
+            "API_BASE": api_base,
+            "API_KEY": "stub-key",
+            "API_MODEL": "stub-model",
+            **agent_config,
+        },
+        "MAX_RETRY": 1,
+        "TIMEOUT": 10,
+        "PRICES": {"openai/stub-model": {"input": 1.0, "output": 2.0}},
+        "TEMPERATURE": 0.0,
+        "TOP_P": 0.0,
+        "MAX_TOKENS": 100,
+    }
+
+
+class ThreadService(BaseService):
+    """Service without an async client, using the default achat_completion."""
+
+    def __init__(self, config, agent_type):
+        self.config_llm = config[agent_type]
+        self.threads = set()
+
+    def chat_completion(self, messages, n=1, **kwargs):
+        self.threads.add(threading.get_ident())
+        return ["thread"], 0.0
+
+
+class TestAsyncLLMService:
+    """Test achat_completion of the LLM services."""
+
+    @pytest.mark.asyncio
+    async def test_openai_achat_completion(self, stub_server):
+        """Test that the OpenAI service completes through the async client."""
+        service = OpenAIService(make_config("openai", stub_server.url), "APP_AGENT")
+        try:
+            responses, cost = await service.achat_completion(
+                [{"role": "user", "content": "Hello"}], 1
+            )
+        finally:
+            await close_async_http_client()
+
+        assert responses == ['{"Status": "FINISH"}']
+        assert cost == pytest.approx((10 * 1.0 + 5 * 2.0) / 1000)
+
+    @pytest.mark.asyncio
+    async def test_ollama_and_claude_achat_completion(self, stub_server):
+        """Test the async completions of the Ollama and Claude services."""
+        ollama = OllamaService(make_config("ollama", stub_server.url), "APP_AGENT")
+        claude = ClaudeService(make_config("claude", stub_server.url), "APP_AGENT")
+        messages = [
+            {"role": "system", "content": "You are a stub."},
+            {"role": "user", "content": [{"type": "text", "text": "Hello"}]},
+        ]
+        try:
+            ollama_responses, _ = await ollama.achat_completion(messages, 1)
+            claude_responses, _ = await claude.achat_completion(messages, 1)
+        finally:
+            await close_async_http_client()
+
+        assert ollama_responses == ['{"Status": "FINISH"}']
+        assert claude_responses == ['{"Status": "FINISH"}']
+
+    @pytest.mark.asyncio
+    async def test_claude_achat_completion_raises_after_retries(self, monkeypatch):
+        """Test that a Claude completion failing MAX_RETRY times raises instead of returning []."""
+        attempts = []
+
+        async def create(**kwargs):
+            attempts.append(kwargs)
+            raise ConnectionError("unreachable")
+
+        async def no_sleep(delay):
+            pass
+
+        config = make_config("claude", "http://stub")
+        config["MAX_RETRY"] = 2
+        claude = ClaudeService(config, "APP_AGENT")
+        client = types.SimpleNamespace(messages=types.SimpleNamespace(create=create))
+        monkeypatch.setattr(claude, "_create_async_client", lambda: client)
+        monkeypatch.setattr(asyncio, "sleep", no_sleep)
+        try:
+            with pytest.raises(ConnectionError):
+                await claude.achat_completion(
+                    [{"role": "user", "content": [{"type": "text", "text": "Hi"}]}], 1
+                )
+        finally:
+            await close_async_http_client()
+
+        assert len(attempts) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_and_connection_reuse(self, stub_server):
+        """Test that in-flight requests per endpoint are bounded and connections are pooled."""
+        service = OpenAIService(
+            make_config("openai", stub_server.url, MAX_CONCURRENT_REQUESTS=3),
+            "APP_AGENT",
+        )
+        stub_server.reset_stats()
+        try:
+            results = await asyncio.gather(
+                *(
+                    service.achat_completion([{"role": "user", "content": "Hi"}], 1)
+                    for _ in range(12)
+                )
+            )
+        finally:
+            await close_async_http_client()
+
+        assert len(results) == 12
+        assert stub_server.requests == 12
+        assert stub_server.max_in_flight == 3
+        # Connections are kept alive and reused across requests
+        assert stub_server.connections <= 3
+
+    @pytest.mark.asyncio
+    async def test_default_achat_completion_runs_in_thread(self):
+        """Test that services without an async client run chat_completion in a worker thread."""
+        service = ThreadService(make_config("custom", "http://stub"), "APP_AGENT")
+
+        responses, _ = await service.achat_completion([], 1)
+
+        assert responses == ["thread"]
+        assert threading.get_ident() not in service.threads
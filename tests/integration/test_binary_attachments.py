@@ -0,0 +1,262 @@
+"""
+Unit Tests for Binary Attachments
+
+Tests that large data URLs in command results are sent as binary frames and
+reassembled by the server-side command dispatcher.
+"""
+
+import asyncio
+import base64
+import json
+import os
+from typing import List, Union
+
+import pytest
+
+from aip.messages import (
+    ClientCapability,
+    ClientMessage,
+    Result,
+    ResultStatus,
+)
+from aip.protocol.attachments import (
+    ATTACHMENT_URI_PREFIX,
+    AttachmentStore,
+    extract_attachments,
+    parse_binary_metadata,
+    resolve_attachments,
+)
+from aip.protocol.compression import DeflateCompressor
+from aip.protocol.task_execution import TaskExecutionProtocol
+from aip.transport.base import TransportState
+from ufo.module.dispatcher import WebSocketCommandDispatcher
+
+
+class RecordingTransport:
+    """Transport recording the frames sent through it."""
+
+    def __init__(self):
+        self.frames: List[Union[str, bytes]] = []
+        self.state = TransportState.CONNECTED
+
+    @property
+    def is_connected(self) -> bool:
+        return True
+
+    async def send(self, data: bytes) -> None:
+        self.frames.append(data.decode("utf-8"))
+
+    async def send_binary(self, data: bytes) -> None:
+        self.frames.append(bytes(data))
+
+
+class YieldingTransport(RecordingTransport):
+    """Transport yielding to the event loop before each frame, as a socket write may."""
+
+    async def send(self, data: bytes) -> None:
+        await asyncio.sleep(0)
+        await super().send(data)
+
+    async def send_binary(self, data: bytes) -> None:
+        await asyncio.sleep(0)
+        await super().send_binary(data)
+
+
+class StubSession:
+    """Minimal session for the command dispatcher."""
+
+    id = "session"
+    task = "task"
+
+
+def make_data_url(size: int = 64 * 1024) -> str:
+    return "data:image/png;base64," + base64.b64encode(os.urandom(size)).decode()
+
+
+def make_results(screenshot: str) -> List[Result]:
+    return [
+        Result(status=ResultStatus.SUCCESS, result=screenshot, call_id="1"),
+        Result(
+            status=ResultStatus.SUCCESS,
+            result=[{"status": "success", "result": screenshot}, {"name": "x"}],
+            call_id="2",
+        ),
+        Result(status=ResultStatus.SUCCESS, result="small", call_id="3"),
+    ]
+
+
+def receive_frames(frames, protocol) -> ClientMessage:
+    """Replay frames the way the server WebSocket loop does."""
+    return receive_all_frames(frames, protocol)[-1]
+
+
+def receive_all_frames(frames, protocol) -> List[ClientMessage]:
+    """Replay frames the way the server WebSocket loop does, returning all messages."""
+    metadata = None
+    messages = []
+    for frame in frames:
+        if isinstance(frame, bytes):
+            if metadata is not None:
+                protocol.store_attachment(metadata, frame)
+                metadata = None
+            else:
+                messages.append(protocol.decode_message(frame, ClientMessage))
+            continue
+        parsed = parse_binary_metadata(frame)
+        if parsed is not None:
+            metadata = parsed
+        else:
+            messages.append(ClientMessage.model_validate_json(frame))
+    return messages
+
+
+class TestAttachmentHelpers:
+    """Test the attachment extraction and resolution helpers"""
+
+    def test_round_trip(self):
+        """Test that extracted data URLs are restored unchanged"""
+        screenshot = make_data_url()
+        payload = {"a": screenshot, "b": [screenshot, "short"], "c": 1}
+
+        extracted, attachments = extract_attachments(payload)
+        assert len(attachments) == 2
+        assert extracted["a"].startswith(ATTACHMENT_URI_PREFIX)
+        assert extracted["b"][1] == "short"
+        assert payload["a"] == screenshot
+
+        store = AttachmentStore()
+        for attachment in attachments:
+            store.add(
+                {
+                    "attachment_id": attachment.attachment_id,
+                    "mime_type": attachment.mime_type,
+                    "size": len(attachment.data),
+                },
+                attachment.data,
+            )
+
+        resolved, missing = resolve_attachments(extracted, store)
+        assert resolved == payload
+        assert missing == []
+        assert len(store) == 0
+
+    def test_small_and_invalid_strings_stay_inline(self):
+        """Test that small data URLs and non-base64 strings are not extracted"""
+        payload = ["data:image/png;base64,AAAA", "x" * 20000, "data:image/png;base64," + "!" * 20000]
+        extracted, attachments = extract_attachments(payload)
+
+        assert extracted == payload
+        assert attachments == []
+
+    def test_store_is_bounded(self):
+        """Test that unclaimed attachments are evicted oldest first"""
+        store = AttachmentStore(max_attachments=2)
+        for attachment_id in ["a", "b", "c"]:
+            store.add({"attachment_id": attachment_id}, b"data")
+
+        assert len(store) == 2
+        assert store.pop("a") is None
+        assert store.pop("c").data == b"data"
+
+    def test_size_mismatch_is_rejected(self):
+        """Test that truncated frames are not stored"""
+        store = AttachmentStore()
+        assert store.add({"attachment_id": "a", "size": 10}, b"data") is None
+        assert len(store) == 0
+
+
+class TestBinaryCommandResults:
+    """Test sending command results with binary attachments end to end"""
+
+    @pytest.mark.asyncio
+    async def test_results_are_reassembled_in_set_result(self):
+        """Test that screenshots travel as binary frames and are reassembled"""
+        screenshot = make_data_url()
+        client_transport = RecordingTransport()
+        client_protocol = TaskExecutionProtocol(client_transport)
+        client_protocol.peer_capabilities = {
+            ClientCapability.BINARY_ATTACHMENTS.value
+        }
+
+        await client_protocol.send_command_results(
+            make_results(screenshot), "session", "client", "response"
+        )
+
+        binary_frames = [f for f in client_transport.frames if isinstance(f, bytes)]
+        text_frames = [f for f in client_transport.frames if isinstance(f, str)]
+        assert len(binary_frames) == 2
+        assert all(len(frame) < len(screenshot) for frame in binary_frames)
+        assert screenshot not in text_frames[-1]
+        assert json.loads(text_frames[-1])["type"] == "command_results"
+
+        server_protocol = TaskExecutionProtocol(RecordingTransport())
+        message = receive_frames(client_transport.frames, server_protocol)
+
+        dispatcher = WebSocketCommandDispatcher(StubSession(), server_protocol)
+        future = asyncio.get_running_loop().create_future()
+        dispatcher.pending["response"] = future
+        await dispatcher.set_result("response", message)
+
+        results = future.result()
+        assert results[0].result == screenshot
+        assert results[1].result[0]["result"] == screenshot
+        assert results[2].result == "small"
+        assert len(server_protocol.attachment_store) == 0
+
+    @pytest.mark.asyncio
+    async def test_compressed_messages_do_not_split_attachments(self):
+        """Test that binary messages sent concurrently never land inside an attachment"""
+        screenshot = make_data_url()
+        transport = YieldingTransport()
+        attachment_protocol = TaskExecutionProtocol(transport)
+        attachment_protocol.peer_capabilities = {
+            ClientCapability.BINARY_ATTACHMENTS.value
+        }
+        # Another protocol on the same connection, sending compressed binary frames
+        compressed_protocol = TaskExecutionProtocol(transport)
+        compressed_protocol.set_compression(DeflateCompressor(), threshold=1024)
+
+        await asyncio.gather(
+            attachment_protocol.send_command_results(
+                make_results(screenshot), "session", "client", "with_attachments"
+            ),
+            *(
+                compressed_protocol.send_command_results(
+                    make_results(screenshot), "session", "client", f"compressed_{i}"
+                )
+                for i in range(3)
+            ),
+        )
+
+        server_protocol = TaskExecutionProtocol(RecordingTransport())
+        server_protocol.set_compression(DeflateCompressor())
+        messages = receive_all_frames(transport.frames, server_protocol)
+
+        assert sorted(message.prev_response_id for message in messages) == [
+            "compressed_0",
+            "compressed_1",
+            "compressed_2",
+            "with_attachments",
+        ]
+        for message in messages:
+            results = server_protocol.resolve_attachments(
+                [result.model_dump() for result in message.action_results]
+            )
+            assert results[0]["result"] == screenshot
+            assert results[1]["result"][0]["result"] == screenshot
+        assert len(server_protocol.attachment_store) == 0
+
+    @pytest.mark.asyncio
+    async def test_inline_without_server_capability(self):
+        """Test that results stay inline if the server did not confirm support"""
+        screenshot = make_data_url()
+        transport = RecordingTransport()
+        protocol = TaskExecutionProtocol(transport)
+
+        await protocol.send_command_results(
+            make_results(screenshot), "session", "client", "response"
+        )
+
+        assert len(transport.frames) == 1
+        message = ClientMessage.model_validate_json(transport.frames[0])
+        assert message.action_results[0].result == screenshot
@@ -337,6 +337,31 @@ class RoleSpoofRejectionTests(unittest.TestCase):
         )
 
 
+    def test_bytes_message_without_protocol_is_decoded_as_json(self) -> None:
+        """Bytes messages decode as JSON when no protocol is bound."""
+        del self.handler.task_protocol
+        legit = ClientMessage(
+            type=ClientMessageType.TASK,
+            status=TaskStatus.OK,
+            client_type=ClientType.DEVICE,
+            client_id="attacker-device",
+            request="bytes request",
+            task_name="bytes-task",
+            session_id="session-bytes",
+        )
+
+        _run(
+            self.handler.handle_message(
+                legit.model_dump_json().encode("utf-8"),
+                registered_client_id="attacker-device",
+                registered_client_type=ClientType.DEVICE,
+            )
+        )
+
+        self.assertEqual(len(self.session_manager.calls), 1)
+        self.assertEqual(self.session_manager.calls[0]["task_name"], "bytes-task")
+
+
 class DuplicateClientRegistrationTests(unittest.TestCase):
     """``add_client`` must not silently overwrite a live client entry."""
 
@@ -0,0 +1,187 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test the scheduling indexes of TaskConstellation: the ready tasks maintained as tasks
+complete, the dependency indexes, and the cycle checks on them.
+"""
+
+import random
+
+import pytest
+
+from galaxy.constellation import TaskConstellation, TaskStar, TaskStarLine
+from galaxy.constellation.editor.constellation_editor import ConstellationEditor
+from galaxy.constellation.enums import TaskPriority, TaskStatus
+
+
+def scan_ready_tasks(constellation):
+    """The ready tasks found by scanning every task and dependency."""
+    ready = []
+    for task in constellation.get_all_tasks():
+        if not task.is_ready_to_execute:
+            continue
+        prerequisites = [
+            constellation.get_task(dep.from_task_id)
+            for dep in constellation.get_all_dependencies()
+            if dep.to_task_id == task.task_id
+        ]
+        if all(p is not None and p.is_terminal for p in prerequisites):
+            ready.append(task)
+    ready.sort(key=lambda t: t.priority.value, reverse=True)
+    return [task.task_id for task in ready]
+
+
+def random_constellation(tasks, seed, max_parents=3):
+    """A random DAG whose edges go from lower to higher task numbers."""
+    rng = random.Random(seed)
+    constellation = TaskConstellation(name="random")
+    for i in range(tasks):
+        constellation.add_task(
+            TaskStar(
+                task_id=f"t{i}",
+                description=f"Task {i}",
+                priority=rng.choice(list(TaskPriority)),
+            )
+        )
+    for i in range(1, tasks):
+        for parent in rng.sample(range(i), min(i, rng.randint(0, max_parents))):
+            constellation.add_dependency(
+                TaskStarLine.create_unconditional(f"t{parent}", f"t{i}")
+            )
+    return constellation
+
+
+class TestReadyTasks:
+    """Test that the maintained ready tasks match a full scan."""
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_execution_matches_scan(self, seed):
+        """Test the ready tasks and their order at every step of an execution."""
+        constellation = random_constellation(60, seed)
+        rng = random.Random(seed)
+        completed = 0
+
+        while not constellation.is_complete():
+            ready = [task.task_id for task in constellation.get_ready_tasks()]
+            assert ready == scan_ready_tasks(constellation)
+
+            task_id = rng.choice(ready)
+            constellation.start_task(task_id)
+            newly_ready = constellation.mark_task_completed(task_id, success=True)
+            completed += 1
+
+            assert set(t.task_id for t in newly_ready) <= set(
+                scan_ready_tasks(constellation)
+            )
+
+        assert completed == 60
+        assert constellation.get_ready_tasks() == []
+
+    def test_started_and_failed_tasks(self):
+        """Test that started tasks leave the ready tasks, and failures release dependents."""
+        constellation = TaskConstellation()
+        for task_id in ("a", "b", "c"):
+            constellation.add_task(TaskStar(task_id=task_id, description=task_id))
+        constellation.add_dependency(TaskStarLine.create_unconditional("a", "c"))
+        constellation.add_dependency(TaskStarLine.create_success_only("b", "c"))
+
+        assert [t.task_id for t in constellation.get_ready_tasks()] == ["a", "b"]
+
+        # Started outside the constellation, as the orchestrator does
+        constellation.get_task("a").start_execution()
+        assert [t.task_id for t in constellation.get_ready_tasks()] == ["b"]
+
+        assert constellation.mark_task_completed("a", success=False) == []
+        assert [t.task_id for t in constellation.get_ready_tasks()] == ["b"]
+
+        newly_ready = constellation.mark_task_completed(
+            "b", success=True, result="done"
+        )
+        assert [t.task_id for t in newly_ready] == ["c"]
+        assert [t.task_id for t in constellation.get_ready_tasks()] == ["c"]
+
+    def test_structure_changes(self):
+        """Test the ready tasks after removing and adding tasks and dependencies."""
+        constellation = TaskConstellation()
+        for task_id in ("a", "b", "c"):
+            constellation.add_task(TaskStar(task_id=task_id, description=task_id))
+        line = TaskStarLine.create_unconditional("a", "b")
+        constellation.add_dependency(line)
+        constellation.add_dependency(TaskStarLine.create_unconditional("b", "c"))
+
+        assert [t.task_id for t in constellation.get_ready_tasks()] == ["a"]
+
+        constellation.remove_dependency(line.line_id)
+        constellation.get_task("c").priority = TaskPriority.HIGH
+        assert [t.task_id for t in constellation.get_ready_tasks()] == ["a", "b"]
+
+        constellation.remove_task("b")
+        assert [t.task_id for t in constellation.get_ready_tasks()] == ["c", "a"]
+        assert constellation.get_task_dependencies("c") == []
+
+        # Re-added tasks come after the others of the same priority
+        constellation.add_task(TaskStar(task_id="b", description="b"))
+        constellation.add_task(TaskStar(task_id="d", description="d"))
+        constellation.add_dependency(TaskStarLine.create_unconditional("d", "a"))
+        assert [t.task_id for t in constellation.get_ready_tasks()] == ["c", "b", "d"]
+        assert constellation.get_ready_tasks() == constellation.get_ready_tasks()
+
+    def test_loaded_and_restored_constellations(self):
+        """Test the indexes of constellations loaded from a dict or restored by undo."""
+        constellation = random_constellation(20, seed=7)
+        for task_id in scan_ready_tasks(constellation)[:2]:
+            constellation.start_task(task_id)
+            constellation.mark_task_completed(task_id, success=True)
+
+        loaded = TaskConstellation.from_dict(constellation.to_dict())
+        assert [t.task_id for t in loaded.get_ready_tasks()] == scan_ready_tasks(
+            constellation
+        )
+        assert len(loaded.get_task_dependencies("t19")) == len(
+            constellation.get_task_dependencies("t19")
+        )
+
+        editor = ConstellationEditor(loaded)
+        ready = [t.task_id for t in loaded.get_ready_tasks()]
+        editor.remove_task(ready[0])
+        editor.undo()
+        assert [t.task_id for t in loaded.get_ready_tasks()] == ready
+
+
+class TestCycleCheck:
+    """Test the cycle checks of add_dependency."""
+
+    def test_cycles_rejected(self):
+        """Test that self loops and back edges are rejected, and diamonds accepted."""
+        constellation = TaskConstellation()
+        for i in range(5):
+            constellation.add_task(TaskStar(task_id=f"t{i}", description=f"t{i}"))
+        for i in range(4):
+            constellation.add_dependency(
+                TaskStarLine.create_unconditional(f"t{i}", f"t{i + 1}")
+            )
+        constellation.add_dependency(TaskStarLine.create_unconditional("t0", "t3"))
+
+        with pytest.raises(ValueError, match="cycle"):
+            constellation.add_dependency(TaskStarLine.create_unconditional("t4", "t0"))
+        with pytest.raises(ValueError, match="cycle"):
+            constellation.add_dependency(TaskStarLine.create_unconditional("t2", "t2"))
+        assert constellation.dependency_count == 5
+        assert not constellation.has_cycle()
+
+    def test_deep_chain(self):
+        """Test that the check does not recurse, on a chain deeper than the recursion limit."""
+        constellation = TaskConstellation()
+        for i in range(1500):
+            constellation.add_task(TaskStar(task_id=f"t{i}", description=f"t{i}"))
+            if i:
+                constellation.add_dependency(
+                    TaskStarLine.create_unconditional(f"t{i - 1}", f"t{i}")
+                )
+
+        assert constellation.get_task("t1").status == TaskStatus.PENDING
+        with pytest.raises(ValueError, match="cycle"):
+            constellation.add_dependency(
+                TaskStarLine.create_unconditional("t1499", "t0")
+            )
@@ -0,0 +1,180 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test the event-driven execution loop of TaskConstellationOrchestrator: dispatch on
+task completion and on modifications, the scheduling latency metrics, and the merge
+of the dispatched tasks only.
+"""
+
+import asyncio
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from galaxy.constellation import TaskConstellation, TaskStar, TaskStarLine
+from galaxy.constellation.enums import TaskStatus
+from galaxy.constellation.orchestrator.orchestrator import TaskConstellationOrchestrator
+from galaxy.core.events import ConstellationEvent, EventBus, EventType
+from galaxy.core.types import ExecutionResult
+from galaxy.session.observers.constellation_sync_observer import (
+    ConstellationModificationSynchronizer,
+)
+
+
+class StubDeviceManager:
+    """Device manager running each task for a while, failing the tasks asked to."""
+
+    def __init__(self, duration=0.05, failing=()):
+        self.duration = duration
+        self.failing = set(failing)
+
+    def get_all_devices(self):
+        return {"device_1": object()}
+
+    async def assign_task_to_device(self, task_id, device_id, **kwargs):
+        await asyncio.sleep(self.duration)
+        if task_id in self.failing:
+            return ExecutionResult(task_id=task_id, status="failed", error="failed")
+        return ExecutionResult(task_id=task_id, status="completed", result="done")
+
+
+def make_constellation(task_ids, edges, create_line=TaskStarLine.create_unconditional):
+    constellation = TaskConstellation(name="event loop")
+    for task_id in task_ids:
+        constellation.add_task(
+            TaskStar(task_id=task_id, description=task_id, target_device_id="device_1")
+        )
+    lines = [create_line(from_id, to_id) for from_id, to_id in edges]
+    for line in lines:
+        constellation.add_dependency(line)
+    return constellation, lines
+
+
+class TestEventDrivenLoop:
+    """Test that the loop reacts to events instead of polling."""
+
+    @pytest.mark.asyncio
+    async def test_dependents_dispatched_on_completion(self):
+        """Test that dependents are dispatched as soon as their dependencies finish."""
+        constellation, _ = make_constellation(
+            ["a", "b", "c", "d"], [("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")]
+        )
+        orchestrator = TaskConstellationOrchestrator(
+            StubDeviceManager(), event_bus=EventBus()
+        )
+        tasks = constellation.get_all_tasks()
+
+        result = await asyncio.wait_for(
+            orchestrator.orchestrate_constellation(constellation), 5
+        )
+
+        assert all(task.status == TaskStatus.COMPLETED for task in tasks)
+        latency = result["scheduling_latency"]
+        assert latency == orchestrator.get_scheduling_metrics(
+            constellation.constellation_id
+        )
+        assert latency["dispatched_tasks"] == 4
+        assert latency["max_latency"] < 0.05
+        assert not orchestrator._execution_tasks
+
+    @pytest.mark.asyncio
+    async def test_idle_loop_wakes_on_modification(self):
+        """Test that a blocked loop sleeps until a modification frees a task."""
+        constellation, [line] = make_constellation(
+            ["a", "b"], [("a", "b")], TaskStarLine.create_success_only
+        )
+        orchestrator = TaskConstellationOrchestrator(
+            StubDeviceManager(failing={"a"}), event_bus=EventBus()
+        )
+
+        iterations = 0
+        sync = orchestrator._sync_constellation_modifications
+
+        async def counting_sync(constellation):
+            nonlocal iterations
+            iterations += 1
+            return await sync(constellation)
+
+        orchestrator._sync_constellation_modifications = counting_sync
+        run = asyncio.create_task(orchestrator.orchestrate_constellation(constellation))
+        try:
+            while constellation.get_task("a").status != TaskStatus.FAILED:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.05)
+
+            # b is blocked by the failure of a: no iteration until woken
+            idle_iterations = iterations
+            await asyncio.sleep(0.3)
+            assert iterations == idle_iterations
+
+            constellation.remove_dependency(line.line_id)
+            orchestrator.notify_constellation_modified()
+            await asyncio.wait_for(run, 5)
+        finally:
+            run.cancel()
+            await asyncio.gather(run, return_exceptions=True)
+
+        assert constellation.get_task("b").status == TaskStatus.COMPLETED
+        latency = orchestrator.get_scheduling_metrics(constellation.constellation_id)
+        assert latency["dispatched_tasks"] == 2
+        assert latency["max_latency"] < 0.05
+
+
+class TestSynchronizerMerge:
+    """Test the merge of execution states into agent modifications."""
+
+    def test_merge_only_given_tasks(self):
+        """Test that only the given tasks are merged, and nothing without a new copy."""
+        orchestrator_constellation, _ = make_constellation(["x", "y"], [])
+        synchronizer = ConstellationModificationSynchronizer(Mock())
+
+        # Without a modification, the constellation is its own copy
+        synchronizer._current_constellation = orchestrator_constellation
+        assert (
+            synchronizer.merge_and_sync_constellation_states(
+                orchestrator_constellation, task_ids={"x"}
+            )
+            is orchestrator_constellation
+        )
+
+        agent_constellation = TaskConstellation.from_dict(
+            orchestrator_constellation.to_dict()
+        )
+        synchronizer._current_constellation = agent_constellation
+        for task_id in ("x", "y"):
+            orchestrator_constellation.start_task(task_id)
+
+        merged = synchronizer.merge_and_sync_constellation_states(
+            orchestrator_constellation, task_ids={"x"}
+        )
+
+        assert merged is agent_constellation
+        assert merged.get_task("x").status == TaskStatus.RUNNING
+        assert merged.get_task("y").status == TaskStatus.PENDING
+
+        # Without task IDs, every task is merged
+        merged = synchronizer.merge_and_sync_constellation_states(
+            TaskConstellation.from_dict(orchestrator_constellation.to_dict())
+        )
+        assert merged.get_task("y").status == TaskStatus.RUNNING
+
+    @pytest.mark.asyncio
+    async def test_modification_wakes_orchestrator(self):
+        """Test that a modification event wakes the orchestrator loop."""
+        orchestrator = Mock()
+        synchronizer = ConstellationModificationSynchronizer(orchestrator)
+
+        await synchronizer.on_event(
+            ConstellationEvent(
+                event_type=EventType.CONSTELLATION_MODIFIED,
+                source_id="agent",
+                timestamp=time.time(),
+                data={"on_task_id": ["x"]},
+                constellation_id="constellation",
+                constellation_state="executing",
+            )
+        )
+
+        orchestrator.notify_constellation_modified.assert_called_once()
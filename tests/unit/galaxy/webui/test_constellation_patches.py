@@ -0,0 +1,239 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test the versioned constellation updates of the Web UI: snapshots and patches
+reconstructing each version, the snapshots on connect, and the resync requests.
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from galaxy.constellation import TaskConstellation, TaskStar, TaskStarLine
+from galaxy.core.events import ConstellationEvent, EventType
+from galaxy.webui.constellation_patches import ConstellationPatchEncoder
+from galaxy.webui.handlers import WebSocketMessageHandler
+from galaxy.webui.websocket_observer import EventSerializer, WebSocketObserver
+
+
+class StubWebSocket:
+    """WebSocket recording the messages sent."""
+
+    def __init__(self):
+        self.client = ("127.0.0.1", 0)
+        self.messages = []
+
+    async def send_text(self, message):
+        self.messages.append(json.loads(message))
+
+    async def send_json(self, message):
+        self.messages.append(message)
+
+
+class PatchClient:
+    """Applies versioned constellations as the Web UI store does."""
+
+    def __init__(self):
+        self.versions = {}
+        self.gaps = []
+
+    def resolve(self, payload):
+        constellation_id = payload["constellation_id"]
+        seq, snapshot = self.versions.get(constellation_id, (0, None))
+        if payload["encoding"] == "snapshot":
+            if payload["seq"] >= seq:
+                self.versions[constellation_id] = (
+                    payload["seq"],
+                    payload["constellation"],
+                )
+        elif snapshot is not None and payload["seq"] == seq + 1:
+            self.versions[constellation_id] = (
+                payload["seq"],
+                ConstellationPatchEncoder.apply_patch(snapshot, payload["ops"]),
+            )
+        elif payload["seq"] > seq:
+            self.gaps.append(constellation_id)
+            return None
+        return self.versions[constellation_id][1]
+
+
+def make_constellation(tasks=20):
+    constellation = TaskConstellation(name="patches")
+    for i in range(tasks):
+        constellation.add_task(
+            TaskStar(task_id=f"t{i}", description=f"Task {i}", tips=[f"tip {i}"])
+        )
+        if i:
+            constellation.add_dependency(
+                TaskStarLine.create_unconditional(f"t{i - 1}", f"t{i}")
+            )
+    return constellation
+
+
+def full_version(serializer, constellation):
+    """The constellation as a full update would send it."""
+    return json.loads(json.dumps(serializer.serialize_value(constellation)))
+
+
+def modified_event(constellation):
+    return ConstellationEvent(
+        event_type=EventType.CONSTELLATION_MODIFIED,
+        source_id="agent",
+        timestamp=time.time(),
+        data={"new_constellation": constellation, "on_task_id": []},
+        constellation_id=constellation.constellation_id,
+        constellation_state="executing",
+    )
+
+
+async def drain():
+    """Let the sender tasks run until they block."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestPatchEncoder:
+    """Test that the versions sent reconstruct the constellation."""
+
+    def test_patches_reconstruct_each_version(self):
+        """Test a snapshot, then patches for status and structure changes."""
+        serializer = EventSerializer()
+        encoder = ConstellationPatchEncoder()
+        client = PatchClient()
+        constellation = make_constellation()
+
+        def send():
+            payload = encoder.encode(serializer.serialize_value(constellation))
+            assert client.resolve(payload) == full_version(serializer, constellation)
+            return payload
+
+        snapshot = send()
+        assert (snapshot["encoding"], snapshot["seq"]) == ("snapshot", 1)
+
+        constellation.start_task("t0")
+        patch = send()
+        assert (patch["encoding"], patch["seq"]) == ("patch", 2)
+        assert {op["path"] for op in patch["ops"]} >= {"/tasks/t0/status"}
+        assert len(json.dumps(patch)) * 5 < len(json.dumps(snapshot))
+
+        constellation.mark_task_completed("t0", success=True, result="done")
+        constellation.get_task("t1").tips.append("new tip")
+        send()
+
+        constellation.remove_task("t19")
+        constellation.add_task(TaskStar(task_id="a/b~c", description="escaped"))
+        constellation.add_dependency(
+            TaskStarLine.create_unconditional("t5", "a/b~c")
+        )
+        patch = send()
+        assert {"op": "remove", "path": "/tasks/t19"} in patch["ops"]
+        assert encoder.get_snapshot(constellation.constellation_id)["seq"] == 4
+
+    def test_gap_detected(self):
+        """Test that a missed patch is detected instead of applied."""
+        serializer = EventSerializer()
+        encoder = ConstellationPatchEncoder()
+        client = PatchClient()
+        constellation = make_constellation(3)
+
+        client.resolve(encoder.encode(serializer.serialize_value(constellation)))
+        constellation.start_task("t0")
+        encoder.encode(serializer.serialize_value(constellation))
+        constellation.mark_task_completed("t0", success=True)
+
+        patch = encoder.encode(serializer.serialize_value(constellation))
+        assert client.resolve(patch) is None
+        assert client.gaps == [constellation.constellation_id]
+
+        snapshot = encoder.get_snapshot(constellation.constellation_id)
+        assert client.resolve(snapshot) == full_version(serializer, constellation)
+
+
+class TestPatchUpdates:
+    """Test the patch updates of WebSocketObserver and the resync requests."""
+
+    @pytest.mark.asyncio
+    async def test_patch_and_full_clients(self):
+        """Test that patch clients rebuild what full clients receive."""
+        observer = WebSocketObserver()
+        full, patched = StubWebSocket(), StubWebSocket()
+        observer.add_connection(full)
+        observer.add_connection(patched, patch_updates=True)
+        client = PatchClient()
+        constellation = make_constellation()
+
+        # Drained after each event, so that the full client does not coalesce them
+        for task_id in ("t0", "t1"):
+            constellation.start_task(task_id)
+            await observer.on_event(modified_event(constellation))
+            await drain()
+            constellation.mark_task_completed(task_id, success=True)
+            await observer.on_event(modified_event(constellation))
+            await drain()
+
+        assert len(full.messages) == len(patched.messages) == 4
+        versions = [m["data"]["new_constellation"] for m in patched.messages]
+        assert [version["seq"] for version in versions] == [1, 2, 3, 4]
+        for full_message, version in zip(full.messages, versions):
+            assert client.resolve(version) == full_message["data"]["new_constellation"]
+
+        # A client connecting later starts from a snapshot of the last version
+        late = StubWebSocket()
+        observer.add_connection(late, patch_updates=True)
+        await drain()
+        [message] = late.messages
+        assert message["type"] == "constellation_snapshot"
+        assert message["data"]["constellation"]["seq"] == 4
+        assert (
+            message["data"]["constellation"]["constellation"]
+            == full.messages[-1]["data"]["new_constellation"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_versions_advance_without_clients(self):
+        """Test that a client connecting after unobserved events gets the latest version."""
+        observer = WebSocketObserver()
+        constellation = make_constellation(3)
+        await observer.on_event(modified_event(constellation))
+        constellation.start_task("t0")
+        await observer.on_event(modified_event(constellation))
+
+        websocket = StubWebSocket()
+        observer.add_connection(websocket, patch_updates=True)
+        await drain()
+
+        [message] = websocket.messages
+        assert message["type"] == "constellation_snapshot"
+        assert message["data"]["constellation"]["seq"] == 2
+        assert message["data"]["constellation"]["constellation"] == full_version(
+            EventSerializer(), constellation
+        )
+
+    @pytest.mark.asyncio
+    async def test_resync_request(self):
+        """Test that a resync request queues a snapshot, coalescing queued ones."""
+        observer = WebSocketObserver()
+        websocket = StubWebSocket()
+        constellation = make_constellation(3)
+        observer.add_connection(StubWebSocket())
+        await observer.on_event(modified_event(constellation))
+
+        observer.add_connection(websocket, patch_updates=True)
+        await drain()
+        handler = WebSocketMessageHandler(Mock(websocket_observer=observer))
+        request = {"type": "resync", "constellation_id": constellation.constellation_id}
+        await handler.handle_message(websocket, request)
+        await handler.handle_message(websocket, request)
+        await drain()
+
+        # The snapshot on connect was sent, and the two requested are coalesced
+        assert [m["type"] for m in websocket.messages] == ["constellation_snapshot"] * 2
+        assert observer.get_delivery_statistics()["coalesced"] == 1
+
+        handler.app_state.websocket_observer = None
+        await handler.handle_message(websocket, request)
+        assert websocket.messages[-1]["type"] == "error"
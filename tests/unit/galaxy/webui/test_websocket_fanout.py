@@ -0,0 +1,157 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test the fan-out of WebSocketObserver: events encoded once and queued per client,
+slow clients isolated, constellation snapshots coalesced, and the delivery counters.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from galaxy.core.events import ConstellationEvent, EventType, TaskEvent
+from galaxy.webui.websocket_observer import WebSocketObserver
+
+
+class StubWebSocket:
+    """WebSocket recording the messages sent, optionally blocked or failing."""
+
+    def __init__(self, blocked=False, failing=False):
+        self.client = ("127.0.0.1", 0)
+        self.messages = []
+        self.failing = failing
+        self.unblocked = asyncio.Event()
+        if not blocked:
+            self.unblocked.set()
+
+    async def send_text(self, message):
+        await self.unblocked.wait()
+        if self.failing:
+            raise ConnectionError("connection closed")
+        self.messages.append(json.loads(message))
+
+
+def task_event(task_id):
+    return TaskEvent(
+        event_type=EventType.TASK_STARTED,
+        source_id="orchestrator",
+        timestamp=time.time(),
+        data={},
+        task_id=task_id,
+        status="running",
+    )
+
+
+def modified_event(version, constellation_id="constellation"):
+    return ConstellationEvent(
+        event_type=EventType.CONSTELLATION_MODIFIED,
+        source_id="agent",
+        timestamp=time.time(),
+        data={"version": version},
+        constellation_id=constellation_id,
+        constellation_state="executing",
+    )
+
+
+async def drain():
+    """Let the sender tasks run until they block."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestFanOut:
+    """Test that each client is served by its own queue."""
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_stall_others(self):
+        """Test that publishing does not wait for a blocked client."""
+        observer = WebSocketObserver()
+        slow, fast = StubWebSocket(blocked=True), StubWebSocket()
+        observer.add_connection(slow)
+        observer.add_connection(fast)
+
+        for i in range(10):
+            await asyncio.wait_for(observer.on_event(task_event(f"t{i}")), 1)
+        await drain()
+
+        assert [m["task_id"] for m in fast.messages] == [f"t{i}" for i in range(10)]
+        assert slow.messages == []
+
+        slow.unblocked.set()
+        await drain()
+        assert slow.messages == fast.messages
+
+        statistics = observer.get_delivery_statistics()
+        assert statistics["delivered"] == 20
+        assert statistics["dropped"] == statistics["pending"] == 0
+        assert statistics["max_latency"] >= statistics["average_latency"] > 0
+
+    @pytest.mark.asyncio
+    async def test_snapshots_coalesced_under_backpressure(self):
+        """Test that queued snapshots of a constellation are replaced by the latest."""
+        observer = WebSocketObserver()
+        websocket = StubWebSocket(blocked=True)
+        observer.add_connection(websocket)
+
+        # The first snapshot is being sent while the others are queued
+        await observer.on_event(modified_event(1))
+        await drain()
+        await observer.on_event(modified_event(2))
+        await observer.on_event(task_event("a"))
+        await observer.on_event(modified_event(1, "other"))
+        await observer.on_event(modified_event(3))
+        await observer.on_event(modified_event(4))
+
+        websocket.unblocked.set()
+        await drain()
+
+        assert [
+            (m["event_type"], m.get("constellation_id"), m["data"].get("version"))
+            for m in websocket.messages
+        ] == [
+            ("constellation_modified", "constellation", 1),
+            ("task_started", None, None),
+            ("constellation_modified", "other", 1),
+            ("constellation_modified", "constellation", 4),
+        ]
+        assert observer.get_delivery_statistics()["coalesced"] == 2
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_oldest(self):
+        """Test that a full queue drops its oldest events."""
+        observer = WebSocketObserver(max_queue_size=2)
+        websocket = StubWebSocket(blocked=True)
+        observer.add_connection(websocket)
+
+        for i in range(5):
+            await observer.on_event(task_event(f"t{i}"))
+            await drain()
+
+        websocket.unblocked.set()
+        await drain()
+
+        assert [m["task_id"] for m in websocket.messages] == ["t0", "t3", "t4"]
+        assert observer.get_delivery_statistics()["dropped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_client_removed(self):
+        """Test that a client whose send fails is removed, keeping its counters."""
+        observer = WebSocketObserver()
+        failing, healthy = StubWebSocket(failing=True), StubWebSocket()
+        observer.add_connection(failing)
+        observer.add_connection(healthy)
+
+        await observer.on_event(task_event("a"))
+        await drain()
+
+        assert observer.connection_count == 1
+        await observer.on_event(task_event("b"))
+        await drain()
+        observer.remove_connection(healthy)
+
+        assert [m["task_id"] for m in healthy.messages] == ["a", "b"]
+        assert observer.connection_count == 0
+        assert observer.get_delivery_statistics()["delivered"] == 2
@@ -0,0 +1,325 @@
+"""
+Unit Tests for Command Pacing
+
+Tests the adaptive pacing and concurrent read-only execution of the CommandRouter.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+import pytest
+from fastmcp import FastMCP
+
+from aip.messages import Command, ResultStatus
+from ufo.client.command_pacing import CommandExecutionMetrics, CommandPacingPolicy
+from ufo.client.computer import CommandRouter, Computer
+from ufo.client.mcp.mcp_server_manager import BaseMCPServer, MCPServerManager
+
+
+class InMemoryMCPServer(BaseMCPServer):
+    """In-memory MCP server wrapping a FastMCP instance for testing."""
+
+    def __init__(self, config, server: FastMCP):
+        super().__init__(config)
+        self._server = server
+
+    def start(self, *args, **kwargs) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def reset(self) -> None:
+        pass
+
+
+class StubComputerManager:
+    """Computer manager always returning the same computer."""
+
+    def __init__(self, computer: Computer):
+        self.computer = computer
+
+    async def get_or_create(self, agent_name, process_name=None, root_name=None):
+        return self.computer
+
+
+class ChangingFrameSource:
+    """Frame source whose frames always differ visibly, like a playing video."""
+
+    def __init__(self):
+        self.captures = 0
+
+    def capture(self):
+        from PIL import Image
+
+        self.captures += 1
+        return Image.new("L", (320, 200), 255 if self.captures % 2 else 0)
+
+
+def make_collector(
+    namespace: str, frames: Optional[ChangingFrameSource] = None
+) -> InMemoryMCPServer:
+    """Create a data collection server with a slow read tool and settle probes."""
+    from ufo.automator.ui_control.screenshot import PhotographerFacade
+
+    mcp = FastMCP(namespace)
+    frames = frames or ChangingFrameSource()
+
+    @mcp.tool(name=f"{namespace.lower()}_changing")
+    async def changing(interval: float = 0.05) -> bool:
+        """Settle probe over a changing frame source, never settled."""
+        first = await asyncio.to_thread(frames.capture)
+        await asyncio.sleep(interval)
+        second = await asyncio.to_thread(frames.capture)
+        return PhotographerFacade.images_similar(first, second)
+
+    @mcp.tool(name=f"{namespace.lower()}_read")
+    def read(seconds: float = 0.2) -> str:
+        """Slow read-only tool."""
+        time.sleep(seconds)
+        return namespace
+
+    @mcp.tool(name=f"{namespace.lower()}_settled")
+    def settled() -> bool:
+        """Settle probe, always settled."""
+        return True
+
+    return InMemoryMCPServer({"namespace": namespace}, mcp)
+
+
+def make_executor(namespace: str, **config) -> InMemoryMCPServer:
+    """Create an action server with a click and a failing tool."""
+    mcp = FastMCP(namespace)
+
+    @mcp.tool()
+    def click() -> str:
+        """Click."""
+        return "clicked"
+
+    @mcp.tool()
+    def broken() -> str:
+        """Always fails."""
+        raise ValueError("broken")
+
+    return InMemoryMCPServer({"namespace": namespace, **config}, mcp)
+
+
+async def make_router(
+    frames: Optional[ChangingFrameSource] = None, **executor_config
+) -> CommandRouter:
+    """Create a command router over a computer with two collectors and one executor."""
+    computer = Computer(
+        name="test_computer",
+        process_name="",
+        mcp_server_manager=MCPServerManager(),
+        data_collection_servers_config=[],
+        action_servers_config=[],
+    )
+    await computer.add_server(
+        "CollectorA", make_collector("CollectorA", frames), tool_type="data_collection"
+    )
+    await computer.add_server(
+        "CollectorB", make_collector("CollectorB"), tool_type="data_collection"
+    )
+    await computer.add_server(
+        "Executor", make_executor("Executor", **executor_config), tool_type="action"
+    )
+    return CommandRouter(StubComputerManager(computer))
+
+
+def data_command(tool_name: str, call_id: str) -> Command:
+    return Command(tool_name=tool_name, tool_type="data_collection", call_id=call_id)
+
+
+def action_command(tool_name: str, call_id: str) -> Command:
+    return Command(tool_name=tool_name, tool_type="action", call_id=call_id)
+
+
+class TestCommandRouterPacing:
+    """Test the pacing behaviour of CommandRouter.execute"""
+
+    @pytest.mark.asyncio
+    async def test_read_only_commands_run_concurrently(self):
+        """Test that data collection commands on different servers overlap"""
+        router = await make_router()
+        try:
+            start = time.monotonic()
+            results = await router.execute(
+                "AppAgent",
+                "",
+                "",
+                [
+                    data_command("collectora_read", "1"),
+                    data_command("collectorb_read", "2"),
+                ],
+            )
+            elapsed = time.monotonic() - start
+
+            assert [r.result for r in results] == ["CollectorA", "CollectorB"]
+            assert [r.call_id for r in results] == ["1", "2"]
+            assert elapsed < 0.38
+            assert router.metrics.get_metrics()["idle_time"] == 0.0
+        finally:
+            router.computer_manager.computer.close()
+
+    @pytest.mark.asyncio
+    async def test_action_waits_configured_settle_timeout(self):
+        """Test that actions wait the namespace's settle timeout without a probe"""
+        router = await make_router(settle_timeout=0.2)
+        try:
+            await router.execute("AppAgent", "", "", [action_command("click", "1")])
+            metrics = router.metrics.get_metrics()
+
+            assert metrics["idle_time"] >= 0.2
+            assert metrics["commands_executed"] == 1
+            assert 0 < metrics["idle_ratio"] <= 1
+        finally:
+            router.computer_manager.computer.close()
+
+    @pytest.mark.asyncio
+    async def test_settle_probe_ends_wait_early(self):
+        """Test that a settled probe ends the wait before the upper bound"""
+        router = await make_router(
+            settle_timeout=2.0, settle_probe="collectora_settled"
+        )
+        try:
+            start = time.monotonic()
+            results = await router.execute(
+                "AppAgent", "", "", [action_command("click", "1")]
+            )
+
+            assert results[0].status == ResultStatus.SUCCESS
+            assert time.monotonic() - start < 1.0
+        finally:
+            router.computer_manager.computer.close()
+
+    @pytest.mark.asyncio
+    async def test_changing_ui_wait_stays_bounded(self):
+        """Test that a UI that never settles waits at most about the settle timeout"""
+        frames = ChangingFrameSource()
+        router = await make_router(
+            frames, settle_timeout=0.3, settle_probe="collectora_changing"
+        )
+        try:
+            await router.execute("AppAgent", "", "", [action_command("click", "1")])
+            idle_time = router.metrics.get_metrics()["idle_time"]
+
+            assert frames.captures >= 4
+            assert 0.3 <= idle_time < 0.5
+        finally:
+            router.computer_manager.computer.close()
+
+    @pytest.mark.asyncio
+    async def test_early_exit_skips_after_failure(self):
+        """Test that commands after a failure are skipped in order"""
+        router = await make_router(settle_timeout=0)
+        try:
+            results = await router.execute(
+                "AppAgent",
+                "",
+                "",
+                [
+                    action_command("broken", "1"),
+                    data_command("collectora_read", "2"),
+                    action_command("click", "3"),
+                    Command(tool_name="", tool_type="action", call_id="4"),
+                ],
+            )
+
+            assert [r.status for r in results] == [
+                ResultStatus.FAILURE,
+                ResultStatus.SKIPPED,
+                ResultStatus.SKIPPED,
+                ResultStatus.SUCCESS,
+            ]
+        finally:
+            router.computer_manager.computer.close()
+
+    @pytest.mark.asyncio
+    async def test_failure_in_read_only_group_skips_following_action(self):
+        """Test that a failing read-only command prevents the next action"""
+        router = await make_router(settle_timeout=0)
+        try:
+            results = await router.execute(
+                "AppAgent",
+                "",
+                "",
+                [
+                    Command(
+                        tool_name="collectora_read",
+                        tool_type="data_collection",
+                        parameters={"seconds": "not-a-number"},
+                        call_id="1",
+                    ),
+                    action_command("click", "2"),
+                ],
+            )
+
+            assert results[0].status == ResultStatus.FAILURE
+            assert results[1].status == ResultStatus.SKIPPED
+        finally:
+            router.computer_manager.computer.close()
+
+
+class TestCommandPacingPolicy:
+    """Test CommandPacingPolicy helpers"""
+
+    def test_read_only_annotation(self):
+        """Test that readOnlyHint annotations mark action tools as read-only"""
+        from aip.messages import MCPToolCall
+
+        server = make_executor("Executor")
+        tool_call = MCPToolCall(
+            tool_key="action::click",
+            tool_name="click",
+            namespace="Executor",
+            tool_type="action",
+            description="",
+            mcp_server=server,
+            annotations={"readOnlyHint": True},
+        )
+
+        assert CommandPacingPolicy.is_read_only(tool_call)
+        assert not CommandPacingPolicy.is_read_only(
+            tool_call.model_copy(update={"annotations": None})
+        )
+
+    def test_metrics_idle_ratio(self):
+        """Test idle ratio computation"""
+        metrics = CommandExecutionMetrics()
+        metrics.record_batch(commands=2, execution_time=3.0, idle_time=1.0)
+
+        assert metrics.get_metrics()["idle_ratio"] == 0.25
+
+    def test_screenshot_stability_check(self):
+        """Test the screenshot comparison of the is_ui_idle settle probe"""
+        from PIL import Image
+
+        from ufo.automator.ui_control.screenshot import PhotographerFacade
+
+        first = Image.new("RGB", (40, 30), "white")
+        changed = first.copy()
+        changed.putpixel((39, 29), (0, 0, 0))
+
+        assert PhotographerFacade.images_identical(first, first.copy())
+        assert PhotographerFacade.images_identical(first, first.convert("RGBA"))
+        assert not PhotographerFacade.images_identical(first, changed)
+        assert not PhotographerFacade.images_identical(first, first.resize((40, 31)))
+
+    def test_screenshot_similarity_tolerates_small_changes(self):
+        """Test that a blinking caret is ignored while a visible change is not"""
+        from PIL import Image, ImageDraw
+
+        from ufo.automator.ui_control.screenshot import PhotographerFacade
+
+        first = Image.new("RGB", (1600, 1000), "white")
+        caret = first.copy()
+        ImageDraw.Draw(caret).rectangle((800, 500, 801, 520), fill="black")
+        dialog = first.copy()
+        ImageDraw.Draw(dialog).rectangle((400, 300, 1200, 700), fill="gray")
+
+        assert PhotographerFacade.images_similar(first, first.convert("RGBA"))
+        assert PhotographerFacade.images_similar(first, caret)
+        assert not PhotographerFacade.images_similar(first, dialog)
+        assert not PhotographerFacade.images_similar(first, first.resize((1600, 999)))
@@ -0,0 +1,125 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test the batched semantic and icon control filters: one encode call per step, vectorised
+top-k scoring, and embeddings cached across steps.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from ufo.automator.ui_control import control_filter as control_filter_module
+from ufo.automator.ui_control.control_filter import (
+    BasicControlFilter,
+    IconControlFilter,
+    SemanticControlFilter,
+)
+
+VOCABULARY = ["save", "open", "close", "print", "font"]
+
+
+class FakeModel:
+    """Embeds a text as the bag of vocabulary words it contains, counting encode calls."""
+
+    def __init__(self):
+        self.batches = []
+
+    def embed(self, content):
+        if isinstance(content, Image.Image):
+            content = VOCABULARY[content.getpixel((0, 0))[0] % len(VOCABULARY)]
+        return np.array(
+            [float(word in content.lower()) for word in VOCABULARY] + [0.1]
+        )
+
+    def encode(self, contents):
+        self.batches.append(len(contents))
+        return np.stack([self.embed(content) for content in contents])
+
+
+@pytest.fixture
+def fake_model(monkeypatch, request):
+    model = FakeModel()
+    monkeypatch.setattr(
+        BasicControlFilter, "load_model", staticmethod(lambda model_path: model)
+    )
+    yield model
+    BasicControlFilter._instances.pop(request.node.name, None)
+
+
+def controls(*names):
+    return {str(i): SimpleNamespace(name=name) for i, name in enumerate(names)}
+
+
+class TestSemanticControlFilter:
+    """Test SemanticControlFilter."""
+
+    def test_top_k_controls(self, fake_model, request):
+        """Test that the controls most similar to any plan are kept, in control order."""
+        control_filter = SemanticControlFilter(request.node.name)
+        control_dicts = controls("Close", "Save As", "Font", "Open")
+
+        filtered = control_filter.control_filter(
+            control_dicts, ["Click save", "Open the file"], top_k=2
+        )
+
+        assert list(filtered) == ["1", "3"]
+        assert fake_model.batches == [4, 2]
+
+    def test_embeddings_are_cached_across_steps(self, fake_model, request):
+        """Test that only new control texts are encoded at the next step."""
+        control_filter = SemanticControlFilter(request.node.name)
+        plans = ["Click save"]
+
+        control_filter.control_filter(controls("Close", "Save"), plans, top_k=1)
+        control_filter.control_filter(controls("Close", "Save", "Print"), plans, top_k=1)
+
+        assert fake_model.batches == [2, 1, 1]
+
+    def test_score_matches_batch(self, fake_model, request):
+        """Test that the single-control score agrees with the batched similarity."""
+        control_filter = SemanticControlFilter(request.node.name)
+
+        score = control_filter.control_filter_score("save", ["save", "open"])
+
+        assert score == pytest.approx(1.0)
+
+
+    def test_cache_is_thread_safe(self, fake_model, request, monkeypatch):
+        """Test that threads sharing a filter model can use and evict its cache."""
+        monkeypatch.setattr(control_filter_module, "EMBEDDING_CACHE_SIZE", 3)
+        control_filter = SemanticControlFilter(request.node.name)
+        texts = [f"{word} {i}" for i in range(4) for word in VOCABULARY]
+
+        def embed_all(offset):
+            for i in range(50):
+                batch = [texts[(offset + i + j) % len(texts)] for j in range(4)]
+                embeddings = control_filter.get_embeddings(batch)
+                assert np.array_equal(embeddings, fake_model.encode(batch))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(embed_all, range(8)))
+
+        assert len(control_filter.embedding_cache) <= 3
+
+
+class TestIconControlFilter:
+    """Test IconControlFilter."""
+
+    def test_icons_are_keyed_by_pixels(self, fake_model, request):
+        """Test that identical icons are embedded once and scored by their content."""
+        control_filter = IconControlFilter(request.node.name)
+        save_icon = Image.new("RGB", (4, 4), (0, 0, 0))
+        font_icon = Image.new("RGB", (4, 4), (4, 0, 0))
+        icons = {"1": save_icon, "2": font_icon, "3": save_icon.copy()}
+
+        filtered = control_filter.control_filter(
+            controls("a", "b", "c", "d"), icons, ["Change the font"], top_k=1
+        )
+
+        assert list(filtered) == ["2"]
+        assert fake_model.batches == [2, 1]
@@ -0,0 +1,140 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test the process-wide index registry: shared loading, reference counting, LRU
+eviction and hot reload when the index files change.
+"""
+
+import gc
+import os
+
+import pytest
+
+from ufo.rag.index_registry import IndexRegistry
+
+
+class FakeStore:
+    """Vector store returning the content of the index file it was loaded from."""
+
+    def __init__(self, path, mmap):
+        with open(os.path.join(path, "index.faiss")) as f:
+            self.content = f.read()
+        self.mmap = mmap
+
+    def similarity_search(self, query, k, filter=None):
+        return [self.content] * k
+
+
+class CountingLoader:
+    """Loader counting the loads per path."""
+
+    def __init__(self):
+        self.loads = []
+
+    def __call__(self, path, mmap):
+        self.loads.append(path)
+        return FakeStore(path, mmap)
+
+
+def write_index(path, content):
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, "index.faiss"), "w") as f:
+        f.write(content)
+    with open(os.path.join(path, "index.pkl"), "w") as f:
+        f.write("docstore")
+
+
+@pytest.fixture
+def loader():
+    return CountingLoader()
+
+
+class TestIndexRegistry:
+    """Test IndexRegistry."""
+
+    def test_index_is_loaded_once_and_shared(self, tmp_path, loader):
+        """Test that handles to the same index share one loaded store."""
+        path = str(tmp_path / "experience_db")
+        write_index(path, "v1")
+        registry = IndexRegistry(loader=loader)
+
+        first = registry.acquire(path)
+        second = registry.acquire(os.path.join(path, "..", "experience_db"))
+
+        assert len(loader.loads) == 1
+        assert first.store is second.store
+        assert first.similarity_search("query", 2) == ["v1", "v1"]
+        assert registry.get_stats()["loaded"] == {os.path.realpath(path): 2}
+
+    def test_missing_index(self, tmp_path, loader):
+        """Test that a missing index yields no handle."""
+        registry = IndexRegistry(loader=loader)
+
+        assert registry.acquire(str(tmp_path / "missing")) is None
+        assert loader.loads == []
+
+    def test_mmap_flag_is_passed_to_loader(self, tmp_path, loader):
+        """Test that the memory-map option reaches the loader."""
+        path = str(tmp_path / "index")
+        write_index(path, "v1")
+
+        handle = IndexRegistry(mmap=True, loader=loader).acquire(path)
+
+        assert handle.store.mmap
+
+    def test_lru_eviction_skips_indexes_in_use(self, tmp_path, loader):
+        """Test that only unused indexes are evicted, least recently used first."""
+        paths = [str(tmp_path / f"index_{i}") for i in range(3)]
+        for path in paths:
+            write_index(path, path)
+        registry = IndexRegistry(max_entries=1, loader=loader)
+
+        kept = registry.acquire(paths[0])
+        released = registry.acquire(paths[1])
+        released.close()
+        registry.acquire(paths[2]).close()
+
+        loaded = registry.get_stats()["loaded"]
+        assert os.path.realpath(paths[0]) in loaded
+        assert os.path.realpath(paths[1]) not in loaded
+        assert registry.get_stats()["evictions"] >= 1
+        assert kept.similarity_search("query", 1) == [paths[0]]
+
+    def test_garbage_collected_handle_releases_reference(self, tmp_path, loader):
+        """Test that dropping a handle without closing it releases its reference."""
+        path = str(tmp_path / "index")
+        write_index(path, "v1")
+        registry = IndexRegistry(loader=loader)
+
+        handle = registry.acquire(path)
+        del handle
+        gc.collect()
+
+        assert registry.get_stats()["loaded"] == {os.path.realpath(path): 0}
+
+    def test_hot_reload_on_change(self, tmp_path, loader):
+        """Test that a handle follows the index when its files change."""
+        path = str(tmp_path / "index")
+        write_index(path, "v1")
+        registry = IndexRegistry(loader=loader)
+        handle = registry.acquire(path)
+
+        write_index(path, "version 2")
+        os.utime(os.path.join(path, "index.faiss"), ns=(1, 1))
+
+        assert handle.similarity_search("query", 1) == ["version 2"]
+        assert len(loader.loads) == 2
+        assert registry.get_stats()["reloads"] == 1
+        assert registry.get_stats()["loaded"] == {os.path.realpath(path): 1}
+
+    def test_closed_handle(self, tmp_path, loader):
+        """Test that a closed handle can no longer be searched."""
+        path = str(tmp_path / "index")
+        write_index(path, "v1")
+        handle = IndexRegistry(loader=loader).acquire(path)
+
+        handle.close()
+
+        with pytest.raises(ValueError):
+            handle.similarity_search("query", 1)
@@ -0,0 +1,97 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test the repair stages of malformed LLM JSON responses.
+"""
+
+import json
+
+import pytest
+
+from ufo.agents.processors.schemas.response_schema import (
+    AppAgentResponse,
+    HostAgentResponse,
+)
+from ufo.llm.json_repair import (
+    TruncatedJSONError,
+    build_fix_json_prompt,
+    extract_json_object,
+    fit_to_schema,
+)
+
+
+class TestExtractJsonObject:
+    """Test the tolerant JSON extraction."""
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            '{"observation": "ok", "thought": "t"}',
+            'Sure, here it is:\n```json\n{"observation": "ok", "thought": "t"}\n```',
+            'Answer: {"observation": "ok", "thought": "t",} Hope this helps.',
+            "{'observation': 'ok', 'thought': 't'}",
+            '{"observation": “ok”, "thought": "t"}',
+        ],
+    )
+    def test_recovers_object(self, text):
+        """Test prose, code fences, trailing commas, single and smart quotes."""
+        assert extract_json_object(text) == {"observation": "ok", "thought": "t"}
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            '{"observation": "ok", "thought": "t", "plan": ["open menu", "cli',
+            '```json\n{"function": "click_input", "arguments": {"button": "le',
+        ],
+    )
+    def test_rejects_truncated_response(self, text):
+        """Test that a response cut off by the token limit is not completed."""
+        with pytest.raises(TruncatedJSONError):
+            extract_json_object(text)
+
+    def test_no_object(self):
+        """Test that text without a JSON object is rejected."""
+        with pytest.raises(ValueError):
+            extract_json_object("I cannot help with that.")
+
+
+class TestFitToSchema:
+    """Test the schema-guided fix-up."""
+
+    def test_field_names_and_types(self):
+        """Test that field names are matched fuzzily and list/string types coerced."""
+        data = {
+            "Observation": "The dialog is open.",
+            "Thought": ["Click", "OK"],
+            "Status": "CONTINUE",
+            "CurrentSubtask": "Close the dialog",
+            "Plan": "Save the file",
+        }
+
+        fixed = fit_to_schema(data, HostAgentResponse)
+
+        assert fixed == {
+            "observation": "The dialog is open.",
+            "thought": "Click\nOK",
+            "status": "CONTINUE",
+            "current_subtask": "Close the dialog",
+            "plan": ["Save the file"],
+        }
+        HostAgentResponse.model_validate(fixed)
+
+    def test_missing_required_field(self):
+        """Test that responses missing required fields are rejected."""
+        with pytest.raises(ValueError):
+            fit_to_schema({"observation": "ok"}, AppAgentResponse)
+
+    def test_fix_json_prompt_is_text_only(self):
+        """Test that the follow-up prompt carries no images and names the fields."""
+        messages = build_fix_json_prompt(
+            '{"observation": "ok"', ValueError("Expecting ','"), AppAgentResponse
+        )
+
+        parts = [part for message in messages for part in message["content"]]
+        assert all(part["type"] == "text" for part in parts)
+        assert "observation, thought" in parts[-1]["text"]
+        assert len(json.dumps(messages)) < 1024
@@ -0,0 +1,169 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test the parallel knowledge retrieval of the AppAgent: the query is embedded once, the
+sources are queried concurrently, and results are cached per (subtask, source, top_k).
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from ufo.agents.agent import app_agent
+from ufo.agents.agent.app_agent import AppAgent
+from ufo.rag.retrieval_cache import RetrievalCache
+
+
+class FakeAgent:
+    """Agent exposing the retrievers used by AppAgent.aretrieve_knowledge."""
+
+    aretrieve_knowledge = AppAgent.aretrieve_knowledge
+
+    def __init__(self, delay=0.1, ttl=300):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+        self.logger = SimpleNamespace(warning=lambda message: None)
+        self.retrieval_cache = RetrievalCache(ttl=ttl)
+        self.experience_retriever = object()
+        self.human_demonstration_retriever = object()
+        self.offline_doc_retriever = object()
+        self.online_doc_retriever = object()
+
+    def _retrieve(self, source, request, top_k, embedding):
+        with self.lock:
+            self.calls.append((source, embedding))
+        time.sleep(self.delay)
+        return f"{source}:{request}:{top_k}"
+
+    def rag_experience_retrieve(self, request, top_k, embedding=None):
+        return self._retrieve("experience", request, top_k, embedding)
+
+    def rag_demonstration_retrieve(self, request, top_k, embedding=None):
+        return self._retrieve("demonstration", request, top_k, embedding)
+
+    def offline_docs_prompt_helper(self, request, top_k, embedding=None):
+        return self._retrieve("offline", request, top_k, embedding)
+
+    def online_docs_prompt_helper(self, request, top_k, embedding=None):
+        return self._retrieve("online", request, top_k, embedding)
+
+
+@pytest.fixture
+def embeddings(monkeypatch):
+    """Count the embedded queries and enable the experience and demonstration sources."""
+    embedded = []
+
+    def fake_embed_query(query):
+        embedded.append(query)
+        return [0.1, 0.2]
+
+    monkeypatch.setattr(app_agent, "embed_query", fake_embed_query)
+    monkeypatch.setattr(app_agent.ufo_config.rag, "experience", True)
+    monkeypatch.setattr(app_agent.ufo_config.rag, "demonstration", True)
+    return embedded
+
+
+class TestRetrievalCache:
+    """Test RetrievalCache."""
+
+    def test_lookup_and_expiry(self, monkeypatch):
+        """Test that cached results, including empty ones, expire after the TTL."""
+        cache = RetrievalCache(ttl=10)
+        now = [100.0]
+        monkeypatch.setattr("ufo.rag.retrieval_cache.time.monotonic", lambda: now[0])
+
+        cache.set(("subtask", "offline_docs", 1), "")
+
+        assert cache.lookup(("subtask", "offline_docs", 1)) == (True, "")
+        now[0] += 11
+        assert cache.lookup(("subtask", "offline_docs", 1)) == (False, None)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_lru_eviction_and_disabled(self):
+        """Test that the oldest entry is evicted, and that a zero TTL caches nothing."""
+        cache = RetrievalCache(ttl=10, max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, key)
+
+        assert cache.lookup("a") == (False, None)
+        assert len(cache) == 2
+
+        disabled = RetrievalCache(ttl=0)
+        disabled.set("a", "a")
+        assert disabled.lookup("a") == (False, None)
+
+
+class TestParallelKnowledgeRetrieval:
+    """Test AppAgent.aretrieve_knowledge."""
+
+    @pytest.mark.asyncio
+    async def test_sources_run_concurrently_with_one_embedding(self, embeddings):
+        """Test that all sources share one embedding and overlap in time."""
+        agent = FakeAgent(delay=0.1)
+
+        start = time.monotonic()
+        knowledge, latency = await agent.aretrieve_knowledge("open the file")
+        elapsed = time.monotonic() - start
+
+        assert embeddings == ["open the file"]
+        assert all(embedding == [0.1, 0.2] for _, embedding in agent.calls)
+        assert len(agent.calls) == 4
+        assert elapsed < 0.3
+        assert list(knowledge) == [
+            "experience_examples",
+            "demonstration_examples",
+            "offline_docs",
+            "online_docs",
+        ]
+        assert knowledge["offline_docs"].startswith("offline:open the file:")
+        assert not any(timing["cached"] for timing in latency.values())
+        assert "embedding" in latency
+
+    @pytest.mark.asyncio
+    async def test_repeated_subtask_is_cached(self, embeddings):
+        """Test that the next step of the same subtask is served from the cache."""
+        agent = FakeAgent(delay=0.01)
+
+        first, _ = await agent.aretrieve_knowledge("open the file")
+        second, latency = await agent.aretrieve_knowledge("open the file")
+
+        assert first == second
+        assert len(agent.calls) == 4
+        assert embeddings == ["open the file"]
+        assert all(timing["cached"] for timing in latency.values())
+
+        await agent.aretrieve_knowledge("save the file")
+        assert len(agent.calls) == 8
+
+    @pytest.mark.asyncio
+    async def test_disabled_sources_use_defaults(self, embeddings):
+        """Test that sources without a retriever are skipped."""
+        agent = FakeAgent(delay=0.01)
+        agent.experience_retriever = None
+        agent.online_doc_retriever = None
+
+        knowledge, latency = await agent.aretrieve_knowledge("open the file")
+
+        assert knowledge["experience_examples"] == []
+        assert knowledge["online_docs"] == ""
+        assert "experience_examples" not in latency
+        assert len(agent.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_embedding_failure_falls_back(self, monkeypatch, embeddings):
+        """Test that the sources embed the query themselves if the shared embedding fails."""
+
+        def failing_embed_query(query):
+            raise RuntimeError("no embedding model")
+
+        monkeypatch.setattr(app_agent, "embed_query", failing_embed_query)
+        agent = FakeAgent(delay=0.01)
+
+        knowledge, _ = await agent.aretrieve_knowledge("open the file")
+
+        assert all(embedding is None for _, embedding in agent.calls)
+        assert knowledge["online_docs"].startswith("online:")
@@ -0,0 +1,201 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test the LLM response cache: content-addressed keys, TTL and LRU eviction, and the
+record then replay flow of get_completions.
+"""
+
+import time
+
+import pytest
+
+from ufo.llm import llm_call, response_cache
+from ufo.llm.response_cache import (
+    LLMCacheMissError,
+    LLMResponseCache,
+    make_cache_key,
+)
+
+CONFIGS = {
+    "APP_AGENT": {"API_TYPE": "openai", "API_MODEL": "stub-model"},
+    "BACKUP_AGENT": {"API_TYPE": "openai", "API_MODEL": "stub-backup"},
+    "TEMPERATURE": 0.0,
+    "TOP_P": 0.0,
+    "MAX_TOKENS": 100,
+}
+
+
+def image_message(data: str) -> list:
+    return [
+        {
+            "role": "user",
+            "content": [
+                {"type": "text", "text": "Describe the screenshot."},
+                {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{data}"}},
+            ],
+        }
+    ]
+
+
+class CountingService:
+    """Service answering with the number of calls made so far."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def chat_completion(self, messages, n=1, **kwargs):
+        self.calls += 1
+        return [f"response {self.calls}"], 0.5
+
+    async def achat_completion(self, messages, n=1, **kwargs):
+        return self.chat_completion(messages, n)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = CountingService()
+    monkeypatch.setattr(llm_call, "_get_service", lambda *args: service)
+    yield service
+    if response_cache._response_cache is not None:
+        response_cache._response_cache.close()
+    monkeypatch.setattr(response_cache, "_response_cache", None)
+
+
+def use_cache(monkeypatch, mode: str, path) -> None:
+    monkeypatch.setenv(response_cache.CACHE_MODE_ENV, mode)
+    monkeypatch.setenv(response_cache.CACHE_PATH_ENV, str(path))
+
+
+class TestLLMResponseCache:
+    """Test the cache keys and the sqlite store."""
+
+    def test_key_is_content_addressed(self):
+        """Test that keys depend on image content, model and sampling parameters."""
+        key = make_cache_key(image_message("AAAA"), "openai", "gpt-4o", 1, {"temperature": 0})
+
+        assert key == make_cache_key(
+            image_message("AAAA"), "OpenAI", "gpt-4o", 1, {"temperature": 0}
+        )
+        assert key != make_cache_key(
+            image_message("BBBB"), "openai", "gpt-4o", 1, {"temperature": 0}
+        )
+        assert key != make_cache_key(
+            image_message("AAAA"), "openai", "gpt-4.1", 1, {"temperature": 0}
+        )
+        assert key != make_cache_key(
+            image_message("AAAA"), "openai", "gpt-4o", 1, {"temperature": 0.7}
+        )
+
+    def test_hit_rate_and_lru_eviction(self, tmp_path):
+        """Test hit/miss metrics and that the least recently used entry is evicted."""
+        cache = LLMResponseCache(str(tmp_path / "cache.db"), max_entries=2)
+        cache.put("a", ["A"], 1.0)
+        cache.put("b", ["B"], 1.0)
+        time.sleep(0.01)
+        assert cache.get("a") == (["A"], 1.0)
+
+        cache.put("c", ["C"], 1.0)
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("c") == (["C"], 1.0)
+        metrics = cache.get_metrics()
+        assert metrics["hits"] == 2
+        assert metrics["misses"] == 1
+        assert metrics["evictions"] == 1
+        assert metrics["hit_rate"] == pytest.approx(2 / 3)
+        assert metrics["saved_cost"] == pytest.approx(2.0)
+        cache.close()
+
+    def test_ttl_expiry(self):
+        """Test that entries older than the TTL are not served."""
+        cache = LLMResponseCache(":memory:", ttl=0.05)
+        cache.put("a", ["A"], 0.0)
+        assert cache.get("a") == (["A"], 0.0)
+
+        time.sleep(0.1)
+
+        assert cache.get("a") is None
+        assert cache.get_metrics()["expired"] == 1
+        cache.close()
+
+    def test_unknown_mode(self):
+        """Test that unknown modes are rejected."""
+        with pytest.raises(ValueError):
+            LLMResponseCache(":memory:", mode="sometimes")
+
+
+class TestCachedCompletions:
+    """Test get_completions with the response cache enabled."""
+
+    def test_read_write_serves_repeated_prompts(self, service, monkeypatch, tmp_path):
+        """Test that identical prompts hit the model once and cache hits cost nothing."""
+        use_cache(monkeypatch, "read_write", tmp_path / "cache.db")
+        messages = image_message("AAAA")
+
+        first = llm_call.get_completions(messages, agent="APP_AGENT", configs=CONFIGS)
+        second = llm_call.get_completions(messages, agent="APP_AGENT", configs=CONFIGS)
+        other = llm_call.get_completions(
+            image_message("BBBB"), agent="APP_AGENT", configs=CONFIGS
+        )
+
+        assert first == (["response 1"], 0.5)
+        assert second == (["response 1"], 0.0)
+        assert other == (["response 2"], 0.5)
+        assert service.calls == 2
+
+    def test_record_then_replay_offline(self, service, monkeypatch, tmp_path):
+        """Test that a recorded flow replays without calling the model."""
+        path = tmp_path / "recording.db"
+        messages = [{"role": "user", "content": "Open Notepad."}]
+
+        use_cache(monkeypatch, "record", path)
+        llm_call.get_completions(messages, agent="APP_AGENT", configs=CONFIGS)
+        recorded = llm_call.get_completions(messages, agent="APP_AGENT", configs=CONFIGS)
+        assert service.calls == 2
+
+        use_cache(monkeypatch, "replay", path)
+        replayed = llm_call.get_completions(messages, agent="APP_AGENT", configs=CONFIGS)
+
+        assert replayed == (recorded[0], 0.0)
+        assert service.calls == 2
+
+        # Unrecorded requests fail instead of reaching the model or the backup engine
+        with pytest.raises(LLMCacheMissError):
+            llm_call.get_completions(
+                [{"role": "user", "content": "Open Word."}],
+                agent="APP_AGENT",
+                configs=CONFIGS,
+            )
+        assert service.calls == 2
+
+    def test_empty_responses_are_not_cached(self, service, monkeypatch, tmp_path):
+        """Test that failed requests returning no completion are retried, not cached."""
+        use_cache(monkeypatch, "read_write", tmp_path / "cache.db")
+        messages = [{"role": "user", "content": "Hello"}]
+        results = iter([([], 0.0), (["recovered"], 0.5)])
+        monkeypatch.setattr(service, "chat_completion", lambda *args: next(results))
+
+        first = llm_call.get_completions(messages, agent="APP_AGENT", configs=CONFIGS)
+        second = llm_call.get_completions(messages, agent="APP_AGENT", configs=CONFIGS)
+        third = llm_call.get_completions(messages, agent="APP_AGENT", configs=CONFIGS)
+
+        assert first == ([], 0.0)
+        assert second == (["recovered"], 0.5)
+        assert third == (["recovered"], 0.0)
+
+    @pytest.mark.asyncio
+    async def test_async_completions_share_the_cache(self, service, monkeypatch, tmp_path):
+        """Test that aget_completions reads responses stored by get_completions."""
+        use_cache(monkeypatch, "read_write", tmp_path / "cache.db")
+        messages = [{"role": "user", "content": "Hello"}]
+
+        llm_call.get_completions(messages, agent="APP_AGENT", configs=CONFIGS)
+        responses, cost = await llm_call.aget_completions(
+            messages, agent="APP_AGENT", configs=CONFIGS
+        )
+
+        assert responses == ["response 1"]
+        assert cost == 0.0
+        assert service.calls == 1
@@ -0,0 +1,186 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test the background log writer: batched appends, records serialized off the caller,
+backpressure on a full queue, zstd-compressed logs and flush.
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from ufo.module import log_writer
+from ufo.module.log_writer import (
+    FileWriter,
+    LogWriterService,
+    read_log_lines,
+)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """A fresh log writer service used by the file writers of the test."""
+    service = LogWriterService(max_queue_size=4, batch_size=64)
+    monkeypatch.setattr(log_writer, "_log_writer", service)
+    return service
+
+
+@pytest.fixture
+def blocked_appends(monkeypatch):
+    """Hold the writer thread in its first append until the event is set, counting appends."""
+    release = threading.Event()
+    appends = []
+    original = FileWriter.append
+
+    def append(self, lines):
+        appends.append(len(lines))
+        release.wait(5)
+        original(self, lines)
+
+    monkeypatch.setattr(FileWriter, "append", append)
+    yield release, appends
+    release.set()
+
+
+class TestFileWriter:
+    """Test FileWriter with the background writer."""
+
+    def test_messages_and_records(self, service, tmp_path):
+        """Test that messages and records are appended in order as lines."""
+        path = tmp_path / "logs" / "response.log"
+        writer = FileWriter(str(path))
+
+        writer.write("first")
+        writer.write_record({"step": 1, "text": "café"})
+        writer.write("last\n")
+        writer.flush()
+
+        assert path.read_text(encoding="utf-8").splitlines() == [
+            "first",
+            '{"step": 1, "text": "café"}',
+            "last",
+        ]
+
+    def test_write_does_not_wait_for_the_file(self, service, tmp_path, blocked_appends):
+        """Test that writes return while the writer is busy, and are batched per file."""
+        release, appends = blocked_appends
+        writer = FileWriter(str(tmp_path / "request.log"))
+
+        writer.write("0")
+        while not appends:
+            time.sleep(0.01)
+        for i in range(1, 4):
+            writer.write(str(i))
+
+        assert service.pending == 4
+        release.set()
+        writer.flush()
+
+        assert appends == [1, 3]
+        assert list(read_log_lines(writer.file_path)) == ["0", "1", "2", "3"]
+
+    def test_full_queue_blocks(self, service, tmp_path, blocked_appends):
+        """Test that a writer blocks once the queue is full, until the writer catches up."""
+        release, appends = blocked_appends
+        writer = FileWriter(str(tmp_path / "request.log"))
+        writer.write("0")
+        while not appends:
+            time.sleep(0.01)
+        for i in range(4):
+            writer.write(str(i))
+
+        blocked = threading.Thread(target=writer.write, args=("overflow",))
+        blocked.start()
+        blocked.join(0.2)
+        assert blocked.is_alive()
+
+        release.set()
+        blocked.join(5)
+        assert not blocked.is_alive()
+        assert service.flush(timeout=5)
+
+    def test_full_queue_waits_off_event_loop(self, service, tmp_path, blocked_appends):
+        """Test that awrite waits for room on a full queue without blocking the event loop."""
+        release, appends = blocked_appends
+        writer = FileWriter(str(tmp_path / "request.log"))
+        writer.write("0")
+        while not appends:
+            time.sleep(0.01)
+        for i in range(1, 5):
+            writer.write(str(i))
+
+        async def write_on_loop():
+            ticks = 0
+            write = asyncio.create_task(writer.awrite("overflow"))
+            for _ in range(10):
+                await asyncio.sleep(0.02)
+                ticks += 1
+            # The loop kept running while the write waits for room
+            assert ticks == 10
+            assert not write.done()
+
+            release.set()
+            await asyncio.wait_for(write, timeout=5)
+
+        asyncio.run(write_on_loop())
+
+        assert writer.flush(timeout=5)
+        assert list(read_log_lines(writer.file_path)) == [
+            "0",
+            "1",
+            "2",
+            "3",
+            "4",
+            "overflow",
+        ]
+
+    def test_flush_waits_for_own_writes(self, service, tmp_path, blocked_appends):
+        """Test that flushing a writer does not wait for the writes of other writers."""
+        release, appends = blocked_appends
+        release.set()
+        done = FileWriter(str(tmp_path / "done.log"))
+        done.write("done")
+        assert done.flush(timeout=5)
+
+        release.clear()
+        busy = FileWriter(str(tmp_path / "busy.log"))
+        busy.write("busy")
+        while len(appends) < 2:
+            time.sleep(0.01)
+
+        assert done.flush(timeout=0.1)
+        assert not busy.flush(timeout=0.1)
+        assert not service.flush(timeout=0.1)
+
+        release.set()
+        assert busy.flush(timeout=5)
+
+    def test_synchronous_write(self, service, tmp_path):
+        """Test that a synchronous writer writes before returning."""
+        path = tmp_path / "evaluation.log"
+        writer = FileWriter(str(path), async_write=False)
+
+        writer.write_record({"complete": "yes"})
+
+        assert json.loads(path.read_text()) == {"complete": "yes"}
+        assert service.pending == 0
+
+    def test_zstd_compression(self, service, tmp_path):
+        """Test that a compressed log is written as .zst frames and read back as lines."""
+        pytest.importorskip("zstandard")
+        path = tmp_path / "request.log"
+        writer = FileWriter(str(path), compression="zstd")
+
+        writer.write_record({"step": 0, "image": "data:image/png;base64," + "A" * 10000})
+        writer.flush()
+        writer.write_record({"step": 1})
+        writer.flush()
+
+        assert writer.file_path == str(path) + ".zst"
+        assert (tmp_path / "request.log.zst").stat().st_size < 1000
+        records = [json.loads(line) for line in read_log_lines(str(path))]
+        assert [record["step"] for record in records] == [0, 1]
@@ -0,0 +1,299 @@
+"""
+Unit Tests for MCP Session Pool
+
+Tests the persistent, pooled MCP client sessions used by the Computer.
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastmcp import FastMCP
+
+from ufo.client.mcp.mcp_server_manager import BaseMCPServer
+from ufo.client.mcp.mcp_session_pool import MCPSessionPool
+
+
+class InMemoryMCPServer(BaseMCPServer):
+    """In-memory MCP server wrapping a FastMCP instance for testing."""
+
+    def __init__(self, config, server: FastMCP):
+        super().__init__(config)
+        self._server = server
+
+    def start(self, *args, **kwargs) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def reset(self) -> None:
+        pass
+
+
+def make_server(namespace: str = "TestServer", max_concurrency: int = None):
+    """Create an in-memory MCP server with a few test tools."""
+    mcp = FastMCP(namespace)
+
+    @mcp.tool()
+    def echo(text: str) -> str:
+        """Echo the text."""
+        return text
+
+    @mcp.tool()
+    def blocking_sleep(seconds: float) -> float:
+        """Block the server with time.sleep."""
+        time.sleep(seconds)
+        return seconds
+
+    @mcp.tool()
+    async def wait(seconds: float) -> float:
+        """Wait without blocking the server."""
+        await asyncio.sleep(seconds)
+        return seconds
+
+    @mcp.tool()
+    def fail() -> str:
+        """Always raise."""
+        raise ValueError("boom")
+
+    config = {"namespace": namespace}
+    if max_concurrency is not None:
+        config["max_concurrency"] = max_concurrency
+
+    return InMemoryMCPServer(config, mcp)
+
+
+class TestMCPSessionPool:
+    """Test MCPSessionPool class"""
+
+    @pytest.mark.asyncio
+    async def test_session_is_reused_across_calls(self):
+        """Test that repeated calls reuse one persistent session"""
+        pool = MCPSessionPool()
+        server = make_server()
+        try:
+            first = await pool.call_tool("TestServer", server, "echo", {"text": "a"})
+            session = pool.get_session("TestServer", server)
+            second = await pool.call_tool("TestServer", server, "echo", {"text": "b"})
+
+            assert first.data == "a"
+            assert second.data == "b"
+            assert pool.get_session("TestServer", server) is session
+            assert session.is_connected
+            assert session.reconnect_count == 0
+        finally:
+            pool.close()
+
+    @pytest.mark.asyncio
+    async def test_list_tools(self):
+        """Test listing tools through the pooled session"""
+        pool = MCPSessionPool()
+        server = make_server()
+        try:
+            tools = await pool.list_tools("TestServer", server)
+            assert {tool.name for tool in tools} == {"echo", "blocking_sleep", "wait", "fail"}
+        finally:
+            pool.close()
+
+    @pytest.mark.asyncio
+    async def test_tool_error_keeps_session(self):
+        """Test that tool errors are returned without dropping the session"""
+        pool = MCPSessionPool()
+        server = make_server()
+        try:
+            result = await pool.call_tool("TestServer", server, "fail", {})
+            assert result.is_error
+
+            session = pool.get_session("TestServer", server)
+            assert session.is_connected
+            assert (await session.call_tool("echo", {"text": "ok"})).data == "ok"
+        finally:
+            pool.close()
+
+    @pytest.mark.asyncio
+    async def test_blocking_tool_does_not_block_caller_loop(self):
+        """Test that blocking tools run off the caller's event loop"""
+        pool = MCPSessionPool()
+        server = make_server()
+        try:
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            await pool.call_tool(
+                "TestServer", server, "blocking_sleep", {"seconds": 0.3}
+            )
+            task.cancel()
+
+            assert ticks >= 5
+        finally:
+            pool.close()
+
+    @pytest.mark.asyncio
+    async def test_health_check_reconnects_dead_session(self):
+        """Test that a disconnected session is re-established before use"""
+        pool = MCPSessionPool(health_check_interval=0.0)
+        server = make_server()
+        try:
+            await pool.call_tool("TestServer", server, "echo", {"text": "a"})
+            session = pool.get_session("TestServer", server)
+
+            # Simulate a dropped connection
+            await session._submit(session._disconnect())
+            session._client = None
+            assert not session.is_connected
+
+            result = await pool.call_tool("TestServer", server, "echo", {"text": "b"})
+            assert result.data == "b"
+            assert session.is_connected
+        finally:
+            pool.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_from_config(self):
+        """Test that the per-server concurrency limit is read from config"""
+        pool = MCPSessionPool(default_max_concurrency=3)
+        default_server = make_server("Default")
+        limited_server = make_server("Limited", max_concurrency=1)
+        try:
+            assert pool.get_session("Default", default_server)._max_concurrency == 3
+            assert pool.get_session("Limited", limited_server)._max_concurrency == 1
+        finally:
+            pool.close()
+
+        # Without configuration, as many calls as the former 10-worker thread pool
+        pool = MCPSessionPool()
+        try:
+            assert pool.get_session("Default", default_server)._max_concurrency == 10
+        finally:
+            pool.close()
+
+    @pytest.mark.asyncio
+    async def test_connection_error_waits_for_in_flight_calls(self):
+        """Test that a broken connection is closed only after the other calls finish"""
+        pool = MCPSessionPool()
+        server = make_server()
+        try:
+            await pool.call_tool("TestServer", server, "echo", {"text": "a"})
+            session = pool.get_session("TestServer", server)
+            client = session._client
+            call_tool = client.call_tool
+
+            async def flaky_call_tool(name, arguments, **kwargs):
+                if name == "echo" and arguments["text"] == "lost":
+                    raise ConnectionError("connection lost")
+                if name == "echo" and arguments["text"] == "bad":
+                    raise RuntimeError("bad call")
+                return await call_tool(name=name, arguments=arguments, **kwargs)
+
+            client.call_tool = flaky_call_tool
+
+            # An error of the call alone keeps the connection
+            with pytest.raises(RuntimeError):
+                await pool.call_tool("TestServer", server, "echo", {"text": "bad"})
+            assert session._client is client
+
+            slow = asyncio.create_task(
+                pool.call_tool("TestServer", server, "wait", {"seconds": 0.3})
+            )
+            await asyncio.sleep(0.1)
+            with pytest.raises(ConnectionError):
+                await pool.call_tool("TestServer", server, "echo", {"text": "lost"})
+
+            # The call in flight completes on the retired client
+            assert client.is_connected()
+            assert (await slow).data == 0.3
+            assert not client.is_connected()
+
+            result = await pool.call_tool("TestServer", server, "echo", {"text": "b"})
+            assert result.data == "b"
+            assert session._client is not client
+            assert session.reconnect_count == 1
+        finally:
+            pool.close()
+
+    @pytest.mark.asyncio
+    async def test_server_replacement_recreates_session(self):
+        """Test that a reset server instance gets a fresh session"""
+        pool = MCPSessionPool()
+        server = make_server()
+        try:
+            old_session = pool.get_session("TestServer", server)
+            new_server = make_server()
+            new_session = pool.get_session("TestServer", new_server)
+            # The replaced session is closed in the background of the running loop
+            await asyncio.sleep(0)
+
+            assert new_session is not old_session
+            assert old_session.closed
+        finally:
+            pool.close()
+
+    @pytest.mark.asyncio
+    async def test_close_namespace(self):
+        """Test closing a single namespace"""
+        pool = MCPSessionPool()
+        server = make_server()
+        await pool.call_tool("TestServer", server, "echo", {"text": "a"})
+        session = pool.get_session("TestServer", server)
+
+        pool.close("TestServer")
+
+        assert session.closed
+        assert "TestServer" not in pool.sessions
+        with pytest.raises(RuntimeError):
+            await session.call_tool("echo", {"text": "b"})
+
+    @pytest.mark.asyncio
+    async def test_aclose_does_not_block_caller_loop(self):
+        """Test closing sessions from a coroutine"""
+        pool = MCPSessionPool()
+        server = make_server()
+        await pool.call_tool("TestServer", server, "echo", {"text": "a"})
+        session = pool.get_session("TestServer", server)
+
+        ticker = asyncio.create_task(asyncio.sleep(0))
+        await pool.aclose()
+
+        assert ticker.done()
+        assert session.closed
+        assert not pool.sessions
+
+
+class TestComputerSessionReuse:
+    """Test that Computer routes tool calls through its session pool"""
+
+    @pytest.mark.asyncio
+    async def test_run_actions_reuses_session(self):
+        """Test that run_actions reuses one session per namespace"""
+        from ufo.client.computer import Computer
+        from ufo.client.mcp.mcp_server_manager import MCPServerManager
+
+        computer = Computer(
+            name="test_computer",
+            process_name="",
+            mcp_server_manager=MCPServerManager(),
+            data_collection_servers_config=[],
+            action_servers_config=[],
+        )
+        try:
+            await computer.add_server("TestServer", make_server(), tool_type="action")
+            session = computer.session_pool.sessions["TestServer"]
+
+            tool_call = computer._tools_registry["action::echo"]
+            tool_call.parameters = {"text": "hello"}
+            results = await computer.run_actions([tool_call, tool_call])
+
+            assert [result.data for result in results] == ["hello", "hello"]
+            assert computer.session_pool.sessions["TestServer"] is session
+
+            await computer.delete_server("TestServer", tool_type="action")
+            assert session.closed
+        finally:
+            computer.close()
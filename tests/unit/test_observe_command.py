@@ -0,0 +1,194 @@
+"""
+Unit Tests for the Composite Observe Command
+
+Tests the client-side observe meta tool and the server-side observation dispatch
+with fallback for clients without observe support.
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from fastmcp import FastMCP
+
+from aip.messages import Command, Result, ResultStatus
+from ufo.client.computer import CommandRouter, Computer
+from ufo.client.mcp.mcp_server_manager import BaseMCPServer, MCPServerManager
+from ufo.module.dispatcher import BasicCommandDispatcher
+
+
+class InMemoryMCPServer(BaseMCPServer):
+    """In-memory MCP server wrapping a FastMCP instance for testing."""
+
+    def __init__(self, config, server: FastMCP):
+        super().__init__(config)
+        self._server = server
+
+    def start(self, *args, **kwargs) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def reset(self) -> None:
+        pass
+
+
+class StubComputerManager:
+    """Computer manager always returning the same computer."""
+
+    def __init__(self, computer: Computer):
+        self.computer = computer
+
+    async def get_or_create(self, agent_name, process_name=None, root_name=None):
+        return self.computer
+
+
+class RouterCommandDispatcher(BasicCommandDispatcher):
+    """Dispatcher executing commands in-process, counting round trips."""
+
+    def __init__(self, router: CommandRouter, observe: bool = True):
+        self.router = router
+        self.observe = observe
+        self.round_trips = []
+
+    def supports_observe(self) -> bool:
+        return self.observe
+
+    async def execute_commands(self, commands, timeout=6000):
+        self.round_trips.append([command.tool_name for command in commands])
+        return await self.router.execute("AppAgent", "", "", commands)
+
+
+def make_collector(namespace: str) -> InMemoryMCPServer:
+    """Create a data collection server with a slow screenshot tool."""
+    mcp = FastMCP(namespace)
+
+    @mcp.tool(name=f"{namespace.lower()}_screenshot")
+    def screenshot(seconds: float = 0.2) -> str:
+        """Slow screenshot."""
+        time.sleep(seconds)
+        return f"data:image/png;base64,{namespace}"
+
+    return InMemoryMCPServer({"namespace": namespace}, mcp)
+
+
+async def make_computer() -> Computer:
+    computer = Computer(
+        name="test_computer",
+        process_name="",
+        mcp_server_manager=MCPServerManager(),
+        data_collection_servers_config=[],
+        action_servers_config=[],
+    )
+    await computer.add_server(
+        "CollectorA", make_collector("CollectorA"), tool_type="data_collection"
+    )
+    await computer.add_server(
+        "CollectorB", make_collector("CollectorB"), tool_type="data_collection"
+    )
+    return computer
+
+
+def observation_commands():
+    return [
+        Command(tool_name="collectora_screenshot", tool_type="data_collection"),
+        Command(tool_name="missing_tool", tool_type="data_collection"),
+        Command(tool_name="collectorb_screenshot", tool_type="data_collection"),
+    ]
+
+
+class TestComputerObserve:
+    """Test the observe meta tool of Computer"""
+
+    @pytest.mark.asyncio
+    async def test_observe_runs_commands_in_parallel(self):
+        """Test that observe returns ordered results and runs sub-commands concurrently"""
+        computer = await make_computer()
+        try:
+            start = time.monotonic()
+            result = await computer.observe(
+                [command.model_dump() for command in observation_commands()]
+            )
+            elapsed = time.monotonic() - start
+
+            results = [Result(**item) for item in result.data]
+            assert [r.status for r in results] == [
+                ResultStatus.SUCCESS,
+                ResultStatus.FAILURE,
+                ResultStatus.SUCCESS,
+            ]
+            assert results[0].result.endswith("CollectorA")
+            assert results[2].result.endswith("CollectorB")
+            assert elapsed < 0.38
+        finally:
+            computer.close()
+
+    @pytest.mark.asyncio
+    async def test_observe_rejects_meta_tools(self):
+        """Test that observe does not run nested meta tools"""
+        computer = await make_computer()
+        try:
+            result = await computer.observe(
+                [{"tool_name": "observe", "tool_type": "data_collection"}]
+            )
+            assert result.data[0]["status"] == ResultStatus.FAILURE.value
+        finally:
+            computer.close()
+
+
+class TestExecuteObservation:
+    """Test BasicCommandDispatcher.execute_observation"""
+
+    @pytest.mark.asyncio
+    async def test_single_round_trip_with_observe_support(self):
+        """Test that supporting clients get one observe round trip per step"""
+        computer = await make_computer()
+        dispatcher = RouterCommandDispatcher(CommandRouter(StubComputerManager(computer)))
+        try:
+            first = await dispatcher.execute_observation(observation_commands())
+            second = await dispatcher.execute_observation(observation_commands())
+
+            assert [r.status for r in first] == [r.status for r in second]
+            assert first[0].result.endswith("CollectorA")
+            assert dispatcher.round_trips == [["observe"], ["observe"]]
+        finally:
+            computer.close()
+
+    @pytest.mark.asyncio
+    async def test_fallback_for_older_clients(self):
+        """Test that clients without observe get one command per round trip"""
+        computer = await make_computer()
+        dispatcher = RouterCommandDispatcher(
+            CommandRouter(StubComputerManager(computer)), observe=False
+        )
+        try:
+            commands = [
+                Command(tool_name="collectora_screenshot", tool_type="data_collection"),
+                Command(tool_name="collectorb_screenshot", tool_type="data_collection"),
+            ]
+            results = await dispatcher.execute_observation(commands)
+
+            assert [r.status for r in results] == [ResultStatus.SUCCESS] * 2
+            assert dispatcher.round_trips == [
+                ["collectora_screenshot"],
+                ["collectorb_screenshot"],
+            ]
+        finally:
+            computer.close()
+
+
+class TestObserveCapability:
+    """Test the observe capability negotiated on registration"""
+
+    def test_peer_capabilities(self):
+        """Test that only advertised capabilities are reported as supported"""
+        from aip.messages import ClientCapability
+        from aip.protocol.base import AIPProtocol
+
+        protocol = AIPProtocol(MagicMock())
+        assert not protocol.supports_capability(ClientCapability.OBSERVE)
+
+        protocol.peer_capabilities = {"observe"}
+        assert protocol.supports_capability(ClientCapability.OBSERVE)
+        assert protocol.supports_capability("observe")
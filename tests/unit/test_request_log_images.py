@@ -0,0 +1,155 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test the deduplicated images of the request logs: images stored once by content hash,
+references resolved by the trajectory parsers, and the converter of old logs.
+"""
+
+import base64
+import json
+import os
+from io import BytesIO
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from ufo.module import log_writer
+from ufo.module.log_writer import FileWriter, LogWriterService
+from ufo.trajectory.image_blobs import (
+    BLOB_DIR,
+    ImageBlobStore,
+    deduplicate_request_log,
+    is_image_ref,
+    load_request_log,
+)
+
+
+def data_url(seed, size=64):
+    """A PNG data URL of random pixels."""
+    pixels = np.random.default_rng(seed).integers(0, 255, (size, size, 3), dtype=np.uint8)
+    buffered = BytesIO()
+    Image.fromarray(pixels).save(buffered, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buffered.getvalue()).decode()
+
+
+def request_record(step, screenshot, last_screenshot):
+    """A request log record embedding its images twice, like AppAgentRequestLog."""
+    return {
+        "step": step,
+        "image_list": [last_screenshot, screenshot],
+        "prompt": [
+            {"role": "system", "content": "You are an agent."},
+            {
+                "role": "user",
+                "content": [
+                    {"type": "image_url", "image_url": {"url": last_screenshot}},
+                    {"type": "image_url", "image_url": {"url": screenshot}},
+                    {"type": "text", "text": "Click the button."},
+                ],
+            },
+        ],
+    }
+
+
+def blobs(log_path):
+    return sorted(os.listdir(os.path.join(log_path, BLOB_DIR)))
+
+
+@pytest.fixture(autouse=True)
+def service(monkeypatch):
+    monkeypatch.setattr(log_writer, "_log_writer", LogWriterService())
+
+
+class TestImageBlobStore:
+    """Test ImageBlobStore."""
+
+    def test_images_stored_once(self, tmp_path):
+        """Test that repeated images are stored once and resolved to the same record."""
+        store = ImageBlobStore(str(tmp_path))
+        record = request_record(1, data_url(1), data_url(0))
+        original = json.loads(json.dumps(record))
+
+        externalized = store.externalize(record)
+
+        assert record == original
+        assert len(blobs(tmp_path)) == 2
+        assert all(is_image_ref(image) for image in externalized["image_list"])
+        assert (
+            externalized["prompt"][1]["content"][1]["image_url"]["url"]
+            == externalized["image_list"][1]
+        )
+        assert store.resolve(externalized) == original
+
+    def test_small_and_non_canonical_images_stay_inline(self, tmp_path):
+        """Test that images that are too small or cannot be restored exactly are kept."""
+        store = ImageBlobStore(str(tmp_path))
+        small = "data:image/png;base64,iVBORw0KGgo="
+        # Base64 with a line break decodes, but would not be restored the same
+        wrapped = data_url(2)[:100] + "\n" + data_url(2)[100:]
+
+        assert store.externalize({"a": small, "b": wrapped}) == {"a": small, "b": wrapped}
+        assert not os.path.exists(os.path.join(tmp_path, BLOB_DIR))
+
+
+class TestRequestLog:
+    """Test writing and loading deduplicated request logs."""
+
+    def test_writer_and_parser(self, tmp_path):
+        """Test that a request log written with an image store loads back unchanged,
+        and is smaller than the images it embeds."""
+        screenshots = [data_url(i) for i in range(4)]
+        records = [
+            request_record(step, screenshots[step + 1], screenshots[step])
+            for step in range(3)
+        ]
+        writer = FileWriter(
+            os.path.join(tmp_path, "request.log"),
+            image_store=ImageBlobStore(str(tmp_path)),
+        )
+
+        for record in records:
+            writer.write_record(record)
+        writer.flush()
+
+        assert len(blobs(tmp_path)) == 4
+        assert load_request_log(str(tmp_path)) == records
+        assert os.path.getsize(writer.file_path) < len(screenshots[0])
+
+    def test_trajectory_request_log(self, tmp_path):
+        """Test that the trajectory parser exposes the resolved request log."""
+        from ufo.trajectory.parser import Trajectory
+
+        record = request_record(0, data_url(1), data_url(0))
+        open(os.path.join(tmp_path, "response.log"), "w").close()
+        writer = FileWriter(
+            os.path.join(tmp_path, "request.log"),
+            image_store=ImageBlobStore(str(tmp_path)),
+        )
+        writer.write_record(record)
+        writer.flush()
+
+        assert Trajectory(str(tmp_path) + os.sep).request_log == [record]
+
+    def test_convert_old_log(self, tmp_path):
+        """Test that an old log is converted in place, smaller, and loads back the same."""
+        screenshots = [data_url(i) for i in range(4)]
+        records = [
+            request_record(step, screenshots[step + 1], screenshots[step])
+            for step in range(3)
+        ]
+        with open(os.path.join(tmp_path, "request.log"), "w") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+            f.write("not a record\n")
+
+        before, after = deduplicate_request_log(str(tmp_path))
+
+        assert after < before / 3
+        assert load_request_log(str(tmp_path)) == records
+        with open(os.path.join(tmp_path, "request.log")) as f:
+            assert f.read().splitlines()[-1] == "not a record"
+
+        # Converting again changes nothing
+        assert deduplicate_request_log(str(tmp_path)) == (after, after)
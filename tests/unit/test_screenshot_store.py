@@ -0,0 +1,141 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test the in-memory screenshot store: images are served from memory, written in the
+background, and encoded once per LLM image policy.
+"""
+
+import base64
+import os
+import threading
+import time
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from ufo.automator.ui_control.screenshot_store import ScreenshotStore
+
+
+def image_string(color=(255, 0, 0), size=(64, 32)):
+    buffered = BytesIO()
+    Image.new("RGB", size, color).save(buffered, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buffered.getvalue()).decode()
+
+
+class TestScreenshotStore:
+    """Test ScreenshotStore."""
+
+    def test_image_string_is_archived_as_is(self, tmp_path):
+        """Test that a PNG image string is written without re-encoding and reused for the LLM."""
+        store = ScreenshotStore()
+        path = str(tmp_path / "log" / "action_step1.png")
+        url = image_string()
+
+        image = store.put_image_string(url, path)
+        store.flush()
+
+        assert image.size == (64, 32)
+        with open(path, "rb") as f:
+            assert f.read() == base64.b64decode(url.split(",")[1])
+        assert store.encode(path) == url
+
+    def test_flush_directory(self, tmp_path, monkeypatch):
+        """Test that flushing a directory does not wait for the images of other directories."""
+        release = threading.Event()
+        original = ScreenshotStore._write
+
+        def write(self, path, stored):
+            if "session2" in path:
+                release.wait(5)
+            original(self, path, stored)
+
+        monkeypatch.setattr(ScreenshotStore, "_write", write)
+        store = ScreenshotStore()
+        own = tmp_path / "session"
+        store.put_image_string(image_string(), str(own / "action_step1.png"))
+        other = str(tmp_path / "session2" / "action_step1.png")
+        store.put_image_string(image_string(), other)
+
+        start = time.monotonic()
+        store.flush(directory=str(own))
+
+        assert time.monotonic() - start < 2
+        assert (own / "action_step1.png").exists()
+        assert store.exists(other) and not os.path.exists(other)
+
+        release.set()
+        store.flush()
+        assert os.path.exists(other)
+
+    def test_invalid_image_string(self, tmp_path):
+        """Test that an invalid image string is replaced by an empty image, as before."""
+        store = ScreenshotStore(async_save=False)
+        path = str(tmp_path / "action_step1.png")
+
+        image = store.put_image_string("not an image", path)
+
+        assert image.size == (1, 1)
+        assert Image.open(path).size == (1, 1)
+
+    def test_get_from_memory_and_disk(self, tmp_path):
+        """Test that images are served from memory, then from disk once evicted."""
+        store = ScreenshotStore(max_images=1)
+        first = str(tmp_path / "first.png")
+        second = str(tmp_path / "second.png")
+        image = Image.new("RGB", (8, 8), (0, 255, 0))
+
+        store.put(first, image)
+        assert store.get(first) is image
+
+        store.put(second, Image.new("RGB", (8, 8)))
+        reloaded = store.get(first)
+
+        assert reloaded is not image
+        assert reloaded.getpixel((0, 0)) == (0, 255, 0)
+        assert store.exists(first) and not store.exists(str(tmp_path / "missing.png"))
+        assert store.get(str(tmp_path / "missing.png")) is None
+
+    def test_encode_is_cached(self, tmp_path, monkeypatch):
+        """Test that an image is encoded once for the LLM."""
+        store = ScreenshotStore()
+        path = str(tmp_path / "annotated.png")
+        store.put(path, Image.new("RGB", (8, 8)))
+        calls = []
+        encode_image = ScreenshotStore.encode_image
+
+        def counting_encode_image(*args, **kwargs):
+            calls.append(args)
+            return encode_image(*args, **kwargs)
+
+        monkeypatch.setattr(
+            ScreenshotStore, "encode_image", staticmethod(counting_encode_image)
+        )
+
+        assert store.encode(path) == store.encode(path)
+        assert len(calls) == 1
+
+    @pytest.mark.parametrize("llm_format", ["jpeg", "webp"])
+    def test_llm_image_policy(self, tmp_path, llm_format):
+        """Test that the LLM receives the configured format while the archive stays PNG."""
+        store = ScreenshotStore(llm_format=llm_format, llm_quality=50)
+        path = str(tmp_path / "action_step1.png")
+
+        store.put_image_string(image_string(), path)
+        url = store.encode(path)
+        store.flush()
+
+        assert url.startswith(f"data:image/{llm_format};base64,")
+        assert Image.open(path).format == "PNG"
+
+    def test_missing_image_encodes_empty(self, tmp_path):
+        """Test that a missing image is encoded as the empty image."""
+        store = ScreenshotStore()
+
+        assert store.encode(str(tmp_path / "missing.png")).startswith("data:image/png")
+
+    def test_invalid_llm_format(self):
+        """Test that an unsupported LLM image format is rejected."""
+        with pytest.raises(ValueError):
+            ScreenshotStore(llm_format="gif")
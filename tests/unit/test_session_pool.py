@@ -0,0 +1,132 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test the concurrent scheduling of SessionPool: the in-flight limit, per-device
+exclusivity, session timeouts, cancellation and throughput metrics.
+"""
+
+import asyncio
+
+import pytest
+
+from ufo.module.session_pool import SessionPool
+from ufo.module.sessions.mobile_session import MobileSession
+
+
+class FakeSession:
+    """Session that records the concurrency it observes on its device."""
+
+    running = {}
+    max_running = {}
+
+    def __init__(self, id, device="local", duration=0.05, error=None):
+        self.id = id
+        self.device = device
+        self.duration = duration
+        self.error = error
+        self.finished = False
+
+    async def run(self):
+        FakeSession.running[self.device] = FakeSession.running.get(self.device, 0) + 1
+        FakeSession.max_running[self.device] = max(
+            FakeSession.max_running.get(self.device, 0),
+            FakeSession.running[self.device],
+        )
+        try:
+            await asyncio.sleep(self.duration)
+            if self.error:
+                raise self.error
+            self.finished = True
+        finally:
+            FakeSession.running[self.device] -= 1
+
+
+@pytest.fixture(autouse=True)
+def reset_fake_sessions():
+    FakeSession.running = {}
+    FakeSession.max_running = {}
+
+
+def by_device(session):
+    return session.device
+
+
+class TestSessionPool:
+    """Test SessionPool.run_all."""
+
+    @pytest.mark.asyncio
+    async def test_bounded_parallelism_across_devices(self):
+        """Test that sessions on different devices overlap up to the in-flight limit."""
+        sessions = [FakeSession(i, device=f"device_{i}", duration=0.1) for i in range(6)]
+        pool = SessionPool(
+            sessions, max_concurrency=3, session_timeout=0, device_key=by_device
+        )
+
+        results = await pool.run_all()
+
+        assert [r["status"] for r in results] == ["completed"] * 6
+        metrics = pool.get_metrics()
+        assert metrics["max_in_flight"] == 3
+        assert metrics["completed"] == 6
+        # Two waves of 0.1 s rather than six sequential sessions
+        assert metrics["elapsed"] < 0.45
+        assert metrics["sessions_per_hour"] > 0
+
+    @pytest.mark.asyncio
+    async def test_device_exclusivity(self):
+        """Test that sessions driving the same device never overlap."""
+        sessions = [FakeSession(i, device=f"device_{i % 2}") for i in range(6)]
+        pool = SessionPool(
+            sessions, max_concurrency=6, session_timeout=0, device_key=by_device
+        )
+
+        await pool.run_all()
+
+        assert FakeSession.max_running == {"device_0": 1, "device_1": 1}
+        assert pool.get_metrics()["max_in_flight"] == 2
+
+    @pytest.mark.asyncio
+    async def test_default_device_key(self):
+        """Test that local sessions share the desktop, and mobile and service sessions their device."""
+        local = FakeSession(0)
+        remote = FakeSession(1)
+        remote.task_protocol = object()
+        mobile = MobileSession.__new__(MobileSession)
+
+        keys = [SessionPool.default_device_key(s) for s in (local, remote, mobile)]
+
+        assert SessionPool.default_device_key(FakeSession(2)) == keys[0]
+        assert len(set(keys)) == 3
+
+    @pytest.mark.asyncio
+    async def test_timeout_and_failure_do_not_stop_the_batch(self):
+        """Test that a slow or failing session is recorded and the others still run."""
+        sessions = [
+            FakeSession(0, device="a", duration=1.0),
+            FakeSession(1, device="b", error=RuntimeError("boom")),
+            FakeSession(2, device="c"),
+        ]
+        pool = SessionPool(
+            sessions, max_concurrency=3, session_timeout=0.2, device_key=by_device
+        )
+
+        results = await pool.run_all()
+
+        assert [r["status"] for r in results] == ["timed_out", "failed", "completed"]
+        assert results[1]["error"] == "boom"
+        assert sessions[2].finished
+
+    @pytest.mark.asyncio
+    async def test_cancel(self):
+        """Test that cancelling stops the running and pending sessions."""
+        sessions = [FakeSession(i, duration=1.0) for i in range(3)]
+        pool = SessionPool(sessions, max_concurrency=3, session_timeout=0)
+
+        runner = asyncio.create_task(pool.run_all())
+        await asyncio.sleep(0.05)
+        pool.cancel()
+        results = await runner
+
+        assert [r["status"] for r in results] == ["cancelled"] * 3
+        assert not any(session.finished for session in sessions)
@@ -0,0 +1,113 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test the vectorised control merge: the dense and grid paths must keep the same targets
+as the pairwise target_info_iou loop.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from ufo.agents.processors.schemas.target import TargetInfo, TargetKind
+from ufo.automator.ui_control import spatial_index
+from ufo.automator.ui_control.screenshot import PhotographerFacade
+
+
+def make_targets(count, seed, width=1920, height=1080):
+    rng = random.Random(seed)
+    targets = []
+    for i in range(count):
+        kind = rng.random()
+        if kind < 0.05:
+            rect = None
+        elif kind < 0.1:
+            # Degenerate rects, empty or inverted
+            left, top = rng.randint(0, width), rng.randint(0, height)
+            rect = [left, top, left - rng.randint(0, 20), top + rng.randint(0, 20)]
+        elif kind < 0.15:
+            # Large containers
+            rect = [0, 0, rng.randint(width // 2, width), rng.randint(height // 2, height)]
+        else:
+            left, top = rng.randint(0, width - 10), rng.randint(0, height - 10)
+            rect = [left, top, left + rng.randint(5, 200), top + rng.randint(5, 60)]
+        targets.append(TargetInfo(kind=TargetKind.CONTROL, name=f"c{i}", id=str(i), rect=rect))
+    return targets
+
+
+def reference_merge(main_targets, additional_targets, threshold):
+    """The pairwise merge, as merge_target_info_list used to do it."""
+    merged = main_targets.copy()
+    for additional in additional_targets:
+        if not any(
+            PhotographerFacade.target_info_iou(additional, main) > threshold
+            for main in main_targets
+        ):
+            merged.append(additional)
+    return merged
+
+
+class TestMergeTargetInfoList:
+    """Test PhotographerFacade.merge_target_info_list."""
+
+    @pytest.mark.parametrize("threshold", [0.1, 0.0, 0.5])
+    def test_same_result_as_pairwise_merge(self, threshold):
+        """Test that the vectorised merge keeps the same targets, in the same order."""
+        main_targets = make_targets(300, seed=1)
+        additional_targets = make_targets(400, seed=2)
+
+        merged = PhotographerFacade.merge_target_info_list(
+            main_targets, additional_targets, iou_overlap_threshold=threshold
+        )
+
+        assert merged == reference_merge(main_targets, additional_targets, threshold)
+
+    def test_negative_threshold(self):
+        """Test that a negative threshold drops every additional target, as before."""
+        main_targets = make_targets(5, seed=3)
+        additional_targets = make_targets(5, seed=4)
+
+        merged = PhotographerFacade.merge_target_info_list(
+            main_targets, additional_targets, iou_overlap_threshold=-1
+        )
+
+        assert merged == main_targets
+
+    def test_empty_lists(self):
+        """Test merging with an empty main or additional list."""
+        targets = make_targets(5, seed=5)
+
+        assert PhotographerFacade.merge_target_info_list([], targets) == targets
+        assert PhotographerFacade.merge_target_info_list(targets, []) == targets
+
+
+class TestSpatialIndex:
+    """Test the IoU matrix and the grid index."""
+
+    def test_iou_matrix_matches_target_info_iou(self):
+        """Test that every IoU value matches the scalar computation."""
+        first = make_targets(40, seed=6)
+        second = make_targets(50, seed=7)
+
+        iou = spatial_index.iou_matrix(
+            spatial_index.rect_array([t.rect for t in first]),
+            spatial_index.rect_array([t.rect for t in second]),
+        )
+
+        expected = [
+            [PhotographerFacade.target_info_iou(a, b) for b in second] for a in first
+        ]
+        assert iou.tolist() == expected
+
+    @pytest.mark.parametrize("threshold", [0.0, 0.1, 0.3])
+    def test_grid_matches_dense(self, threshold):
+        """Test that the grid index finds the same overlaps as the dense path."""
+        query = spatial_index.rect_array([t.rect for t in make_targets(500, seed=8)])
+        indexed = spatial_index.rect_array([t.rect for t in make_targets(500, seed=9)])
+
+        dense = spatial_index.overlapping_mask(query, indexed, threshold, use_grid=False)
+        grid = spatial_index.overlapping_mask(query, indexed, threshold, use_grid=True)
+
+        np.testing.assert_array_equal(dense, grid)
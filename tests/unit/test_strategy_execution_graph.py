@@ -0,0 +1,221 @@
+"""
+Unit Tests for Dependency-Driven Strategy Execution
+
+Tests the strategy execution graph built from @depends_on/@provides metadata, the
+concurrent ComposedStrategy mode and the critical-path timing report.
+"""
+
+import asyncio
+
+import pytest
+
+from ufo.agents.processors.context.processing_context import BasicProcessorContext
+from ufo.agents.processors.core.processor_framework import (
+    ProcessingContext,
+    ProcessingPhase,
+    ProcessingResult,
+)
+from ufo.agents.processors.core.strategy_dependency import (
+    StrategyExecutionGraph,
+    depends_on,
+    provides,
+)
+from ufo.agents.processors.strategies.processing_strategy import (
+    BaseProcessingStrategy,
+    ComposedStrategy,
+)
+
+
+class SleepStrategy(BaseProcessingStrategy):
+    """Strategy sleeping for a while, then providing its declared fields."""
+
+    def __init__(self, name, duration=0.1, success=True, fail_fast=False):
+        super().__init__(name=name, fail_fast=fail_fast)
+        self.duration = duration
+        self.success = success
+        self.seen = {}
+        self.finished = False
+
+    async def execute(self, agent, context):
+        for dependency in self.get_dependencies():
+            self.seen[dependency.field_name] = context.get_local(
+                dependency.field_name
+            )
+        await asyncio.sleep(self.duration)
+        self.finished = True
+        if not self.success:
+            return ProcessingResult(success=False, data={}, error="failed")
+        return ProcessingResult(
+            success=True, data={field: self.name for field in self.get_provides()}
+        )
+
+
+@depends_on("subtask")
+@provides("knowledge")
+class KnowledgeStrategy(SleepStrategy):
+    pass
+
+
+@depends_on("log_path")
+@provides("screenshot")
+class ScreenshotStrategy(SleepStrategy):
+    pass
+
+
+@depends_on("screenshot")
+@provides("controls")
+class ControlStrategy(SleepStrategy):
+    pass
+
+
+class UndeclaredStrategy(SleepStrategy):
+    pass
+
+
+def make_context():
+    return ProcessingContext(
+        global_context=None, local_context=BasicProcessorContext(agent_type="AppAgent")
+    )
+
+
+def data_collection(**kwargs):
+    return [
+        KnowledgeStrategy("knowledge", **kwargs),
+        ScreenshotStrategy("screenshot", **kwargs),
+        ControlStrategy("controls", **kwargs),
+    ]
+
+
+class TestStrategyExecutionGraph:
+    """Test building and running the strategy graph."""
+
+    def test_graph_from_metadata(self):
+        """Test that strategies only wait for the providers of their dependencies."""
+        graph = StrategyExecutionGraph(data_collection())
+
+        assert graph.describe() == {
+            "knowledge": [],
+            "screenshot": [],
+            "controls": ["screenshot"],
+        }
+
+    def test_sequential_graph_is_a_chain(self):
+        """Test that the sequential graph keeps the declaration order."""
+        graph = StrategyExecutionGraph(data_collection(), sequential=True)
+
+        assert graph.describe() == {
+            "knowledge": [],
+            "screenshot": ["knowledge"],
+            "controls": ["screenshot"],
+        }
+
+    def test_undeclared_strategy_is_a_barrier(self):
+        """Test that a strategy without metadata runs alone, in order."""
+        strategies = data_collection()
+        strategies.insert(1, UndeclaredStrategy("undeclared"))
+        graph = StrategyExecutionGraph(strategies)
+
+        assert graph.describe() == {
+            "knowledge": [],
+            "undeclared": ["knowledge"],
+            "screenshot": ["undeclared"],
+            "controls": ["undeclared", "screenshot"],
+        }
+
+    @pytest.mark.asyncio
+    async def test_independent_strategies_overlap(self):
+        """Test that independent strategies run at the same time."""
+        strategies = data_collection(duration=0.1)
+        context = make_context()
+
+        results, timings = await StrategyExecutionGraph(strategies).execute(
+            None, context
+        )
+
+        assert all(result.success for result in results)
+        by_name = {timing.strategy_name: timing for timing in timings}
+        # Knowledge overlaps the screenshot, controls follow the screenshot
+        assert by_name["knowledge"].start < by_name["screenshot"].end
+        assert by_name["controls"].start >= by_name["screenshot"].end
+        assert max(timing.end for timing in timings) < 0.28
+        # Dependencies are merged into the context before successors start
+        assert strategies[2].seen == {"screenshot": "screenshot"}
+        assert context.get_local("knowledge") == "knowledge"
+
+    @pytest.mark.asyncio
+    async def test_critical_path(self):
+        """Test that the critical path follows the chain finishing last."""
+        strategies = [
+            KnowledgeStrategy("knowledge", duration=0.05),
+            ScreenshotStrategy("screenshot", duration=0.1),
+            ControlStrategy("controls", duration=0.05),
+        ]
+
+        _, timings = await StrategyExecutionGraph(strategies).execute(
+            None, make_context()
+        )
+
+        assert [t.strategy_name for t in timings if t.critical] == [
+            "screenshot",
+            "controls",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_fail_fast_cancels_remaining(self):
+        """Test that a failure cancels the strategies still running or waiting."""
+        strategies = [
+            KnowledgeStrategy("knowledge", duration=0.3),
+            ScreenshotStrategy("screenshot", duration=0.05, success=False),
+            ControlStrategy("controls", duration=0.05),
+        ]
+
+        results, _ = await StrategyExecutionGraph(strategies).execute(
+            None, make_context(), fail_fast=True
+        )
+
+        assert not results[1].success
+        assert results[0] is None and results[2] is None
+        assert not strategies[0].finished and not strategies[2].finished
+
+
+class TestConcurrentComposedStrategy:
+    """Test ComposedStrategy in concurrent mode."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_composed_strategy(self):
+        """Test that the composed result carries the per-strategy timings."""
+        composed = ComposedStrategy(
+            strategies=data_collection(duration=0.1),
+            name="DataCollection",
+            concurrent=True,
+        )
+        context = make_context()
+
+        result = await composed.execute(None, context)
+
+        assert result.success
+        assert result.phase == ProcessingPhase.DATA_COLLECTION
+        assert result.execution_time < 0.28
+        assert [t["strategy"] for t in result.strategy_timings] == [
+            "knowledge",
+            "screenshot",
+            "controls",
+        ]
+        assert context.get_local("controls") == "controls"
+
+    @pytest.mark.asyncio
+    async def test_composed_failure(self):
+        """Test that a failed component fails the composed strategy in fail-fast mode."""
+        composed = ComposedStrategy(
+            strategies=[
+                ScreenshotStrategy("screenshot", success=False, duration=0.01),
+                ControlStrategy("controls", duration=0.01),
+            ],
+            fail_fast=True,
+            concurrent=True,
+        )
+
+        result = await composed.execute(None, make_context())
+
+        assert not result.success
+        assert "screenshot" in result.error
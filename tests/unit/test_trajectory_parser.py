@@ -0,0 +1,183 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test the streaming Trajectory loader: steps parsed on demand, screenshots decoded on
+first access, the step index for random access, and the loaders built on it.
+"""
+
+import base64
+import json
+import os
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from ufo.experience.experience_parser import ExperienceLogLoader
+from ufo.trajectory.parser import LazyScreenshots, Trajectory
+
+
+def app_step(step, subtask="Write the title"):
+    return {
+        "agent_type": "AppAgent",
+        "request": "Write a document",
+        "Step": step,
+        "Round": 0,
+        "session_step": step,
+        "subtask": subtask,
+        "Subtask": subtask,
+        "Application": "WINWORD.EXE",
+        "thought": f"Thought {step}",
+        "action": [{"action_string": f"click(id={step})", "result": "ok"}],
+        "clean_screenshot_path": f"logs/task/action_step{step}.png",
+        "annotated_screenshot_path": f"logs/task/action_step{step}_annotated.png",
+        "selected_control_screenshot_path": "",
+    }
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    """A trajectory of a host agent step and three app agent steps, with screenshots."""
+    steps = [{"agent_type": "HostAgent", "request": "Write a document", "Step": 0}]
+    steps += [app_step(step) for step in range(1, 4)]
+
+    with open(tmp_path / "response.log", "w", encoding="utf-8") as f:
+        f.write(json.dumps(steps[0]) + "\n")
+        f.write("not a step\n")
+        for step in steps[1:]:
+            f.write(json.dumps(step) + "\n")
+
+    for step in range(1, 4):
+        color = (step * 60, 0, 0)
+        Image.new("RGB", (32, 16), color).save(tmp_path / f"action_step{step}.png")
+        Image.new("RGB", (32, 16), color).save(
+            tmp_path / f"action_step{step}_annotated.png"
+        )
+
+    return tmp_path
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    """Count the screenshots decoded."""
+    paths = []
+    original = Trajectory.load_screenshot
+
+    def load_screenshot(path):
+        paths.append(path)
+        return original(path)
+
+    monkeypatch.setattr(Trajectory, "load_screenshot", staticmethod(load_screenshot))
+    return paths
+
+
+class TestLazyLoading:
+    """Test that steps and screenshots are only loaded when used."""
+
+    def test_construction_decodes_nothing(self, log_dir, decodes):
+        """Test that opening a trajectory and streaming its steps decodes no screenshot."""
+        trajectory = Trajectory(str(log_dir))
+        steps = list(trajectory.iter_steps())
+
+        assert [step["agent_type"] for step in steps] == ["HostAgent"] + ["AppAgent"] * 3
+        assert decodes == []
+
+    def test_screenshots_decode_on_first_access(self, log_dir, decodes):
+        """Test that a screenshot is decoded once, on first access."""
+        step = next(Trajectory(str(log_dir)).iter_steps(agent_type="AppAgent"))
+        screenshots = step[Trajectory._step_screenshot_key]
+
+        assert isinstance(screenshots, LazyScreenshots)
+        assert set(screenshots) == set(Trajectory._screenshot_keys)
+        assert not screenshots.is_loaded("clean_screenshot_path")
+
+        image = screenshots["clean_screenshot_path"]
+        assert screenshots.get("clean_screenshot_path") is image
+        assert image.getpixel((0, 0)) == (60, 0, 0)
+        assert screenshots.get("concat_screenshot_path") is None
+        assert screenshots.get("selected_control_screenshot_path") is None
+        assert decodes == [str(log_dir / "action_step1.png")]
+
+    def test_step_log_compatibility(self, log_dir):
+        """Test the list views of the steps."""
+        trajectory = Trajectory(str(log_dir))
+
+        assert len(trajectory.step_log) == 4
+        assert [step["Step"] for step in trajectory.app_agent_log] == [1, 2, 3]
+        assert len(trajectory.host_agent_log) == 1
+        assert trajectory.request == "Write a document"
+        assert trajectory.step_number == 4
+        assert trajectory.structured_data["StepLog"] is trajectory.step_log
+
+
+class TestStepIndex:
+    """Test the random access to the steps."""
+
+    def test_get_step(self, log_dir):
+        """Test that indexed steps are the streamed steps."""
+        trajectory = Trajectory(str(log_dir))
+        steps = list(trajectory.iter_steps())
+
+        assert trajectory.step_count == 4
+        assert trajectory.step_index["agent_types"][1] == "AppAgent"
+        for position, step in enumerate(steps):
+            loaded = trajectory.get_step(position)
+            del loaded["ScreenshotImages"], step["ScreenshotImages"]
+            assert loaded == step
+        assert trajectory.get_step(-1)["Step"] == 3
+
+    def test_saved_index_extended_on_append(self, log_dir):
+        """Test that a saved index is reused, and extended with the steps appended since."""
+        path = Trajectory(str(log_dir)).save_step_index()
+        assert os.path.basename(path) == "response.log.index"
+        with open(path) as f:
+            assert len(json.load(f)["offsets"]) == 4
+
+        with open(log_dir / "response.log", "a", encoding="utf-8") as f:
+            f.write(json.dumps(app_step(4)) + "\n")
+            f.write('{"agent_type": "AppAgent", "Ste')
+
+        trajectory = Trajectory(str(log_dir))
+        assert trajectory.step_count == 5
+        assert trajectory.get_step(4)["Step"] == 4
+
+        # The partial line is indexed once complete
+        with open(log_dir / "response.log", "a", encoding="utf-8") as f:
+            f.write('p": 5}\n')
+        assert trajectory.step_count == 6
+        assert trajectory.get_step(5)["Step"] == 5
+
+
+class TestLoadersOnSteps:
+    """Test the markdown export and the experience loader."""
+
+    def test_markdown(self, log_dir, decodes):
+        """Test that the markdown export summarizes and renders the app agent steps."""
+        output = log_dir / "output.md"
+        Trajectory(str(log_dir)).to_markdown(str(output))
+        markdown = output.read_text(encoding="utf-8")
+
+        assert "- **Request**: Write a document" in markdown
+        assert "- **Total Steps**: 4" in markdown
+        assert "- **Host Agent Steps**: 1" in markdown
+        assert "- **App Agent Steps**: 3" in markdown
+        assert markdown.count("### Step") == 3
+        assert "- **Action**: click(id=2)" in markdown
+        assert '<img src="./action_step3_annotated.png"' in markdown
+        assert decodes == []
+
+    def test_experience_loader(self, log_dir, decodes):
+        """Test that the experience loader encodes the screenshot files without decoding."""
+        loader = ExperienceLogLoader(str(log_dir))
+        [partition] = loader.subtask_partition
+
+        assert partition["application"] == "WINWORD.EXE"
+        assert [log["Step"] for log in partition["logs"]] == [1, 2, 3]
+
+        image_urls = partition["logs"][1][ExperienceLogLoader._image_url_key]
+        encoded = image_urls["clean_screenshot_path"].split(",", 1)[1]
+        image = Image.open(BytesIO(base64.b64decode(encoded)))
+        assert image.getpixel((0, 0)) == (120, 0, 0)
+        assert image_urls["concat_screenshot_path"].startswith("data:image/png;base64,")
+        assert decodes == []
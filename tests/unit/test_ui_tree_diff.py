@@ -0,0 +1,203 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test the keyed UI tree diff, the delta transport between client and server, and the
+keyframe and delta files of the UI tree logs.
+"""
+
+import copy
+import itertools
+import json
+import os
+
+import pytest
+
+from ufo.automator.ui_control.ui_tree import UITree
+from ufo.automator.ui_control.ui_tree_sync import (
+    UITreeHistory,
+    UITreeRecorder,
+    load_ui_tree,
+)
+
+
+def node(name, control_type="Button", children=(), left=0):
+    return {
+        "id": None,
+        "name": name,
+        "control_type": control_type,
+        "rectangle": {"left": left, "top": 0, "right": left + 10, "bottom": 10},
+        "level": 0,
+        "children": list(children),
+    }
+
+
+def number(tree):
+    """Number the nodes in preorder and set their levels, as UITree does."""
+    counter = itertools.count()
+
+    def visit(item, level):
+        item["id"] = f"node_{next(counter)}"
+        item["level"] = level
+        for child in item["children"]:
+            visit(child, level + 1)
+
+    visit(tree, 0)
+    return tree
+
+
+def window(*names):
+    return number(
+        node(
+            "Window",
+            "Window",
+            [node("Toolbar", "Pane", [node(name) for name in names])]
+            + [node("Document", "Document", [node("Text", "Text")])],
+        )
+    )
+
+
+def round_trip(tree_1, tree_2):
+    diff = UITree.keyed_ui_tree_diff(tree_1, tree_2)
+    assert UITree.apply_keyed_ui_tree_diff(tree_1, diff) == tree_2
+    return diff
+
+
+class TestKeyedUITreeDiff:
+    """Test UITree.keyed_ui_tree_diff and apply_keyed_ui_tree_diff."""
+
+    def test_unchanged_tree(self):
+        """Test that identical trees have an empty diff."""
+        assert round_trip(window("Save", "Open"), window("Save", "Open")) == []
+
+    def test_field_change_is_local(self):
+        """Test that a changed field only produces a set operation on its node."""
+        tree_1 = window("Save", "Open")
+        tree_2 = copy.deepcopy(tree_1)
+        tree_2["children"][1]["children"][0]["rectangle"]["right"] = 99
+
+        diff = round_trip(tree_1, tree_2)
+
+        assert diff == [
+            {
+                "op": "set",
+                "path": [1, 0],
+                "fields": {"rectangle": {"left": 0, "top": 0, "right": 99, "bottom": 10}},
+            }
+        ]
+
+    def test_insertion_keeps_siblings_by_key(self):
+        """Test that an insertion before existing children sends only the new child,
+        and renumbers the ids of the following nodes."""
+        tree_1 = window("Save", "Open")
+        tree_2 = window("New", "Save", "Open")
+
+        diff = round_trip(tree_1, tree_2)
+
+        assert len(diff) == 1
+        assert diff[0]["op"] == "children"
+        assert diff[0]["path"] == [0]
+        assert diff[0]["children"][0]["name"] == "New"
+        assert diff[0]["children"][1:] == [0, 1]
+
+    def test_removal_and_reorder(self):
+        """Test that removed and reordered children are rebuilt from the base tree."""
+        diff = round_trip(window("Save", "Open", "Close"), window("Close", "Save"))
+
+        assert diff == [{"op": "children", "path": [0], "children": [2, 0]}]
+
+    def test_unset_and_new_fields(self):
+        """Test that fields added or removed from a node are transmitted."""
+        tree_1 = window("Save")
+        tree_1["error"] = "partial tree"
+        tree_2 = window("Save")
+        tree_2["children"][0]["extra"] = 1
+
+        round_trip(tree_1, tree_2)
+
+    def test_ids_not_in_preorder(self):
+        """Test that a tree whose ids cannot be restored is not diffed."""
+        tree_2 = window("Save")
+        tree_2["children"][0]["id"] = "node_7"
+
+        assert UITree.keyed_ui_tree_diff(window("Save"), tree_2) is None
+
+    def test_base_tree_is_not_modified(self):
+        """Test that applying a diff leaves the base tree untouched."""
+        tree_1 = window("Save", "Open")
+        expected = copy.deepcopy(tree_1)
+        tree_2 = window("Open")
+        tree_2["children"][0]["rectangle"]["left"] = 5
+
+        round_trip(tree_1, tree_2)
+
+        assert tree_1 == expected
+
+
+class TestUITreeTransport:
+    """Test UITreeHistory and UITreeRecorder.receive."""
+
+    def test_deltas_against_acknowledged_version(self):
+        """Test that the client sends a diff once the server acknowledged a version."""
+        history = UITreeHistory()
+        recorder = UITreeRecorder()
+
+        first = history.encode(window("Save"), recorder.version)
+        assert "tree" in first
+        assert recorder.receive(first) == window("Save")
+
+        second = history.encode(window("Save", "Open"), recorder.version)
+        assert second["base_version"] == first["version"]
+        assert "tree" not in second
+        assert recorder.receive(second) == window("Save", "Open")
+        assert recorder.version == second["version"]
+
+    def test_unknown_base_version(self):
+        """Test that an evicted base version is answered in full, and that the server
+        rejects a diff against another version."""
+        history = UITreeHistory(max_versions=1)
+        first = history.encode(window("Save"))
+        history.encode(window("Open"))
+
+        assert "tree" in history.encode(window("Close"), first["version"])
+
+        recorder = UITreeRecorder()
+        recorder.receive(first)
+        stale = {"version": "v", "base_version": "other", "diff": []}
+        with pytest.raises(ValueError):
+            recorder.receive(stale)
+        with pytest.raises(ValueError):
+            recorder.receive({"error": "No window selected"})
+
+
+class TestUITreeFiles:
+    """Test the keyframe and delta files of UITreeRecorder."""
+
+    def test_keyframes_and_deltas(self, tmp_path):
+        """Test that every saved step loads back, with a keyframe every interval."""
+        recorder = UITreeRecorder(keyframe_interval=3)
+        trees = [window(*[f"Item {i}" for i in range(step + 1)]) for step in range(5)]
+        paths = [os.path.join(tmp_path, f"ui_tree_step{i}.json") for i in range(5)]
+
+        keyframes = [recorder.save(tree, path) for tree, path in zip(trees, paths)]
+
+        assert keyframes == [True, False, False, True, False]
+        for tree, path in zip(trees, paths):
+            assert load_ui_tree(path) == tree
+
+        with open(paths[1]) as file:
+            delta = json.load(file)
+        assert delta["format"] == "ui_tree_delta"
+        assert delta["base"] == "ui_tree_step0.json"
+        assert os.path.getsize(paths[1]) < os.path.getsize(paths[0])
+
+    def test_keyframe_interval_one(self, tmp_path):
+        """Test that an interval of 1 saves every tree in full."""
+        recorder = UITreeRecorder(keyframe_interval=1)
+        path = os.path.join(tmp_path, "ui_tree_step1.json")
+
+        recorder.save(window("Save"), os.path.join(tmp_path, "ui_tree_step0.json"))
+        assert recorder.save(window("Open"), path)
+
+        with open(path) as file:
+            assert json.load(file) == window("Open")
@@ -0,0 +1,203 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Test the concurrent sessions of UFOWebSocketClient against a local stub server:
+per-session workers, the concurrency limit, and heartbeats flowing during long commands.
+"""
+
+import asyncio
+import datetime
+import time
+import uuid
+
+import pytest
+import websockets
+
+from aip.messages import (
+    ClientMessage,
+    ClientMessageType,
+    Command,
+    Result,
+    ResultStatus,
+    ServerMessage,
+    ServerMessageType,
+    TaskStatus,
+)
+from ufo.client.websocket import UFOWebSocketClient
+
+
+def now():
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+class StubUFOClient:
+    """UFO client whose steps sleep, recording the steps running at the same time."""
+
+    def __init__(self, step_time=0.1):
+        self.client_id = "stub_device"
+        self.platform = "linux"
+        self.session_id = None
+        self.task_lock = asyncio.Lock()
+        self.step_time = step_time
+        self.running = 0
+        self.max_running = 0
+        self.steps = []
+        self.resets = 0
+
+    def reset(self):
+        self.resets += 1
+
+    async def execute_step(self, response):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.step_time)
+            self.steps.append((response.session_id, response.actions[0].tool_name))
+            return [Result(status=ResultStatus.SUCCESS, call_id=response.response_id)]
+        finally:
+            self.running -= 1
+
+
+class StubServer:
+    """Server running sessions of a number of steps, one command at a time per session."""
+
+    def __init__(self, sessions=4, steps=5):
+        self.sessions = [f"session_{i}" for i in range(sessions)]
+        self.steps = steps
+        self.next_step = {}
+        self.results = []
+        self.heartbeats = []
+        self.task_requests = []
+        self.done = asyncio.Event()
+
+    def command(self, session_id):
+        step = self.next_step[session_id]
+        self.next_step[session_id] += 1
+        last = step == self.steps - 1
+        return ServerMessage(
+            type=ServerMessageType.COMMAND,
+            status=TaskStatus.COMPLETED if last else TaskStatus.CONTINUE,
+            session_id=session_id,
+            response_id=str(uuid.uuid4()),
+            agent_name="AppAgent",
+            actions=[Command(tool_name=f"step_{step}", tool_type="action")],
+            timestamp=now(),
+        ).model_dump_json()
+
+    async def handler(self, ws):
+        register = ClientMessage.model_validate_json(await ws.recv())
+        assert register.type == ClientMessageType.REGISTER
+        await ws.send(
+            ServerMessage(
+                type=ServerMessageType.HEARTBEAT, status=TaskStatus.OK, timestamp=now()
+            ).model_dump_json()
+        )
+
+        for session_id in self.sessions:
+            self.next_step[session_id] = 0
+            await ws.send(self.command(session_id))
+
+        async for frame in ws:
+            message = ClientMessage.model_validate_json(frame)
+            if message.type == ClientMessageType.HEARTBEAT:
+                self.heartbeats.append(time.monotonic())
+            elif message.type == ClientMessageType.TASK:
+                self.task_requests.append(message.request)
+            elif message.type == ClientMessageType.COMMAND_RESULTS:
+                self.results.append((message.session_id, time.monotonic()))
+                if self.next_step[message.session_id] < self.steps:
+                    await ws.send(self.command(message.session_id))
+                elif len(self.results) == len(self.sessions) * self.steps:
+                    self.done.set()
+
+
+async def run_sessions(server, ufo_client, max_concurrent_tasks, heartbeat=120):
+    """Connect a client to the stub server and wait until all the sessions ran."""
+    async with websockets.serve(server.handler, "127.0.0.1", 0) as ws_server:
+        port = ws_server.sockets[0].getsockname()[1]
+        ws_client = UFOWebSocketClient(
+            f"ws://127.0.0.1:{port}",
+            ufo_client,
+            max_retries=1,
+            timeout=heartbeat,
+            max_concurrent_tasks=max_concurrent_tasks,
+        )
+        client_task = asyncio.create_task(ws_client.connect_and_listen())
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(server.done.wait(), 10)
+            return ws_client, time.monotonic() - start
+        finally:
+            client_task.cancel()
+            await asyncio.gather(client_task, return_exceptions=True)
+
+
+class TestConcurrentSessions:
+    """Test the per-session workers of UFOWebSocketClient."""
+
+    @pytest.mark.asyncio
+    async def test_throughput_scales_with_concurrency(self):
+        """Test that independent sessions overlap up to the limit, in order per session."""
+        serial_client = StubUFOClient()
+        _, serial_time = await run_sessions(StubServer(), serial_client, 1)
+
+        concurrent_client = StubUFOClient()
+        _, concurrent_time = await run_sessions(StubServer(), concurrent_client, 4)
+
+        assert serial_client.max_running == 1
+        assert concurrent_client.max_running == 4
+        # 20 steps of 0.1 s: about 2 s one at a time, about 0.5 s four at a time
+        assert concurrent_time < serial_time / 2
+
+        for session_id in StubServer().sessions:
+            steps = [step for sid, step in concurrent_client.steps if sid == session_id]
+            assert steps == [f"step_{i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        """Test that no more sessions execute at the same time than the limit."""
+        ufo_client = StubUFOClient(step_time=0.05)
+        ws_client, _ = await run_sessions(StubServer(sessions=6, steps=3), ufo_client, 2)
+
+        assert ufo_client.max_running == 2
+        assert len(ufo_client.steps) == 18
+        # The workers finish with their sessions
+        assert not ws_client._session_workers
+        assert not ws_client.active_sessions
+
+    @pytest.mark.asyncio
+    async def test_heartbeats_during_long_command(self):
+        """Test that the connection stays served while a command runs."""
+        server = StubServer(sessions=1, steps=1)
+        ufo_client = StubUFOClient(step_time=0.5)
+
+        await run_sessions(server, ufo_client, 1, heartbeat=0.05)
+
+        result_time = server.results[0][1]
+        assert len([t for t in server.heartbeats if t < result_time]) >= 4
+
+    @pytest.mark.asyncio
+    async def test_tasks_started_while_running(self):
+        """Test that a task request is sent while other sessions run, without a reset."""
+        server = StubServer(sessions=1, steps=4)
+        ufo_client = StubUFOClient(step_time=0.1)
+
+        async with websockets.serve(server.handler, "127.0.0.1", 0) as ws_server:
+            port = ws_server.sockets[0].getsockname()[1]
+            ws_client = UFOWebSocketClient(
+                f"ws://127.0.0.1:{port}", ufo_client, max_retries=1
+            )
+            client_task = asyncio.create_task(ws_client.connect_and_listen())
+            try:
+                while not ws_client.active_sessions:
+                    await asyncio.sleep(0.01)
+                await ws_client.start_task("first", None)
+                await ws_client.start_task("second", None)
+                await asyncio.wait_for(server.done.wait(), 10)
+            finally:
+                client_task.cancel()
+                await asyncio.gather(client_task, return_exceptions=True)
+
+        assert server.task_requests == ["first", "second"]
+        assert ufo_client.resets == 0
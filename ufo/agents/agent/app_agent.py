@@ -4,9 +4,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
+import time
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import openai
@@ -32,6 +34,8 @@ from aip.messages import Command, MCPToolInfo
 from ufo.module import interactor
 from ufo.module.context import Context, ContextNames
 from ufo.prompter.agent_prompter import AppAgentPrompter
+from ufo.rag.retrieval_cache import RetrievalCache
+from ufo.rag.retriever import embed_query
 
 console = Console()
 
@@ -76,6 +80,7 @@ class AppAgent(BasicAgent):
         self.online_doc_retriever = None
         self.experience_retriever = None
         self.human_demonstration_retriever = None
+        self.retrieval_cache = RetrievalCache(ttl=ufo_config.rag.retrieval_cache_ttl)
 
         self._mode = mode
 
@@ -254,53 +259,161 @@ class AppAgent(BasicAgent):
         :return: The prompt message for the external_knowledge.
         """
 
-        # Retrieve offline documents and construct the prompt
-        if self.offline_doc_retriever:
+        return (
+            self.offline_docs_prompt_helper(request, offline_top_k),
+            self.online_docs_prompt_helper(request, online_top_k),
+        )
 
-            offline_docs = self.offline_doc_retriever.retrieve(
-                request,
-                offline_top_k,
-                filter=None,
-            )
+    def offline_docs_prompt_helper(
+        self, request: str, offline_top_k: int, embedding: List[float] = None
+    ) -> str:
+        """
+        Retrieve offline documents and construct the prompt.
+        :param request: The request.
+        :param offline_top_k: The number of offline documents to retrieve.
+        :param embedding: The precomputed embedding of the request.
+        :return: The prompt message for the offline documents.
+        """
+
+        if not self.offline_doc_retriever:
+            return ""
+
+        offline_docs = self.offline_doc_retriever.retrieve(
+            request,
+            offline_top_k,
+            filter=None,
+            embedding=embedding,
+        )
+
+        format_string = "[Similar Requests]: {question}\nStep: {answer}\n"
+
+        return self.prompter.retrieved_documents_prompt_helper(
+            "[Help Documents]",
+            "",
+            [
+                format_string.format(
+                    question=doc.metadata.get("title", ""),
+                    answer=doc.metadata.get("text", ""),
+                )
+                for doc in offline_docs
+            ],
+        )
 
-            format_string = "[Similar Requests]: {question}\nStep: {answer}\n"
+    def online_docs_prompt_helper(
+        self, request: str, online_top_k: int, embedding: List[float] = None
+    ) -> str:
+        """
+        Retrieve online documents and construct the prompt.
+        :param request: The request.
+        :param online_top_k: The number of online documents to retrieve.
+        :param embedding: The precomputed embedding of the request.
+        :return: The prompt message for the online documents.
+        """
 
-            offline_docs_prompt = self.prompter.retrieved_documents_prompt_helper(
-                "[Help Documents]",
+        if not self.online_doc_retriever:
+            return ""
+
+        online_search_docs = self.online_doc_retriever.retrieve(
+            request, online_top_k, filter=None, embedding=embedding
+        )
+
+        return self.prompter.retrieved_documents_prompt_helper(
+            "Online Search Results",
+            "Search Result",
+            [doc.page_content for doc in online_search_docs],
+        )
+
+    async def aretrieve_knowledge(
+        self, request: str
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """
+        Retrieve the examples and documents for the request from all enabled sources at the
+        same time. The request is embedded once for all sources, and results are cached by
+        (request, source, top_k), so repeated steps of one subtask skip retrieval.
+        :param request: The request, usually the current subtask.
+        :return: The retrieved knowledge, and the latency and cache status of each source.
+        """
+
+        rag_config = ufo_config.rag
+
+        # Source name -> (enabled, retrieval function, top_k, default result)
+        sources = {
+            "experience_examples": (
+                rag_config.experience and self.experience_retriever,
+                self.rag_experience_retrieve,
+                rag_config.experience_retrieved_topk,
+                [],
+            ),
+            "demonstration_examples": (
+                rag_config.demonstration and self.human_demonstration_retriever,
+                self.rag_demonstration_retrieve,
+                rag_config.demonstration_retrieved_topk,
+                [],
+            ),
+            "offline_docs": (
+                self.offline_doc_retriever,
+                self.offline_docs_prompt_helper,
+                rag_config.offline_docs_retrieved_topk,
+                "",
+            ),
+            "online_docs": (
+                self.online_doc_retriever,
+                self.online_docs_prompt_helper,
+                rag_config.online_retrieved_topk,
                 "",
-                [
-                    format_string.format(
-                        question=doc.metadata.get("title", ""),
-                        answer=doc.metadata.get("text", ""),
-                    )
-                    for doc in offline_docs
-                ],
+            ),
+        }
+
+        knowledge = {}
+        latency: Dict[str, Dict[str, Any]] = {}
+        pending = {}
+
+        for source, (enabled, retrieve, top_k, default) in sources.items():
+            if not enabled:
+                knowledge[source] = default
+                continue
+
+            found, cached = self.retrieval_cache.lookup((request, source, top_k))
+            if found:
+                knowledge[source] = cached
+                latency[source] = {"latency": 0.0, "cached": True}
+            else:
+                pending[source] = (retrieve, top_k)
+
+        if not pending:
+            return knowledge, latency
+
+        # Embed the request once and share the embedding with all sources
+        embedding = None
+        start = time.time()
+        try:
+            embedding = await asyncio.to_thread(embed_query, request)
+        except Exception as e:
+            self.logger.warning(
+                f"Failed to embed the request, each source embeds it instead: {e}"
             )
-        else:
-            offline_docs_prompt = ""
+        latency["embedding"] = {"latency": time.time() - start, "cached": False}
 
-        # Retrieve online documents and construct the prompt
-        if self.online_doc_retriever:
-            online_search_docs = self.online_doc_retriever.retrieve(
-                request, online_top_k, filter=None
-            )
-            online_docs_prompt = self.prompter.retrieved_documents_prompt_helper(
-                "Online Search Results",
-                "Search Result",
-                [doc.page_content for doc in online_search_docs],
-            )
-        else:
-            online_docs_prompt = ""
+        async def retrieve_source(source: str) -> None:
+            retrieve, top_k = pending[source]
+            source_start = time.time()
+            result = await asyncio.to_thread(retrieve, request, top_k, embedding)
+            latency[source] = {"latency": time.time() - source_start, "cached": False}
+            knowledge[source] = result
+            self.retrieval_cache.set((request, source, top_k), result)
+
+        await asyncio.gather(*(retrieve_source(source) for source in pending))
 
-        return offline_docs_prompt, online_docs_prompt
+        return {source: knowledge[source] for source in sources}, latency
 
     def rag_experience_retrieve(
-        self, request: str, experience_top_k: int
+        self, request: str, experience_top_k: int, embedding: List[float] = None
     ) -> List[Dict[str, Any]]:
         """
         Retrieving experience examples for the user request.
         :param request: The user request.
         :param experience_top_k: The number of documents to retrieve.
+        :param embedding: The precomputed embedding of the request.
         :return: The retrieved examples and tips dictionary.
         """
 
@@ -312,6 +425,7 @@ class AppAgent(BasicAgent):
             experience_top_k,
             filter=lambda x: self._app_root_name.lower()
             in [app.lower() for app in x["app_list"]],
+            embedding=embedding,
         )
 
         if experience_docs:
@@ -331,11 +445,14 @@ class AppAgent(BasicAgent):
 
         return retrieved_docs
 
-    def rag_demonstration_retrieve(self, request: str, demonstration_top_k: int) -> str:
+    def rag_demonstration_retrieve(
+        self, request: str, demonstration_top_k: int, embedding: List[float] = None
+    ) -> str:
         """
         Retrieving demonstration examples for the user request.
         :param request: The user request.
         :param demonstration_top_k: The number of documents to retrieve.
+        :param embedding: The precomputed embedding of the request.
         :return: The retrieved examples and tips string.
         """
 
@@ -343,7 +460,7 @@ class AppAgent(BasicAgent):
 
         # Retrieve demonstration examples.
         demonstration_docs = self.human_demonstration_retriever.retrieve(
-            request, demonstration_top_k
+            request, demonstration_top_k, embedding=embedding
         )
 
         if demonstration_docs:
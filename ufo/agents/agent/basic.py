@@ -174,6 +174,25 @@ class BasicAgent(ABC):
         )
         return response_string, cost
 
+    @classmethod
+    async def aget_response(
+        cls,
+        message: List[dict],
+        namescope: str,
+        use_backup_engine: bool,
+    ) -> Tuple[str, float]:
+        """
+        Get the response for the prompt without blocking the event loop.
+        :param message: The message for LLMs.
+        :param namescope: The namescope for the LLMs.
+        :param use_backup_engine: Whether to use the backup engine.
+        :return: The response.
+        """
+        response_string, cost = await llm_call.aget_completion(
+            message, namescope, use_backup_engine=use_backup_engine
+        )
+        return response_string, cost
+
     @staticmethod
     def response_to_dict(response: str) -> Dict[str, str]:
         """
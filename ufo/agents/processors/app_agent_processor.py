@@ -18,6 +18,7 @@ from typing import TYPE_CHECKING, Any, Dict
 from rich.console import Console
 from rich.panel import Panel
 
+from config.config_loader import get_ufo_config
 from ufo.agents.processors.context.app_agent_processing_context import (
     AppAgentProcessorContext,
 )
@@ -27,6 +28,7 @@ from ufo.agents.processors.core.processor_framework import ProcessorTemplate
 from ufo.agents.processors.strategies.app_agent_processing_strategy import (
     AppActionExecutionStrategy,
     AppControlInfoStrategy,
+    AppKnowledgeRetrievalStrategy,
     AppLLMInteractionStrategy,
     AppMemoryUpdateStrategy,
     AppScreenshotCaptureStrategy,
@@ -35,6 +37,7 @@ from ufo.agents.processors.strategies.processing_strategy import ComposedStrateg
 from ufo.module.context import Context, ContextNames
 
 console = Console()
+ufo_config = get_ufo_config()
 
 
 def _safe_console_text(text: str) -> str:
@@ -63,7 +66,8 @@ class AppAgentProcessor(ProcessorTemplate):
     - Includes robust error handling and performance monitoring
 
     Processing Pipeline:
-    1. Data Collection: Screenshot capture and UI control information (using a composed strategy)
+    1. Data Collection: Knowledge retrieval, screenshot capture and UI control information
+       (using a composed strategy, concurrent when CONCURRENT_STRATEGIES is enabled)
     2. LLM Interaction: Context-aware prompting and response parsing
     3. Action Execution: UI automation and control interaction
     4. Memory Update: Agent memory and blackboard synchronization
@@ -83,14 +87,17 @@ class AppAgentProcessor(ProcessorTemplate):
         """Setup processing strategies for App Agent."""
         from ufo.agents.processors.context.processing_context import ProcessingPhase
 
-        # Data collection strategy (combines screenshot + control info)
+        # Data collection strategy (combines knowledge + screenshot + control info).
+        # Knowledge retrieval is independent of the screenshot and control info.
         self.strategies[ProcessingPhase.DATA_COLLECTION] = ComposedStrategy(
             strategies=[
+                AppKnowledgeRetrievalStrategy(),
                 AppScreenshotCaptureStrategy(),
                 AppControlInfoStrategy(),
             ],
             name="AppDataCollectionStrategy",
             fail_fast=True,
+            concurrent=ufo_config.system.concurrent_strategies,
         )
 
         # LLM interaction strategy
@@ -65,6 +65,12 @@ class AppAgentProcessorContext(BasicProcessorContext):
     save_screenshot: Dict[str, Any] = field(
         default_factory=dict
     )  # Screenshot saving configuration
+    llm_parsing: Dict[str, Any] = field(
+        default_factory=dict
+    )  # Retry and JSON repair statistics of the LLM response
+    knowledge_retrieval: Dict[str, Any] = field(
+        default_factory=dict
+    )  # Latency and cache status of each knowledge source
 
     # Action execution data
     execution_result: List[Any] = field(
@@ -108,6 +114,9 @@ class AppAgentProcessorContext(BasicProcessorContext):
             "status",
             "request",
             "llm_cost",
+            "llm_parsing",
+            "knowledge_retrieval",
+            "strategy_timings",
             "observation",
             "thought",
             "plan",
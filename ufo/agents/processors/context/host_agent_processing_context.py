@@ -88,6 +88,7 @@ class HostAgentProcessorContext(BasicProcessorContext):
             "result",
             "last_error",  # error (mapped to last_error)
             "execution_times",  # time_cost (mapped to execution_times)
+            "strategy_timings",
             "total_time",
             "control_log",  # ControlLog
         ]
@@ -45,6 +45,7 @@ class ProcessingResult:
     error: Optional[str] = None
     phase: Optional[ProcessingPhase] = None
     execution_time: float = 0.0
+    strategy_timings: List[Dict[str, Any]] = field(default_factory=list)
 
 
 class ProcessorContextProtocol(ABC):
@@ -104,6 +105,7 @@ class BasicProcessorContext(ProcessorContextProtocol):
 
     # Performance and error tracking
     execution_times: Dict[str, float] = field(default_factory=dict)
+    strategy_timings: List[Dict[str, Any]] = field(default_factory=list)
     total_time: float = 0.0
     error_count: int = 0
     last_error: Optional[str] = None
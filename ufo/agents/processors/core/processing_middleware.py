@@ -3,8 +3,6 @@ import traceback
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Optional
 
-from flask import json
-
 from ufo.agents.processors.context.processing_context import (
     ProcessingContext,
     ProcessingResult,
@@ -121,9 +119,7 @@ class EnhancedLoggingMiddleware(ProcessorMiddleware):
 
         safe_obj = to_jsonable_python(local_context.to_dict(selective=True))
 
-        local_context_string = json.dumps(safe_obj, ensure_ascii=False)
-
-        local_logger.write(local_context_string)
+        await local_logger.awrite_record(safe_obj)
 
         self.logger.info("Log saved successfully.")
 
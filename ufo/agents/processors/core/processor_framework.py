@@ -333,6 +333,58 @@ class ProcessorTemplate(ABC):
                 f"Error during provides consistency check for {strategy.name}: {consistency_error}"
             )
 
+    def _get_strategy_timings(
+        self,
+        phase: ProcessingPhase,
+        strategy: ProcessingStrategy,
+        result: ProcessingResult,
+        phase_offset: float,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the timings of the strategies run in a phase, relative to the start of processing.
+        Phases run one after another, so the critical path of the step is made of the
+        critical path of each phase.
+        :param phase: The processing phase.
+        :param strategy: The strategy of the phase.
+        :param result: The result of the phase.
+        :param phase_offset: The start time of the phase relative to the start of processing.
+        :return: The timing of each strategy run in the phase.
+        """
+        timings = result.strategy_timings or [
+            {
+                "strategy": strategy.name,
+                "start": 0.0,
+                "end": result.execution_time,
+                "duration": result.execution_time,
+                "depends_on": [],
+                "success": result.success,
+                "critical": True,
+            }
+        ]
+
+        return [
+            {
+                **timing,
+                "phase": phase.value,
+                "start": timing["start"] + phase_offset,
+                "end": timing["end"] + phase_offset,
+            }
+            for timing in timings
+        ]
+
+    def _log_critical_path(self, strategy_timings: List[Dict[str, Any]]) -> None:
+        """
+        Log the strategies on the critical path of the step.
+        :param strategy_timings: The timing of each strategy run in the step.
+        """
+        critical_path = " -> ".join(
+            f"{timing['strategy']} ({timing['duration']:.2f}s)"
+            for timing in strategy_timings
+            if timing["critical"]
+        )
+        if critical_path:
+            self.logger.info(f"Critical path: {critical_path}")
+
     async def process(self) -> ProcessingResult:
         """
         A template method that defines the processing workflow.
@@ -350,6 +402,7 @@ class ProcessorTemplate(ABC):
 
             # Execute each phase processing
             combined_result = ProcessingResult(success=True, data={})
+            strategy_timings: List[Dict[str, Any]] = []
 
             for phase in ProcessingPhase:
                 if phase in self.strategies:
@@ -370,6 +423,12 @@ class ProcessorTemplate(ABC):
                     result.execution_time = time.time() - phase_start
                     result.phase = phase
 
+                    strategy_timings.extend(
+                        self._get_strategy_timings(
+                            phase, strategy, result, phase_start - start_time
+                        )
+                    )
+
                     # Validate provides consistency after execution
                     self._validate_strategy_provides_runtime(strategy, result)
 
@@ -396,6 +455,11 @@ class ProcessorTemplate(ABC):
 
             combined_result.execution_time = time.time() - start_time
 
+            # Record the per-strategy timing report, including the critical path
+            combined_result.strategy_timings = strategy_timings
+            self.processing_context.set_local("strategy_timings", strategy_timings)
+            self._log_critical_path(strategy_timings)
+
             # Add phase results to the final result
             combined_result.data["phase_results"] = (
                 self.processing_context.get_all_phase_results()
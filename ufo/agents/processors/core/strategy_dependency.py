@@ -5,14 +5,17 @@ This module provides dependency declaration and validation for processing strate
 to ensure proper data flow and early detection of dependency issues.
 """
 
+import asyncio
 import logging
+import time
 from dataclasses import dataclass, field
-from typing import Set, List, Dict, Any, Optional, Type
+from typing import Set, List, Dict, Any, Optional, Tuple, Type
 
 
 from ufo.agents.processors.context.processing_context import (
     ProcessingPhase,
     ProcessingContext,
+    ProcessingResult,
 )
 
 
@@ -431,6 +434,229 @@ class StrategyDependencyValidator:
             print()
 
 
+@dataclass
+class StrategyTiming:
+    """
+    Timing of a single strategy execution, relative to the start of its graph.
+    """
+
+    strategy_name: str
+    """Name of the strategy."""
+
+    start: float
+    """Start time (seconds) relative to the start of the graph."""
+
+    end: float
+    """End time (seconds) relative to the start of the graph."""
+
+    depends_on: List[str] = field(default_factory=list)
+    """Names of the strategies this strategy waited for."""
+
+    success: bool = True
+    """Whether the strategy succeeded."""
+
+    critical: bool = False
+    """Whether the strategy is on the critical path of the graph."""
+
+    @property
+    def duration(self) -> float:
+        """The execution time of the strategy in seconds."""
+        return self.end - self.start
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the timing to a dictionary for logging.
+        :return: The timing as a dictionary.
+        """
+        return {
+            "strategy": self.strategy_name,
+            "start": self.start,
+            "end": self.end,
+            "duration": self.duration,
+            "depends_on": self.depends_on,
+            "success": self.success,
+            "critical": self.critical,
+        }
+
+
+class StrategyExecutionGraph:
+    """
+    Dependency graph of strategies built from their declared dependencies and provides.
+
+    A strategy waits for the latest earlier strategy providing each field it depends on,
+    and for the earlier providers of the fields it provides itself, so that strategies
+    running at the same time never overwrite each other's fields. A strategy without any
+    declared metadata is a barrier: it waits for all earlier strategies and all later
+    strategies wait for it. With sequential=True the graph is a plain chain.
+    """
+
+    def __init__(self, strategies: List[Any], sequential: bool = False):
+        """
+        Build the dependency graph.
+        :param strategies: The strategies, in declaration order.
+        :param sequential: Whether to run the strategies one after another.
+        """
+        self.strategies = list(strategies)
+        self.sequential = sequential
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        if sequential:
+            self.predecessors: List[Set[int]] = [
+                {index - 1} if index else set() for index in range(len(strategies))
+            ]
+        else:
+            self.predecessors = self._build_predecessors()
+
+    @staticmethod
+    def get_strategy_fields(strategy: Any) -> Tuple[List[str], List[str]]:
+        """
+        Get the fields a strategy depends on and the fields it provides.
+        :param strategy: The strategy instance.
+        :return: The dependency field names and the provided field names.
+        """
+        if callable(getattr(strategy, "get_dependencies", None)):
+            dependencies = strategy.get_dependencies()
+        else:
+            dependencies = StrategyMetadataRegistry.get_dependencies(
+                strategy.__class__
+            )
+
+        if callable(getattr(strategy, "get_provides", None)):
+            provides = strategy.get_provides()
+        else:
+            provides = StrategyMetadataRegistry.get_provides(strategy.__class__)
+
+        return [dep.field_name for dep in dependencies], list(provides)
+
+    def _build_predecessors(self) -> List[Set[int]]:
+        """
+        Build the predecessors of each strategy from the declared metadata.
+        :return: The indices of the predecessors of each strategy.
+        """
+        predecessors = []
+        providers: Dict[str, int] = {}
+        barrier: Optional[int] = None
+
+        for index, strategy in enumerate(self.strategies):
+            requires, provides = self.get_strategy_fields(strategy)
+
+            if not requires and not provides:
+                preceding = set(range(index))
+                barrier = index
+            else:
+                preceding = {
+                    providers[field_name]
+                    for field_name in requires + provides
+                    if field_name in providers
+                }
+                if barrier is not None:
+                    preceding.add(barrier)
+
+            for field_name in provides:
+                providers[field_name] = index
+
+            predecessors.append(preceding)
+
+        return predecessors
+
+    def describe(self) -> Dict[str, List[str]]:
+        """
+        Describe the graph by the strategies each strategy waits for.
+        :return: Mapping from strategy name to the names of its predecessors.
+        """
+        return {
+            strategy.name: [self.strategies[p].name for p in sorted(preceding)]
+            for strategy, preceding in zip(self.strategies, self.predecessors)
+        }
+
+    async def execute(
+        self, agent: Any, context: ProcessingContext, fail_fast: bool = True
+    ) -> Tuple[List[Optional[ProcessingResult]], List[StrategyTiming]]:
+        """
+        Execute the strategies, each as soon as all its predecessors have finished.
+        The data of each successful strategy is merged into the local context before
+        its successors start.
+        :param agent: The agent instance.
+        :param context: The processing context.
+        :param fail_fast: Whether to cancel the remaining strategies on the first failure.
+        :return: The result of each strategy (None if it did not run) and the timings,
+        in declaration order.
+        """
+        count = len(self.strategies)
+        results: List[Optional[ProcessingResult]] = [None] * count
+        timings: List[Optional[StrategyTiming]] = [None] * count
+        tasks: List[asyncio.Task] = []
+        graph_start = time.time()
+
+        async def run(index: int) -> None:
+            preceding = sorted(self.predecessors[index])
+            if preceding:
+                await asyncio.gather(*(tasks[p] for p in preceding))
+
+            strategy = self.strategies[index]
+            start = time.time() - graph_start
+
+            try:
+                result = await strategy.execute(agent, context)
+            except Exception as e:
+                result = ProcessingResult(
+                    success=False,
+                    data={},
+                    error=f"Strategy '{strategy.name}' raised exception: {str(e)}",
+                )
+
+            results[index] = result
+            timings[index] = StrategyTiming(
+                strategy_name=strategy.name,
+                start=start,
+                end=time.time() - graph_start,
+                depends_on=[self.strategies[p].name for p in preceding],
+                success=result.success,
+            )
+
+            if result.success:
+                if result.data:
+                    context.update_local(result.data)
+            else:
+                self.logger.error(
+                    f"Strategy '{strategy.name}' failed: {result.error or 'Unknown error'}"
+                )
+                if fail_fast:
+                    for task in tasks:
+                        if task is not asyncio.current_task():
+                            task.cancel()
+
+        tasks.extend(asyncio.create_task(run(index)) for index in range(count))
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        finished_timings = [timing for timing in timings if timing is not None]
+        self.mark_critical_path(finished_timings)
+
+        return results, finished_timings
+
+    @staticmethod
+    def mark_critical_path(timings: List[StrategyTiming]) -> List[StrategyTiming]:
+        """
+        Mark the critical path: the chain of strategies, ending with the one that
+        finished last, in which each strategy waited for the one before it.
+        :param timings: The timings of the executed strategies.
+        :return: The timings on the critical path, in execution order.
+        """
+        by_name = {timing.strategy_name: timing for timing in timings}
+        path = []
+
+        current = max(timings, key=lambda timing: timing.end, default=None)
+        while current is not None:
+            current.critical = True
+            path.append(current)
+            preceding = [
+                by_name[name] for name in current.depends_on if name in by_name
+            ]
+            current = max(preceding, key=lambda timing: timing.end, default=None)
+
+        return list(reversed(path))
+
+
 # ===== Strategy Decorator Implementation =====
 from functools import wraps
 from typing import Union, Type
@@ -13,6 +13,7 @@ This module implements the architecture for Customized Agent processing, providi
 """
 
 from typing import TYPE_CHECKING
+from config.config_loader import get_ufo_config
 from ufo.agents.processors.app_agent_processor import AppAgentProcessor
 from ufo.agents.processors.context.processing_context import (
     ProcessingContext,
@@ -42,6 +43,7 @@ from ufo.agents.processors.strategies.mobile_agent_strategy import (
 from ufo.agents.processors.strategies.processing_strategy import ComposedStrategy
 from ufo.module.context import Context, ContextNames
 
+ufo_config = get_ufo_config()
 
 if TYPE_CHECKING:
     from ufo.agents.agent.customized_agent import CustomizedAgent
@@ -157,6 +159,7 @@ class MobileAgentProcessor(CustomizedProcessor):
             ],
             name="MobileDataCollectionStrategy",
             fail_fast=True,
+            concurrent=ufo_config.system.concurrent_strategies,
         )
 
         # LLM interaction strategy (depends on all collected data)
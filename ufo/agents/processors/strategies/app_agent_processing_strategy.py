@@ -5,6 +5,7 @@
 App Agent Processing Strategies - Modular strategies for App Agent using the new framework.
 
 This module contains all the processing strategies for App Agent including:
+- Knowledge retrieval from experience, demonstrations and documents
 - Screenshot capture and UI control information collection
 - Control filtering and annotation
 - LLM interaction with app-specific prompting
@@ -20,7 +21,7 @@ import os
 import time
 import traceback
 from dataclasses import asdict
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from ufo import utils
 from ufo.agents.memory.memory import MemoryItem
@@ -47,9 +48,20 @@ from ufo.agents.processors.schemas.target import TargetInfo, TargetKind, TargetR
 from ufo.agents.processors.strategies.processing_strategy import BaseProcessingStrategy
 from ufo.automator.ui_control.grounding.omniparser import OmniparserGrounding
 from ufo.automator.ui_control.screenshot import PhotographerFacade
+from ufo.automator.ui_control.screenshot_store import get_screenshot_store
+from ufo.automator.ui_control.ui_tree_sync import (
+    UITreeRecorder,
+    get_ui_tree_recorder,
+)
 from config.config_loader import get_ufo_config
 from aip.messages import Command, Result, ResultStatus
 from ufo.llm import AgentType
+from ufo.llm.json_repair import (
+    TruncatedJSONError,
+    build_fix_json_prompt,
+    extract_json_object,
+    fit_to_schema,
+)
 from ufo.llm.grounding_model.omniparser_service import OmniParser
 from ufo.module.context import ContextNames
 from ufo.module.dispatcher import BasicCommandDispatcher
@@ -58,6 +70,8 @@ from ufo.module.dispatcher import BasicCommandDispatcher
 ufo_config = get_ufo_config()
 
 if TYPE_CHECKING:
+    from PIL import Image
+
     from ufo.agents.agent.app_agent import AppAgent
     from ufo.module.basic import FileWriter
 
@@ -65,6 +79,110 @@ CONTROL_BACKEND = ufo_config.system.control_backend
 BACKEND = "win32" if "win32" in CONTROL_BACKEND else "uia"
 
 
+def _is_usable_observation(observed_result: Optional[Result]) -> bool:
+    """
+    Whether a result collected by the observe command can be used as is.
+    :param observed_result: The result collected by the observe command, if any
+    :return: False if the result is missing, failed or empty
+    """
+    return (
+        observed_result is not None
+        and observed_result.status == ResultStatus.SUCCESS
+        and bool(observed_result.result)
+    )
+
+
+async def _observed_or_execute(
+    command_dispatcher: BasicCommandDispatcher,
+    observed_result: Optional[Result],
+    command: Command,
+) -> List[Result]:
+    """
+    Use the result collected by the observe command, or execute the command on its own
+    if that result is not usable. All observations follow this same fallback rule.
+    :param command_dispatcher: Command dispatcher for executing commands
+    :param observed_result: The result collected by the observe command, if any
+    :param command: The command collecting the observation on its own
+    :return: The results of the command
+    """
+    if _is_usable_observation(observed_result):
+        return [observed_result]
+    return await command_dispatcher.execute_commands([command])
+
+
+@depends_on("subtask")
+@provides("knowledge_retrieved", "knowledge_retrieval")
+class AppKnowledgeRetrievalStrategy(BaseProcessingStrategy):
+    """
+    Strategy for retrieving the knowledge for the current subtask.
+
+    This strategy handles:
+    - Experience and demonstration example retrieval
+    - Offline and online document retrieval
+
+    All enabled sources are queried at the same time with a single embedding of the
+    subtask, and the results are cached across the steps of the subtask. The retrievers
+    are blocking, so they run in worker threads and do not hold up the screenshot and
+    control collection of the same step.
+    """
+
+    def __init__(self, fail_fast: bool = True) -> None:
+        """
+        Initialize knowledge retrieval strategy.
+        :param fail_fast: Whether to raise exceptions immediately on errors
+        """
+        super().__init__(name="app_knowledge_retrieval", fail_fast=fail_fast)
+
+    async def execute(
+        self, agent: "AppAgent", context: ProcessingContext
+    ) -> ProcessingResult:
+        """
+        Execute knowledge retrieval for App Agent.
+        :param agent: The AppAgent instance
+        :param context: Processing context with the subtask
+        :return: ProcessingResult with the retrieved knowledge and per-source latency
+        """
+        try:
+            self.logger.info("Retrieving knowledge from the knowledge base")
+
+            knowledge_retrieved, knowledge_retrieval = await self.retrieve_knowledge(
+                agent, context.get("subtask")
+            )
+
+            for source, timing in knowledge_retrieval.items():
+                self.logger.debug(
+                    f"Knowledge source {source}: {timing['latency']:.3f}s"
+                    + (" (cached)" if timing["cached"] else "")
+                )
+
+            return ProcessingResult(
+                success=True,
+                data={
+                    "knowledge_retrieved": knowledge_retrieved,
+                    "knowledge_retrieval": knowledge_retrieval,
+                },
+                phase=ProcessingPhase.DATA_COLLECTION,
+            )
+
+        except Exception as e:
+            error_msg = f"App knowledge retrieval failed: {str(e)}"
+            self.logger.error(error_msg)
+            return self.handle_error(e, ProcessingPhase.DATA_COLLECTION, context)
+
+    @staticmethod
+    async def retrieve_knowledge(
+        agent: "AppAgent", subtask: str
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """
+        Retrieve knowledge for the given subtask.
+        :param: agent: The agent to conduct the retrieval
+        :param: subtask: The subtask for which to retrieve knowledge.
+        :return: The retrieved examples and documents, and the latency of each source.
+        """
+
+        return await agent.aretrieve_knowledge(subtask)
+
+
 @depends_on("app_root", "log_path", "session_step")
 @provides(
     "clean_screenshot_path",
@@ -75,6 +193,7 @@ BACKEND = "win32" if "win32" in CONTROL_BACKEND else "uia"
     "desktop_screenshot_url",
     "application_window_info",
     "screenshot_saved_time",
+    "prefetched_uia_controls",
 )
 class AppScreenshotCaptureStrategy(BaseProcessingStrategy):
     """
@@ -85,6 +204,11 @@ class AppScreenshotCaptureStrategy(BaseProcessingStrategy):
     - Desktop screenshot capture (if needed)
     - Screenshot path management and storage
     - Performance timing for screenshot operations
+
+    All observations of a step (screenshots, UI tree, window info and UIA controls) are
+    collected with a single composite observe command, which the client runs in parallel.
+    An observation that is missing, failed or empty, e.g. for clients without observe
+    support, is requested again with its own command.
     """
 
     def __init__(self, fail_fast: bool = True) -> None:
@@ -121,13 +245,28 @@ class AppScreenshotCaptureStrategy(BaseProcessingStrategy):
                     "command_dispatcher is required but not found in global context"
                 )
 
+            ui_tree_path = os.path.join(
+                log_path, "ui_trees", f"ui_tree_step{session_step}.json"
+            )
+            ui_tree_recorder = (
+                get_ui_tree_recorder(os.path.dirname(ui_tree_path))
+                if ufo_config.system.save_ui_tree
+                else None
+            )
+
+            # Step 0: Collect all observations of the step in one round trip
+            self.logger.info("Collecting observations of the application window")
+            observation = await self._observe(command_dispatcher, ui_tree_recorder)
+
             # Step 1: Capture application window screenshot
             self.logger.info("Capturing application window screenshot")
 
             clean_screenshot_path = f"{log_path}action_step{session_step}.png"
 
             clean_screenshot_url = await self._capture_app_screenshot(
-                clean_screenshot_path, command_dispatcher
+                clean_screenshot_path,
+                command_dispatcher,
+                observation.get("capture_window_screenshot"),
             )
 
             # Step 2: Capture desktop screenshot if needed
@@ -136,23 +275,27 @@ class AppScreenshotCaptureStrategy(BaseProcessingStrategy):
             if ufo_config.system.save_full_screen:
                 self.logger.info("Capturing desktop screenshot")
                 desktop_screenshot_url = await self._capture_desktop_screenshot(
-                    desktop_screenshot_path, command_dispatcher
+                    desktop_screenshot_path,
+                    command_dispatcher,
+                    observation.get("capture_desktop_screenshot"),
                 )
             else:
                 desktop_screenshot_url = ""
 
             # Step 3: Capture ui tree if needed.
-            ui_tree_path = os.path.join(
-                log_path, "ui_trees", f"ui_tree_step{session_step}.json"
-            )
-            if ufo_config.system.save_ui_tree:
+            if ui_tree_recorder is not None:
                 self.logger.info("Capturing UI tree")
-                await self._capture_ui_tree(ui_tree_path, command_dispatcher)
+                await self._capture_ui_tree(
+                    ui_tree_path,
+                    command_dispatcher,
+                    observation.get("get_ui_tree_delta"),
+                    ui_tree_recorder,
+                )
 
             # Step 4: Get application window information
             self.logger.info("Getting application window information")
             application_window_info = await self._get_application_window_info(
-                command_dispatcher
+                command_dispatcher, observation.get("get_app_window_info")
             )
 
             screenshot_time = time.time() - start_time
@@ -167,6 +310,9 @@ class AppScreenshotCaptureStrategy(BaseProcessingStrategy):
                     "clean_screenshot_url": clean_screenshot_url,
                     "desktop_screenshot_url": desktop_screenshot_url,
                     "application_window_info": application_window_info,
+                    "prefetched_uia_controls": observation.get(
+                        "get_app_window_controls_target_info"
+                    ),
                 },
                 phase=ProcessingPhase.DATA_COLLECTION,
             )
@@ -176,13 +322,80 @@ class AppScreenshotCaptureStrategy(BaseProcessingStrategy):
             self.logger.error(error_msg)
             return self.handle_error(e, ProcessingPhase.DATA_COLLECTION, context)
 
+    async def _observe(
+        self,
+        command_dispatcher: BasicCommandDispatcher,
+        ui_tree_recorder: Optional[UITreeRecorder] = None,
+    ) -> Dict[str, Result]:
+        """
+        Collect all observations of the step with a single composite observe command.
+        :param command_dispatcher: Command dispatcher for executing commands
+        :param ui_tree_recorder: The recorder of the UI trees, if the UI tree is saved
+        :return: The observation results keyed by tool name
+        """
+        commands = [
+            Command(
+                tool_name="capture_window_screenshot",
+                parameters={},
+                tool_type="data_collection",
+            ),
+            Command(
+                tool_name="get_app_window_info",
+                parameters={"field_list": ControlInfoRecorder.recording_fields},
+                tool_type="data_collection",
+            ),
+        ]
+
+        if ufo_config.system.save_full_screen:
+            commands.append(
+                Command(
+                    tool_name="capture_desktop_screenshot",
+                    parameters={"all_screens": True},
+                    tool_type="data_collection",
+                )
+            )
+
+        if ui_tree_recorder is not None:
+            # Only the changes since the last tree received are sent
+            commands.append(
+                Command(
+                    tool_name="get_ui_tree_delta",
+                    parameters={"base_version": ui_tree_recorder.version},
+                    tool_type="data_collection",
+                )
+            )
+
+        if "uia" in CONTROL_BACKEND:
+            commands.append(
+                Command(
+                    tool_name="get_app_window_controls_target_info",
+                    parameters={"field_list": ControlInfoRecorder.recording_fields},
+                    tool_type="data_collection",
+                )
+            )
+
+        try:
+            results = await command_dispatcher.execute_observation(commands)
+        except Exception as e:
+            # Each observation falls back to its own command below.
+            self.logger.warning(f"Observation failed: {str(e)}")
+            return {}
+
+        return {
+            command.tool_name: result for command, result in zip(commands, results)
+        }
+
     async def _capture_app_screenshot(
-        self, save_path: str, command_dispatcher: BasicCommandDispatcher
+        self,
+        save_path: str,
+        command_dispatcher: BasicCommandDispatcher,
+        observed_result: Optional[Result] = None,
     ) -> str:
         """
         Capture application window screenshot.
         :param save_path: The path for saving screenshots
         :param command_dispatcher: Command dispatcher for executing commands
+        :param observed_result: The result already collected by the observe command, if any
         :return: The path to the saved screenshot
         """
         try:
@@ -192,14 +405,14 @@ class AppScreenshotCaptureStrategy(BaseProcessingStrategy):
             if not command_dispatcher:
                 raise ValueError("Command dispatcher not available")
 
-            result = await command_dispatcher.execute_commands(
-                [
-                    Command(
-                        tool_name="capture_window_screenshot",
-                        parameters={},
-                        tool_type="data_collection",
-                    )
-                ]
+            result = await _observed_or_execute(
+                command_dispatcher,
+                observed_result,
+                Command(
+                    tool_name="capture_window_screenshot",
+                    parameters={},
+                    tool_type="data_collection",
+                ),
             )
 
             if (
@@ -222,7 +435,9 @@ class AppScreenshotCaptureStrategy(BaseProcessingStrategy):
                 )
                 return clean_screenshot_url
 
-            saved_image = utils.save_image_string(clean_screenshot_url, save_path)
+            saved_image = get_screenshot_store().put_image_string(
+                clean_screenshot_url, save_path
+            )
             if (
                 not saved_image
                 or saved_image.size[0] <= 1
@@ -247,25 +462,28 @@ class AppScreenshotCaptureStrategy(BaseProcessingStrategy):
             return PhotographerFacade._empty_image_string
 
     async def _get_application_window_info(
-        self, command_dispatcher: BasicCommandDispatcher
+        self,
+        command_dispatcher: BasicCommandDispatcher,
+        observed_result: Optional[Result] = None,
     ) -> TargetInfo:
         """
         Get application window information and set up the application window (from original implementation).
         :param command_dispatcher: Command dispatcher for executing commands
+        :param observed_result: The result already collected by the observe command, if any
         """
         try:
             if not command_dispatcher:
                 raise ValueError("Command dispatcher not available")
 
             # Get application window information
-            result = await command_dispatcher.execute_commands(
-                [
-                    Command(
-                        tool_name="get_app_window_info",
-                        parameters={"field_list": ControlInfoRecorder.recording_fields},
-                        tool_type="data_collection",
-                    )
-                ]
+            result = await _observed_or_execute(
+                command_dispatcher,
+                observed_result,
+                Command(
+                    tool_name="get_app_window_info",
+                    parameters={"field_list": ControlInfoRecorder.recording_fields},
+                    tool_type="data_collection",
+                ),
             )
 
             if result and result[0].result:
@@ -290,54 +508,72 @@ class AppScreenshotCaptureStrategy(BaseProcessingStrategy):
             self.logger.warning(f"Failed to get application window info: {str(e)}")
 
     async def _capture_ui_tree(
-        self, save_path: str, command_dispatcher: BasicCommandDispatcher
+        self,
+        save_path: str,
+        command_dispatcher: BasicCommandDispatcher,
+        observed_result: Optional[Result] = None,
+        ui_tree_recorder: Optional[UITreeRecorder] = None,
     ) -> Dict[str, Any]:
         """
-        Capture UI tree.
+        Capture UI tree, and save it as a keyframe or a delta against the previous step.
         :param save_path: The log path for saving UI tree
         :param command_dispatcher: Command dispatcher for executing commands
+        :param observed_result: The get_ui_tree_delta result already collected by the observe command, if any
+        :param ui_tree_recorder: The recorder of the UI trees, by default the one of the save path
         :return: The dict of UI tree.
         """
         try:
 
-            # Execute get_ui_tree command
             if not command_dispatcher:
                 raise ValueError("Command dispatcher not available")
 
-            result = await command_dispatcher.execute_commands(
-                [
-                    Command(
-                        tool_name="get_ui_tree",
-                        parameters={},
-                        tool_type="data_collection",
-                    )
-                ]
-            )
+            if ui_tree_recorder is None:
+                ui_tree_recorder = get_ui_tree_recorder(os.path.dirname(save_path))
+
+            ui_tree = None
+            if _is_usable_observation(observed_result):
+                try:
+                    ui_tree = ui_tree_recorder.receive(observed_result.result)
+                except ValueError as e:
+                    self.logger.warning(f"Failed to decode the UI tree delta: {str(e)}")
+
+            if ui_tree is None:
+                # Fall back to the full tree, e.g. for clients without get_ui_tree_delta
+                result = await command_dispatcher.execute_commands(
+                    [
+                        Command(
+                            tool_name="get_ui_tree",
+                            parameters={},
+                            tool_type="data_collection",
+                        )
+                    ]
+                )
 
-            if not result or not result[0].result:
-                raise ValueError("Failed to capture UI tree")
+                if not result or not result[0].result:
+                    raise ValueError("Failed to capture UI tree")
 
-            save_dir = os.path.dirname(save_path)
-            if not os.path.exists(save_dir):
-                os.makedirs(save_dir)
+                ui_tree = ui_tree_recorder.reset(result[0].result)
 
-            with open(save_path, "w") as file:
-                json.dump(result[0].result, file, indent=4)
+            ui_tree_recorder.save(ui_tree, save_path)
 
             self.logger.info(f"UI tree saved to: {save_path}")
 
-            return result[0].result
+            return ui_tree
 
         except Exception as e:
             raise Exception(f"Failed to capture UI tree: {str(e)}")
 
     async def _capture_desktop_screenshot(
-        self, save_path: str, command_dispatcher: BasicCommandDispatcher
+        self,
+        save_path: str,
+        command_dispatcher: BasicCommandDispatcher,
+        observed_result: Optional[Result] = None,
     ) -> str:
         """
         Capture desktop screenshot if needed.
         :param save_path: The path for saving screenshots
         :param command_dispatcher: Command dispatcher for executing commands
+        :param observed_result: The result already collected by the observe command, if any
         :return: Desktop screenshot string
         """
         try:
@@ -349,21 +585,21 @@ class AppScreenshotCaptureStrategy(BaseProcessingStrategy):
             desktop_screenshot_url = ""
             if command_dispatcher:
                 # Execute desktop screenshot command
-                result = await command_dispatcher.execute_commands(
-                    [
-                        Command(
-                            tool_name="capture_desktop_screenshot",
-                            parameters={"all_screens": True},
-                            tool_type="data_collection",
-                        )
-                    ]
+                result = await _observed_or_execute(
+                    command_dispatcher,
+                    observed_result,
+                    Command(
+                        tool_name="capture_desktop_screenshot",
+                        parameters={"all_screens": True},
+                        tool_type="data_collection",
+                    ),
                 )
 
                 if result and result[0].result:
                     desktop_screenshot_url = result[0].result
                     if not isinstance(desktop_screenshot_url, str) or not desktop_screenshot_url.startswith("data:image/"):
                         raise RuntimeError("Desktop screenshot capture returned invalid image")
-                    saved_image = utils.save_image_string(
+                    saved_image = get_screenshot_store().put_image_string(
                         desktop_screenshot_url, save_path
                     )
                     if (
@@ -396,7 +632,7 @@ class AppScreenshotCaptureStrategy(BaseProcessingStrategy):
                             raise RuntimeError(
                                 "Desktop screenshot retry returned invalid image"
                             )
-                        saved_image = utils.save_image_string(
+                        saved_image = get_screenshot_store().put_image_string(
                             desktop_screenshot_url, save_path
                         )
                         if (
@@ -418,7 +654,9 @@ class AppScreenshotCaptureStrategy(BaseProcessingStrategy):
                 f"Desktop screenshot capture failed, using empty image: {str(e)}"
             )
             desktop_screenshot_url = utils._empty_image_string
-            utils.save_image_string(desktop_screenshot_url, save_path)
+            get_screenshot_store().put_image_string(
+                desktop_screenshot_url, save_path
+            )
             return desktop_screenshot_url
 
 
@@ -500,7 +738,9 @@ class AppControlInfoStrategy(BaseProcessingStrategy):
             # Step 1: Getting control info from UIA
             if "uia" in self.control_detection_backend:
                 self.logger.info("Collecting Control Information from UIA API...")
-                api_control_list = await self._collect_uia_controls(command_dispatcher)
+                api_control_list = await self._collect_uia_controls(
+                    command_dispatcher, context.get_local("prefetched_uia_controls")
+                )
                 self.control_recorder.uia_controls_info = api_control_list
 
                 self.logger.info(
@@ -585,11 +825,14 @@ class AppControlInfoStrategy(BaseProcessingStrategy):
         return {control_info.id: control_info for control_info in control_info_list}
 
     async def _collect_uia_controls(
-        self, command_dispatcher: BasicCommandDispatcher
+        self,
+        command_dispatcher: BasicCommandDispatcher,
+        prefetched_result: Optional[Result] = None,
     ) -> List[TargetInfo]:
         """
         Collect UIA controls from the application window.
         :param command_dispatcher: Command dispatcher for executing commands
+        :param prefetched_result: The result already collected by the observe command, if any
         :return: List of UIA controls
         """
         try:
@@ -597,14 +840,14 @@ class AppControlInfoStrategy(BaseProcessingStrategy):
             if not command_dispatcher:
                 raise ValueError("Command dispatcher not available")
 
-            result = await command_dispatcher.execute_commands(
-                [
-                    Command(
-                        tool_name="get_app_window_controls_target_info",
-                        parameters={"field_list": ControlInfoRecorder.recording_fields},
-                        tool_type="data_collection",
-                    )
-                ]
+            result = await _observed_or_execute(
+                command_dispatcher,
+                prefetched_result,
+                Command(
+                    tool_name="get_app_window_controls_target_info",
+                    parameters={"field_list": ControlInfoRecorder.recording_fields},
+                    tool_type="data_collection",
+                ),
             )
 
             if not result:
@@ -638,6 +881,8 @@ class AppControlInfoStrategy(BaseProcessingStrategy):
         """
 
         try:
+            # The grounding service reads the screenshot from disk
+            get_screenshot_store().flush(clean_screenshot_path)
             if not clean_screenshot_path or not os.path.exists(clean_screenshot_path):
                 return []
 
@@ -787,17 +1032,19 @@ class AppControlInfoStrategy(BaseProcessingStrategy):
         """
 
         try:
-            self.photographer.capture_app_window_screenshot_with_target_list(
-                application_window_info=application_window_info,
-                target_list=target_list,
-                path=clean_screenshot_path,
-                save_path=save_path,
-                highlight_bbox=True,
+            screenshot_store = get_screenshot_store()
+            annotated_screenshot = (
+                self.photographer.capture_app_window_screenshot_with_target_list(
+                    application_window_info=application_window_info,
+                    target_list=target_list,
+                    path=clean_screenshot_path,
+                    image=screenshot_store.get(clean_screenshot_path),
+                    highlight_bbox=True,
+                )
             )
+            screenshot_store.put(save_path, annotated_screenshot)
 
-            annotated_screenshot_url = self.photographer.encode_image_from_path(
-                save_path
-            )
+            annotated_screenshot_url = screenshot_store.encode(save_path)
             return annotated_screenshot_url
         except Exception as e:
             import traceback
@@ -811,6 +1058,7 @@ class AppControlInfoStrategy(BaseProcessingStrategy):
     "parsed_response",
     "response_text",
     "llm_cost",
+    "llm_parsing",
     "prompt_message",
     "save_screenshot",
     "comment",
@@ -880,7 +1128,7 @@ class AppLLMInteractionStrategy(BaseProcessingStrategy):
                 log_path + f"action_step{session_step - 1}_selected_controls.png"
             )
 
-            if not os.path.exists(last_control_screenshot_path):
+            if not get_screenshot_store().exists(last_control_screenshot_path):
                 last_control_screenshot_path = (
                     log_path + f"action_step{session_step - 1}.png"
                 )
@@ -898,10 +1146,13 @@ class AppLLMInteractionStrategy(BaseProcessingStrategy):
                 f"Collected {len(image_string_list)} screenshots for prompt."
             )
 
-            # Step 2: Retrieve knowledge from the knowledge base
-            self.logger.info("Retrieving knowledge from the knowledge base")
+            # Step 2: Retrieve knowledge from the knowledge base, unless already
+            # retrieved during data collection
+            knowledge_retrieved = context.get_local("knowledge_retrieved")
 
-            knowledge_retrieved = self._knowledge_retrieval(agent, subtask)
+            if knowledge_retrieved is None:
+                self.logger.info("Retrieving knowledge from the knowledge base")
+                knowledge_retrieved = await self._knowledge_retrieval(agent, subtask)
 
             # Step 3: Build comprehensive prompt
             self.logger.info("Building App Agent prompt with control information")
@@ -922,8 +1173,9 @@ class AppLLMInteractionStrategy(BaseProcessingStrategy):
 
             # Step 4: Get LLM response
             self.logger.info("Getting LLM response for App Agent")
+            llm_parsing = {}
             response_text, llm_cost = await self._get_llm_response(
-                agent, prompt_message
+                agent, prompt_message, llm_parsing
             )
 
             # Step 5: Parse and validate response
@@ -939,6 +1191,7 @@ class AppLLMInteractionStrategy(BaseProcessingStrategy):
                     "parsed_response": parsed_response,
                     "response_text": response_text,
                     "llm_cost": llm_cost,
+                    "llm_parsing": llm_parsing,
                     "concat_screenshot_path": concat_screenshot_path,
                     "last_control_screenshot_path": last_control_screenshot_path,
                     "prompt_message": prompt_message,
@@ -968,28 +1221,36 @@ class AppLLMInteractionStrategy(BaseProcessingStrategy):
         :return: A list of image base64 string.
         """
 
-        photographer = PhotographerFacade()
+        screenshot_store = get_screenshot_store()
         image_string_list = []
 
         if ufo_config.system.include_last_screenshot:
 
             image_string_list += [
-                photographer.encode_image_from_path(last_control_screenshot_path)
+                screenshot_store.encode(last_control_screenshot_path)
             ]
 
-        photographer.concat_screenshots(
-            clean_screenshot_path,
-            annotated_screenshot_path,
-            concat_screenshot_save_path,
-        )
+        # Concatenate the screenshots kept in memory, instead of reading them back
+        clean_screenshot = screenshot_store.get(clean_screenshot_path)
+        annotated_screenshot = screenshot_store.get(annotated_screenshot_path)
+
+        if clean_screenshot is not None and annotated_screenshot is not None:
+            screenshot_store.put(
+                concat_screenshot_save_path,
+                PhotographerFacade.concat_images(clean_screenshot, annotated_screenshot),
+            )
+        else:
+            self.logger.warning(
+                f"Cannot concatenate {clean_screenshot_path} and {annotated_screenshot_path}."
+            )
 
         if ufo_config.system.concat_screenshot:
             image_string_list += [
-                photographer.encode_image_from_path(concat_screenshot_save_path)
+                screenshot_store.encode(concat_screenshot_save_path)
             ]
         else:
-            screenshot_url = photographer.encode_image_from_path(clean_screenshot_path)
-            screenshot_annotated_url = photographer.encode_image_from_path(
+            screenshot_url = screenshot_store.encode(clean_screenshot_path)
+            screenshot_annotated_url = screenshot_store.encode(
                 annotated_screenshot_path
             )
             image_string_list += [screenshot_url, screenshot_annotated_url]
@@ -1016,31 +1277,17 @@ class AppLLMInteractionStrategy(BaseProcessingStrategy):
             self.logger.warning(f"Failed to get previous plan: {str(e)}")
             return []
 
-    def _knowledge_retrieval(self, agent: "AppAgent", subtask: str):
+    async def _knowledge_retrieval(self, agent: "AppAgent", subtask: str):
         """
         Retrieve knowledge for the given subtask.
         :param: agent: The agent to conduct the retrieval
         :param: subtask: The subtask for which to retrieve knowledge.
         """
 
-        experience_examples, demonstration_examples = agent.demonstration_prompt_helper(
-            request=subtask
-        )
-
-        # Get the external knowledge prompt for the AppAgent using the offline and online retrievers.
-
-        offline_docs, online_docs = agent.external_knowledge_prompt_helper(
-            subtask,
-            ufo_config.rag.offline_docs_retrieved_topk,
-            ufo_config.rag.online_retrieved_topk,
+        knowledge_retrieved, _ = await AppKnowledgeRetrievalStrategy.retrieve_knowledge(
+            agent, subtask
         )
-
-        return {
-            "experience_examples": experience_examples,
-            "demonstration_examples": demonstration_examples,
-            "offline_docs": offline_docs,
-            "online_docs": online_docs,
-        }
+        return knowledge_retrieved
 
     async def _build_app_prompt(
         self,
@@ -1107,7 +1354,7 @@ class AppLLMInteractionStrategy(BaseProcessingStrategy):
             )
 
             # Log request data for debugging
-            self._log_request_data(
+            await self._log_request_data(
                 session_step=session_step,
                 plan=plan,
                 prev_subtask=prev_subtask,
@@ -1152,7 +1399,7 @@ class AppLLMInteractionStrategy(BaseProcessingStrategy):
             self.logger.warning(f"Failed to get last success actions: {str(e)}")
             return []
 
-    def _log_request_data(
+    async def _log_request_data(
         self,
         session_step: int,
         plan: List[str],
@@ -1208,41 +1455,59 @@ class AppLLMInteractionStrategy(BaseProcessingStrategy):
                 prompt=prompt_message,
             )
 
-            # Log as JSON
-            request_log_str = json.dumps(asdict(request_data), ensure_ascii=False)
-
-            # Use request logger if available
+            # Log as JSON, serialized by the background log writer
             if request_logger:
-                request_logger.write(request_log_str)
+                await request_logger.awrite_record(asdict(request_data))
 
         except Exception as e:
             self.logger.warning(f"Failed to log request data: {str(e)}")
 
     async def _get_llm_response(
-        self, agent: "AppAgent", prompt_message: List[Dict[str, Any]]
+        self,
+        agent: "AppAgent",
+        prompt_message: List[Dict[str, Any]],
+        parsing_stats: Optional[Dict[str, Any]] = None,
     ) -> tuple[str, float]:
         """
-        Get response from LLM with retry logic.
+        Get response from LLM with retry logic. A response that fails to parse is
+        repaired first (see _repair_llm_response); the full prompt is only resent when
+        the repair fails.
         :param agent: The AppAgent instance
         :param prompt_message: Prompt message to send
-        :return: Tuple of (response_text, cost)
-        """
+        :param parsing_stats: Optional dictionary filled with the retry and repair statistics
+        :return: Tuple of (response_text, cost), where cost covers all attempts
+        """
+        stats = parsing_stats if parsing_stats is not None else {}
+        stats.update(
+            {
+                "full_retries": 0,
+                "repair_attempts": 0,
+                "repair_successes": 0,
+                "repair_success_rate": None,
+                "repair_stage": None,
+                "bytes_saved": 0,
+            }
+        )
+
         try:
             max_retries = ufo_config.system.json_parsing_retry
             last_exception = None
+            total_cost = 0.0
 
             for retry_count in range(max_retries):
+                response_text = None
                 try:
-                    # 🔧 FIX: Run synchronous LLM call in thread executor to avoid blocking event loop
-                    # This prevents WebSocket ping/pong timeout during long LLM responses
-                    loop = asyncio.get_event_loop()
-                    response_text, cost = await loop.run_in_executor(
-                        None,  # Use default ThreadPoolExecutor
-                        agent.get_response,
+                    if retry_count > 0:
+                        stats["full_retries"] += 1
+
+                    # Await the async LLM service directly, so long LLM responses neither block
+                    # the event loop (WebSocket ping/pong) nor hold a worker thread
+                    response_text, cost = await agent.aget_response(
                         prompt_message,
                         AgentType.APP,
                         True,  # use_backup_engine
                     )
+                    total_cost += cost
 
                     # Validate response can be parsed
                     agent.response_to_dict(response_text)
@@ -1252,14 +1517,23 @@ class AppLLMInteractionStrategy(BaseProcessingStrategy):
                             f"LLM response successful after {retry_count} retries"
                         )
 
-                    return response_text, cost
+                    return response_text, total_cost
 
                 except Exception as e:
                     last_exception = e
-                    if retry_count < max_retries - 1:
-                        self.logger.warning(
-                            f"LLM response parsing failed (attempt {retry_count + 1}/{max_retries}): {str(e)}"
-                        )
+
+                if response_text is not None:
+                    repaired_text, repair_cost = await self._repair_llm_response(
+                        agent, prompt_message, response_text, last_exception, stats
+                    )
+                    total_cost += repair_cost
+                    if repaired_text is not None:
+                        return repaired_text, total_cost
+
+                if retry_count < max_retries - 1:
+                    self.logger.warning(
+                        f"LLM response parsing failed (attempt {retry_count + 1}/{max_retries}): {str(last_exception)}"
+                    )
 
             raise Exception(
                 f"LLM interaction failed after {max_retries} attempts: {str(last_exception)}"
@@ -1268,6 +1542,70 @@ class AppLLMInteractionStrategy(BaseProcessingStrategy):
         except Exception as e:
             raise Exception(f"Failed to get LLM response: {str(e)}")
 
+        finally:
+            if stats["repair_attempts"]:
+                stats["repair_success_rate"] = (
+                    stats["repair_successes"] / stats["repair_attempts"]
+                )
+
+    async def _repair_llm_response(
+        self,
+        agent: "AppAgent",
+        prompt_message: List[Dict[str, Any]],
+        response_text: str,
+        error: Exception,
+        stats: Dict[str, Any],
+    ) -> tuple[Optional[str], float]:
+        """
+        Repair a response that failed to parse, without resending the multimodal prompt:
+        tolerant JSON extraction and schema-guided fix-up first, then a short text-only
+        follow-up asking the model to fix its JSON. Truncated responses are not repaired,
+        since completing them could execute a cut-off action; the full prompt is resent.
+        :param agent: The AppAgent instance
+        :param prompt_message: The prompt that produced the response
+        :param response_text: The response that failed to parse
+        :param error: The parsing error
+        :param stats: The retry and repair statistics to update
+        :return: Tuple of (repaired response text or None, cost of the follow-up)
+        """
+        stats["repair_attempts"] += 1
+        prompt_bytes = len(json.dumps(prompt_message, ensure_ascii=False).encode("utf-8"))
+
+        try:
+            extracted = extract_json_object(response_text)
+            repaired = fit_to_schema(extracted, AppAgentResponse)
+            stage = "extraction" if repaired == extracted else "schema"
+            cost = 0.0
+        except TruncatedJSONError as e:
+            self.logger.warning(
+                f"LLM response is truncated, resending the full prompt: {str(e)}"
+            )
+            return None, 0.0
+        except ValueError as e:
+            follow_up = build_fix_json_prompt(response_text, e, AppAgentResponse)
+            cost = 0.0
+            try:
+                fixed_text, cost = await agent.aget_response(
+                    follow_up, AgentType.APP, True
+                )
+                repaired = fit_to_schema(extract_json_object(fixed_text), AppAgentResponse)
+            except Exception as follow_up_error:
+                self.logger.warning(
+                    f"LLM response repair failed, resending the full prompt: {str(follow_up_error)}"
+                )
+                return None, cost
+            stage = "follow_up"
+            prompt_bytes -= len(json.dumps(follow_up, ensure_ascii=False).encode("utf-8"))
+
+        stats["repair_successes"] += 1
+        stats["repair_stage"] = stage
+        stats["bytes_saved"] += max(prompt_bytes, 0)
+        self.logger.info(
+            f"Repaired LLM response by {stage} after parsing failed ({str(error)}), "
+            f"saved resending {prompt_bytes} bytes"
+        )
+        return json.dumps(repaired, ensure_ascii=False), cost
+
     def _parse_app_response(
         self, agent: "AppAgent", response_text: str
     ) -> AppAgentResponse:
@@ -1503,24 +1841,29 @@ class AppActionExecutionStrategy(BaseProcessingStrategy):
         clean_screenshot_path: str,
         target_list: List[TargetInfo],
         save_path: str,
-    ) -> str:
+    ) -> Optional["Image.Image"]:
         """
         Save annotated screenshot using photographer with optimized TargetRegistry approach.
+        The image is encoded for the LLM only when the next step includes it.
         :param clean_screenshot_path: Path to the clean screenshot
         :param target_list: List of TargetInfo objects
         :param save_path: The saved path of the annotated screenshot
-        :return: The return annotated image string
+        :return: The annotated image
         """
 
         try:
             photographer = PhotographerFacade()
-            photographer.capture_app_window_screenshot_with_target_list(
-                application_window_info=application_window_info,
-                target_list=target_list,
-                path=clean_screenshot_path,
-                save_path=save_path,
-                highlight_bbox=True,
+            screenshot_store = get_screenshot_store()
+            annotated_screenshot = (
+                photographer.capture_app_window_screenshot_with_target_list(
+                    application_window_info=application_window_info,
+                    target_list=target_list,
+                    path=clean_screenshot_path,
+                    image=screenshot_store.get(clean_screenshot_path),
+                    highlight_bbox=True,
+                )
             )
+            screenshot_store.put(save_path, annotated_screenshot)
             self.logger.info(
                 f"application_window_info: {application_window_info}, clean_screenshot_path: {clean_screenshot_path}, target_list: {target_list}, save_path: {save_path}"
             )
@@ -1528,8 +1871,7 @@ class AppActionExecutionStrategy(BaseProcessingStrategy):
                 f"Annotated screenshot for selected controls is saved to {save_path}"
             )
 
-            annotated_screenshot_url = photographer.encode_image_from_path(save_path)
-            return annotated_screenshot_url
+            return annotated_screenshot
         except Exception as e:
             import traceback
 
@@ -1695,6 +2037,7 @@ class AppMemoryUpdateStrategy(BaseProcessingStrategy):
             app_context.app_root = context.get("app_root", "")
 
             app_context.cost = context.get("llm_cost", 0.0)
+            app_context.llm_parsing = context.get("llm_parsing", {})
 
             app_context.results = context.get("execution_result", [])
 
@@ -1765,6 +2108,8 @@ class AppMemoryUpdateStrategy(BaseProcessingStrategy):
                     "screenshot application": application_process_name,
                     "saving reason": save_reason,
                 }
+                # The blackboard reads the screenshot from disk
+                get_screenshot_store().flush(screenshot_path)
                 agent.blackboard.add_image(screenshot_path, metadata)
 
         except Exception as e:
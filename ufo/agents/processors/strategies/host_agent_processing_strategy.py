@@ -16,8 +16,6 @@ The processor maintains backward compatibility with BaseProcessor interface
 while providing enhanced modularity, error handling, and extensibility.
 """
 
-import asyncio
-import json
 from dataclasses import asdict
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
@@ -510,7 +508,7 @@ class HostLLMInteractionStrategy(BaseProcessingStrategy):
             )
 
             # Log request data for debugging
-            self._log_request_data(
+            await self._log_request_data(
                 session_step,
                 desktop_screenshot_url,
                 target_info_list,
@@ -528,7 +526,7 @@ class HostLLMInteractionStrategy(BaseProcessingStrategy):
         except Exception as e:
             raise Exception(f"Failed to build prompt message: {str(e)}")
 
-    def _log_request_data(
+    async def _log_request_data(
         self,
         session_step: int,
         desktop_screenshot_url: str,
@@ -564,12 +562,9 @@ class HostLLMInteractionStrategy(BaseProcessingStrategy):
                 prompt=prompt_message,
             )
 
-            # Log request data as JSON
-            request_log_str = json.dumps(asdict(request_data), ensure_ascii=False)
-
-            # Use request logger if available
+            # Log request data as JSON, serialized by the background log writer
             if request_logger:
-                request_logger.write(request_log_str)
+                await request_logger.awrite_record(asdict(request_data))
 
         except Exception as e:
             self.logger.warning(f"Failed to log request data: {str(e)}")
@@ -589,12 +584,9 @@ class HostLLMInteractionStrategy(BaseProcessingStrategy):
 
         for retry_count in range(max_retries):
             try:
-                # 🔧 FIX: Run synchronous LLM call in thread executor to avoid blocking event loop
-                # This prevents WebSocket ping/pong timeout during long LLM responses
-                loop = asyncio.get_event_loop()
-                response_text, cost = await loop.run_in_executor(
-                    None,  # Use default ThreadPoolExecutor
-                    host_agent.get_response,
+                # Await the async LLM service directly, so long LLM responses neither block
+                # the event loop (WebSocket ping/pong) nor hold a worker thread
+                response_text, cost = await host_agent.aget_response(
                     prompt_message,
                     AgentType.HOST,
                     True,  # use_backup_engine
@@ -7,6 +7,7 @@ from ufo.agents.processors.core.processor_framework import (
     ProcessingPhase,
     ProcessingResult,
 )
+from ufo.agents.processors.core.strategy_dependency import StrategyExecutionGraph
 
 
 if TYPE_CHECKING:
@@ -143,10 +144,11 @@ class ComposedStrategy(BaseProcessingStrategy):
 
     This strategy allows for flexible composition of multiple processing strategies while
     maintaining the framework requirement of one strategy per processing phase. It executes
-    strategies sequentially and combines their results.
+    strategies sequentially, or concurrently along the dependency graph built from their
+    declared dependencies and provides, and combines their results.
 
     Features:
-    - Sequential execution of multiple strategies
+    - Sequential or dependency-driven concurrent execution of multiple strategies
     - Context data propagation between strategies
     - Combined result aggregation
     - Flexible error handling (fail-fast or continue)
@@ -159,6 +161,7 @@ class ComposedStrategy(BaseProcessingStrategy):
         name: str = "",
         fail_fast: bool = True,
         phase: ProcessingPhase = ProcessingPhase.DATA_COLLECTION,
+        concurrent: bool = False,
     ) -> None:
         """
         Initialize generic composed strategy.
@@ -167,6 +170,7 @@ class ComposedStrategy(BaseProcessingStrategy):
         :param name: Name of the composed strategy
         :param fail_fast: Whether to stop on first error or continue with partial results
         :param phase: Processing phase for this composed strategy
+        :param concurrent: Whether to run independent strategies at the same time
         """
         super().__init__(name=name, fail_fast=fail_fast)
 
@@ -175,6 +179,9 @@ class ComposedStrategy(BaseProcessingStrategy):
 
         self.strategies = strategies
         self.execution_phase = phase
+        self.execution_graph = StrategyExecutionGraph(
+            strategies, sequential=not concurrent
+        )
 
         if not self.name:
             self.name = "ComposedStrategy_" + "_".join([s.name for s in strategies])
@@ -221,7 +228,7 @@ class ComposedStrategy(BaseProcessingStrategy):
 
     async def execute(self, agent, context: ProcessingContext) -> ProcessingResult:
         """
-        Execute all component strategies in sequence.
+        Execute all component strategies, each once the strategies it depends on are done.
 
         :param agent: The agent instance (can be AppAgent, HostAgent, etc.)
         :param context: Processing context
@@ -229,78 +236,45 @@ class ComposedStrategy(BaseProcessingStrategy):
         """
         try:
             start_time = time.time()
+            mode = "sequential" if self.execution_graph.sequential else "concurrent"
             self.logger.info(
-                f"Starting composed strategy '{self.name}' with {len(self.strategies)} components"
+                f"Starting composed strategy '{self.name}' with {len(self.strategies)} components ({mode})"
             )
 
-            combined_data = {}
-            execution_results = []
-
-            # Execute each strategy in sequence
-            for i, strategy in enumerate(self.strategies):
-                strategy_name = strategy.name
-
-                self.logger.info(
-                    f"Executing component {i+1}/{len(self.strategies)}: {strategy_name}"
-                )
+            # Successful results are merged into the context as each strategy finishes
+            results, timings = await self.execution_graph.execute(
+                agent, context, fail_fast=self.fail_fast
+            )
 
-                try:
-                    # Execute the strategy
-                    result: ProcessingResult = await strategy.execute(agent, context)
-                    execution_results.append(result)
-
-                    if result.success:
-                        # Update context with strategy results for next strategy
-                        if result.data:
-                            context.update_local(result.data)
-
-                        self.logger.debug(
-                            f"Strategy '{strategy_name}' completed successfully"
-                        )
-                    else:
-                        # Handle strategy failure
-                        error_msg = f"Strategy '{strategy_name}' failed: {result.error or 'Unknown error'}"
-                        self.logger.error(error_msg)
-
-                        if self.fail_fast:
-                            return ProcessingResult(
-                                success=False,
-                                data=combined_data,
-                                error=error_msg,
-                                phase=self.execution_phase,
-                            )
-                        else:
-                            # Continue with next strategy, log warning
-                            self.logger.warning(
-                                f"Continuing with remaining strategies despite failure in '{strategy_name}'"
-                            )
-
-                except Exception as e:
-                    error_msg = f"Strategy '{strategy_name}' raised exception: {str(e)}"
-                    self.logger.error(error_msg)
-
-                    if self.fail_fast:
-                        return ProcessingResult(
-                            success=False,
-                            data=combined_data,
-                            error=error_msg,
-                            phase=self.execution_phase,
-                        )
-                    else:
-                        self.logger.warning(
-                            f"Continuing with remaining strategies despite exception in '{strategy_name}'"
-                        )
+            combined_data = {}
 
             # Calculate total execution time
             total_time = time.time() - start_time
 
-            # Determine overall success
             successful_strategies = sum(
-                1 for result in execution_results if result.success
+                1 for result in results if result is not None and result.success
             )
-            overall_success = (
-                successful_strategies > 0
-            )  # At least one strategy succeeded
+            failed_results = [
+                (strategy, result)
+                for strategy, result in zip(self.strategies, results)
+                if result is not None and not result.success
+            ]
+
+            if self.fail_fast and failed_results:
+                strategy, result = failed_results[0]
+                return ProcessingResult(
+                    success=False,
+                    data=combined_data,
+                    error=f"Strategy '{strategy.name}' failed: {result.error or 'Unknown error'}",
+                    phase=self.execution_phase,
+                    execution_time=total_time,
+                    strategy_timings=[timing.to_dict() for timing in timings],
+                )
+
+            for strategy, _ in failed_results:
+                self.logger.warning(
+                    f"Continuing with remaining strategies despite failure in '{strategy.name}'"
+                )
 
             if not self.fail_fast:
                 # In non-fail-fast mode, success if any strategy succeeded
@@ -319,6 +293,7 @@ class ComposedStrategy(BaseProcessingStrategy):
                 data=combined_data,
                 phase=self.execution_phase,
                 execution_time=total_time,
+                strategy_timings=[timing.to_dict() for timing in timings],
             )
 
         except Exception as e:
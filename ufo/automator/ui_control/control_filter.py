@@ -1,10 +1,16 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
-import heapq
+import hashlib
 import re
+import threading
 from abc import abstractmethod
-from typing import Dict, List
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List
 
+import numpy as np
+
+# The max number of embeddings kept per filter model, across steps
+EMBEDDING_CACHE_SIZE = 4096
 
 
 class ControlFilterFactory:
@@ -76,6 +82,9 @@ class BasicControlFilter:
         if model_path not in cls._instances:
             instance = super(BasicControlFilter, cls).__new__(cls)
             instance.model = cls.load_model(model_path)
+            instance.embedding_cache = OrderedDict()
+            # Filter models are shared, so their cache may be used from several threads
+            instance.embedding_cache_lock = threading.Lock()
             cls._instances[model_path] = instance
         return cls._instances[model_path]
 
@@ -99,6 +108,92 @@ class BasicControlFilter:
 
         return self.model.encode(content)
 
+    def get_embeddings(
+        self, contents: List[Any], key: Callable[[Any], Hashable] = None
+    ) -> np.ndarray:
+        """
+        Encodes the given contents into an embedding matrix. Cached embeddings are reused,
+        and the remaining contents are encoded together in a single batch, outside the
+        cache lock.
+        :param contents: The contents to encode.
+        :param key: Gets the cache key of a content, the content itself by default.
+        :return: The embeddings, one row per content.
+        """
+        key = key or (lambda content: content)
+        keys = [key(content) for content in contents]
+
+        found = {}
+        missing = {}
+        with self.embedding_cache_lock:
+            for cache_key, content in zip(keys, contents):
+                if cache_key in self.embedding_cache:
+                    found[cache_key] = self.embedding_cache[cache_key]
+                else:
+                    missing.setdefault(cache_key, content)
+
+        if missing:
+            embeddings = np.asarray(self.model.encode(list(missing.values())))
+            found.update(zip(missing, embeddings))
+
+        with self.embedding_cache_lock:
+            for cache_key in keys:
+                self.embedding_cache[cache_key] = found[cache_key]
+                self.embedding_cache.move_to_end(cache_key)
+            while len(self.embedding_cache) > EMBEDDING_CACHE_SIZE:
+                self.embedding_cache.popitem(last=False)
+
+        rows = [found[cache_key] for cache_key in keys]
+        return np.stack(rows) if rows else np.empty((0, 0))
+
+    @staticmethod
+    def similarity_matrix(embeddings1: np.ndarray, embeddings2: np.ndarray) -> np.ndarray:
+        """
+        Computes the cosine similarity between every pair of rows of two embedding matrices.
+        :param embeddings1: The first embeddings, one row per item.
+        :param embeddings2: The second embeddings, one row per item.
+        :return: The similarity matrix of shape (len(embeddings1), len(embeddings2)).
+        """
+
+        def normalize(embeddings: np.ndarray) -> np.ndarray:
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            return embeddings / np.maximum(norms, 1e-12)
+
+        return normalize(embeddings1) @ normalize(embeddings2).T
+
+    def top_k_scores(
+        self,
+        labels: List[str],
+        contents: List[Any],
+        plans: List[str],
+        top_k: int,
+        key: Callable[[Any], Hashable] = None,
+    ) -> Dict[str, float]:
+        """
+        Scores each content by its highest similarity to any of the plans and keeps the top-k.
+        :param labels: The labels of the contents.
+        :param contents: The contents to score.
+        :param plans: The plans to compare the contents against.
+        :param top_k: The number of top items to return.
+        :param key: Gets the cache key of a content.
+        :return: The top-k labels and their scores, best first.
+        """
+        if not labels or not plans or top_k <= 0:
+            return {}
+
+        scores = self.similarity_matrix(
+            self.get_embeddings(contents, key), self.get_embeddings(plans)
+        ).max(axis=1)
+
+        if top_k < len(scores):
+            candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            candidates = np.arange(len(scores))
+        # Stable sort, so ties keep the order of the contents
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        return {labels[i]: float(scores[i]) for i in ranked}
+
     @abstractmethod
     def control_filter(self, control_dicts, plans, **kwargs):
         """
@@ -200,34 +295,31 @@ class SemanticControlFilter(BasicControlFilter):
         :return: The score (0-1) indicating the similarity between the control text and the keywords.
         """
 
-        plan_embedding = self.get_embedding(plans)
-        control_text_embedding = self.get_embedding(control_text)
-        return max(self.cos_sim(control_text_embedding, plan_embedding).tolist()[0])
+        return float(
+            self.similarity_matrix(
+                self.get_embeddings([control_text]), self.get_embeddings(plans)
+            ).max()
+        )
 
     def control_filter(self, control_dicts, plans, top_k):
         """
         Filters control items based on their similarity to a set of keywords.
+        All control texts and plans are embedded in one batch and scored together.
         :param control_dicts: The dictionary of control items to be filtered.
         :param plans: The list of plans to be used for filtering.
         :param top_k: The number of top control items to return.
         :return: The filtered control items.
         """
-        scores_items = []
-        filtered_control_dict = {}
+        labels = list(control_dicts)
+        control_texts = [control_dicts[label].name.lower() for label in labels]
 
-        for label, control_item in control_dicts.items():
-            control_text = control_item.name.lower()
-            score = self.control_filter_score(control_text, plans)
-            scores_items.append((label, score))
-        topk_scores_items = heapq.nlargest(top_k, (scores_items), key=lambda x: x[1])
-        topk_items = [
-            (score_item[0], score_item[1]) for score_item in topk_scores_items
-        ]
+        topk_items = self.top_k_scores(labels, control_texts, plans, top_k)
 
-        for label, control_item in control_dicts.items():
-            if label in topk_items:
-                filtered_control_dict[label] = control_item
-        return filtered_control_dict
+        return {
+            label: control_item
+            for label, control_item in control_dicts.items()
+            if label in topk_items
+        }
 
 
 class IconControlFilter(BasicControlFilter):
@@ -243,13 +335,32 @@ class IconControlFilter(BasicControlFilter):
         :return: The maximum similarity score between the control icon and the keywords.
         """
 
-        plans_embedding = self.get_embedding(plans)
-        control_icon_embedding = self.get_embedding(control_icon)
-        return max(self.cos_sim(control_icon_embedding, plans_embedding).tolist()[0])
+        return float(
+            self.similarity_matrix(
+                self.get_embeddings([control_icon], self.icon_key),
+                self.get_embeddings(plans),
+            ).max()
+        )
+
+    @staticmethod
+    def icon_key(control_icon) -> Hashable:
+        """
+        Gets the cache key of an icon image: the hash of its pixels.
+        :param control_icon: The control icon image.
+        :return: The cache key.
+        """
+        try:
+            pixels = control_icon.tobytes()
+            shape = (control_icon.mode, control_icon.size)
+        except AttributeError:
+            pixels = np.ascontiguousarray(control_icon).tobytes()
+            shape = np.shape(control_icon)
+        return ("icon", shape, hashlib.sha1(pixels).hexdigest())
 
     def control_filter(self, control_dicts, cropped_icons_dict, plans, top_k):
         """
         Filters control items based on their scores and returns the top-k items.
+        All icons and plans are embedded in one batch and scored together.
         :param control_dicts: The dictionary of all control items.
         :param cropped_icons_dict: The dictionary of the cropped icons.
         :param plans: The plans to compare the control icons against.
@@ -257,16 +368,15 @@ class IconControlFilter(BasicControlFilter):
         :return: The list of top-k control items based on their scores.
         """
 
-        scores_items = []
-        filtered_control_dict = {}
+        labels = list(cropped_icons_dict)
+        cropped_icons = [cropped_icons_dict[label] for label in labels]
 
-        for label, cropped_icon in cropped_icons_dict.items():
-            score = self.control_filter_score(cropped_icon, plans)
-            scores_items.append((score, label))
-        topk_scores_items = heapq.nlargest(top_k, scores_items, key=lambda x: x[0])
-        topk_labels = [scores_items[1] for scores_items in topk_scores_items]
+        topk_labels = self.top_k_scores(
+            labels, cropped_icons, plans, top_k, key=self.icon_key
+        )
 
-        for label, control_item in control_dicts.items():
-            if label in topk_labels:
-                filtered_control_dict[label] = control_item
-        return filtered_control_dict
+        return {
+            label: control_item
+            for label, control_item in control_dicts.items()
+            if label in topk_labels
+        }
@@ -11,7 +11,7 @@ from abc import ABC, abstractmethod
 from io import BytesIO
 from typing import Dict, List, Optional, Tuple, TYPE_CHECKING, Any
 
-from PIL import Image, ImageDraw, ImageFont, ImageGrab
+from PIL import Image, ImageChops, ImageDraw, ImageFont, ImageGrab
 
 # Conditional imports for Windows-specific packages
 if TYPE_CHECKING or platform.system() == "Windows":
@@ -22,6 +22,7 @@ else:
     RECT = Any
 
 from ufo import utils
+from ufo.automator.ui_control import spatial_index
 from config.config_loader import get_ufo_config
 
 if TYPE_CHECKING:
@@ -829,6 +830,7 @@ class TargetAnnotationDecorator(PhotographerDecorator):
         save_path: Optional[str] = None,
         path: Optional[str] = None,
         highlight_bbox: bool = False,
+        image: Optional[Image.Image] = None,
     ) -> Image.Image:
         """
         Capture a screenshot with annotations using target information.
@@ -836,10 +838,14 @@ class TargetAnnotationDecorator(PhotographerDecorator):
         :param save_path: The path to save the screenshot.
         :param path: The path to the background image.
         :param highlight_bbox: Whether to highlight control bounding boxes.
+        :param image: The background image already in memory, used instead of the path.
         :return: The screenshot with annotations.
         """
+        if image is not None:
+            # Labels are pasted in place, so keep the given image clean
+            screenshot_annotated = image.copy()
         # Load screenshot from path (since we don't have application window)
-        if path and os.path.exists(path):
+        elif path and os.path.exists(path):
             screenshot_annotated = Image.open(path)
         else:
             raise ValueError("Background screenshot path is required and must exist")
@@ -1179,9 +1185,23 @@ class PhotographerFacade:
 
             return Image.new("RGB", (0, 0))
 
-        image1 = Image.open(image1_path)
-        image2 = Image.open(image2_path)
+        result = PhotographerFacade.concat_images(
+            Image.open(image1_path), Image.open(image2_path)
+        )
+
+        # Save the result
+        result.save(output_path, compress_level=DEFAULT_PNG_COMPRESS_LEVEL)
 
+        return result
+
+    @staticmethod
+    def concat_images(image1: Image.Image, image2: Image.Image) -> Image.Image:
+        """
+        Concatenate two images horizontally, cropped to the same height.
+        :param image1: The first image.
+        :param image2: The second image.
+        :return: The concatenated image.
+        """
         # Ensure both images have the same height
         min_height = min(image1.height, image2.height)
         image1 = image1.crop((0, 0, image1.width, min_height))
@@ -1192,11 +1212,57 @@ class PhotographerFacade:
         result.paste(image1, (0, 0))
         result.paste(image2, (image1.width, 0))
 
-        # Save the result
-        result.save(output_path, compress_level=DEFAULT_PNG_COMPRESS_LEVEL)
-
         return result
 
+    @staticmethod
+    def images_identical(image1: Image.Image, image2: Image.Image) -> bool:
+        """
+        Check whether two images have the same size and pixels.
+        :param image1: The first image.
+        :param image2: The second image.
+        :return: True if the images are identical.
+        """
+        if image1.size != image2.size:
+            return False
+        if image1.mode != image2.mode:
+            image2 = image2.convert(image1.mode)
+        return ImageChops.difference(image1, image2).getbbox() is None
+
+    @staticmethod
+    def images_similar(
+        image1: Image.Image,
+        image2: Image.Image,
+        tolerance: float = 0.01,
+        threshold: int = 16,
+        max_side: int = 160,
+    ) -> bool:
+        """
+        Check whether two images look the same, ignoring small changes such as a
+        blinking caret or a spinner. Both images are downscaled to grayscale
+        thumbnails, and they are similar when the share of thumbnail pixels that
+        differ by more than the threshold does not exceed the tolerance.
+        :param image1: The first image.
+        :param image2: The second image.
+        :param tolerance: The maximum share (0-1) of differing thumbnail pixels.
+        :param threshold: The minimum grayscale difference (0-255) of a differing pixel.
+        :param max_side: The longest side of the thumbnails in pixels.
+        :return: True if the images are similar.
+        """
+        if image1.size != image2.size:
+            return False
+
+        scale = min(1.0, max_side / max(image1.size))
+        size = (
+            max(1, round(image1.width * scale)),
+            max(1, round(image1.height * scale)),
+        )
+        thumb1 = image1.convert("L").resize(size, Image.BILINEAR)
+        thumb2 = image2.convert("L").resize(size, Image.BILINEAR)
+
+        histogram = ImageChops.difference(thumb1, thumb2).histogram()
+        changed = sum(histogram[threshold + 1 :])
+        return changed <= tolerance * size[0] * size[1]
+
     @staticmethod
     def load_image(image_path: str) -> Image.Image:
         """
@@ -1328,18 +1394,21 @@ class PhotographerFacade:
         """
         merged_target_list = main_target_list.copy()
 
-        for additional_target in additional_target_list:
-            is_overlapping = False
-            for main_target in main_target_list:
-                if (
-                    PhotographerFacade.target_info_iou(additional_target, main_target)
-                    > iou_overlap_threshold
-                ):
-                    is_overlapping = True
-                    break
+        if not additional_target_list:
+            return merged_target_list
 
-            if not is_overlapping:
-                merged_target_list.append(additional_target)
+        # Score all pairs at once on rect arrays, see target_info_iou for the IoU
+        overlapping = spatial_index.overlapping_mask(
+            spatial_index.rect_array([target.rect for target in additional_target_list]),
+            spatial_index.rect_array([target.rect for target in main_target_list]),
+            iou_overlap_threshold,
+        )
+
+        merged_target_list.extend(
+            target
+            for target, is_overlapping in zip(additional_target_list, overlapping)
+            if not is_overlapping
+        )
 
         return merged_target_list
 
@@ -1465,6 +1534,7 @@ class PhotographerFacade:
         save_path: Optional[str] = None,
         path: Optional[str] = None,
         highlight_bbox: bool = False,
+        image: Optional[Image.Image] = None,
     ) -> Image.Image:
         """
         Capture the control screenshot with annotations using TargetRegistry.
@@ -1477,6 +1547,7 @@ class PhotographerFacade:
         :param save_path: The path to save the screenshot.
         :param path: The path to the background image.
         :param highlight_bbox: Whether to highlight control bounding boxes with semi-transparent overlays.
+        :param image: The background image already in memory, used instead of the path.
         :return: The screenshot with annotations.
         """
 
@@ -1488,5 +1559,5 @@ class PhotographerFacade:
             application_window_info=application_window_info,
         )
         return screenshot.capture_with_target_info(
-            target_list, save_path, path, highlight_bbox
+            target_list, save_path, path, highlight_bbox, image
         )
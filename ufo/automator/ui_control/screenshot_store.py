@@ -0,0 +1,344 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+In-memory store of the screenshots of the current steps.
+
+The screenshot pipeline of a step used to write every image to PNG under the log path and
+read it back to annotate, concatenate and base64-encode it for the LLM. The store keeps
+the images of the recent steps in memory, keyed by their log path, instead:
+
+- put registers an image and schedules its PNG archive on a background writer.
+- get and encode are served from memory, and fall back to the file on disk.
+- encode applies the LLM image policy (LLM_IMAGE_FORMAT / LLM_IMAGE_QUALITY) and caches
+  the data URL, so an image is encoded at most once per policy.
+- flush waits for pending writes, before anything reads the files from disk.
+"""
+
+import atexit
+import base64
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Dict, Optional
+
+from PIL import Image
+
+from ufo import utils
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_IMAGES = 10
+
+# The image formats the LLM policy supports, with their mime types
+LLM_IMAGE_FORMATS = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+
+
+@dataclass
+class StoredImage:
+    """
+    An image kept in memory and its encodings.
+    """
+
+    image: Image.Image
+    # The PNG bytes the image was decoded from, written to disk as they are
+    png_data: Optional[bytes] = None
+    # Image format and quality -> data URL
+    urls: Dict[tuple, str] = field(default_factory=dict)
+
+
+class ScreenshotStore:
+    """
+    Thread-safe in-memory store of screenshots with a background PNG writer.
+    """
+
+    def __init__(
+        self,
+        max_images: int = DEFAULT_MAX_IMAGES,
+        async_save: bool = True,
+        compress_level: int = 1,
+        llm_format: str = "png",
+        llm_quality: int = 85,
+    ) -> None:
+        """
+        Create a screenshot store.
+        :param max_images: The number of images kept in memory, least recently used first out.
+        :param async_save: Whether to write the images in the background. If False,
+        put writes the image before returning.
+        :param compress_level: The PNG compress level of the archived images, 0-9.
+        :param llm_format: The format of the images sent to the LLM: png, jpeg or webp.
+        :param llm_quality: The quality of jpeg and webp images sent to the LLM, 1-100.
+        """
+        if llm_format not in LLM_IMAGE_FORMATS:
+            raise ValueError(
+                f"Unsupported LLM image format {llm_format}, expected one of {list(LLM_IMAGE_FORMATS)}."
+            )
+
+        self.max_images = max_images
+        self.async_save = async_save
+        self.compress_level = compress_level
+        self.llm_format = llm_format
+        self.llm_quality = llm_quality
+
+        self._images: "OrderedDict[str, StoredImage]" = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+        # Reentrant, as a write finishing early runs its callback inside put
+        self._lock = threading.RLock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def put(
+        self, path: str, image: Image.Image, png_data: Optional[bytes] = None
+    ) -> Image.Image:
+        """
+        Keep an image in memory and archive it to a path.
+        :param path: The path of the archived image, also the key of the image.
+        :param image: The image.
+        :param png_data: The PNG bytes of the image, if already encoded.
+        :return: The image.
+        """
+        stored = StoredImage(image=image, png_data=png_data)
+        if png_data is not None:
+            # The source bytes are what the LLM would have received before
+            stored.urls[("png", None)] = "data:image/png;base64," + base64.b64encode(
+                png_data
+            ).decode("ascii")
+
+        with self._lock:
+            self._images[path] = stored
+            self._images.move_to_end(path)
+            while len(self._images) > self.max_images:
+                self._images.popitem(last=False)
+
+            if self.async_save:
+                future = self._get_executor().submit(self._write, path, stored)
+                self._pending[path] = future
+                future.add_done_callback(lambda f, path=path: self._done(path, f))
+
+        if not self.async_save:
+            self._write(path, stored)
+
+        return image
+
+    def put_image_string(self, image_string: str, path: str) -> Optional[Image.Image]:
+        """
+        Decode a base64 image string, keep it in memory and archive it, like
+        utils.save_image_string does without reading the file back.
+        :param image_string: The base64 image string.
+        :param path: The path of the archived image.
+        :return: The image, or None if it cannot be decoded.
+        """
+        if not isinstance(image_string, str) or not image_string.startswith(
+            "data:image/"
+        ):
+            image_string = utils._empty_image_string
+
+        try:
+            data = utils.decode_base64_image(image_string)
+            image = Image.open(BytesIO(data))
+            image.load()
+        except Exception as e:
+            logger.warning(f"Failed to decode the image for {path}: {e}")
+            return None
+
+        png_data = data if image.format == "PNG" else None
+        return self.put(path, image, png_data)
+
+    def get(self, path: str) -> Optional[Image.Image]:
+        """
+        Get an image from memory, or from its file.
+        :param path: The path of the image.
+        :return: The image, or None if it does not exist.
+        """
+        with self._lock:
+            stored = self._images.get(path)
+            if stored is not None:
+                self._images.move_to_end(path)
+                return stored.image
+
+        self.flush(path)
+        if not path or not os.path.exists(path):
+            return None
+
+        image = Image.open(path)
+        image.load()
+        return image
+
+    def exists(self, path: str) -> bool:
+        """
+        Check whether an image is in memory or on disk.
+        :param path: The path of the image.
+        :return: Whether the image exists.
+        """
+        with self._lock:
+            if path in self._images or path in self._pending:
+                return True
+        return bool(path) and os.path.exists(path)
+
+    def encode(self, path: str) -> str:
+        """
+        Encode an image as a data URL for the LLM, with the LLM image policy.
+        :param path: The path of the image.
+        :return: The data URL, or an empty image if the image does not exist.
+        """
+        quality = None if self.llm_format == "png" else self.llm_quality
+        key = (self.llm_format, quality)
+
+        with self._lock:
+            stored = self._images.get(path)
+            if stored is not None and key in stored.urls:
+                return stored.urls[key]
+
+        if stored is None:
+            self.flush(path)
+            if not path or not os.path.exists(path):
+                logger.warning(f"{path} does not exist.")
+                return utils._empty_image_string
+            if self.llm_format == "png":
+                return utils.encode_image_from_path(path)
+            stored = StoredImage(image=Image.open(path))
+
+        url = self.encode_image(stored.image, self.llm_format, quality)
+        with self._lock:
+            stored.urls[key] = url
+        return url
+
+    @staticmethod
+    def encode_image(
+        image: Image.Image, image_format: str = "png", quality: Optional[int] = None
+    ) -> str:
+        """
+        Encode an image as a data URL.
+        :param image: The image.
+        :param image_format: The format: png, jpeg or webp.
+        :param quality: The quality of jpeg and webp images.
+        :return: The data URL.
+        """
+        buffered = BytesIO()
+        if image_format == "png":
+            if image.mode not in ("RGB", "RGBA", "L", "P"):
+                image = image.convert("RGB")
+            image.save(buffered, format="PNG", optimize=True)
+        else:
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            image.save(buffered, format=image_format.upper(), quality=quality)
+
+        encoded = base64.b64encode(buffered.getvalue()).decode("ascii")
+        return f"data:{LLM_IMAGE_FORMATS[image_format]};base64,{encoded}"
+
+    def flush(
+        self,
+        path: Optional[str] = None,
+        timeout: Optional[float] = None,
+        directory: Optional[str] = None,
+    ) -> None:
+        """
+        Wait for pending writes.
+        :param path: The image to wait for, all images by default.
+        :param timeout: The max time (seconds) to wait.
+        :param directory: Only wait for the images under this directory (e.g. the log directory of a session).
+        """
+        with self._lock:
+            if path is not None:
+                futures = [self._pending[path]] if path in self._pending else []
+            elif directory is not None:
+                root = os.path.join(os.path.abspath(directory), "")
+                futures = [
+                    future
+                    for pending_path, future in self._pending.items()
+                    if os.path.abspath(pending_path).startswith(root)
+                ]
+            else:
+                futures = list(self._pending.values())
+
+        if futures:
+            wait(futures, timeout=timeout)
+
+    def clear(self) -> None:
+        """
+        Write the pending images and drop the images kept in memory.
+        """
+        self.flush()
+        with self._lock:
+            self._images.clear()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Get the background writer, created on first use. Must be called with the lock held.
+        :return: The executor.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="screenshot-writer"
+            )
+        return self._executor
+
+    def _write(self, path: str, stored: StoredImage) -> None:
+        """
+        Archive an image as PNG.
+        :param path: The path of the image.
+        :param stored: The stored image.
+        """
+        try:
+            save_dir = os.path.dirname(path)
+            if save_dir:
+                os.makedirs(save_dir, exist_ok=True)
+
+            if stored.png_data is not None:
+                with open(path, "wb") as f:
+                    f.write(stored.png_data)
+            else:
+                stored.image.save(path, format="PNG", compress_level=self.compress_level)
+        except Exception as e:
+            logger.error(f"Failed to save the screenshot {path}: {e}")
+
+    def _done(self, path: str, future: Future) -> None:
+        """
+        Forget a finished write.
+        :param path: The path of the image.
+        :param future: The finished write.
+        """
+        with self._lock:
+            if self._pending.get(path) is future:
+                del self._pending[path]
+
+
+_screenshot_store: Optional[ScreenshotStore] = None
+_screenshot_store_lock = threading.Lock()
+
+
+def get_screenshot_store() -> ScreenshotStore:
+    """
+    Get the process-wide screenshot store configured by ASYNC_SCREENSHOT_SAVE,
+    DEFAULT_PNG_COMPRESS_LEVEL, LLM_IMAGE_FORMAT and LLM_IMAGE_QUALITY.
+    :return: The store.
+    """
+    global _screenshot_store
+
+    with _screenshot_store_lock:
+        if _screenshot_store is None:
+            kwargs = {}
+
+            try:
+                from config.config_loader import get_ufo_config
+
+                system_config = get_ufo_config().system
+                kwargs = {
+                    "async_save": system_config.async_screenshot_save,
+                    "compress_level": system_config.default_png_compress_level,
+                    "llm_format": system_config.llm_image_format.lower(),
+                    "llm_quality": system_config.llm_image_quality,
+                }
+            except Exception:
+                # Without a UFO configuration, the defaults apply
+                pass
+
+            _screenshot_store = ScreenshotStore(**kwargs)
+            # Do not lose the screenshots still being written on exit
+            atexit.register(_screenshot_store.flush)
+
+        return _screenshot_store
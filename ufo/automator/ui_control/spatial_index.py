@@ -0,0 +1,180 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Vectorised rectangle overlap for merging control lists.
+
+Rectangles are [left, top, right, bottom] in absolute coordinates. The IoU is computed
+exactly as PhotographerFacade.target_info_iou does, on NumPy arrays:
+
+- iou_matrix scores every pair of two rectangle arrays at once, in chunks.
+- GridIndex buckets rectangles into a uniform grid, so only rectangles sharing a cell
+  are scored. It is used for very large lists.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# The max number of IoU values computed at once by the dense path
+DENSE_CHUNK_PAIRS = 1 << 20
+
+# Above this number of pairs, the grid index is used instead of the dense path
+GRID_INDEX_MIN_PAIRS = 1 << 20
+
+# Rectangles covering more grid cells than this are checked against every query
+GRID_MAX_CELLS_PER_RECT = 64
+
+
+def rect_array(rects: Sequence[Optional[Sequence[float]]]) -> np.ndarray:
+    """
+    Convert rectangles to an (N, 4) float array. A missing or empty rectangle becomes
+    [0, 0, 0, 0], which has an IoU of 0 with any rectangle, like in target_info_iou.
+    :param rects: The rectangles, [left, top, right, bottom] or None.
+    :return: The rectangle array.
+    """
+    array = np.zeros((len(rects), 4), dtype=np.float64)
+    for i, rect in enumerate(rects):
+        if rect:
+            array[i] = rect
+    return array
+
+
+def iou_matrix(rects1: np.ndarray, rects2: np.ndarray) -> np.ndarray:
+    """
+    Compute the IoU of every pair of rectangles of two arrays.
+    :param rects1: The first rectangles, shape (M, 4).
+    :param rects2: The second rectangles, shape (N, 4).
+    :return: The IoU matrix, shape (M, N). Pairs with an empty union have an IoU of 0.
+    """
+    a = rects1[:, None, :]
+    b = rects2[None, :, :]
+
+    width = np.maximum(0, np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]))
+    height = np.maximum(0, np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]))
+    intersection = width * height
+
+    area1 = (rects1[:, 2] - rects1[:, 0]) * (rects1[:, 3] - rects1[:, 1])
+    area2 = (rects2[:, 2] - rects2[:, 0]) * (rects2[:, 3] - rects2[:, 1])
+    union = area1[:, None] + area2[None, :] - intersection
+
+    iou = np.zeros_like(union)
+    np.divide(intersection, union, out=iou, where=union != 0)
+    return iou
+
+
+class GridIndex:
+    """
+    Uniform grid over a set of rectangles, to find the rectangles that may intersect a query.
+    """
+
+    def __init__(
+        self,
+        rects: np.ndarray,
+        cell_size: Optional[float] = None,
+        max_cells_per_rect: int = GRID_MAX_CELLS_PER_RECT,
+    ) -> None:
+        """
+        Build the grid.
+        :param rects: The indexed rectangles, shape (N, 4).
+        :param cell_size: The grid cell size, by default the median size of the rectangles.
+        :param max_cells_per_rect: Rectangles covering more cells are kept aside and
+        returned for every query.
+        """
+        self.rects = rects
+        widths = rects[:, 2] - rects[:, 0]
+        heights = rects[:, 3] - rects[:, 1]
+        # Rectangles without area cannot intersect anything
+        proper = np.flatnonzero((widths > 0) & (heights > 0))
+
+        if cell_size is None:
+            sizes = np.maximum(widths[proper], heights[proper])
+            cell_size = float(np.median(sizes)) if len(sizes) else 1.0
+        self.cell_size = max(cell_size, 1.0)
+
+        cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        large: List[int] = []
+
+        for i in proper:
+            x0, y0, x1, y1 = self._cell_range(rects[i])
+            if (x1 - x0 + 1) * (y1 - y0 + 1) > max_cells_per_rect:
+                large.append(i)
+                continue
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    cells[(x, y)].append(i)
+
+        self._cells = {cell: np.array(indices) for cell, indices in cells.items()}
+        self._large = np.array(large, dtype=np.intp)
+
+    def _cell_range(self, rect: np.ndarray) -> Tuple[int, int, int, int]:
+        """
+        Get the range of cells covered by a rectangle.
+        :param rect: The rectangle.
+        :return: The first and last cell columns and rows.
+        """
+        left, top, right, bottom = (np.floor(rect / self.cell_size)).astype(int)
+        return left, top, right, bottom
+
+    def candidates(self, rect: np.ndarray) -> np.ndarray:
+        """
+        Get the indexed rectangles sharing a cell with the query, or kept aside as large.
+        :param rect: The query rectangle.
+        :return: The indices of the candidate rectangles.
+        """
+        x0, y0, x1, y1 = self._cell_range(rect)
+        found = [self._large]
+        # Iterate over the smaller of the query cells and the occupied cells
+        if (x1 - x0 + 1) * (y1 - y0 + 1) <= len(self._cells):
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    indices = self._cells.get((x, y))
+                    if indices is not None:
+                        found.append(indices)
+        else:
+            for (x, y), indices in self._cells.items():
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    found.append(indices)
+        return np.unique(np.concatenate(found)) if len(found) > 1 else self._large
+
+
+def overlapping_mask(
+    query_rects: np.ndarray,
+    indexed_rects: np.ndarray,
+    threshold: float,
+    use_grid: Optional[bool] = None,
+) -> np.ndarray:
+    """
+    Find the query rectangles whose IoU with any indexed rectangle exceeds the threshold.
+    :param query_rects: The query rectangles, shape (M, 4).
+    :param indexed_rects: The indexed rectangles, shape (N, 4).
+    :param threshold: The IoU threshold.
+    :param use_grid: Whether to use the grid index, by default only for very large lists.
+    :return: A boolean array of shape (M,).
+    """
+    m, n = len(query_rects), len(indexed_rects)
+    if n == 0:
+        return np.zeros(m, dtype=bool)
+
+    # The grid only finds intersecting pairs, so it needs a non-negative threshold
+    if use_grid is None:
+        use_grid = m * n >= GRID_INDEX_MIN_PAIRS
+    use_grid = use_grid and threshold >= 0
+
+    mask = np.zeros(m, dtype=bool)
+
+    if use_grid:
+        grid = GridIndex(indexed_rects)
+        for i in range(m):
+            candidates = grid.candidates(query_rects[i])
+            if len(candidates):
+                iou = iou_matrix(query_rects[i : i + 1], indexed_rects[candidates])
+                mask[i] = bool((iou > threshold).any())
+        return mask
+
+    chunk = max(1, DENSE_CHUNK_PAIRS // n)
+    for start in range(0, m, chunk):
+        iou = iou_matrix(query_rects[start : start + chunk], indexed_rects)
+        mask[start : start + chunk] = (iou > threshold).any(axis=1)
+    return mask
@@ -2,11 +2,13 @@
 # Licensed under the MIT License.
 
 import copy
+import itertools
 import json
 import os
 import platform
 import traceback
-from typing import Any, Dict, List, TYPE_CHECKING
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 # Conditional import for Windows-specific packages
 if TYPE_CHECKING or platform.system() == "Windows":
@@ -16,6 +18,23 @@ else:
 
 from ufo.automator.ui_control.screenshot import PhotographerDecorator
 
+# The node fields that are not compared by the keyed diff
+UNCOMPARED_FIELDS = ("id", "children")
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Convert a JSON value to a hashable value. Dict items are kept in order: a different order
+    only makes an unchanged node compared field by field.
+    :param value: The JSON value.
+    :return: The hashable value.
+    """
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
 
 class UITree:
     """
@@ -326,3 +345,222 @@ class UITree:
             modify_node_by_path(modification["path"], modification["changes"])
 
         return ui_tree_2
+
+
+    @staticmethod
+    def subtree_hashes(ui_tree: Dict[str, Any]) -> Dict[int, int]:
+        """
+        Hash every subtree of a UI tree, so that unchanged branches can be skipped by the
+        keyed diff. Node ids are not hashed, as they change whenever a node is inserted before.
+        The hashes are only comparable within the same process.
+        :param ui_tree: The UI tree.
+        :return: The subtree hashes, keyed by the id() of the nodes.
+        """
+        hashes = {}
+
+        def hash_node(node: Dict[str, Any]) -> int:
+            # Rectangles are flat dicts, nested values are only frozen if needed
+            fields = tuple(
+                (key, tuple(value.items()) if isinstance(value, dict) else value)
+                for key, value in node.items()
+                if key not in UNCOMPARED_FIELDS
+            )
+            children = tuple(hash_node(child) for child in node.get("children", []))
+            try:
+                node_hash = hash((fields, children))
+            except TypeError:
+                node_hash = hash((_freeze(fields), children))
+            hashes[id(node)] = node_hash
+            return node_hash
+
+        hash_node(ui_tree)
+        return hashes
+
+    @staticmethod
+    def has_preorder_ids(ui_tree: Dict[str, Any]) -> bool:
+        """
+        Check whether the node ids of a UI tree are node_0, node_1, ... in preorder, as
+        UITree numbers them, so that they can be restored without being transmitted.
+        :param ui_tree: The UI tree.
+        :return: Whether the ids are numbered in preorder.
+        """
+        counter = itertools.count()
+        stack = [ui_tree]
+        while stack:
+            node = stack.pop()
+            if node.get("id") != f"node_{next(counter)}":
+                return False
+            stack.extend(reversed(node.get("children", [])))
+        return True
+
+    @staticmethod
+    def keyed_ui_tree_diff(
+        ui_tree_1: Dict[str, Any],
+        ui_tree_2: Dict[str, Any],
+        hashes_1: Optional[Dict[int, int]] = None,
+        hashes_2: Optional[Dict[int, int]] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Compute the difference between two UI trees, matching the children of a node by their
+        control type and name rather than by position, and skipping the subtrees with the same hash.
+        The diff is a list of operations addressed by the child index path in ui_tree_1:
+        - {"op": "set", "path": [...], "fields": {...}, "unset": [...]} updates the fields of a node.
+        - {"op": "children", "path": [...], "children": [...]} rebuilds the children of a node,
+          from the indices of the children kept from ui_tree_1 and the new child nodes.
+        :param ui_tree_1: The base UI tree.
+        :param ui_tree_2: The new UI tree.
+        :param hashes_1: The subtree hashes of the base tree, if already computed.
+        :param hashes_2: The subtree hashes of the new tree, if already computed.
+        :return: The diff, or None if the new tree cannot be rebuilt from a diff because its
+        node ids are not numbered in preorder.
+        """
+        if not UITree.has_preorder_ids(ui_tree_2):
+            return None
+
+        if hashes_1 is None:
+            hashes_1 = UITree.subtree_hashes(ui_tree_1)
+        if hashes_2 is None:
+            hashes_2 = UITree.subtree_hashes(ui_tree_2)
+
+        diff = []
+
+        def child_key(node: Dict[str, Any]) -> Tuple[Any, Any]:
+            return node.get("control_type"), node.get("name")
+
+        def match_children(
+            children_1: List[Dict[str, Any]], children_2: List[Dict[str, Any]]
+        ) -> List[Optional[int]]:
+            # Match the unchanged children first, then the children with the same control
+            # type and name, then the renamed children with the same control type, in order
+            keys = [
+                lambda child, hashes: hashes[id(child)],
+                lambda child, hashes: child_key(child),
+                lambda child, hashes: child.get("control_type"),
+            ]
+
+            matches: List[Optional[int]] = [None] * len(children_2)
+            used = set()
+            for key in keys:
+                candidates = defaultdict(list)
+                for i, child in enumerate(children_1):
+                    if i not in used:
+                        candidates[key(child, hashes_1)].append(i)
+                if not candidates:
+                    break
+
+                for j, child in enumerate(children_2):
+                    if matches[j] is None:
+                        found = candidates.get(key(child, hashes_2))
+                        if found:
+                            matches[j] = found.pop(0)
+                            used.add(matches[j])
+            return matches
+
+        def compare_nodes(node1: Dict[str, Any], node2: Dict[str, Any], path: List[int]):
+            if hashes_1[id(node1)] == hashes_2[id(node2)]:
+                return
+
+            fields = {
+                key: value
+                for key, value in node2.items()
+                if key not in UNCOMPARED_FIELDS
+                and (key not in node1 or node1[key] != value)
+            }
+            unset = [
+                key
+                for key in node1
+                if key not in UNCOMPARED_FIELDS and key not in node2
+            ]
+            if fields or unset:
+                operation = {"op": "set", "path": path, "fields": fields}
+                if unset:
+                    operation["unset"] = unset
+                diff.append(operation)
+
+            children_1 = node1.get("children", [])
+            children_2 = node2.get("children", [])
+            matches = match_children(children_1, children_2)
+
+            if matches != list(range(len(children_1))):
+                diff.append(
+                    {
+                        "op": "children",
+                        "path": path,
+                        "children": [
+                            child if i is None else i
+                            for i, child in zip(matches, children_2)
+                        ],
+                    }
+                )
+
+            for i, child in zip(matches, children_2):
+                if i is not None:
+                    compare_nodes(children_1[i], child, path + [i])
+
+        compare_nodes(ui_tree_1, ui_tree_2, [])
+
+        return diff
+
+    @staticmethod
+    def apply_keyed_ui_tree_diff(
+        ui_tree_1: Dict[str, Any], diff: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Apply a keyed UI tree diff to ui_tree_1 to get ui_tree_2. The node ids are renumbered
+        in preorder. ui_tree_1 is not modified.
+        :param ui_tree_1: The base UI tree.
+        :param diff: The diff computed by keyed_ui_tree_diff.
+        :return: The new UI tree after applying the diff.
+        """
+        set_operations = {}
+        children_operations = {}
+        for operation in diff:
+            path = tuple(operation["path"])
+            if operation["op"] == "set":
+                set_operations[path] = operation
+            elif operation["op"] == "children":
+                children_operations[path] = operation["children"]
+            else:
+                raise ValueError(f"Unknown UI tree diff operation {operation['op']}")
+
+        counter = itertools.count()
+
+        def build_node(
+            node: Dict[str, Any], path: Optional[Tuple[int, ...]]
+        ) -> Dict[str, Any]:
+            # Path is None for the nodes added by the diff, which have no operations
+            new_node = {
+                key: dict(value) if isinstance(value, dict) else value
+                for key, value in node.items()
+                if key != "children"
+            }
+            if "id" in new_node:
+                new_node["id"] = f"node_{next(counter)}"
+
+            operation = set_operations.get(path) if path is not None else None
+            if operation is not None:
+                new_node.update(copy.deepcopy(operation.get("fields", {})))
+                for key in operation.get("unset", []):
+                    new_node.pop(key, None)
+
+            children = node.get("children")
+            spec = children_operations.get(path) if path is not None else None
+
+            if spec is not None:
+                new_node["children"] = [
+                    (
+                        build_node(children[child], path + (child,))
+                        if isinstance(child, int)
+                        else build_node(child, None)
+                    )
+                    for child in spec
+                ]
+            elif children is not None:
+                new_node["children"] = [
+                    build_node(child, path + (i,) if path is not None else None)
+                    for i, child in enumerate(children)
+                ]
+
+            return new_node
+
+        return build_node(ui_tree_1, ())
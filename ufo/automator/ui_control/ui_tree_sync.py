@@ -0,0 +1,249 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Incremental transport and storage of the UI trees captured at every step.
+
+A UI tree rarely changes much between two steps, so instead of the full tree:
+
+- the client (UITreeHistory) keeps the last tree versions it sent, and answers a request
+  for the tree with a keyed diff against the version the server last acknowledged;
+- the server (UITreeRecorder) applies the diff to its copy of that version, and saves the
+  trees of a log as a keyframe every UI_TREE_KEYFRAME_INTERVAL steps, with deltas against
+  the previous step in between. load_ui_tree rebuilds the tree of any step.
+
+A delta file is a JSON object {"format": "ui_tree_delta", "base": <file name>, "diff": [...]},
+a keyframe is the plain UI tree.
+"""
+
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ufo.automator.ui_control.ui_tree import UITree
+
+DELTA_FORMAT = "ui_tree_delta"
+
+DEFAULT_MAX_VERSIONS = 4
+
+DEFAULT_KEYFRAME_INTERVAL = 10
+
+# The max number of log directories with a recorder kept in memory
+MAX_RECORDERS = 16
+
+
+class UITreeHistory:
+    """
+    Client side of the UI tree transport: the recent tree versions and their subtree hashes.
+    """
+
+    def __init__(self, max_versions: int = DEFAULT_MAX_VERSIONS) -> None:
+        """
+        Create a UI tree history.
+        :param max_versions: The number of versions kept to diff against.
+        """
+        self.max_versions = max_versions
+        self._versions: "OrderedDict[str, Tuple[Dict[str, Any], Dict[int, int]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def encode(
+        self, ui_tree: Dict[str, Any], base_version: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Register a new tree version and encode it against a base version.
+        :param ui_tree: The new UI tree.
+        :param base_version: The version last acknowledged by the receiver, if any.
+        :return: {"version", "base_version", "diff"} if the base version is known,
+        {"version", "tree"} otherwise.
+        """
+        hashes = UITree.subtree_hashes(ui_tree)
+        version = uuid.uuid4().hex
+
+        with self._lock:
+            base = self._versions.get(base_version) if base_version else None
+            self._versions[version] = (ui_tree, hashes)
+            while len(self._versions) > self.max_versions:
+                self._versions.popitem(last=False)
+
+        diff = None
+        if base is not None:
+            diff = UITree.keyed_ui_tree_diff(base[0], ui_tree, base[1], hashes)
+
+        if diff is None:
+            return {"version": version, "tree": ui_tree}
+        return {"version": version, "base_version": base_version, "diff": diff}
+
+
+class UITreeRecorder:
+    """
+    Server side of the UI tree transport, and writer of the keyframe and delta files of a log.
+    """
+
+    def __init__(self, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL) -> None:
+        """
+        Create a UI tree recorder.
+        :param keyframe_interval: A full tree is saved every keyframe_interval trees,
+        1 to save every tree in full.
+        """
+        self.keyframe_interval = max(1, keyframe_interval)
+
+        # The last tree received from the client and its version
+        self.version: Optional[str] = None
+        self.tree: Optional[Dict[str, Any]] = None
+
+        # The last tree saved, its hashes and file, and the trees saved since the keyframe
+        self._saved: Optional[Tuple[Dict[str, Any], Dict[int, int], str]] = None
+        self._since_keyframe = 0
+
+        self._lock = threading.Lock()
+
+    def receive(self, payload: Any) -> Dict[str, Any]:
+        """
+        Decode a tree sent by UITreeHistory.encode, and acknowledge its version.
+        :param payload: The payload from the client.
+        :return: The UI tree.
+        """
+        if not isinstance(payload, dict) or not (
+            "tree" in payload or "diff" in payload
+        ):
+            raise ValueError("Not a UI tree payload.")
+
+        with self._lock:
+            if "diff" in payload:
+                if self.tree is None or payload.get("base_version") != self.version:
+                    raise ValueError(
+                        f"Unknown UI tree base version {payload.get('base_version')}."
+                    )
+                ui_tree = UITree.apply_keyed_ui_tree_diff(self.tree, payload["diff"])
+            else:
+                ui_tree = payload["tree"]
+
+            self.version = payload.get("version")
+            self.tree = ui_tree
+
+        return ui_tree
+
+    def reset(self, ui_tree: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Keep a tree received in full without a version, so the next one is sent in full.
+        :param ui_tree: The UI tree.
+        :return: The UI tree.
+        """
+        with self._lock:
+            self.version = None
+            self.tree = ui_tree
+        return ui_tree
+
+    def save(self, ui_tree: Dict[str, Any], path: str) -> bool:
+        """
+        Save a tree as a keyframe, or as a delta against the previous tree saved.
+        :param ui_tree: The UI tree.
+        :param path: The file path.
+        :return: Whether the tree was saved as a keyframe.
+        """
+        hashes = UITree.subtree_hashes(ui_tree)
+
+        with self._lock:
+            diff = None
+            if self._saved is not None and self._since_keyframe < self.keyframe_interval:
+                base_tree, base_hashes, base_path = self._saved
+                if base_path != path:
+                    diff = UITree.keyed_ui_tree_diff(
+                        base_tree, ui_tree, base_hashes, hashes
+                    )
+
+            if diff is None:
+                content = ui_tree
+                self._since_keyframe = 1
+            else:
+                content = {
+                    "format": DELTA_FORMAT,
+                    "base": os.path.relpath(base_path, os.path.dirname(path) or "."),
+                    "diff": diff,
+                }
+                self._since_keyframe += 1
+
+            save_dir = os.path.dirname(path)
+            if save_dir:
+                os.makedirs(save_dir, exist_ok=True)
+
+            with open(path, "w") as file:
+                json.dump(content, file, separators=(",", ":"))
+
+            self._saved = (ui_tree, hashes, path)
+
+        return diff is None
+
+
+def load_ui_tree(path: str) -> Dict[str, Any]:
+    """
+    Load a UI tree saved by UITreeRecorder, applying the deltas down from its keyframe.
+    :param path: The file path.
+    :return: The UI tree.
+    """
+    diffs: List[List[Dict[str, Any]]] = []
+    visited = set()
+
+    while True:
+        if path in visited:
+            raise ValueError(f"Cyclic UI tree delta chain at {path}.")
+        visited.add(path)
+
+        with open(path, "r") as file:
+            content = json.load(file)
+
+        if not (isinstance(content, dict) and content.get("format") == DELTA_FORMAT):
+            break
+
+        diffs.append(content["diff"])
+        path = os.path.join(os.path.dirname(path), content["base"])
+
+    for diff in reversed(diffs):
+        content = UITree.apply_keyed_ui_tree_diff(content, diff)
+    return content
+
+
+_recorders: "OrderedDict[str, UITreeRecorder]" = OrderedDict()
+_recorders_lock = threading.Lock()
+
+
+def get_ui_tree_recorder(
+    directory: str, keyframe_interval: Optional[int] = None
+) -> UITreeRecorder:
+    """
+    Get the recorder of the UI trees saved in a log directory.
+    :param directory: The directory of the UI tree files.
+    :param keyframe_interval: The keyframe interval of a new recorder, by default
+    UI_TREE_KEYFRAME_INTERVAL.
+    :return: The recorder.
+    """
+    key = os.path.abspath(directory)
+
+    with _recorders_lock:
+        recorder = _recorders.get(key)
+        if recorder is None:
+            if keyframe_interval is None:
+                keyframe_interval = DEFAULT_KEYFRAME_INTERVAL
+                try:
+                    from config.config_loader import get_ufo_config
+
+                    keyframe_interval = (
+                        get_ufo_config().system.ui_tree_keyframe_interval
+                    )
+                except Exception:
+                    # Without a UFO configuration, the default applies
+                    pass
+
+            recorder = UITreeRecorder(keyframe_interval)
+            _recorders[key] = recorder
+            while len(_recorders) > MAX_RECORDERS:
+                _recorders.popitem(last=False)
+        else:
+            _recorders.move_to_end(key)
+
+        return recorder
@@ -35,6 +35,13 @@ parser.add_argument(
     dest="max_retries",
     help="Maximum retries for failed requests (default: 5)",
 )
+parser.add_argument(
+    "--max-concurrent-tasks",
+    type=int,
+    default=None,
+    dest="max_concurrent_tasks",
+    help="Max number of sessions executing commands at the same time (default: CLIENT_MAX_CONCURRENT_TASKS, 1)",
+)
 parser.add_argument(
     "--request",
     dest="request_text",
@@ -99,8 +106,15 @@ async def main():
     logger.info(f"UFO Client initialized for platform: {args.platform}")
 
     # Create WebSocket client and build the connection
+    max_concurrent_tasks = args.max_concurrent_tasks
+    if max_concurrent_tasks is None:
+        max_concurrent_tasks = ufo_config.system.client_max_concurrent_tasks
+
     ws_client = UFOWebSocketClient(
-        args.ws_server_url, client, max_retries=args.max_retries
+        args.ws_server_url,
+        client,
+        max_retries=args.max_retries,
+        max_concurrent_tasks=max_concurrent_tasks,
     )
     try:
         asyncio.create_task(ws_client.connect_and_listen())
@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional, Set
+
+from aip.messages import Command, MCPToolCall
+
+if TYPE_CHECKING:
+    from ufo.client.computer import Computer
+
+
+class CommandPacingPolicy:
+    """
+    Per-tool pacing policy applied after each command executed by the CommandRouter.
+    Read-only (data collection) tools get no delay. UI actions wait until the UI is
+    settled, bounded by a per-namespace upper limit. The behaviour of each namespace is
+    read from its MCP server configuration:
+
+    - settle_timeout: Upper bound (seconds) to wait after an action (default: 0.1).
+    - settle_interval: Polling interval (seconds) of the settle probe (default: 0.05).
+    - settle_probe: Optional data collection tool returning a truthy value once the UI is settled,
+      such as is_ui_idle of the UICollector server, configured for the UI executors by default.
+      Without a probe, or if it is not registered, the action waits for the full settle_timeout.
+    """
+
+    _data_collection_tool_type = "data_collection"
+
+    def __init__(
+        self,
+        default_settle_timeout: float = 0.1,
+        default_settle_interval: float = 0.05,
+    ) -> None:
+        """
+        Initialize the pacing policy.
+        :param default_settle_timeout: The default upper bound (seconds) to wait after an action.
+        :param default_settle_interval: The default polling interval (seconds) of settle probes.
+        """
+        self.default_settle_timeout = default_settle_timeout
+        self.default_settle_interval = default_settle_interval
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._missing_probes: Set[str] = set()
+
+    @classmethod
+    def is_read_only(cls, tool_call: MCPToolCall) -> bool:
+        """
+        Whether a tool call is read-only, so it needs no pacing and can run concurrently
+        with other read-only calls.
+        :param tool_call: The tool call.
+        :return: True if the tool call is read-only.
+        """
+        if tool_call.tool_type == cls._data_collection_tool_type:
+            return True
+
+        annotations = tool_call.annotations or {}
+        return bool(annotations.get("readOnlyHint"))
+
+    def settle_config(self, tool_call: MCPToolCall) -> Dict[str, Any]:
+        """
+        Get the settle configuration of the namespace of a tool call.
+        :param tool_call: The tool call.
+        :return: The settle configuration with timeout, interval and probe.
+        """
+        config = tool_call.mcp_server.config if tool_call.mcp_server else {}
+
+        return {
+            "timeout": float(config.get("settle_timeout", self.default_settle_timeout)),
+            "interval": float(
+                config.get("settle_interval", self.default_settle_interval)
+            ),
+            "probe": config.get("settle_probe"),
+        }
+
+    async def wait(self, computer: "Computer", tool_call: MCPToolCall) -> float:
+        """
+        Wait after a command according to the policy.
+        :param computer: The computer the command was executed on.
+        :param tool_call: The executed tool call.
+        :return: The time (seconds) spent waiting.
+        """
+        if self.is_read_only(tool_call):
+            return 0.0
+
+        settle = self.settle_config(tool_call)
+        timeout = settle["timeout"]
+        if timeout <= 0:
+            return 0.0
+
+        start = time.monotonic()
+        probe = self._get_probe(computer, settle["probe"])
+
+        if probe is None:
+            await asyncio.sleep(timeout)
+            return time.monotonic() - start
+
+        deadline = start + timeout
+        while True:
+            if await self._is_settled(computer, probe):
+                break
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.logger.debug(
+                    f"UI did not settle within {timeout}s after {tool_call.tool_name}."
+                )
+                break
+            await asyncio.sleep(min(settle["interval"], remaining))
+
+        return time.monotonic() - start
+
+    def _get_probe(
+        self, computer: "Computer", probe_name: Optional[str]
+    ) -> Optional[MCPToolCall]:
+        """
+        Resolve the settle probe tool on the computer.
+        :param computer: The computer.
+        :param probe_name: The name of the probe tool, if configured.
+        :return: The probe tool call, or None if no usable probe is available.
+        """
+        if not probe_name:
+            return None
+
+        try:
+            return computer.command2tool(
+                Command(
+                    tool_name=probe_name,
+                    tool_type=self._data_collection_tool_type,
+                )
+            )
+        except ValueError:
+            if probe_name not in self._missing_probes:
+                self._missing_probes.add(probe_name)
+                self.logger.warning(
+                    f"Settle probe {probe_name} is not registered on {computer.name}. Falling back to fixed delays."
+                )
+            return None
+
+    @staticmethod
+    async def _is_settled(computer: "Computer", probe: MCPToolCall) -> bool:
+        """
+        Run the settle probe once.
+        :param computer: The computer.
+        :param probe: The probe tool call.
+        :return: True if the probe reports the UI as settled.
+        """
+        results = await computer.run_actions([probe])
+        result = results[0]
+        return not result.is_error and bool(result.data)
+
+
+class CommandExecutionMetrics:
+    """
+    Metrics of the time the CommandRouter spends executing commands versus idling
+    in pacing delays.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the metrics.
+        """
+        self.metrics: Dict[str, Any] = {
+            "commands_executed": 0,
+            "batches": 0,
+            "execution_time": 0.0,
+            "idle_time": 0.0,
+        }
+
+    def record_batch(self, commands: int, execution_time: float, idle_time: float) -> None:
+        """
+        Record a batch of executed commands.
+        :param commands: The number of executed commands.
+        :param execution_time: The time (seconds) spent executing commands.
+        :param idle_time: The time (seconds) spent in pacing delays.
+        """
+        self.metrics["batches"] += 1
+        self.metrics["commands_executed"] += commands
+        self.metrics["execution_time"] += execution_time
+        self.metrics["idle_time"] += idle_time
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get the collected metrics.
+        :return: The metrics dictionary, including the idle ratio.
+        """
+        total = self.metrics["execution_time"] + self.metrics["idle_time"]
+        return {
+            **self.metrics,
+            "idle_ratio": self.metrics["idle_time"] / total if total > 0 else 0.0,
+        }
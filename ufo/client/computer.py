@@ -1,5 +1,4 @@
 import asyncio
-import concurrent.futures
 import copy
 import inspect
 import json
@@ -7,11 +6,13 @@ import logging
 import time
 from typing import Any, Callable, Dict, List, Optional
 
-from fastmcp import Client, FastMCP
+from fastmcp import FastMCP
 from fastmcp.client.client import CallToolResult
 from mcp.types import TextContent
 
+from ufo.client.command_pacing import CommandExecutionMetrics, CommandPacingPolicy
 from ufo.client.mcp.mcp_server_manager import BaseMCPServer, MCPServerManager
+from ufo.client.mcp.mcp_session_pool import MCPSessionPool
 from aip.messages import Command, Result, MCPToolCall, ResultStatus
 import ufo.client.mcp.local_servers
 
@@ -61,10 +62,9 @@ class Computer:
 
         self.logger = logging.getLogger(self.__class__.__name__)
 
-        # Thread pool executor for isolating blocking MCP tool calls
-        self._executor = concurrent.futures.ThreadPoolExecutor(
-            max_workers=10, thread_name_prefix="mcp_tool_"
-        )
+        # Persistent MCP client sessions, one per server namespace. Each session runs
+        # on its own event loop thread to isolate blocking MCP tool calls.
+        self._session_pool = MCPSessionPool()
 
         # Tool execution timeout (seconds)
         self._tool_timeout = 6000  # 5 minutes
@@ -164,18 +164,18 @@ class Computer:
         tool_info = self._tools_registry.get(tool_key, None)
         namespace = tool_info.namespace if tool_info else None
 
-        self.logger.debug(
-            f"Running [{namespace}] tool: {tool_info.tool_name} with parameters: {tool_info.parameters}"
-        )
-
         if not tool_info:
             raise ValueError(f"Tool {tool_key} is not registered.")
 
+        self.logger.debug(
+            f"Running [{namespace}] tool: {tool_info.tool_name} with parameters: {tool_call.parameters}"
+        )
+
         # Check if the tool is a meta tool for listing tools
         if tool_info.tool_name in self._meta_tools:
             # Special case for listing tools, which does not require a server call
 
-            parameters = tool_info.parameters or {}
+            parameters = tool_call.parameters or {}
             self.logger.info(
                 f"Running meta tool: {tool_info.tool_name} with parameters: {parameters}"
             )
@@ -188,39 +188,19 @@ class Computer:
             else:
                 return result
 
-        server = tool_info.mcp_server.server
-
         tool_name = tool_info.tool_name
-        params = tool_info.parameters or {}
-
-        # Run MCP tool call in a separate thread to avoid blocking the event loop
-        # This prevents blocking operations (like time.sleep) in MCP tools from
-        # affecting the main event loop and causing WebSocket disconnections
-        def _call_tool_in_thread():
-            """
-            Execute MCP tool call in an isolated thread with its own event loop.
-            This prevents blocking operations in MCP tools from blocking the main event loop.
-            """
-            # Create a new event loop for this thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-
-                async def _do_call():
-                    async with Client(server) as client:
-                        return await client.call_tool(
-                            name=tool_name, arguments=params, raise_on_error=False
-                        )
-
-                return loop.run_until_complete(_do_call())
-            finally:
-                loop.close()
+        params = tool_call.parameters or {}
 
         try:
-            # Execute in thread pool with timeout protection
-            loop = asyncio.get_event_loop()
+            # Reuse the pooled session of the namespace instead of creating a new
+            # event loop and client context for every call.
             result = await asyncio.wait_for(
-                loop.run_in_executor(self._executor, _call_tool_in_thread),
+                self._session_pool.call_tool(
+                    namespace=namespace,
+                    mcp_server=tool_info.mcp_server,
+                    tool_name=tool_name,
+                    arguments=params,
+                ),
                 timeout=self._tool_timeout,
             )
 
@@ -312,59 +292,58 @@ class Computer:
             f"Registering tools from [{namespace}] server for ({tool_type})."
         )
 
-        async with Client(mcp_server.server) as client:
-            tools = await client.list_tools()
-
-            for tool in tools:
-                tool_key = self.make_tool_key(tool_type, tool.name)
-                if tool_key not in self._tools_registry:
-                    self._register_tool(
-                        tool_key=tool_key,
-                        tool_name=tool.name,
-                        title=tool.title,
-                        namespace=namespace,
-                        tool_type=tool_type,
-                        description=tool.description,
-                        input_schema=(
-                            tool.inputSchema
-                            if hasattr(tool, "inputSchema") and tool.inputSchema
-                            else {}
-                        ),
-                        output_schema=(
-                            tool.outputSchema
-                            if hasattr(tool, "outputSchema") and tool.outputSchema
-                            else {}
-                        ),
-                        mcp_server=mcp_server,
-                        meta=(tool.meta),
-                        annotations=(
-                            tool.annotations.model_dump() if tool.annotations else None
-                        ),
-                    )
-                else:
-                    self.logger.warning(
-                        f"Tool {tool_key} is already registered. Skipping registration."
-                    )
+        tools = await self._session_pool.list_tools(namespace, mcp_server)
+
+        for tool in tools:
+            tool_key = self.make_tool_key(tool_type, tool.name)
+            if tool_key not in self._tools_registry:
+                self._register_tool(
+                    tool_key=tool_key,
+                    tool_name=tool.name,
+                    title=tool.title,
+                    namespace=namespace,
+                    tool_type=tool_type,
+                    description=tool.description,
+                    input_schema=(
+                        tool.inputSchema
+                        if hasattr(tool, "inputSchema") and tool.inputSchema
+                        else {}
+                    ),
+                    output_schema=(
+                        tool.outputSchema
+                        if hasattr(tool, "outputSchema") and tool.outputSchema
+                        else {}
+                    ),
+                    mcp_server=mcp_server,
+                    meta=(tool.meta),
+                    annotations=(
+                        tool.annotations.model_dump() if tool.annotations else None
+                    ),
+                )
+            else:
+                self.logger.warning(
+                    f"Tool {tool_key} is already registered. Skipping registration."
+                )
 
-            for meta_tool_name, meta_tool_func in self._meta_tools.items():
-                tool_key = self.make_tool_key(tool_type, meta_tool_name)
+        for meta_tool_name, meta_tool_func in self._meta_tools.items():
+            tool_key = self.make_tool_key(tool_type, meta_tool_name)
 
-                if tool_key not in self._tools_registry:
-                    # Register the meta tool with the computer
-                    self.logger.info(
-                        f"Registering meta tool: {meta_tool_name} with key: {tool_key} for computer {self._name} for MCP server {namespace}."
-                    )
-                    self._register_tool(
-                        tool_key=tool_key,
-                        tool_name=meta_tool_name,
-                        title=meta_tool_func.__name__,
-                        namespace=namespace,
-                        tool_type=tool_type,
-                        description=meta_tool_func.__doc__ or "Meta tool",
-                        input_schema=meta_tool_func.__annotations__,
-                        output_schema=meta_tool_func.__annotations__,
-                        mcp_server=mcp_server,
-                    )
+            if tool_key not in self._tools_registry:
+                # Register the meta tool with the computer
+                self.logger.info(
+                    f"Registering meta tool: {meta_tool_name} with key: {tool_key} for computer {self._name} for MCP server {namespace}."
+                )
+                self._register_tool(
+                    tool_key=tool_key,
+                    tool_name=meta_tool_name,
+                    title=meta_tool_func.__name__,
+                    namespace=namespace,
+                    tool_type=tool_type,
+                    description=meta_tool_func.__doc__ or "Meta tool",
+                    input_schema=meta_tool_func.__annotations__,
+                    output_schema=meta_tool_func.__annotations__,
+                    mcp_server=mcp_server,
+                )
 
     def _register_tool(
         self,
@@ -464,6 +443,18 @@ class Computer:
         elif tool_type == self._action_namespaces:
             self._action_servers.pop(namespace, None)
 
+        # Close the pooled session once no tool of the namespace is left
+        if not any(
+            tool.namespace == namespace for tool in self._tools_registry.values()
+        ):
+            await self._session_pool.aclose(namespace)
+
+    def close(self) -> None:
+        """
+        Close all persistent MCP client sessions of the computer.
+        """
+        self._session_pool.close()
+
     @meta_tool("list_tools")
     async def list_tools(
         self,
@@ -509,6 +500,65 @@ class Computer:
 
         return tool_result
 
+    @meta_tool("observe")
+    async def observe(self, commands: List[Dict[str, Any]]) -> CallToolResult:
+        """
+        Run a batch of data collection commands concurrently and return all their results at once.
+        :param commands: The commands to run, each a dict with tool_name, tool_type and parameters.
+        :return: The results of the commands, in the same order, as a list of Result dicts.
+        """
+
+        async def _observe_one(command: Command) -> Result:
+            try:
+                if command.tool_name in self._meta_tools:
+                    raise ValueError(
+                        f"Meta tool {command.tool_name} cannot be used in an observation."
+                    )
+                tool_call = self.command2tool(command)
+                call_tool_result = (await self.run_actions([tool_call]))[0]
+            except Exception as e:
+                return Result(
+                    status=ResultStatus.FAILURE,
+                    error=str(e),
+                    call_id=command.call_id,
+                )
+
+            if call_tool_result.is_error:
+                return Result(
+                    status=ResultStatus.FAILURE,
+                    error=call_tool_result.content[0].text,
+                    call_id=command.call_id,
+                    namespace=tool_call.namespace,
+                )
+
+            return Result(
+                status=ResultStatus.SUCCESS,
+                result=call_tool_result.data if call_tool_result.data else None,
+                call_id=command.call_id,
+                namespace=tool_call.namespace,
+            )
+
+        results = await asyncio.gather(
+            *[_observe_one(Command(**command)) for command in commands]
+        )
+        data = [result.model_dump(mode="json") for result in results]
+
+        # Keep the text content small: the results may hold large screenshots.
+        content = [
+            TextContent(
+                type="text",
+                text=f"Observed {len(data)} commands.",
+                annotations=None,
+                meta=None,
+            )
+        ]
+
+        return CallToolResult(
+            data=data,
+            content=content,
+            structured_content=None,
+        )
+
     def command2tool(self, command: Command) -> MCPToolCall:
         """
         Convert a Command object to an MCPToolCall object.
@@ -552,11 +602,8 @@ class Computer:
 
         parameters = copy.deepcopy(command.parameters) if command.parameters else {}
 
-        tool_info.parameters = parameters
-
-        if not tool_info:
-            raise ValueError(f"Tool {tool_key} is not registered.")
-        return tool_info
+        # Copy the registered tool so that concurrent commands never share parameters
+        return tool_info.model_copy(update={"parameters": parameters})
 
     @staticmethod
     def make_tool_key(tool_type: str, tool_name: str) -> str:
@@ -591,6 +638,13 @@ class Computer:
         """
         return self._name
 
+    @property
+    def session_pool(self) -> MCPSessionPool:
+        """
+        Get the pool of persistent MCP client sessions of the computer.
+        """
+        return self._session_pool
+
 
 class ComputerManager:
     """Manager for managing multiple Computer instances.
@@ -608,6 +662,8 @@ class ComputerManager:
         self.mcp_server_manager = mcp_server_manager
         self.computers = {}
         self.logger = logging.getLogger(self.__class__.__name__)
+        # Sessions running concurrently must not create the same computer twice
+        self._create_lock = asyncio.Lock()
 
     async def get_or_create(
         self,
@@ -623,7 +679,12 @@ class ComputerManager:
 
         key = f"{agent_name}::{process_name}::{root_name or 'default'}"
 
-        if key not in self.computers:
+        if key in self.computers:
+            return self.computers[key]
+
+        async with self._create_lock:
+            if key in self.computers:
+                return self.computers[key]
 
             # Get the configuration for the agent
             mcp_config = self.configs.get(self._configs_key, {})
@@ -673,6 +734,8 @@ class ComputerManager:
         Reset the ComputerManager by clearing all Computer instances.
         This is useful for reinitializing the manager without restarting the application.
         """
+        for computer in self.computers.values():
+            computer.close()
         self.computers.clear()
 
 
@@ -682,12 +745,19 @@ class CommandRouter:
     This class takes a ComputerManager and executes commands on the appropriate Computer instance.
     """
 
-    def __init__(self, computer_manager: ComputerManager):
+    def __init__(
+        self,
+        computer_manager: ComputerManager,
+        pacing_policy: Optional[CommandPacingPolicy] = None,
+    ):
         """
         Initialize the CommandRouter with a ComputerManager.
         :param manager: An instance of ComputerManager to manage Computer instances.
+        :param pacing_policy: The policy deciding how long to wait after each command.
         """
         self.computer_manager = computer_manager
+        self.pacing_policy = pacing_policy or CommandPacingPolicy()
+        self.metrics = CommandExecutionMetrics()
         self.logger = logging.getLogger(self.__class__.__name__)
 
     async def execute(
@@ -700,6 +770,8 @@ class CommandRouter:
     ) -> List[Result]:
         """
         Execute a command on the appropriate Computer instance based on the provided configuration.
+        Consecutive read-only commands run concurrently; other commands run one after another,
+        each followed by the pacing delay of its namespace.
         :param agent_name: The name of the agent to execute the command for.
         :param process_name: The name of the process to control, or None if not specified
         :param root_name: The root name of the computer, or None if not specified.
@@ -712,80 +784,154 @@ class CommandRouter:
             agent_name=agent_name, process_name=process_name, root_name=root_name
         )
 
-        results: List[Result] = []
+        results: List[Optional[Result]] = [None] * len(commands)
         has_failed = False  # track if any command failed
+        read_only_group: List[tuple] = []  # pending (index, command, tool_call)
+
+        batch_start = time.monotonic()
+        idle_time = 0.0
+        executed = 0
+
+        async def flush_read_only_group() -> None:
+            """
+            Run the pending read-only commands concurrently.
+            """
+            nonlocal has_failed, executed
+            group = list(read_only_group)
+            read_only_group.clear()
+
+            if not group:
+                return
 
-        for command in commands:
+            if early_exit and has_failed:
+                for index, command, _ in group:
+                    results[index] = self._skipped_result(command)
+                return
+
+            group_results = await asyncio.gather(
+                *[
+                    self._execute_one(computer, command, tool_call)
+                    for _, command, tool_call in group
+                ]
+            )
+            executed += len(group)
+
+            for (index, _, _), result in zip(group, group_results):
+                results[index] = result
+                if result.status == ResultStatus.FAILURE:
+                    has_failed = True
+
+        for index, command in enumerate(commands):
             call_id = command.call_id
 
             # Handle commands without tool_name
             if not command.tool_name:
-                results.append(
-                    Result(
-                        status=ResultStatus.SUCCESS,
-                        result="No action taken.",
-                        error="",
-                        call_id=call_id,
-                    )
+                results[index] = Result(
+                    status=ResultStatus.SUCCESS,
+                    result="No action taken.",
+                    error="",
+                    call_id=call_id,
                 )
                 continue
 
             # If there was a failure before and early_exit is enabled, skip subsequent commands
+            if early_exit and has_failed and not read_only_group:
+                results[index] = self._skipped_result(command)
+                continue
+
+            tool_call = computer.command2tool(command)
+
+            if self.pacing_policy.is_read_only(tool_call):
+                read_only_group.append((index, command, tool_call))
+                continue
+
+            # A conflicting command: finish the pending read-only commands first
+            await flush_read_only_group()
+
+            # A pending read-only command may have failed in the meantime
             if early_exit and has_failed:
-                self.logger.warning(
-                    f"Skipping command {call_id} (tool: {command.tool_name}) due to previous failure."
-                )
-                results.append(
-                    Result(
-                        status=ResultStatus.SKIPPED,
-                        result=None,
-                        error="Skipped due to previous failure (early_exit=True).",
-                        call_id=call_id,
-                        namespace=None,
-                    )
-                )
+                results[index] = self._skipped_result(command)
                 continue  # Skip this iteration, do not execute command
 
             # Execute command
-            tool_call = computer.command2tool(command)
-            result = await computer.run_actions([tool_call])
-            namespace = tool_call.namespace if tool_call else None
-
-            call_tool_result: CallToolResult = result[0]
-            text_content = call_tool_result.data if call_tool_result.data else None
-
-            # Build Result object based on execution result
-            if not call_tool_result.is_error:
-                results.append(
-                    Result(
-                        status=ResultStatus.SUCCESS,
-                        result=text_content,
-                        error=None,
-                        call_id=call_id,
-                        namespace=namespace,
-                    )
-                )
-            else:
-                # Command execution failed
+            result = await self._execute_one(computer, command, tool_call)
+            executed += 1
+            results[index] = result
+
+            if result.status == ResultStatus.FAILURE:
                 has_failed = True
-                results.append(
-                    Result(
-                        status=ResultStatus.FAILURE,
-                        error=call_tool_result.content[0].text,
-                        result=None,
-                        call_id=call_id,
-                        namespace=namespace,
-                    )
-                )
-                self.logger.warning(
-                    f"Command {call_id} (tool: {command.tool_name}) failed with error: {text_content}"
-                )
 
-            # Sleep to avoid overwhelming the server with requests
-            await asyncio.sleep(0.1)
+            # Wait for the UI to settle before the next command
+            idle_time += await self.pacing_policy.wait(computer, tool_call)
+
+        await flush_read_only_group()
+
+        elapsed = time.monotonic() - batch_start
+        self.metrics.record_batch(
+            commands=executed, execution_time=elapsed - idle_time, idle_time=idle_time
+        )
+        self.logger.debug(
+            f"Executed {executed} commands in {elapsed:.3f}s ({idle_time:.3f}s idle)."
+        )
 
         return results
 
+    async def _execute_one(
+        self, computer: Computer, command: Command, tool_call: MCPToolCall
+    ) -> Result:
+        """
+        Execute a single command on the computer.
+        :param computer: The computer to execute the command on.
+        :param command: The command to execute.
+        :param tool_call: The tool call of the command.
+        :return: The result of the command.
+        """
+        call_id = command.call_id
+        result = await computer.run_actions([tool_call])
+        namespace = tool_call.namespace if tool_call else None
+
+        call_tool_result: CallToolResult = result[0]
+        text_content = call_tool_result.data if call_tool_result.data else None
+
+        # Build Result object based on execution result
+        if not call_tool_result.is_error:
+            return Result(
+                status=ResultStatus.SUCCESS,
+                result=text_content,
+                error=None,
+                call_id=call_id,
+                namespace=namespace,
+            )
+
+        # Command execution failed
+        self.logger.warning(
+            f"Command {call_id} (tool: {command.tool_name}) failed with error: {text_content}"
+        )
+        return Result(
+            status=ResultStatus.FAILURE,
+            error=call_tool_result.content[0].text,
+            result=None,
+            call_id=call_id,
+            namespace=namespace,
+        )
+
+    def _skipped_result(self, command: Command) -> Result:
+        """
+        Build the result of a command skipped due to a previous failure.
+        :param command: The skipped command.
+        :return: The skipped result.
+        """
+        self.logger.warning(
+            f"Skipping command {command.call_id} (tool: {command.tool_name}) due to previous failure."
+        )
+        return Result(
+            status=ResultStatus.SKIPPED,
+            result=None,
+            error="Skipped due to previous failure (early_exit=True).",
+            call_id=command.call_id,
+            namespace=None,
+        )
+
 
 def test_command_router():
     """
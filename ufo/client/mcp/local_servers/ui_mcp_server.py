@@ -23,6 +23,7 @@ if platform.system() != "Windows":
     # Exit module loading gracefully
     sys.exit(0)
 
+import asyncio
 import logging
 import os
 from typing import Annotated, Any, Dict, List, Optional
@@ -39,6 +40,7 @@ from ufo.automator.puppeteer import AppPuppeteer
 from ufo.automator.ui_control import ui_tree
 from ufo.automator.ui_control.inspector import ControlInspectorFacade
 from ufo.automator.ui_control.screenshot import PhotographerFacade
+from ufo.automator.ui_control.ui_tree_sync import UITreeHistory
 from ufo.client.mcp.mcp_registry import MCPRegistry
 from ufo.config import get_config
 from aip.messages import ControlInfo, Rect, WindowInfo
@@ -147,6 +149,8 @@ class UIServerState:
                 None  # Initialize grounding service as None for now
             )
             self.control_dict: Optional[Dict[str, UIAWrapper]] = None
+            # The recent UI tree versions, to send the UI tree as a diff
+            self.ui_tree_history = UITreeHistory()
             UIServerState._initialized = True
             self.logger = logging.getLogger(__name__)
 
@@ -883,6 +887,44 @@ def create_data_mcp_server(*args, **kwargs) -> FastMCP:
             # Return the empty placeholder image instead of crashing
             return ui_state.photographer._empty_image_string
 
+    @data_mcp.tool()
+    async def is_ui_idle(
+        interval: Annotated[
+            float,
+            Field(description="Seconds between the two screenshots compared."),
+        ] = 0.05,
+    ) -> bool:
+        """
+        Check whether the UI is settled: two screenshots of the selected application
+        window (or of the primary screen if no window is selected) taken interval
+        seconds apart look the same, ignoring small changes such as a blinking caret.
+        Used as the settle probe of UI actions.
+        :param interval: Seconds between the two screenshots compared.
+        :return: True if the UI did not visibly change between the screenshots.
+        """
+
+        def capture():
+            if ui_state.selected_app_window:
+                return ui_state.photographer.capture_app_window_screenshot(
+                    ui_state.selected_app_window
+                )
+            return ui_state.photographer.capture_desktop_screen_screenshot(
+                all_screens=False
+            )
+
+        try:
+            first = await asyncio.to_thread(capture)
+            await asyncio.sleep(interval)
+            second = await asyncio.to_thread(capture)
+        except Exception as e:
+            # Nothing to watch (e.g. the window was closed by the action)
+            logger.debug(f"UI idle check failed: {e}")
+            return True
+
+        return await asyncio.to_thread(
+            ui_state.photographer.images_similar, first, second
+        )
+
     @data_mcp.tool()
     def get_ui_tree() -> Dict[str, Any]:
         """
@@ -897,6 +939,32 @@ def create_data_mcp_server(*args, **kwargs) -> FastMCP:
         except Exception as e:
             return {"error": f"Error getting UI tree: {str(e)}"}
 
+    @data_mcp.tool()
+    def get_ui_tree_delta(
+        base_version: Annotated[
+            Optional[str],
+            Field(
+                description="The version of the last UI tree received, to get the UI tree as a diff against it."
+            ),
+        ] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get the UI tree for currently selected application window, as a keyed diff against
+        a previous version if it is still known, or in full otherwise.
+        :param base_version: The version of the last UI tree received.
+        :return: {"version", "base_version", "diff"} or {"version", "tree"}.
+        """
+        if not ui_state.selected_app_window:
+            return {"error": "No window selected"}
+
+        try:
+            window = ui_state.selected_app_window
+            return ui_state.ui_tree_history.encode(
+                ui_tree.UITree(window).ui_tree, base_version
+            )
+        except Exception as e:
+            return {"error": f"Error getting UI tree: {str(e)}"}
+
     @data_mcp.tool()
     def add_control_list(control_list: List[Dict[str, Any]]) -> str:
         """
@@ -0,0 +1,487 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import anyio
+from fastmcp import Client
+from fastmcp.client.client import CallToolResult
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED, Tool
+
+from ufo.client.mcp.mcp_server_manager import BaseMCPServer, MCPServerType
+
+# Errors raised when the transport of a session is broken, as opposed to errors of
+# a single call on a healthy session.
+CONNECTION_ERRORS = (
+    ConnectionError,
+    OSError,
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+)
+
+# Default number of in-flight calls per server, as the thread pool used before
+# the sessions were pooled.
+DEFAULT_MAX_CONCURRENCY = 10
+
+
+def is_connection_error(error: Exception, client: Client) -> bool:
+    """
+    Whether an error raised by a call means that the connection of the client is broken.
+    :param error: The error raised by the call.
+    :param client: The client the call was made on.
+    :return: True if the client should be reconnected.
+    """
+    if isinstance(error, CONNECTION_ERRORS):
+        return True
+    if isinstance(error, McpError) and error.error.code == CONNECTION_CLOSED:
+        return True
+    return not client.is_connected()
+
+
+class MCPClientSession:
+    """
+    A long-lived fastmcp client session for a single MCP server.
+    The session runs on a dedicated event loop thread, so blocking operations inside
+    in-process MCP tools (e.g. time.sleep) never block the caller's event loop.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        server: MCPServerType,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        health_check_interval: float = 30.0,
+    ) -> None:
+        """
+        Initialize the client session.
+        :param namespace: The namespace of the MCP server.
+        :param server: The MCP server (URL, FastMCP instance or StdioTransport).
+        :param max_concurrency: The maximum number of in-flight calls on this session.
+        :param health_check_interval: Idle time (seconds) after which the session is pinged before use.
+        """
+        self._namespace = namespace
+        self._server = server
+        self._max_concurrency = max(1, max_concurrency)
+        self._health_check_interval = health_check_interval
+
+        self._client: Optional[Client] = None
+        self._last_used = 0.0
+        self._connect_count = 0
+        self._reconnect_count = 0
+
+        # In-flight calls per client. A broken client is retired: it is replaced for
+        # new calls, and disconnected once the calls still running on it finish.
+        self._in_flight: Dict[Client, int] = {}
+        self._retired: List[Client] = []
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        # The session loop lives in its own thread for the lifetime of the session.
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name=f"mcp_session_{namespace}",
+            daemon=True,
+        )
+        self._thread.start()
+
+        # Created on the session loop so that callers from any loop can share it.
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._closed = False
+
+    async def _submit(self, coro) -> Any:
+        """
+        Run a coroutine on the session loop and await it from the caller loop.
+        :param coro: The coroutine to run.
+        :return: The result of the coroutine.
+        """
+        if self._closed:
+            coro.close()
+            raise RuntimeError(f"MCP session [{self._namespace}] is closed.")
+
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        return await asyncio.wrap_future(future)
+
+    async def _ensure_connected(self) -> Client:
+        """
+        Make sure the underlying client is connected and healthy, reconnecting if needed.
+        Must be called on the session loop.
+        :return: The connected client.
+        """
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+
+        async with self._connect_lock:
+            if self._client is not None and self._client.is_connected():
+                idle = time.monotonic() - self._last_used
+                if idle < self._health_check_interval:
+                    return self._client
+
+                try:
+                    await self._client.ping()
+                    return self._client
+                except Exception as e:
+                    self.logger.warning(
+                        f"Health check failed for MCP session [{self._namespace}]: {e}. Reconnecting."
+                    )
+
+            if self._client is not None:
+                await self._retire(self._client)
+
+            client = Client(self._server)
+            await client.__aenter__()
+            self._client = client
+            self._last_used = time.monotonic()
+            if self._connect_count:
+                self._reconnect_count += 1
+            self._connect_count += 1
+            self.logger.debug(f"MCP session [{self._namespace}] connected.")
+
+            return client
+
+    async def _retire(self, client: Client) -> None:
+        """
+        Stop handing out a client, and disconnect it once no call is running on it.
+        Must be called on the session loop.
+        :param client: The client to retire.
+        """
+        if self._client is client:
+            self._client = None
+        if client in self._retired:
+            return
+        if self._in_flight.get(client):
+            self._retired.append(client)
+        else:
+            await self._close_client(client)
+
+    async def _close_client(self, client: Client) -> None:
+        """
+        Disconnect a client. Must be called on the session loop.
+        :param client: The client to disconnect.
+        """
+        try:
+            await client.__aexit__(None, None, None)
+        except Exception as e:
+            self.logger.debug(
+                f"Error while disconnecting MCP session [{self._namespace}]: {e}"
+            )
+
+    async def _disconnect(self) -> None:
+        """
+        Disconnect the underlying client and the retired ones. Must be called on the
+        session loop.
+        """
+        clients = self._retired + ([self._client] if self._client else [])
+        self._client = None
+        self._retired = []
+        self._in_flight.clear()
+        for client in clients:
+            await self._close_client(client)
+
+    async def _call_tool(
+        self, tool_name: str, arguments: Dict[str, Any]
+    ) -> CallToolResult:
+        """
+        Call a tool on the session loop under the concurrency limit.
+        :param tool_name: The name of the tool.
+        :param arguments: The arguments of the tool.
+        :return: The result of the tool call.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async with self._semaphore:
+            client = await self._ensure_connected()
+            self._in_flight[client] = self._in_flight.get(client, 0) + 1
+            try:
+                result = await client.call_tool(
+                    name=tool_name, arguments=arguments, raise_on_error=False
+                )
+            except Exception as e:
+                # A broken transport is retired so that the next call reconnects, but
+                # the call itself is never replayed: actions are not idempotent.
+                if is_connection_error(e, client):
+                    self.logger.warning(
+                        f"Connection of MCP session [{self._namespace}] lost: {e}. Reconnecting on next call."
+                    )
+                    await self._retire(client)
+                raise
+            finally:
+                await self._release(client)
+            self._last_used = time.monotonic()
+            return result
+
+    async def _release(self, client: Client) -> None:
+        """
+        Count a call on a client as finished, disconnecting the client if it was
+        retired and this was its last call. Must be called on the session loop.
+        :param client: The client the call was made on.
+        """
+        remaining = self._in_flight.get(client, 0) - 1
+        if remaining > 0:
+            self._in_flight[client] = remaining
+            return
+        self._in_flight.pop(client, None)
+        if client in self._retired:
+            self._retired.remove(client)
+            await self._close_client(client)
+
+    async def _list_tools(self) -> List[Tool]:
+        """
+        List the tools of the server on the session loop.
+        :return: The list of tools.
+        """
+        client = await self._ensure_connected()
+        tools = await client.list_tools()
+        self._last_used = time.monotonic()
+        return tools
+
+    async def call_tool(
+        self, tool_name: str, arguments: Optional[Dict[str, Any]] = None
+    ) -> CallToolResult:
+        """
+        Call a tool through the persistent session.
+        :param tool_name: The name of the tool.
+        :param arguments: The arguments of the tool.
+        :return: The result of the tool call.
+        """
+        return await self._submit(self._call_tool(tool_name, arguments or {}))
+
+    async def list_tools(self) -> List[Tool]:
+        """
+        List the tools available on the server.
+        :return: The list of tools.
+        """
+        return await self._submit(self._list_tools())
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Close the session and stop its event loop thread, blocking the calling thread.
+        Safe to call from any thread; coroutines should await aclose instead.
+        :param timeout: Maximum time (seconds) to wait for a graceful disconnect.
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        try:
+            asyncio.run_coroutine_threadsafe(self._disconnect(), self._loop).result(
+                timeout=timeout
+            )
+        except Exception as e:
+            self.logger.debug(f"MCP session [{self._namespace}] close error: {e}")
+
+        self._stop_loop(timeout)
+
+    async def aclose(self, timeout: float = 5.0) -> None:
+        """
+        Close the session and stop its event loop thread without blocking the caller loop.
+        :param timeout: Maximum time (seconds) to wait for a graceful disconnect.
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        try:
+            future = asyncio.run_coroutine_threadsafe(self._disconnect(), self._loop)
+            await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+        except Exception as e:
+            self.logger.debug(f"MCP session [{self._namespace}] close error: {e}")
+
+        await asyncio.to_thread(self._stop_loop, timeout)
+
+    def _stop_loop(self, timeout: float) -> None:
+        """
+        Stop the session loop and wait for its thread.
+        :param timeout: Maximum time (seconds) to wait for the thread.
+        """
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=timeout)
+        if not self._thread.is_alive():
+            self._loop.close()
+
+    @property
+    def namespace(self) -> str:
+        """
+        Get the namespace of the session.
+        """
+        return self._namespace
+
+    @property
+    def server(self) -> MCPServerType:
+        """
+        Get the MCP server the session is bound to.
+        """
+        return self._server
+
+    @property
+    def is_connected(self) -> bool:
+        """
+        Whether the underlying client is currently connected.
+        """
+        return self._client is not None and self._client.is_connected()
+
+    @property
+    def reconnect_count(self) -> int:
+        """
+        The number of times the session has been re-established.
+        """
+        return self._reconnect_count
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether the session has been closed.
+        """
+        return self._closed
+
+
+class MCPSessionPool:
+    """
+    Pool of persistent MCP client sessions, one per MCP server namespace.
+    The per-server concurrency limit is read from the `max_concurrency` key of the
+    server configuration, falling back to the pool default.
+    """
+
+    def __init__(
+        self,
+        default_max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        health_check_interval: float = 30.0,
+    ) -> None:
+        """
+        Initialize the session pool.
+        :param default_max_concurrency: The default number of in-flight calls per server.
+        :param health_check_interval: Idle time (seconds) after which a session is pinged before use.
+        """
+        self._default_max_concurrency = default_max_concurrency
+        self._health_check_interval = health_check_interval
+        self._sessions: Dict[str, MCPClientSession] = {}
+        self._lock = threading.Lock()
+        # Replaced sessions closing in the background, referenced until closed
+        self._closing: set = set()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def get_session(self, namespace: str, mcp_server: BaseMCPServer) -> MCPClientSession:
+        """
+        Get the session for a namespace, creating it if needed. A session bound to a
+        different server instance (e.g. after a server reset) is replaced, and closed
+        in the background when called from a running event loop.
+        :param namespace: The namespace of the MCP server.
+        :param mcp_server: The MCP server.
+        :return: The client session.
+        """
+        session, stale = self._get_or_replace(namespace, mcp_server)
+
+        if stale is not None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                stale.close()
+            else:
+                task = asyncio.ensure_future(stale.aclose())
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+
+        return session
+
+    def _get_or_replace(self, namespace: str, mcp_server: BaseMCPServer) -> tuple:
+        """
+        Get the session for a namespace, creating it if needed.
+        :param namespace: The namespace of the MCP server.
+        :param mcp_server: The MCP server.
+        :return: The client session, and the replaced session to close or None.
+        """
+        stale = None
+        with self._lock:
+            session = self._sessions.get(namespace)
+            if session is not None and (
+                session.closed or session.server is not mcp_server.server
+            ):
+                stale, session = session, None
+
+            if session is None:
+                max_concurrency = mcp_server.config.get(
+                    "max_concurrency", self._default_max_concurrency
+                )
+                session = MCPClientSession(
+                    namespace=namespace,
+                    server=mcp_server.server,
+                    max_concurrency=max_concurrency,
+                    health_check_interval=self._health_check_interval,
+                )
+                self._sessions[namespace] = session
+                self.logger.info(
+                    f"Created persistent MCP session for [{namespace}] with max_concurrency={max_concurrency}."
+                )
+
+        return session, stale
+
+    async def call_tool(
+        self,
+        namespace: str,
+        mcp_server: BaseMCPServer,
+        tool_name: str,
+        arguments: Optional[Dict[str, Any]] = None,
+    ) -> CallToolResult:
+        """
+        Call a tool on the server of a namespace through its pooled session.
+        :param namespace: The namespace of the MCP server.
+        :param mcp_server: The MCP server.
+        :param tool_name: The name of the tool.
+        :param arguments: The arguments of the tool.
+        :return: The result of the tool call.
+        """
+        session = self.get_session(namespace, mcp_server)
+        return await session.call_tool(tool_name, arguments)
+
+    async def list_tools(self, namespace: str, mcp_server: BaseMCPServer) -> List[Tool]:
+        """
+        List the tools of the server of a namespace through its pooled session.
+        :param namespace: The namespace of the MCP server.
+        :param mcp_server: The MCP server.
+        :return: The list of tools.
+        """
+        session = self.get_session(namespace, mcp_server)
+        return await session.list_tools()
+
+    def close(self, namespace: Optional[str] = None) -> None:
+        """
+        Close pooled sessions, blocking the calling thread.
+        :param namespace: The namespace to close, or None to close all sessions.
+        """
+        for session in self._pop_sessions(namespace):
+            session.close()
+
+    async def aclose(self, namespace: Optional[str] = None) -> None:
+        """
+        Close pooled sessions without blocking the caller loop.
+        :param namespace: The namespace to close, or None to close all sessions.
+        """
+        sessions = self._pop_sessions(namespace)
+        await asyncio.gather(*(session.aclose() for session in sessions))
+
+    def _pop_sessions(self, namespace: Optional[str]) -> List[MCPClientSession]:
+        """
+        Remove sessions from the pool.
+        :param namespace: The namespace to remove, or None to remove all sessions.
+        :return: The removed sessions.
+        """
+        with self._lock:
+            if namespace is None:
+                sessions = list(self._sessions.values())
+                self._sessions.clear()
+            else:
+                session = self._sessions.pop(namespace, None)
+                sessions = [session] if session else []
+        return sessions
+
+    @property
+    def sessions(self) -> Dict[str, MCPClientSession]:
+        """
+        Get the pooled sessions keyed by namespace.
+        """
+        return dict(self._sessions)
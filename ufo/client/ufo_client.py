@@ -53,6 +53,8 @@ class UFOClient:
     async def execute_step(self, response: ServerMessage) -> List[Result]:
         """
         Perform a single step execution.
+        Steps of different sessions may run concurrently, so the step is executed with
+        the names of its own message rather than the attributes of the client.
         :param response: The ServerMessage instance to process.
         :return: A list of Result instances.
         """
@@ -62,14 +64,28 @@ class UFOClient:
         self.root_name = response.root_name
 
         # Execute the actions and collect results
-        action_results = await self.execute_actions(response.actions)
+        action_results = await self.execute_actions(
+            response.actions,
+            agent_name=response.agent_name,
+            process_name=response.process_name,
+            root_name=response.root_name,
+        )
 
         return action_results
 
-    async def execute_actions(self, commands: Optional[List[Command]]) -> List[Result]:
+    async def execute_actions(
+        self,
+        commands: Optional[List[Command]],
+        agent_name: Optional[str] = None,
+        process_name: Optional[str] = None,
+        root_name: Optional[str] = None,
+    ) -> List[Result]:
         """
         Execute the actions provided by the server
         :param commands: List of actions to execute
+        :param agent_name: The agent name, by default the current agent name
+        :param process_name: The process name, by default the current process name
+        :param root_name: The root name, by default the current root name
         :returns: Results of the executed actions
         """
         action_results = []
@@ -79,9 +95,11 @@ class UFOClient:
             # Process each action
 
             action_results = await self.command_router.execute(
-                agent_name=self.agent_name,
-                process_name=self.process_name,
-                root_name=self.root_name,
+                agent_name=agent_name if agent_name is not None else self.agent_name,
+                process_name=(
+                    process_name if process_name is not None else self.process_name
+                ),
+                root_name=root_name if root_name is not None else self.root_name,
                 commands=commands,
             )
 
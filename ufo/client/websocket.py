@@ -1,17 +1,20 @@
 import asyncio
 import datetime
 import logging
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Dict, Optional, Set, Union
 from uuid import uuid4
 
 import websockets
 from websockets import WebSocketClientProtocol
 
+from aip.protocol.codecs import available_codecs
+from aip.protocol.compression import available_compressors
 from aip.protocol.registration import RegistrationProtocol
 from aip.protocol.heartbeat import HeartbeatProtocol
 from aip.protocol.task_execution import TaskExecutionProtocol
 from aip.transport.websocket import WebSocketTransport
 from aip.messages import (
+    ClientCapability,
     ClientMessage,
     ClientMessageType,
     ServerMessage,
@@ -28,6 +31,11 @@ class UFOWebSocketClient:
     WebSocket client compatible with FastAPI UFO server.
     Uses AIP (Agent Interaction Protocol) for structured message handling.
     Handles task_request, heartbeat, result_ack, notify_ack.
+
+    The receive loop never waits for commands to execute: the messages of each session
+    are queued to a worker of the session, which executes them in order. Up to
+    max_concurrent_tasks sessions execute commands at the same time, so heartbeats and
+    the messages of other sessions keep flowing during long commands.
     """
 
     def __init__(
@@ -36,6 +44,7 @@ class UFOWebSocketClient:
         ufo_client: "UFOClient",
         max_retries: int = 3,
         timeout: float = 120,
+        max_concurrent_tasks: int = 1,
     ):
         """
         Initialize the WebSocket client.
@@ -43,6 +52,8 @@ class UFOWebSocketClient:
         :param ufo_client: Instance of UFOClient
         :param max_retries: Maximum number of connection retries
         :param timeout: Connection timeout in seconds
+        :param max_concurrent_tasks: Max number of sessions executing commands at the same time.
+            Keep 1 on desktops, where sessions share the screen; raise it on headless/Linux clients.
         """
         self.ws_url = ws_url
         self.ufo_client = ufo_client
@@ -54,6 +65,16 @@ class UFOWebSocketClient:
         self.session_id: Optional[str] = None
         self._ws: Optional[WebSocketClientProtocol] = None
 
+        # Per-session workers, created on the first queued message of a session and
+        # finished once its queue is drained
+        self.max_concurrent_tasks = max(1, max_concurrent_tasks)
+        self._execution_slots = asyncio.Semaphore(self.max_concurrent_tasks)
+        self._session_queues: Dict[str, asyncio.Queue] = {}
+        self._session_workers: Dict[str, asyncio.Task] = {}
+        self._task_requests: Set[asyncio.Task] = set()
+        # Sessions started and not yet completed or failed
+        self.active_sessions: Set[str] = set()
+
         self.connected_event = asyncio.Event()
 
         # AIP protocol instances (will be initialized on connection)
@@ -62,6 +83,9 @@ class UFOWebSocketClient:
         self.heartbeat_protocol: Optional[HeartbeatProtocol] = None
         self.task_protocol: Optional[TaskExecutionProtocol] = None
 
+        # Optional protocol features advertised to the server on registration
+        self.capabilities = [ClientCapability.OBSERVE.value]
+
     async def connect_and_listen(self):
         """
         Connect to the FastAPI WebSocket server and listen for incoming messages.
@@ -167,6 +191,9 @@ class UFOWebSocketClient:
                 "registration_time": datetime.datetime.now(
                     datetime.timezone.utc
                 ).isoformat(),
+                "capabilities": self.capabilities,
+                "codecs": available_codecs(),
+                "compression": available_compressors(),
             }
 
             self.logger.info(
@@ -183,6 +210,9 @@ class UFOWebSocketClient:
                 "registration_time": datetime.datetime.now(
                     datetime.timezone.utc
                 ).isoformat(),
+                "capabilities": self.capabilities,
+                "codecs": available_codecs(),
+                "compression": available_compressors(),
             }
 
         # Use AIP RegistrationProtocol to register
@@ -196,6 +226,16 @@ class UFOWebSocketClient:
         )
 
         if success:
+            # Use the optional protocol features, wire codec and compression the server confirmed
+            self.task_protocol.peer_capabilities = set(
+                self.registration_protocol.peer_capabilities
+            )
+            for protocol in (self.task_protocol, self.heartbeat_protocol):
+                protocol.codec = self.registration_protocol.codec
+                protocol.set_compression(
+                    self.registration_protocol.compression,
+                    self.registration_protocol.compression_threshold,
+                )
             self.connected_event.set()
             self.logger.warning(
                 f"[WS] [AIP] ✅ Successfully registered as {self.ufo_client.client_id}"
@@ -244,9 +284,18 @@ class UFOWebSocketClient:
             # Re-raise to trigger reconnection in connect_and_listen
             raise
 
+        finally:
+            # Stop the loops as well when the listener itself is cancelled
+            for task in (recv_task, heartbeat_task):
+                if not task.done():
+                    task.cancel()
+            # The server cancels the sessions of a disconnected device
+            await self.cancel_sessions()
+
     async def recv_loop(self):
         """
         Listen for incoming messages from the WebSocket.
+        Messages are only dispatched here, commands execute in the session workers.
         """
         try:
             while True:
@@ -276,12 +325,13 @@ class UFOWebSocketClient:
                 )
                 break  # Exit loop if connection is closed
 
-    async def handle_message(self, msg: str):
+    async def handle_message(self, msg: Union[str, bytes]):
         """
         Dispatch messages based on their type.
+        :param msg: The raw message (JSON text, or bytes encoded with the negotiated codec).
         """
         try:
-            data = ServerMessage.model_validate_json(msg)
+            data = self.task_protocol.decode_message(msg, ServerMessage)
             msg_type = data.type
 
             self.logger.info(f"[WS] Received message: {data}")
@@ -290,12 +340,11 @@ class UFOWebSocketClient:
                 await self.start_task(data.user_request, data.task_name)
             elif msg_type == ServerMessageType.HEARTBEAT:
                 self.logger.info("[WS] Heartbeat received")
-            elif msg_type == ServerMessageType.TASK_END:
-                await self.handle_task_end(data)
+            elif msg_type in (ServerMessageType.TASK_END, ServerMessageType.COMMAND):
+                # Handled by the worker of the session, after its earlier messages
+                self.enqueue_session_message(data)
             elif msg_type == ServerMessageType.ERROR:
                 self.logger.error(f"[WS] Server error: {data.error}")
-            elif msg_type == ServerMessageType.COMMAND:
-                await self.handle_commands(data)
             else:
                 self.logger.warning(f"[WS] Unknown message type: {msg_type}")
 
@@ -305,22 +354,19 @@ class UFOWebSocketClient:
     async def start_task(self, request_text: str, task_name: str | None):
         """
         Start a new task based on the received data.
-        :param data: The data received from the server.
-        :param ws: The WebSocket connection.
+        Tasks may be started while others are running, the server runs each in its own session.
+        :param request_text: The user request of the task.
+        :param task_name: The name of the task, or None to generate one.
         """
-        if self.current_task is not None and not self.current_task.done():
-            self.logger.warning(
-                f"[WS] Task {self.session_id} is still running, ignoring new task"
-            )
-            return
-
         self.logger.info(f"[WS] Starting task: {request_text}")
 
         async def task_loop():
 
             try:
                 async with self.ufo_client.task_lock:
-                    self.ufo_client.reset()
+                    # Only reset the client state that no running session relies on
+                    if not self.active_sessions:
+                        self.ufo_client.reset()
 
                     # Build metadata with platform information
                     metadata = {}
@@ -354,6 +400,77 @@ class UFOWebSocketClient:
                 await self.transport.send(error_msg.model_dump_json().encode())
 
         self.current_task = asyncio.create_task(task_loop())
+        # Keep a reference until it is done, the task may not be the current one for long
+        self._task_requests.add(self.current_task)
+        self.current_task.add_done_callback(self._task_requests.discard)
+
+    def enqueue_session_message(self, server_response: ServerMessage) -> None:
+        """
+        Queue a message for the worker of its session, starting the worker if needed.
+        :param server_response: The COMMAND or TASK_END message.
+        """
+        session_id = server_response.session_id or ""
+
+        if (
+            server_response.type == ServerMessageType.COMMAND
+            and server_response.status
+            not in (TaskStatus.COMPLETED, TaskStatus.FAILED)
+        ):
+            self.active_sessions.add(session_id)
+
+        queue = self._session_queues.get(session_id)
+        if queue is None:
+            queue = self._session_queues[session_id] = asyncio.Queue()
+        queue.put_nowait(server_response)
+
+        if session_id not in self._session_workers:
+            self._session_workers[session_id] = asyncio.create_task(
+                self._session_worker(session_id, queue),
+                name=f"session_worker_{session_id}",
+            )
+
+    async def _session_worker(self, session_id: str, queue: asyncio.Queue) -> None:
+        """
+        Handle the queued messages of a session in order, then finish.
+        :param session_id: The session ID.
+        :param queue: The message queue of the session.
+        """
+        try:
+            while not queue.empty():
+                server_response: ServerMessage = queue.get_nowait()
+                try:
+                    if server_response.type == ServerMessageType.COMMAND:
+                        async with self._execution_slots:
+                            await self.handle_commands(server_response)
+                    else:
+                        await self.handle_task_end(server_response)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.logger.error(
+                        f"[WS] Error handling message of session {session_id}: {e}",
+                        exc_info=True,
+                    )
+        finally:
+            # No await between the empty check and the removal: a message queued
+            # afterwards starts a new worker
+            self._session_workers.pop(session_id, None)
+            self._session_queues.pop(session_id, None)
+
+    async def cancel_sessions(self) -> None:
+        """
+        Cancel the session workers and forget the queued messages and running sessions.
+        """
+        workers = list(self._session_workers.values())
+        for worker in workers:
+            worker.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+            self.logger.warning(f"[WS] Cancelled {len(workers)} session worker(s)")
+
+        self._session_workers.clear()
+        self._session_queues.clear()
+        self.active_sessions.clear()
 
     async def handle_commands(self, server_response: ServerMessage):
         """
@@ -363,13 +480,14 @@ class UFOWebSocketClient:
 
         response_id = server_response.response_id
         task_status = server_response.status
-        self.session_id = server_response.session_id
+        session_id = server_response.session_id
+        self.session_id = session_id
 
         action_results = await self.ufo_client.execute_step(server_response)
 
         # Use AIP TaskExecutionProtocol to send results
         await self.task_protocol.send_task_result(
-            session_id=self.session_id,
+            session_id=session_id,
             prev_response_id=response_id,
             action_results=action_results,
             status=task_status,
@@ -388,18 +506,22 @@ class UFOWebSocketClient:
         Handle task end messages from the server.
         :param server_response: The server response message.
         """
+        session_id = server_response.session_id
+
+        if server_response.status in (TaskStatus.COMPLETED, TaskStatus.FAILED):
+            self.active_sessions.discard(session_id or "")
 
         if server_response.status == TaskStatus.COMPLETED:
             self.logger.info(
-                f"[WS] Task {self.session_id} completed, result: {server_response.result}"
+                f"[WS] Task {session_id} completed, result: {server_response.result}"
             )
         elif server_response.status == TaskStatus.FAILED:
             self.logger.info(
-                f"[WS] Task {self.session_id} failed, with error: {server_response.error}"
+                f"[WS] Task {session_id} failed, with error: {server_response.error}"
             )
         else:
             self.logger.warning(
-                f"[WS] Unknown task status for {self.session_id}: {server_response.status}"
+                f"[WS] Unknown task status for {session_id}: {server_response.status}"
             )
 
     async def _maybe_retry(self):
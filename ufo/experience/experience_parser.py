@@ -1,7 +1,7 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 from collections import defaultdict
 
 from ufo.trajectory import parser
@@ -24,26 +24,31 @@ class ExperienceLogLoader:
         """
         self._log_path = log_path
         trajectory = parser.Trajectory(log_path)
-        self._subtask_partition = self.group_by_subtask(trajectory.app_agent_log)
+        # Stream the steps, their screenshots are encoded from the files without decoding
+        self._subtask_partition = self.group_by_subtask(
+            trajectory.iter_steps(agent_type="AppAgent")
+        )
 
     @classmethod
     def group_by_subtask(
-        cls, step_log: List[Dict[str, Any]]
+        cls, step_log: Iterable[Dict[str, Any]]
     ) -> List[List[Dict[str, Any]]]:
         """
         Group the logs by the value of the "Subtask" field.
-        :param step_log: The step log.
+        :param step_log: The step log, a list or a stream of steps.
         :return: The grouped logs.
         """
 
         grouped = defaultdict(list)
         for log in step_log:
             # Group by the value of the "Subtask" field
+            screenshots = log.get(parser.Trajectory._step_screenshot_key, {})
             image_urls = {}
             for key in parser.Trajectory._screenshot_keys:
-                image_urls[key] = ufo.utils.encode_image(
-                    log.get(parser.Trajectory._step_screenshot_key, {}).get(key)
-                )
+                if isinstance(screenshots, parser.LazyScreenshots):
+                    image_urls[key] = screenshots.data_url(key)
+                else:
+                    image_urls[key] = ufo.utils.encode_image(screenshots.get(key))
             log[cls._image_url_key] = image_urls
             subtask = log.get(cls._subtask_key)
             grouped[subtask].append(log)
@@ -2,10 +2,15 @@
 # Licensed under the MIT License.
 
 import abc
+import asyncio
 from importlib import import_module
-from typing import Dict
+from typing import Any, Dict, List
 import functools
 from ufo.llm.config_helper import get_agent_config
+from ufo.llm.connection_pool import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    get_endpoint_semaphore,
+)
 from config.config_loader import get_ufo_config, get_galaxy_config
 
 
@@ -18,6 +23,45 @@ class BaseService(abc.ABC):
     def chat_completion(self, *args, **kwargs):
         pass
 
+    async def achat_completion(
+        self, messages: List[Dict[str, str]], n: int = 1, **kwargs: Any
+    ) -> Any:
+        """
+        Generates completions asynchronously. Services with an async client override this;
+        the default runs chat_completion in a worker thread.
+        :param messages: The list of messages in the conversation.
+        :param n: The number of completions to generate.
+        :param kwargs: Additional keyword arguments passed to chat_completion.
+        :return: A tuple containing a list of generated completions and the estimated cost.
+        """
+        async with self.concurrency_limit():
+            return await asyncio.to_thread(self.chat_completion, messages, n, **kwargs)
+
+    @property
+    def endpoint(self) -> str:
+        """
+        The key of the endpoint the service sends requests to, shared by all services
+        using the same API.
+        :return: The endpoint key.
+        """
+        config_llm = getattr(self, "config_llm", {})
+        return "{}:{}".format(
+            config_llm.get("API_TYPE", self.__class__.__name__),
+            config_llm.get("API_BASE") or config_llm.get("API_MODEL", ""),
+        )
+
+    def concurrency_limit(self) -> asyncio.Semaphore:
+        """
+        Get the semaphore bounding the in-flight requests to the endpoint of the service,
+        configured with MAX_CONCURRENT_REQUESTS in the agent configuration.
+        :return: The semaphore.
+        """
+        config_llm = getattr(self, "config_llm", {})
+        return get_endpoint_semaphore(
+            self.endpoint,
+            config_llm.get("MAX_CONCURRENT_REQUESTS", DEFAULT_MAX_CONCURRENT_REQUESTS),
+        )
+
     @staticmethod
     @functools.cache
     def get_service(
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import re
 import time
@@ -7,6 +8,7 @@ import anthropic
 from PIL import Image
 
 from ufo.llm.base import BaseService
+from ufo.llm.connection_pool import get_async_http_client, get_loop_resource
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +30,40 @@ class ClaudeService(BaseService):
         self.prices = self.config["PRICES"]
         self.max_retry = self.config["MAX_RETRY"]
         self.api_type = self.config_llm["API_TYPE"].lower()
-        self.client = anthropic.Anthropic(api_key=self.config_llm["API_KEY"])
+        self.base_url = self.config_llm.get("API_BASE") or None
+        self.client = anthropic.Anthropic(
+            api_key=self.config_llm["API_KEY"], base_url=self.base_url
+        )
+
+    @property
+    def async_client(self) -> anthropic.AsyncAnthropic:
+        """
+        The async Anthropic client of the running event loop, using the pooled HTTP client
+        if the SDK accepts it.
+        :return: The async Anthropic client.
+        """
+        return get_loop_resource(
+            ("claude", self.base_url, self.config_llm["API_KEY"]),
+            self._create_async_client,
+        )
+
+    def _create_async_client(self) -> anthropic.AsyncAnthropic:
+        """
+        Create the async Anthropic client. SDK releases built on another HTTP library than
+        httpx reject the pooled HTTP client and keep their own connection pool instead.
+        :return: The async Anthropic client.
+        """
+        try:
+            return anthropic.AsyncAnthropic(
+                api_key=self.config_llm["API_KEY"],
+                base_url=self.base_url,
+                http_client=get_async_http_client(),
+            )
+        except TypeError as e:
+            logger.debug(f"Using the connection pool of the Anthropic SDK: {e}")
+            return anthropic.AsyncAnthropic(
+                api_key=self.config_llm["API_KEY"], base_url=self.base_url
+            )
 
     def chat_completion(
         self,
@@ -70,15 +105,8 @@ class ClaudeService(BaseService):
                         messages=user_prompt,
                     )
                     responses.append(response.content[0].text)
-                    prompt_tokens = response.usage.input_tokens
-                    completion_tokens = response.usage.output_tokens
-                    cost += self.get_cost_estimator(
-                        self.api_type,
-                        self.model,
-                        self.prices,
-                        prompt_tokens,
-                        completion_tokens,
-                    )
+                    cost += self._usage_cost(response.usage)
+                    break
                 except Exception as e:
                     import traceback
 
@@ -93,6 +121,63 @@ class ClaudeService(BaseService):
 
         return responses, cost
 
+    async def achat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        n: int = 1,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Generates completions for a given list of messages with the async Anthropic client.
+        The parameters are the same as chat_completion.
+        :return: A list of generated completions for each message and the estimated cost.
+        :raises Exception: The last error of a completion that failed MAX_RETRY times,
+            so the caller can switch to the backup engine.
+        """
+        max_tokens = max_tokens if max_tokens is not None else self.config["MAX_TOKENS"]
+
+        responses = []
+        cost = 0.0
+        system_prompt, user_prompt = self.process_messages(messages)
+
+        for _ in range(n):
+            for attempt in range(1, self.max_retry + 1):
+                try:
+                    async with self.concurrency_limit():
+                        response = await self.async_client.messages.create(
+                            max_tokens=max_tokens,
+                            model=self.model,
+                            system=system_prompt,
+                            messages=user_prompt,
+                        )
+                    responses.append(response.content[0].text)
+                    cost += self._usage_cost(response.usage)
+                    break
+                except Exception as e:
+                    logger.error(f"Error when making API request: {e}", exc_info=True)
+                    if attempt == self.max_retry:
+                        raise
+                    await asyncio.sleep(3)
+
+        return responses, cost
+
+    def _usage_cost(self, usage: Any) -> float:
+        """
+        Estimate the cost of a request from its token usage.
+        :param usage: The usage of the response.
+        :return: The estimated cost.
+        """
+        return self.get_cost_estimator(
+            self.api_type,
+            self.model,
+            self.prices,
+            usage.input_tokens,
+            usage.output_tokens,
+        )
+
     def process_messages(
         self, messages: List[Dict[str, str]]
     ) -> Tuple[str, list[Dict]]:
@@ -0,0 +1,80 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Shared resources of the async LLM services: one pooled HTTP client and one
+concurrency semaphore per endpoint, for each event loop.
+
+asyncio primitives and HTTP connections are bound to the event loop that created
+them, so the resources are kept per loop and released with it.
+"""
+
+import asyncio
+import weakref
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+import httpx
+
+# Maximum number of in-flight requests per endpoint, unless configured with
+# MAX_CONCURRENT_REQUESTS in the agent configuration.
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+
+# Connection pool of the shared HTTP client
+DEFAULT_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=100)
+
+T = TypeVar("T")
+
+_loop_resources: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_loop_resource(key: Hashable, factory: Callable[[], T]) -> T:
+    """
+    Get a resource shared by all callers on the running event loop, creating it on first use.
+    :param key: The resource key.
+    :param factory: Creates the resource.
+    :return: The resource.
+    """
+    loop = asyncio.get_running_loop()
+    resources = _loop_resources.setdefault(loop, {})
+    if key not in resources:
+        resources[key] = factory()
+    return resources[key]
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Get the pooled HTTP client shared by the async LLM clients of the running event loop.
+    Timeouts and retries are applied per request by the SDK clients.
+    :return: The HTTP client.
+    """
+    return get_loop_resource(
+        "http_client",
+        lambda: httpx.AsyncClient(limits=DEFAULT_POOL_LIMITS, follow_redirects=True),
+    )
+
+
+def get_endpoint_semaphore(
+    endpoint: str, limit: int = DEFAULT_MAX_CONCURRENT_REQUESTS
+) -> asyncio.Semaphore:
+    """
+    Get the semaphore bounding the in-flight requests to an endpoint.
+    The limit is fixed when the semaphore is first created.
+    :param endpoint: The endpoint key.
+    :param limit: The maximum number of in-flight requests.
+    :return: The semaphore.
+    """
+    return get_loop_resource(("semaphore", endpoint), lambda: asyncio.Semaphore(limit))
+
+
+async def close_async_http_client() -> None:
+    """
+    Close the pooled HTTP client and the cached clients of the running event loop,
+    including the clients managing their own connection pool, and drop them.
+    """
+    resources = _loop_resources.pop(asyncio.get_running_loop(), {})
+    for resource in resources.values():
+        close = getattr(resource, "aclose", None) or getattr(resource, "close", None)
+        if close is not None and asyncio.iscoroutinefunction(close):
+            await close()
@@ -47,3 +47,29 @@ class DeepSeekService(BaseOpenAIService):
             response_format={"type": "json_object"},
             **kwargs,
         )
+
+    async def achat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        n: int = 1,
+        stream: bool = True,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Tuple[List[str], Optional[float]]:
+        """
+        Generates completions for a given conversation using the DeepSeek API asynchronously.
+        The parameters are the same as chat_completion.
+        :return: A tuple containing a list of generated completions and the estimated cost.
+        """
+        async with self.concurrency_limit():
+            return await super()._achat_completion(
+                messages,
+                False,
+                temperature,
+                max_tokens,
+                top_p,
+                response_format={"type": "json_object"},
+                **kwargs,
+            )
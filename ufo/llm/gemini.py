@@ -1,3 +1,4 @@
+import asyncio
 import functools
 import base64
 import logging
@@ -69,64 +70,123 @@ class GeminiService(BaseService):
         )
         top_p = top_p if top_p is not None else self.config["TOP_P"]
         max_tokens = max_tokens if max_tokens is not None else self.config["MAX_TOKENS"]
-        genai_config = GenerateContentConfig(
-            max_output_tokens=max_tokens,
-            temperature=temperature,
-            top_p=top_p,
-            response_mime_type="application/json",
-        )
+        genai_config = self._build_generate_config(temperature, max_tokens, top_p)
 
         processed_messages = self.process_messages(messages)
 
-        # Default parameters from OpenAI
-        # Ref: _calculate_retry_timeout from https://github.com/openai/openai-python/blob/main/src/openai/_base_client.pys
-        initial_delay = 0.5
-        max_delay = 8.0
-        jitter_factor = 0.25
+        for attempt in range(self.max_retry):
+            try:
+                response = self.client.models.generate_content(
+                    model=self.model,
+                    contents=processed_messages,
+                    config=genai_config,
+                )
+                cost = self._usage_cost(response)
+                break
+            except Exception as e:
+                time.sleep(self._retry_delay(attempt, e))
+
+        return self.get_text_from_all_candidates(response), cost
+
+    async def achat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        n: int = 1,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Generates completions for a given list of messages with the async Gemini client.
+        The parameters are the same as chat_completion.
+        :return: A list of generated completions for each message and the estimated cost.
+        """
+        temperature = (
+            temperature if temperature is not None else self.config["TEMPERATURE"]
+        )
+        top_p = top_p if top_p is not None else self.config["TOP_P"]
+        max_tokens = max_tokens if max_tokens is not None else self.config["MAX_TOKENS"]
+        genai_config = self._build_generate_config(temperature, max_tokens, top_p)
+
+        processed_messages = self.process_messages(messages)
 
         for attempt in range(self.max_retry):
             try:
-                if self.json_schema_enabled:
-                    response_format = {
-                        AgentType.HOST: HostAgentResponse,
-                        AgentType.APP: AppAgentResponse,
-                        AgentType.EVALUATION: EvaluationResponse,
-                    }.get(self.agent_type, None)
-                    genai_config.response_schema = response_format
-                    response = self.client.models.generate_content(
+                async with self.concurrency_limit():
+                    response = await self.client.aio.models.generate_content(
                         model=self.model,
                         contents=processed_messages,
                         config=genai_config,
                     )
-                else:
-                    response = self.client.models.generate_content(
-                        model=self.model,
-                        contents=processed_messages,
-                        config=genai_config,
-                    )
-                prompt_tokens = response.usage_metadata.prompt_token_count
-                completion_tokens = response.usage_metadata.candidates_token_count
-                cost = self.get_cost_estimator(
-                    self.api_type,
-                    self.model,
-                    self.prices,
-                    prompt_tokens,
-                    completion_tokens,
-                )
+                cost = self._usage_cost(response)
                 break
             except Exception as e:
-                # Calculate backoff with jitter
-                delay = min(initial_delay * (2**attempt), max_delay)
-                jitter = random.uniform(-jitter_factor * delay, 0)
-                sleep_time = delay + jitter
-                logger.warning(
-                    f"Error during Gemini API request, attempt {attempt+1}/{self.max_retry}: {e}. "
-                    f"Retrying in {sleep_time:.2f}s..."
-                )
-                time.sleep(sleep_time)
+                await asyncio.sleep(self._retry_delay(attempt, e))
 
         return self.get_text_from_all_candidates(response), cost
 
+    def _build_generate_config(
+        self, temperature: float, max_tokens: int, top_p: float
+    ) -> GenerateContentConfig:
+        """
+        Build the generation config of a request.
+        :param temperature: The temperature parameter for randomness in the output.
+        :param max_tokens: The maximum number of tokens in the generated completion.
+        :param top_p: The top-p parameter for nucleus sampling.
+        :return: The generation config.
+        """
+        genai_config = GenerateContentConfig(
+            max_output_tokens=max_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            response_mime_type="application/json",
+        )
+        if self.json_schema_enabled:
+            genai_config.response_schema = {
+                AgentType.HOST: HostAgentResponse,
+                AgentType.APP: AppAgentResponse,
+                AgentType.EVALUATION: EvaluationResponse,
+            }.get(self.agent_type, None)
+        return genai_config
+
+    def _usage_cost(self, response: GenerateContentResponse) -> float:
+        """
+        Estimate the cost of a request from its token usage.
+        :param response: The response.
+        :return: The estimated cost.
+        """
+        return self.get_cost_estimator(
+            self.api_type,
+            self.model,
+            self.prices,
+            response.usage_metadata.prompt_token_count,
+            response.usage_metadata.candidates_token_count,
+        )
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """
+        Log a failed request and compute the backoff before the next attempt.
+        :param attempt: The index of the failed attempt.
+        :param error: The error of the failed attempt.
+        :return: The delay in seconds.
+        """
+        # Default parameters from OpenAI
+        # Ref: _calculate_retry_timeout from https://github.com/openai/openai-python/blob/main/src/openai/_base_client.pys
+        initial_delay = 0.5
+        max_delay = 8.0
+        jitter_factor = 0.25
+
+        # Calculate backoff with jitter
+        delay = min(initial_delay * (2**attempt), max_delay)
+        jitter = random.uniform(-jitter_factor * delay, 0)
+        sleep_time = delay + jitter
+        logger.warning(
+            f"Error during Gemini API request, attempt {attempt+1}/{self.max_retry}: {error}. "
+            f"Retrying in {sleep_time:.2f}s..."
+        )
+        return sleep_time
+
     def process_messages(self, messages: List[Dict[str, str]]) -> List[str]:
         """
         Process the given messages and extract prompts from them.
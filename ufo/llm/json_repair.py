@@ -0,0 +1,179 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Repair of malformed JSON responses, so that a response which fails to parse can be
+fixed without resending the whole (multimodal) prompt:
+
+1. extract_json_object: tolerant extraction of the JSON object from the response text.
+   Truncated responses are not completed, since the missing part may change the action;
+   they raise TruncatedJSONError so the full prompt is resent.
+2. fit_to_schema: schema-guided fix-up of field names and types against a response model.
+3. build_fix_json_prompt: a short text-only follow-up asking the model to fix its JSON.
+"""
+
+import ast
+import json
+import re
+from typing import Any, Dict, List, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+_CODE_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)(?:```|$)", re.DOTALL)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"'})
+
+
+class TruncatedJSONError(ValueError):
+    """
+    Raised when a response ends inside its JSON object, e.g. cut off by the token limit.
+    """
+
+    pass
+
+
+def extract_json_object(text: str) -> Dict[str, Any]:
+    """
+    Extract a JSON object from a response, tolerating surrounding prose, code fences,
+    trailing commas and Python literals.
+    :param text: The response text.
+    :return: The parsed object.
+    :raises TruncatedJSONError: If the JSON object is left open by a truncated response.
+    :raises ValueError: If no JSON object can be recovered.
+    """
+    candidates = [text.strip()]
+
+    fenced = _CODE_FENCE.search(text)
+    if fenced:
+        candidates.append(fenced.group(1).strip())
+
+    start = text.find("{")
+    if start >= 0:
+        end = text.rfind("}")
+        if end > start:
+            candidates.append(text[start : end + 1])
+
+    for candidate in candidates:
+        for attempt in (
+            candidate,
+            _TRAILING_COMMA.sub(r"\1", candidate.translate(_SMART_QUOTES)),
+        ):
+            try:
+                value = json.loads(attempt)
+            except ValueError:
+                try:
+                    # Single quotes and True/False/None
+                    value = ast.literal_eval(attempt)
+                except (ValueError, SyntaxError, MemoryError, RecursionError):
+                    continue
+            if isinstance(value, dict):
+                return value
+
+    if start >= 0 and _is_truncated(text[start:]):
+        raise TruncatedJSONError("The JSON object in the response is truncated")
+    raise ValueError("No JSON object found in the response")
+
+
+def _is_truncated(text: str) -> bool:
+    """
+    Check whether a JSON text ends inside a string, object or array.
+    :param text: The JSON text, starting at its opening brace.
+    :return: True if the text is left open.
+    """
+    stack = []
+    in_string = escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+
+    return in_string or bool(stack)
+
+
+def _normalize_key(key: str) -> str:
+    return re.sub(r"[\s_\-]", "", str(key)).lower()
+
+
+def _is_list_annotation(annotation: Any) -> bool:
+    if get_origin(annotation) in (list, List):
+        return True
+    if get_origin(annotation) is Union:
+        return any(_is_list_annotation(arg) for arg in get_args(annotation))
+    return False
+
+
+def fit_to_schema(data: Dict[str, Any], schema: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Fix up a parsed response against a response model: field names are matched
+    ignoring case and separators (e.g. "CurrentSubtask" to "current_subtask"), a
+    single string is wrapped for list fields and a list is joined for string fields.
+    :param data: The parsed response.
+    :param schema: The response model.
+    :return: The fixed response, which validates against the model.
+    :raises ValueError: If the response cannot be fitted to the model.
+    """
+    fields = {_normalize_key(name): name for name in schema.model_fields}
+    fixed = {}
+    for key, value in data.items():
+        name = fields.get(_normalize_key(key), key)
+        if name in fixed and key != name:
+            # Keep the exact field name over a fuzzy match
+            continue
+        field = schema.model_fields.get(name)
+        if field is not None:
+            if field.annotation is str and isinstance(value, list):
+                value = "\n".join(str(item) for item in value)
+            elif field.annotation is str and isinstance(value, (int, float)):
+                value = str(value)
+            elif isinstance(value, str) and _is_list_annotation(field.annotation):
+                value = [value] if value else []
+        fixed[name] = value
+
+    # Raises a ValidationError (a ValueError) if the response does not fit
+    schema.model_validate(fixed)
+    return fixed
+
+
+def build_fix_json_prompt(
+    response_text: str, error: Exception, schema: Type[BaseModel]
+) -> List[Dict[str, Any]]:
+    """
+    Build a short text-only prompt asking the model to fix its malformed JSON response.
+    :param response_text: The malformed response.
+    :param error: The parsing error.
+    :param schema: The expected response model.
+    :return: The prompt messages.
+    """
+    field_names = ", ".join(schema.model_fields)
+    return [
+        {
+            "role": "system",
+            "content": [
+                {
+                    "type": "text",
+                    "text": "You fix malformed JSON. Reply with the corrected JSON object only, "
+                    "without code fences or any other text. Keep the content unchanged.",
+                }
+            ],
+        },
+        {
+            "role": "user",
+            "content": [
+                {
+                    "type": "text",
+                    "text": f"The following response could not be parsed ({error}). "
+                    f"The JSON object must have the fields: {field_names}.\n\n{response_text}",
+                }
+            ],
+        },
+    ]
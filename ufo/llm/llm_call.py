@@ -1,12 +1,21 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
+import asyncio
 import logging
 from ufo.llm import AgentType
-from typing import Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.config_loader import get_galaxy_config, get_ufo_config
 
 from .base import BaseService
 from .config_helper import get_agent_config
+from .response_cache import (
+    LLMCacheMissError,
+    LLMResponseCache,
+    get_response_cache,
+    make_cache_key,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +57,118 @@ def get_completions(
     :return: A tuple containing the completion responses and the cost.
     """
 
+    agent_type, api_type, api_model = _resolve_agent_api(agent, configs)
+
+    cache = get_response_cache()
+    if cache is not None:
+        key = make_cache_key(
+            messages, api_type, api_model, n, _sampling_params(agent_type, configs)
+        )
+        cached = _lookup_cache(cache, key, agent_type)
+        if cached is not None:
+            return cached
+
+    try:
+        service = _get_service(agent_type, api_type, api_model)
+        response, cost = service.chat_completion(messages, n)
+        if cache is not None:
+            _store_in_cache(cache, key, response, cost)
+        return response, cost
+    except Exception as e:
+        if use_backup_engine:
+            logger.error(f"The API request of {agent_type} failed: {e}.")
+            logger.warning(f"Switching to use the backup engine...")
+            return get_completions(
+                messages,
+                agent=AgentType.BACKUP,
+                use_backup_engine=False,
+                n=n,
+                configs=configs,
+            )
+        else:
+            raise e
+
+
+async def aget_completion(
+    messages,
+    agent: str = AgentType.APP,
+    use_backup_engine: bool = True,
+    configs: dict = {},
+) -> Tuple[str, float]:
+    """
+    Get completion for the given messages without blocking the event loop.
+    :param messages: List of messages to be used for completion.
+    :param agent: Type of agent. Possible values are 'hostagent', 'appagent' or 'backup'.
+    :param use_backup_engine: Flag indicating whether to use the backup engine or not.
+    :return: A tuple containing the completion response and the cost.
+    """
+
+    responses, cost = await aget_completions(
+        messages, agent=agent, use_backup_engine=use_backup_engine, n=1, configs=configs
+    )
+    if not responses:
+        raise ValueError(f"The API request of {agent} returned no completion.")
+    return responses[0], cost
+
+
+async def aget_completions(
+    messages,
+    agent: str = AgentType.APP,
+    use_backup_engine: bool = True,
+    n: int = 1,
+    configs: dict = {},
+) -> Tuple[list, float]:
+    """
+    Get completions for the given messages without blocking the event loop, using the
+    async API of the service.
+    :param messages: List of messages to be used for completion.
+    :param agent: Type of agent. Possible values are 'hostagent', 'appagent' or 'backup'.
+    :param use_backup_engine: Flag indicating whether to use the backup engine or not.
+    :param n: Number of completions to generate.
+    :param configs: (Deprecated) Legacy configs dict. If empty, will use new config system.
+    :return: A tuple containing the completion responses and the cost.
+    """
+
+    agent_type, api_type, api_model = _resolve_agent_api(agent, configs)
+
+    cache = get_response_cache()
+    if cache is not None:
+        key = make_cache_key(
+            messages, api_type, api_model, n, _sampling_params(agent_type, configs)
+        )
+        # sqlite reads and writes run in a worker thread, off the event loop
+        cached = await asyncio.to_thread(_lookup_cache, cache, key, agent_type)
+        if cached is not None:
+            return cached
+
+    try:
+        service = _get_service(agent_type, api_type, api_model)
+        response, cost = await service.achat_completion(messages, n)
+        if cache is not None:
+            await asyncio.to_thread(_store_in_cache, cache, key, response, cost)
+        return response, cost
+    except Exception as e:
+        if use_backup_engine:
+            logger.error(f"The API request of {agent_type} failed: {e}.")
+            logger.warning(f"Switching to use the backup engine...")
+            return await aget_completions(
+                messages,
+                agent=AgentType.BACKUP,
+                use_backup_engine=False,
+                n=n,
+                configs=configs,
+            )
+        else:
+            raise e
+
+
+def _resolve_agent_api(agent: str, configs: dict) -> Tuple[str, str, str]:
+    """
+    Resolve the agent type whose LLM configuration is used, and its API type and model.
+    :param agent: Type of agent.
+    :param configs: (Deprecated) Legacy configs dict. If empty, will use new config system.
+    :return: A tuple containing the agent type, the API type and the API model.
+    """
     if agent in [
         AgentType.HOST,
         AgentType.APP,
@@ -88,24 +209,88 @@ def get_completions(
         api_type = configs[agent_type]["API_TYPE"]
         api_model = configs[agent_type]["API_MODEL"]
 
-    try:
-        api_type_lower = api_type.lower()
-        service = BaseService.get_service(api_type_lower, agent_type, api_model.lower())
-        if service:
-            response, cost = service.chat_completion(messages, n)
-            return response, cost
-        else:
-            raise ValueError(f"API_TYPE {api_type} not supported")
-    except Exception as e:
-        if use_backup_engine:
-            logger.error(f"The API request of {agent_type} failed: {e}.")
-            logger.warning(f"Switching to use the backup engine...")
-            return get_completions(
-                messages,
-                agent=AgentType.BACKUP,
-                use_backup_engine=False,
-                n=n,
-                configs=configs,
-            )
-        else:
-            raise e
+    return agent_type, api_type, api_model
+
+
+def _get_service(agent_type: str, api_type: str, api_model: str) -> BaseService:
+    """
+    Get the LLM service of an agent type.
+    :param agent_type: The agent type.
+    :param api_type: The API type.
+    :param api_model: The API model.
+    :return: The service.
+    """
+    service = BaseService.get_service(api_type.lower(), agent_type, api_model.lower())
+    if not service:
+        raise ValueError(f"API_TYPE {api_type} not supported")
+    return service
+
+
+def _sampling_params(agent_type: str, configs: dict) -> Dict[str, Any]:
+    """
+    Get the sampling parameters the services apply to a request, as part of its cache key.
+    :param agent_type: The agent type.
+    :param configs: (Deprecated) Legacy configs dict. If empty, will use new config system.
+    :return: The temperature, top_p and max_tokens.
+    """
+    if configs:
+        source = configs
+    elif agent_type == AgentType.CONSTELLATION:
+        source = get_galaxy_config().constellation
+    else:
+        source = get_ufo_config().system
+
+    return {
+        "temperature": source.get("TEMPERATURE", 0.0),
+        "top_p": source.get("TOP_P", 0.0),
+        "max_tokens": source.get("MAX_TOKENS", 2000),
+    }
+
+
+def _is_complete(responses: Any) -> bool:
+    """
+    Check that a request returned a completion for every choice, so it may be cached.
+    :param responses: The completion responses.
+    :return: True if there is at least one response and none is empty.
+    """
+    return isinstance(responses, list) and bool(responses) and all(responses)
+
+
+def _store_in_cache(
+    cache: LLMResponseCache, key: str, responses: List[str], cost: float
+) -> None:
+    """
+    Store the responses of a successful request in the response cache. Empty or
+    partial responses of failed requests are not stored, so they are retried.
+    :param cache: The response cache.
+    :param key: The cache key of the request.
+    :param responses: The completion responses.
+    :param cost: The cost of the request.
+    """
+    if cache.writable and _is_complete(responses):
+        cache.put(key, responses, cost)
+
+
+def _lookup_cache(
+    cache: LLMResponseCache, key: str, agent_type: str
+) -> Optional[Tuple[List[str], float]]:
+    """
+    Look up a request in the response cache. Cache hits cost nothing.
+    :param cache: The response cache.
+    :param key: The cache key of the request.
+    :param agent_type: The agent type, for logging.
+    :return: The cached responses and a zero cost, or None if the model must be called.
+    """
+    if not cache.readable:
+        return None
+
+    cached = cache.get(key)
+    if cached is not None and _is_complete(cached[0]):
+        logger.debug(f"LLM response cache hit for {agent_type} ({key[:12]}).")
+        return cached[0], 0.0
+
+    if cache.mode == "replay":
+        raise LLMCacheMissError(
+            f"No recorded response for the {agent_type} request {key[:12]} in replay mode."
+        )
+    return None
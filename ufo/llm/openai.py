@@ -12,9 +12,10 @@ import urllib.error
 import urllib.request
 from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
 
-from openai import AzureOpenAI, OpenAI
+from openai import AsyncAzureOpenAI, AsyncOpenAI, AzureOpenAI, OpenAI
 from openai.lib._parsing._completions import type_to_response_format_param
 from ufo.llm.base import BaseService
+from ufo.llm.connection_pool import get_async_http_client, get_loop_resource
 from ufo.llm.response_schema import (
     AppAgentResponse,
     EvaluationResponse,
@@ -47,17 +48,19 @@ class BaseOpenAIService(BaseService):
         assert api_provider in ["openai", "aoai", "azure_ad"], "Invalid API Provider"
         self.use_responses = bool(self.config_llm.get("USE_RESPONSES", False))
 
-        self.client: OpenAI = OpenAIService.get_openai_client(
-            api_provider,
-            api_base,
-            self.max_retry,
-            self.config["TIMEOUT"],
-            self.config_llm.get("API_KEY", ""),
-            self.config_llm.get("API_VERSION", ""),
+        # Shared by the sync client and the async clients created per event loop
+        self._client_params = dict(
+            api_type=api_provider,
+            api_base=api_base,
+            max_retry=self.max_retry,
+            timeout=self.config["TIMEOUT"],
+            api_key=self.config_llm.get("API_KEY", ""),
+            api_version=self.config_llm.get("API_VERSION", ""),
             aad_api_scope_base=self.config_llm.get("AAD_API_SCOPE_BASE", ""),
             aad_tenant_id=self.config_llm.get("AAD_TENANT_ID", ""),
             use_responses=self.use_responses,
         )
+        self.client: OpenAI = OpenAIService.get_openai_client(**self._client_params)
 
         self.model = self.config_llm["API_MODEL"]
 
@@ -90,6 +93,22 @@ class BaseOpenAIService(BaseService):
                     self.json_schema_enabled = False
                 break  # Exit the loop if no exception is raised
 
+    @property
+    def endpoint(self) -> str:
+        """
+        The key of the endpoint the service sends requests to.
+        :return: The endpoint key.
+        """
+        return f"{self._client_params['api_type']}:{self._client_params['api_base']}"
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """
+        The async OpenAI client of the running event loop.
+        :return: The async OpenAI client.
+        """
+        return OpenAIService.get_async_openai_client(**self._client_params)
+
     def _chat_completion(
         self,
         messages: List[Dict[str, str]],
@@ -125,47 +144,9 @@ class BaseOpenAIService(BaseService):
                     max_tokens=max_tokens,
                     top_p=top_p,
                 )
-            # Build base parameters
-            base_params = {
-                "model": self.model,
-                "messages": messages,
-                "n": 1,
-                **kwargs,
-            }
-
-            # Add response format if JSON schema is enabled
-            if self.json_schema_enabled:
-                response_format_mapping = {
-                    AgentType.HOST: HostAgentResponse,
-                    AgentType.APP: AppAgentResponse,
-                    AgentType.EVALUATION: EvaluationResponse,
-                }
-                response_format = response_format_mapping.get(
-                    AgentType(self.agent_type)
-                )
-                if response_format:
-                    base_params["response_format"] = type_to_response_format_param(
-                        response_format
-                    )
-
-            # Add generation parameters for non-reasoning models
-            if not self.config_llm.get("REASONING_MODEL", False):
-                base_params.update(
-                    {
-                        "temperature": temperature,
-                        # "max_tokens": max_tokens,
-                        "top_p": top_p,
-                    }
-                )
-
-            # Add streaming parameters if needed
-            if stream:
-                base_params.update(
-                    {
-                        "stream": True,
-                        "stream_options": {"include_usage": True},
-                    }
-                )
+            base_params = self._build_chat_params(
+                messages, stream, temperature, top_p, **kwargs
+            )
 
             response = self.client.chat.completions.create(**base_params)
 
@@ -180,53 +161,177 @@ class BaseOpenAIService(BaseService):
                     else:
                         usage = chunk.usage
 
-                prompt_tokens = usage.prompt_tokens
-                completion_tokens = usage.completion_tokens
+                return collected_content, self._usage_cost(usage)
+            else:
+                return [response.choices[0].message.content], self._usage_cost(
+                    response.usage
+                )
+
+        except openai.APIError as e:
+            raise self._wrap_api_error(e)
 
-                cost = self.get_cost_estimator(
-                    self.api_type,
-                    self.model,
-                    self.prices,
-                    prompt_tokens,
-                    completion_tokens,
+    async def _achat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        stream: bool = False,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Tuple[List[str], Optional[float]]:
+        """
+        Generates completions for a given conversation using the async OpenAI Chat API.
+        The parameters are the same as _chat_completion.
+        :return: A tuple containing a list of generated completions and the estimated cost.
+        :raises: Exception if there is an error in the OpenAI API request
+        """
+        temperature = (
+            temperature if temperature is not None else self.config["TEMPERATURE"]
+        )
+        max_tokens = max_tokens if max_tokens is not None else self.config["MAX_TOKENS"]
+        top_p = top_p if top_p is not None else self.config["TOP_P"]
+
+        try:
+            if self.use_responses:
+                return await self._aresponses_completion(
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    top_p=top_p,
                 )
-                return collected_content, cost
+            base_params = self._build_chat_params(
+                messages, stream, temperature, top_p, **kwargs
+            )
+
+            response = await self.async_client.chat.completions.create(**base_params)
+
+            if stream:
+                collected_content = [""]
+
+                async for chunk in response:
+                    if chunk.choices:
+                        delta = chunk.choices[0].delta
+                        if delta and delta.content:
+                            collected_content[0] += delta.content
+                    else:
+                        usage = chunk.usage
+
+                return collected_content, self._usage_cost(usage)
             else:
-                usage = response.usage
-                prompt_tokens = usage.prompt_tokens
-                completion_tokens = usage.completion_tokens
-
-                cost = self.get_cost_estimator(
-                    self.api_type,
-                    self.model,
-                    self.prices,
-                    prompt_tokens,
-                    completion_tokens,
+                return [response.choices[0].message.content], self._usage_cost(
+                    response.usage
+                )
+
+        except openai.APIError as e:
+            raise self._wrap_api_error(e)
+
+    def _build_chat_params(
+        self,
+        messages: List[Dict[str, str]],
+        stream: bool,
+        temperature: float,
+        top_p: float,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """
+        Build the parameters of a Chat API request.
+        :param messages: The list of messages in the conversation.
+        :param stream: Whether to stream the API response.
+        :param temperature: The temperature parameter for randomness in the output.
+        :param top_p: The top-p parameter for nucleus sampling.
+        :param kwargs: Additional keyword arguments to pass to the OpenAI API.
+        :return: The request parameters.
+        """
+        # Build base parameters
+        base_params = {
+            "model": self.model,
+            "messages": messages,
+            "n": 1,
+            **kwargs,
+        }
+
+        # Add response format if JSON schema is enabled
+        if self.json_schema_enabled:
+            response_format = self._get_response_format()
+            if response_format:
+                base_params["response_format"] = type_to_response_format_param(
+                    response_format
                 )
 
-                return [response.choices[0].message.content], cost
+        # Add generation parameters for non-reasoning models
+        if not self.config_llm.get("REASONING_MODEL", False):
+            base_params.update(
+                {
+                    "temperature": temperature,
+                    # "max_tokens": max_tokens,
+                    "top_p": top_p,
+                }
+            )
+
+        # Add streaming parameters if needed
+        if stream:
+            base_params.update(
+                {
+                    "stream": True,
+                    "stream_options": {"include_usage": True},
+                }
+            )
+
+        return base_params
+
+    def _get_response_format(self) -> Optional[type]:
+        """
+        Get the structured output schema of the agent type.
+        :return: The response schema, or None if the agent type has none.
+        """
+        response_format_mapping = {
+            AgentType.HOST: HostAgentResponse,
+            AgentType.APP: AppAgentResponse,
+            AgentType.EVALUATION: EvaluationResponse,
+        }
+        return response_format_mapping.get(AgentType(self.agent_type))
+
+    def _usage_cost(self, usage: Any) -> float:
+        """
+        Estimate the cost of a Chat API request from its token usage.
+        :param usage: The usage of the response.
+        :return: The estimated cost.
+        """
+        return self.get_cost_estimator(
+            self.api_type,
+            self.model,
+            self.prices,
+            usage.prompt_tokens,
+            usage.completion_tokens,
+        )
 
-        except openai.APITimeoutError as e:
+    @staticmethod
+    def _wrap_api_error(e: openai.APIError) -> Exception:
+        """
+        Convert an OpenAI API error into the exception raised to the caller.
+        :param e: The OpenAI API error.
+        :return: The exception to raise.
+        """
+        if isinstance(e, openai.APITimeoutError):
             # Handle timeout error, e.g. retry or log
-            raise Exception(f"OpenAI API request timed out: {e}")
-        except openai.APIConnectionError as e:
+            return Exception(f"OpenAI API request timed out: {e}")
+        if isinstance(e, openai.APIConnectionError):
             # Handle connection error, e.g. check network or log
-            raise Exception(f"OpenAI API request failed to connect: {e}")
-        except openai.BadRequestError as e:
+            return Exception(f"OpenAI API request failed to connect: {e}")
+        if isinstance(e, openai.BadRequestError):
             # Handle invalid request error, e.g. validate parameters or log
-            raise Exception(f"OpenAI API request was invalid: {e}")
-        except openai.AuthenticationError as e:
+            return Exception(f"OpenAI API request was invalid: {e}")
+        if isinstance(e, openai.AuthenticationError):
             # Handle authentication error, e.g. check credentials or log
-            raise Exception(f"OpenAI API request was not authorized: {e}")
-        except openai.PermissionDeniedError as e:
+            return Exception(f"OpenAI API request was not authorized: {e}")
+        if isinstance(e, openai.PermissionDeniedError):
             # Handle permission error, e.g. check scope or log
-            raise Exception(f"OpenAI API request was not permitted: {e}")
-        except openai.RateLimitError as e:
+            return Exception(f"OpenAI API request was not permitted: {e}")
+        if isinstance(e, openai.RateLimitError):
             # Handle rate limit error, e.g. wait or log
-            raise Exception(f"OpenAI API request exceeded rate limit: {e}")
-        except openai.APIError as e:
-            # Handle API error, e.g. retry or log
-            raise Exception(f"OpenAI API returned an API Error: {e}")
+            return Exception(f"OpenAI API request exceeded rate limit: {e}")
+        # Handle API error, e.g. retry or log
+        return Exception(f"OpenAI API returned an API Error: {e}")
 
     def _responses_completion(
         self,
@@ -238,6 +343,58 @@ class BaseOpenAIService(BaseService):
         """
         Generate a completion using the Responses API.
         """
+        base_params = self._build_responses_params(
+            messages, temperature, max_tokens, top_p
+        )
+
+        try:
+            response = self.client.responses.create(**base_params)
+        except openai.BadRequestError as e:
+            # Fallback if response_format isn't supported on Responses API
+            if "response_format" in str(e).lower():
+                base_params.pop("response_format", None)
+                response = self.client.responses.create(**base_params)
+            else:
+                raise
+
+        return self._parse_responses_response(response)
+
+    async def _aresponses_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None,
+    ) -> Tuple[List[str], Optional[float]]:
+        """
+        Generate a completion using the async Responses API.
+        """
+        base_params = self._build_responses_params(
+            messages, temperature, max_tokens, top_p
+        )
+
+        try:
+            response = await self.async_client.responses.create(**base_params)
+        except openai.BadRequestError as e:
+            # Fallback if response_format isn't supported on Responses API
+            if "response_format" in str(e).lower():
+                base_params.pop("response_format", None)
+                response = await self.async_client.responses.create(**base_params)
+            else:
+                raise
+
+        return self._parse_responses_response(response)
+
+    def _build_responses_params(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        top_p: Optional[float],
+    ) -> Dict[str, Any]:
+        """
+        Build the parameters of a Responses API request.
+        """
         inputs = self._messages_to_responses_input(messages)
 
         base_params: Dict[str, Any] = {
@@ -259,27 +416,20 @@ class BaseOpenAIService(BaseService):
 
         # Add response format if JSON schema is enabled
         if self.json_schema_enabled:
-            response_format_mapping = {
-                AgentType.HOST: HostAgentResponse,
-                AgentType.APP: AppAgentResponse,
-                AgentType.EVALUATION: EvaluationResponse,
-            }
-            response_format = response_format_mapping.get(AgentType(self.agent_type))
+            response_format = self._get_response_format()
             if response_format:
                 base_params["response_format"] = type_to_response_format_param(
                     response_format
                 )
 
-        try:
-            response = self.client.responses.create(**base_params)
-        except openai.BadRequestError as e:
-            # Fallback if response_format isn't supported on Responses API
-            if "response_format" in str(e).lower():
-                base_params.pop("response_format", None)
-                response = self.client.responses.create(**base_params)
-            else:
-                raise
+        return base_params
 
+    def _parse_responses_response(
+        self, response: Any
+    ) -> Tuple[List[str], Optional[float]]:
+        """
+        Extract the completion and its estimated cost from a Responses API response.
+        """
         response_dict = response.model_dump() if hasattr(response, "model_dump") else response
         content_text = self._extract_responses_text(response_dict)
 
@@ -471,6 +621,69 @@ class BaseOpenAIService(BaseService):
                 )
         return client
 
+    @staticmethod
+    def get_async_openai_client(
+        api_type: str,
+        api_base: str,
+        max_retry: int,
+        timeout: int,
+        api_key: Optional[str] = None,
+        api_version: Optional[str] = None,
+        aad_api_scope_base: Optional[str] = None,
+        aad_tenant_id: Optional[str] = None,
+        use_responses: bool = False,
+    ) -> AsyncOpenAI:
+        """
+        Get the async OpenAI client of the running event loop, using the pooled HTTP client.
+        The parameters are the same as get_openai_client.
+        :return: The async OpenAI client.
+        """
+
+        def create_client() -> AsyncOpenAI:
+            common_params = dict(
+                max_retries=max_retry,
+                timeout=timeout,
+                http_client=get_async_http_client(),
+            )
+            if api_type == "openai":
+                return AsyncOpenAI(base_url=api_base, api_key=api_key, **common_params)
+
+            headers = {"x-ms-enable-preview": "true"} if use_responses else {}
+            if api_type == "aoai":
+                return AsyncAzureOpenAI(
+                    api_version=api_version,
+                    azure_endpoint=api_base,
+                    api_key=api_key,
+                    default_headers=headers,
+                    **common_params,
+                )
+            return AsyncAzureOpenAI(
+                api_version=api_version,
+                azure_endpoint=api_base,
+                azure_ad_token_provider=OpenAIService.get_aad_token_provider(
+                    aad_api_scope_base=aad_api_scope_base,
+                    aad_tenant_id=aad_tenant_id,
+                ),
+                default_headers=headers,
+                **common_params,
+            )
+
+        return get_loop_resource(
+            (
+                "openai",
+                api_type,
+                api_base,
+                max_retry,
+                timeout,
+                api_key,
+                api_version,
+                aad_api_scope_base,
+                aad_tenant_id,
+                use_responses,
+            ),
+            create_client,
+        )
+
     @functools.lru_cache()
     @staticmethod
     def get_aad_token_provider(
@@ -688,6 +901,35 @@ class OpenAIService(BaseOpenAIService):
                 messages,
             )
 
+    async def achat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        n: int = 1,
+        stream: bool = False,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Tuple[List[str] | Dict[str, Any], Optional[float]]:
+        """
+        Generates completions for a given conversation using the async OpenAI Chat API.
+        The parameters are the same as chat_completion.
+        :return: A tuple containing a list of generated completions and the estimated cost.
+        :raises: Exception if there is an error in the OpenAI API request
+        """
+        if self.agent_type.lower() == "operator":
+            return await super().achat_completion(messages, n)
+
+        async with self.concurrency_limit():
+            return await self._achat_completion(
+                messages,
+                False,
+                temperature,
+                max_tokens,
+                top_p,
+                **kwargs,
+            )
+
 
 class OpenAIBetaClient:
 
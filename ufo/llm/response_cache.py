@@ -0,0 +1,306 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Content-addressed cache of LLM responses, stored in an on-disk sqlite database.
+
+Entries are keyed on a stable hash of the messages, the model and the sampling
+parameters. Inline images (data URLs) are reduced to the hash of their content, so
+the same screenshot yields the same key regardless of where it came from.
+
+Cache modes:
+
+- off: the cache is disabled (default).
+- read_write: serve hits from the cache, call the model and store the response on a miss.
+- record: always call the model and store (or refresh) the response.
+- replay: serve from the cache only; a miss raises LLMCacheMissError instead of
+  calling the model, so recorded flows can run without a network.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+CACHE_MODES = ("off", "read_write", "record", "replay")
+
+DEFAULT_CACHE_PATH = "cache/llm_responses.db"
+DEFAULT_CACHE_MAX_ENTRIES = 10000
+
+# Environment variables overriding the configured mode and path, e.g. to replay
+# recorded sessions in CI.
+CACHE_MODE_ENV = "UFO_LLM_CACHE_MODE"
+CACHE_PATH_ENV = "UFO_LLM_CACHE_PATH"
+
+
+class LLMCacheMissError(Exception):
+    """
+    Raised in replay mode when a request has no recorded response.
+    """
+
+    pass
+
+
+def _canonicalize(value: Any) -> Any:
+    """
+    Reduce inline images to the hash of their content, so keys stay small and stable.
+    :param value: A message or part of a message.
+    :return: The canonical value.
+    """
+    if isinstance(value, dict):
+        return {key: _canonicalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonicalize(item) for item in value]
+    if isinstance(value, str) and value.startswith("data:"):
+        return "sha256:" + hashlib.sha256(value.encode("utf-8")).hexdigest()
+    return value
+
+
+def make_cache_key(
+    messages: List[Dict[str, Any]],
+    api_type: str,
+    model: str,
+    n: int = 1,
+    params: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Compute the cache key of a completion request.
+    :param messages: The prompt messages.
+    :param api_type: The API type.
+    :param model: The model name.
+    :param n: The number of completions.
+    :param params: The sampling parameters, e.g. temperature, top_p and max_tokens.
+    :return: The hex digest of the request.
+    """
+    request = {
+        "api_type": api_type.lower(),
+        "model": model,
+        "n": n,
+        "params": params or {},
+        "messages": _canonicalize(messages),
+    }
+    data = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    sqlite-backed LLM response cache with TTL expiry and LRU eviction.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        mode: str = "read_write",
+        ttl: float = 0,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+    ):
+        """
+        Initialize the cache.
+        :param path: The sqlite database file, or ":memory:".
+        :param mode: The cache mode, one of CACHE_MODES.
+        :param ttl: The time (seconds) an entry stays valid, 0 to never expire.
+        :param max_entries: The maximum number of entries, the least recently used are evicted.
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(
+                f"Unknown LLM cache mode {mode}, expected one of {', '.join(CACHE_MODES)}"
+            )
+
+        self.path = path
+        self.mode = mode
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+        self.metrics = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "expired": 0,
+            "evictions": 0,
+            "saved_cost": 0.0,
+        }
+
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)"
+        )
+        self._conn.commit()
+
+    @property
+    def readable(self) -> bool:
+        """
+        Whether responses are served from the cache.
+        """
+        return self.mode in ("read_write", "replay")
+
+    @property
+    def writable(self) -> bool:
+        """
+        Whether model responses are stored in the cache.
+        """
+        return self.mode in ("read_write", "record")
+
+    def get(self, key: str) -> Optional[Tuple[List[str], float]]:
+        """
+        Look up a response.
+        :param key: The cache key.
+        :return: The cached responses and their original cost, or None on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is not None and self.ttl and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.metrics["expired"] += 1
+                row = None
+
+            if row is None:
+                self.metrics["misses"] += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+
+        value = json.loads(row[0])
+        self.metrics["hits"] += 1
+        self.metrics["saved_cost"] += value["cost"] or 0.0
+        return value["responses"], value["cost"]
+
+    def put(self, key: str, responses: List[str], cost: float) -> None:
+        """
+        Store a response, evicting the least recently used entries over the limit.
+        :param key: The cache key.
+        :param responses: The completion responses.
+        :param cost: The cost of the request.
+        """
+        now = time.time()
+        value = json.dumps({"responses": responses, "cost": cost}, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self.metrics["stores"] += 1
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """
+        Drop the expired entries and the least recently used entries over the limit.
+        Must be called with the lock held.
+        :param now: The current time.
+        """
+        if self.ttl:
+            cursor = self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (now - self.ttl,)
+            )
+            self.metrics["expired"] += cursor.rowcount
+
+        if self.max_entries:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            if count > self.max_entries:
+                cursor = self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+                self.metrics["evictions"] += cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self) -> None:
+        """
+        Remove all entries.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """
+        Close the database.
+        """
+        with self._lock:
+            self._conn.close()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get the cache metrics.
+        :return: The metrics, including the hit rate.
+        """
+        lookups = self.metrics["hits"] + self.metrics["misses"]
+        return {
+            **self.metrics,
+            "hit_rate": self.metrics["hits"] / lookups if lookups else 0.0,
+        }
+
+
+_response_cache: Optional[LLMResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the process-wide response cache configured by LLM_CACHE_MODE, LLM_CACHE_PATH,
+    LLM_CACHE_TTL and LLM_CACHE_MAX_ENTRIES in the system configuration. The mode
+    and path can be overridden with the UFO_LLM_CACHE_MODE and UFO_LLM_CACHE_PATH
+    environment variables.
+    :return: The cache, or None if caching is off.
+    """
+    global _response_cache
+
+    mode = os.environ.get(CACHE_MODE_ENV)
+    path = os.environ.get(CACHE_PATH_ENV)
+    ttl, max_entries = 0, DEFAULT_CACHE_MAX_ENTRIES
+
+    try:
+        from config.config_loader import get_ufo_config
+
+        system_config = get_ufo_config().system
+        mode = mode or system_config.llm_cache_mode
+        path = path or system_config.llm_cache_path
+        ttl = system_config.llm_cache_ttl
+        max_entries = system_config.llm_cache_max_entries
+    except Exception:
+        # Without a UFO configuration, only the environment variables apply
+        pass
+
+    mode = (mode or "off").lower()
+    if mode == "off":
+        return None
+    path = path or DEFAULT_CACHE_PATH
+
+    with _response_cache_lock:
+        cache = _response_cache
+        if cache is None or cache.path != path or cache.mode != mode:
+            if cache is not None:
+                cache.close()
+            cache = LLMResponseCache(path, mode, ttl=ttl, max_entries=max_entries)
+            cache.logger.info(f"LLM response cache enabled in {mode} mode at {path}")
+            _response_cache = cache
+        return cache
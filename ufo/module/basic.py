@@ -14,6 +14,7 @@ The session is the core class of UFO. It manages the state transition and handle
 For more details definition of the state pattern, please refer to the state.py module.
 """
 
+import asyncio
 import json
 import logging
 import os
@@ -35,10 +36,14 @@ from ufo.agents.agent.basic import BasicAgent
 from ufo.agents.agent.evaluation_agent import EvaluationAgent
 from ufo.agents.agent.host_agent import HostAgent
 from ufo.agents.states.basic import AgentState, AgentStatus
+from ufo.automator.ui_control.screenshot_store import get_screenshot_store
 from config.config_loader import get_ufo_config
 from aip.messages import Command
 from ufo.experience.summarizer import ExperienceSummarizer
+from ufo.llm.response_cache import get_response_cache
 from ufo.module.context import Context, ContextNames
+from ufo.module.log_writer import FileWriter
+from ufo.trajectory.image_blobs import ImageBlobStore
 from ufo.trajectory.parser import Trajectory
 
 ufo_config = get_ufo_config()
@@ -55,44 +60,22 @@ def _safe_console_text(text: str) -> str:
     return text.encode("ascii", "ignore").decode("ascii")
 
 
-class FileWriter:
+def _flush_session_logs(context: Context, log_path: str) -> None:
     """
-    Simple file writer that bypasses global logging settings.
-    Provides a unified write interface for logging to files.
+    Wait until the screenshots and the log files of a session are written. The writes
+    of other sessions are not waited for.
+    :param context: The context of the session, holding its log writers.
+    :param log_path: The log directory of the session.
     """
-
-    def __init__(self, file_path: str, mode: str = "a"):
-        """
-        Initialize file writer.
-        :param file_path: Path to the log file
-        :param mode: File open mode (default: 'a' for append)
-        """
-        self.file_path = file_path
-        self.mode = mode
-
-        # Ensure directory exists (only if there's a directory part)
-        dir_path = os.path.dirname(file_path)
-        if dir_path:  # Only create directory if there's a directory part
-            os.makedirs(dir_path, exist_ok=True)
-
-        # Create or open the file to ensure it exists
-        with open(file_path, mode, encoding="utf-8") as f:
-            pass
-
-    def write(self, message: str) -> None:
-        """
-        Write message to file.
-        :param message: Message to write
-        """
-        try:
-            with open(self.file_path, self.mode, encoding="utf-8") as f:
-                f.write(message)
-                if not message.endswith("\n"):
-                    f.write("\n")
-                f.flush()  # Ensure immediate write
-        except Exception as e:
-            # Fallback: at least try to print the error
-            print(f"Failed to write to file {self.file_path}: {e}")
+    get_screenshot_store().flush(directory=log_path)
+    for name in (
+        ContextNames.LOGGER,
+        ContextNames.REQUEST_LOGGER,
+        ContextNames.EVALUATION_LOGGER,
+    ):
+        writer = context.get(name)
+        if writer is not None:
+            writer.flush()
 
 
 class BaseRound(ABC):
@@ -185,6 +168,9 @@ class BaseRound(ABC):
 
         await self.capture_last_snapshot()
 
+        # The evaluation reads the screenshots and the logs of the round from disk
+        await asyncio.to_thread(_flush_session_logs, self.context, self.log_path)
+
         if self._should_evaluate:
             self.evaluation()
 
@@ -512,28 +498,38 @@ class BaseSession(ABC):
         :return: The result per session
         """
 
-        while not self.is_finished():
+        try:
+            while not self.is_finished():
 
-            round = self.create_new_round()
-            if round is None:
-                break
+                round = self.create_new_round()
+                if round is None:
+                    break
 
-            round_result = await round.run()
+                round_result = await round.run()
 
-            self.results.append({"request": round.request, "result": round_result})
+                self.results.append(
+                    {"request": round.request, "result": round_result}
+                )
 
-        await self.capture_last_snapshot()
+            await self.capture_last_snapshot()
 
-        if self._should_evaluate and not self.is_error():
-            self.evaluation()
+            # The evaluation and the markdown log read the screenshots and the logs from disk
+            await asyncio.to_thread(_flush_session_logs, self.context, self.log_path)
 
-        if ufo_config.system.log_to_markdown:
+            if self._should_evaluate and not self.is_error():
+                self.evaluation()
 
-            self.save_log_to_markdown()
+            if ufo_config.system.log_to_markdown:
 
-        self.print_cost()
+                self.save_log_to_markdown()
 
-        return self.results
+            self.print_cost()
+
+            return self.results
+
+        finally:
+            # The logs of the session are complete when it ends, even on failure
+            await asyncio.to_thread(_flush_session_logs, self.context, self.log_path)
 
     @abstractmethod
     def _init_agents(self) -> None:
@@ -600,8 +596,17 @@ class BaseSession(ABC):
         response_writer = FileWriter(
             os.path.join(self.log_path, "response.log"), mode="a"
         )
+        # The request log holds the screenshots of every step, they are stored once
+        # under request_images/ and the log can be compressed
         request_writer = FileWriter(
-            os.path.join(self.log_path, "request.log"), mode="a"
+            os.path.join(self.log_path, "request.log"),
+            mode="a",
+            compression=ufo_config.system.log_compression,
+            image_store=(
+                ImageBlobStore(self.log_path)
+                if ufo_config.system.deduplicate_log_images
+                else None
+            ),
         )
         eval_writer = FileWriter(
             os.path.join(self.log_path, "evaluation.log"), mode="a"
@@ -801,6 +806,17 @@ class BaseSession(ABC):
             )
             self.logger.warning("Cost information is not available.")
 
+        cache = get_response_cache()
+        if cache is not None:
+            metrics = cache.get_metrics()
+            console.print(
+                _safe_console_text(
+                    f"🗄️  LLM response cache: {metrics['hits']} hits, {metrics['misses']} misses "
+                    f"({metrics['hit_rate']:.0%} hit rate), ${metrics['saved_cost']:.2f} saved"
+                ),
+                style="yellow",
+            )
+
     def is_error(self):
         """
         Check if the session is in error state.
@@ -5,10 +5,12 @@ import uuid
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Callable, Coroutine, Any, Dict, List, Optional
 
+from aip.protocol.attachments import has_attachment_references
 from aip.protocol.task_execution import TaskExecutionProtocol
 from ufo.client.mcp.mcp_server_manager import MCPServerManager
 from ufo.config import get_config
 from aip.messages import (
+    ClientCapability,
     ClientMessage,
     Command,
     Result,
@@ -28,6 +30,8 @@ class BasicCommandDispatcher(ABC):
     Provides methods to send commands and receive results.
     """
 
+    _observe_tool_name = ClientCapability.OBSERVE.value
+
     @abstractmethod
     async def execute_commands(
         self, commands: List[Command], timeout: float = 6000
@@ -63,6 +67,67 @@ class BasicCommandDispatcher(ABC):
 
         return result_list
 
+    def supports_observe(self) -> bool:
+        """
+        Whether the client supports the composite observe command.
+        :return: True if the client supports the observe command.
+        """
+        return False
+
+    async def execute_observation(
+        self, commands: List[Command], timeout: float = 6000
+    ) -> List[Result]:
+        """
+        Execute a batch of data collection commands in a single round trip using the
+        composite observe command, falling back to one round trip per command for
+        clients without observe support.
+        :param commands: The data collection commands to execute.
+        :param timeout: The timeout for waiting for the results.
+        :return: The results of the commands, in the same order.
+        """
+        for command in commands:
+            command.call_id = command.call_id or str(uuid.uuid4())
+
+        if self.supports_observe():
+            results = await self.execute_commands(
+                [
+                    Command(
+                        tool_name=self._observe_tool_name,
+                        parameters={
+                            "commands": [command.model_dump() for command in commands]
+                        },
+                        tool_type="data_collection",
+                    )
+                ],
+                timeout=timeout,
+            )
+
+            if (
+                results
+                and results[0].status == ResultStatus.SUCCESS
+                and isinstance(results[0].result, list)
+                and len(results[0].result) == len(commands)
+            ):
+                return [Result(**result) for result in results[0].result]
+
+            logging.getLogger(__name__).warning(
+                f"Observe command failed, falling back to individual commands: {results}"
+            )
+
+        observation = []
+        for command in commands:
+            results = await self.execute_commands([command], timeout=timeout)
+            if results:
+                observation.append(results[0])
+            else:
+                observation.extend(
+                    self.generate_error_results(
+                        [command], RuntimeError("No result returned")
+                    )
+                )
+
+        return observation
+
 
 class LocalCommandDispatcher(BasicCommandDispatcher):
     """
@@ -90,6 +155,13 @@ class LocalCommandDispatcher(BasicCommandDispatcher):
         self.computer_manager = ComputerManager(configs, mcp_server_manager)
         self.command_router = CommandRouter(self.computer_manager)
 
+    def supports_observe(self) -> bool:
+        """
+        The local command router always provides the composite observe command.
+        :return: True.
+        """
+        return True
+
     async def execute_commands(
         self, commands: List[Command], timeout=6000
     ) -> Optional[List[Result]]:
@@ -161,6 +233,13 @@ class WebSocketCommandDispatcher(BasicCommandDispatcher):
 
         # Note: No longer need _send_loop observer - AIP transport handles sending
 
+    def supports_observe(self) -> bool:
+        """
+        Whether the connected client advertised the observe capability on registration.
+        :return: True if the client supports the observe command.
+        """
+        return self.protocol.supports_capability(ClientCapability.OBSERVE)
+
     def register_observer(
         self, observer: Callable[[], Coroutine[Any, Any, None]]
     ) -> None:
@@ -249,4 +328,15 @@ class WebSocketCommandDispatcher(BasicCommandDispatcher):
         """
         fut = self.pending.get(response_id)
         if fut and not fut.done():
+            action_results = result.action_results or []
+            # Reassemble results whose data was sent as binary attachments
+            for index, action_result in enumerate(action_results):
+                if has_attachment_references(action_result.result):
+                    action_results[index] = action_result.model_copy(
+                        update={
+                            "result": self.protocol.resolve_attachments(
+                                action_result.result
+                            )
+                        }
+                    )
             fut.set_result(result.action_results)
@@ -0,0 +1,434 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Log files of the sessions, written by a background writer.
+
+FileWriter.write used to open, write, flush and close its file on every call, on the event
+loop, for request logs holding whole base64 screenshots. The writes are now handed off to
+a LogWriterService:
+
+- write and write_record queue the message and return. Records are serialized to JSON
+  in the writer thread.
+- The writer drains the queue in batches, and appends each batch to its file with a
+  single open and write.
+- The queue is bounded (LOG_QUEUE_SIZE): when the writer falls behind, write waits until
+  there is room again. Coroutines use awrite and awrite_record instead, which wait in a
+  worker thread, so a full queue slows the writing session down without stalling the
+  event loop. No write is ever dropped.
+- flush waits for everything a writer queued so far, so a session only waits for its own
+  logs. The service flushes everything on exit.
+
+A writer created with compression="zstd" writes a .zst file, one zstd frame per batch.
+read_log_lines reads plain and compressed logs alike.
+"""
+
+import asyncio
+import atexit
+import io
+import json
+import logging
+import os
+import queue
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+if TYPE_CHECKING:
+    from ufo.trajectory.image_blobs import ImageBlobStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 256
+
+# The max number of queued writes appended in one batch
+DEFAULT_BATCH_SIZE = 64
+
+ZSTD_SUFFIX = ".zst"
+
+
+class FileWriter:
+    """
+    Simple file writer that bypasses global logging settings.
+    Provides a unified write interface for logging to files.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        mode: str = "a",
+        compression: Optional[str] = None,
+        async_write: Optional[bool] = None,
+        image_store: Optional["ImageBlobStore"] = None,
+    ):
+        """
+        Initialize file writer.
+        :param file_path: Path to the log file
+        :param mode: File open mode when the file is created (default: 'a' for append), messages are appended
+        :param compression: None, or "zstd" to write a zstd-compressed file with a .zst suffix
+        :param async_write: Whether to write in the background, by default ASYNC_LOG_WRITE
+        :param image_store: If set, the images of the records are stored once in it and referenced
+        """
+        if compression not in (None, "none", "zstd"):
+            raise ValueError(f"Unsupported log compression {compression}.")
+
+        if compression == "zstd" and zstandard is None:
+            logger.warning(
+                "zstandard is not installed, writing %s uncompressed.", file_path
+            )
+            compression = None
+
+        if compression == "zstd" and not file_path.endswith(ZSTD_SUFFIX):
+            file_path += ZSTD_SUFFIX
+
+        self.file_path = file_path
+        self.mode = mode
+        self.image_store = image_store
+        self.compression = compression if compression == "zstd" else None
+        self._compressor = (
+            zstandard.ZstdCompressor() if self.compression == "zstd" else None
+        )
+
+        self._service = get_log_writer()
+        self.async_write = (
+            self._service.enabled if async_write is None else async_write
+        )
+        # Writes queued and written, guarded by the condition of the service
+        self._submitted = 0
+        self._written = 0
+
+        # Ensure directory exists (only if there's a directory part)
+        dir_path = os.path.dirname(file_path)
+        if dir_path:  # Only create directory if there's a directory part
+            os.makedirs(dir_path, exist_ok=True)
+
+        # Create or open the file to ensure it exists
+        with open(file_path, mode + "b" if "b" not in mode else mode) as f:
+            pass
+
+    def write(self, message: str) -> None:
+        """
+        Write message to file.
+        :param message: Message to write
+        """
+        self._submit(message)
+
+    def write_record(self, record: Any) -> None:
+        """
+        Write a record to file as a JSON line, serialized in the background.
+        :param record: The JSON-serializable record. It must not be modified afterwards.
+        """
+        self._submit(record)
+
+    async def awrite(self, message: str) -> None:
+        """
+        Write message to file from a coroutine, waiting for room off the event loop.
+        :param message: Message to write
+        """
+        await self._asubmit(message)
+
+    async def awrite_record(self, record: Any) -> None:
+        """
+        Write a record to file as a JSON line from a coroutine, waiting for room off the
+        event loop.
+        :param record: The JSON-serializable record. It must not be modified afterwards.
+        """
+        await self._asubmit(record)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the messages written so far by this writer are in the file.
+        :param timeout: The max time (seconds) to wait.
+        :return: Whether the messages were written before the timeout.
+        """
+        if not self.async_write:
+            return True
+        return self._service.flush(timeout, writer=self)
+
+    def _submit(self, item: Any) -> None:
+        """
+        Queue a message or record, or write it directly if the writes are synchronous.
+        :param item: The message or record.
+        """
+        if self.async_write:
+            self._service.submit(self, item)
+            return
+
+        self._append_item(item)
+
+    async def _asubmit(self, item: Any) -> None:
+        """
+        Queue a message or record from a coroutine, or write it directly if the writes are
+        synchronous.
+        :param item: The message or record.
+        """
+        if self.async_write:
+            await self._service.asubmit(self, item)
+            return
+
+        self._append_item(item)
+
+    def _append_item(self, item: Any) -> None:
+        """
+        Write a message or record directly.
+        :param item: The message or record.
+        """
+        try:
+            self.append([self.format(item)])
+        except Exception as e:
+            # Fallback: at least try to print the error
+            print(f"Failed to write to file {self.file_path}: {e}")
+
+    def format(self, item: Any) -> str:
+        """
+        Format a message or record as a line.
+        :param item: The message, or a record to serialize as JSON.
+        :return: The line, ending with a newline.
+        """
+        if not isinstance(item, str):
+            if self.image_store is not None:
+                item = self.image_store.externalize(item)
+            item = json.dumps(item, ensure_ascii=False, default=str)
+        return item if item.endswith("\n") else item + "\n"
+
+    def append(self, lines: List[str]) -> None:
+        """
+        Append lines to the file with a single write.
+        :param lines: The lines.
+        """
+        data = "".join(lines).encode("utf-8")
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+
+        with open(self.file_path, "ab") as f:
+            f.write(data)
+            f.flush()  # Ensure immediate write
+
+
+class LogWriterService:
+    """
+    Background writer of the log files, with a bounded queue and batched appends.
+
+    Writes are queued in order as soon as they are submitted; a submitter then waits
+    while more than max_queue_size writes are queued ahead of its own, which bounds the
+    queue without reordering the writes of waiting submitters.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_queue_size: int = DEFAULT_QUEUE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        """
+        Create a log writer service.
+        :param enabled: Whether file writers write in the background by default.
+        :param max_queue_size: The max number of queued writes, before write waits.
+        :param batch_size: The max number of queued writes appended in one batch.
+        """
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.max_queue_size = max(1, max_queue_size)
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._condition = threading.Condition()
+        self._submitted = 0
+        self._taken = 0
+        self._done = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, writer: FileWriter, item: Any) -> None:
+        """
+        Queue a message or record for a writer. Blocks while the queue is full.
+        :param writer: The file writer.
+        :param item: The message or record.
+        """
+        ticket = self._enqueue(writer, item)
+        self._wait_for_room(ticket)
+
+    async def asubmit(self, writer: FileWriter, item: Any) -> None:
+        """
+        Queue a message or record for a writer from a coroutine. While the queue is full,
+        waits in a worker thread, so that the event loop keeps running.
+        :param writer: The file writer.
+        :param item: The message or record.
+        """
+        ticket = self._enqueue(writer, item)
+        if not self._has_room(ticket):
+            await asyncio.to_thread(self._wait_for_room, ticket)
+
+    def _enqueue(self, writer: FileWriter, item: Any) -> int:
+        """
+        Queue a message or record for a writer.
+        :param writer: The file writer.
+        :param item: The message or record.
+        :return: The position of the write, to wait for room with.
+        """
+        with self._condition:
+            self._ensure_thread()
+            self._submitted += 1
+            writer._submitted += 1
+            self._queue.put_nowait((writer, item))
+            return self._submitted
+
+    def _has_room(self, ticket: int) -> bool:
+        """
+        Whether a write is within the queue size. Without the condition held, the answer
+        may be stale, which only costs a needless wait in a thread.
+        :param ticket: The position of the write.
+        :return: True if at most max_queue_size writes are queued up to this one.
+        """
+        return ticket - self._taken <= self.max_queue_size
+
+    def _wait_for_room(self, ticket: int) -> None:
+        """
+        Wait until a write is within the queue size.
+        :param ticket: The position of the write.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._has_room(ticket))
+
+    def flush(
+        self, timeout: Optional[float] = None, writer: Optional[FileWriter] = None
+    ) -> bool:
+        """
+        Wait until everything queued so far is written.
+        :param timeout: The max time (seconds) to wait.
+        :param writer: Only wait for the writes of this writer, by default for all writes.
+        :return: Whether everything was written before the timeout.
+        """
+        with self._condition:
+            if writer is None:
+                target = self._submitted
+                return self._condition.wait_for(lambda: self._done >= target, timeout)
+
+            target = writer._submitted
+            return self._condition.wait_for(
+                lambda: writer._written >= target, timeout
+            )
+
+    @property
+    def pending(self) -> int:
+        """
+        The number of writes not yet done.
+        """
+        with self._condition:
+            return self._submitted - self._done
+
+    def _ensure_thread(self) -> None:
+        """
+        Start the writer thread on first use. Must be called with the condition held.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        """
+        Write the queued items in batches.
+        """
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            with self._condition:
+                self._taken += len(batch)
+                self._condition.notify_all()
+
+            try:
+                self._write_batch(batch)
+            finally:
+                with self._condition:
+                    self._done += len(batch)
+                    for writer, _ in batch:
+                        writer._written += 1
+                    self._condition.notify_all()
+
+    @staticmethod
+    def _write_batch(batch: List[tuple]) -> None:
+        """
+        Append a batch of items, with one write per file.
+        :param batch: The (writer, item) pairs, in order.
+        """
+        lines: Dict[FileWriter, List[str]] = {}
+        for writer, item in batch:
+            try:
+                lines.setdefault(writer, []).append(writer.format(item))
+            except Exception as e:
+                logger.error(f"Failed to serialize a log record for {writer.file_path}: {e}")
+
+        for writer, writer_lines in lines.items():
+            try:
+                writer.append(writer_lines)
+            except Exception as e:
+                # Fallback: at least try to print the error
+                print(f"Failed to write to file {writer.file_path}: {e}")
+
+
+def read_log_lines(file_path: str) -> Iterator[str]:
+    """
+    Read the lines of a log file, plain or zstd-compressed.
+    :param file_path: The path of the log file. If it does not exist, the .zst file is read.
+    :return: The lines, without the newline.
+    """
+    if not os.path.exists(file_path) and os.path.exists(file_path + ZSTD_SUFFIX):
+        file_path += ZSTD_SUFFIX
+
+    if file_path.endswith(ZSTD_SUFFIX):
+        if zstandard is None:
+            raise ImportError(f"zstandard is required to read {file_path}.")
+        with open(file_path, "rb") as f:
+            reader = zstandard.ZstdDecompressor().stream_reader(
+                f, read_across_frames=True
+            )
+            for line in io.TextIOWrapper(reader, encoding="utf-8"):
+                yield line.rstrip("\n")
+        return
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+
+_log_writer: Optional[LogWriterService] = None
+_log_writer_lock = threading.Lock()
+
+
+def get_log_writer() -> LogWriterService:
+    """
+    Get the process-wide log writer configured by ASYNC_LOG_WRITE and LOG_QUEUE_SIZE.
+    :return: The log writer.
+    """
+    global _log_writer
+
+    with _log_writer_lock:
+        if _log_writer is None:
+            kwargs = {}
+
+            try:
+                from config.config_loader import get_ufo_config
+
+                system_config = get_ufo_config().system
+                kwargs = {
+                    "enabled": system_config.async_log_write,
+                    "max_queue_size": system_config.log_queue_size,
+                }
+            except Exception:
+                # Without a UFO configuration, the defaults apply
+                pass
+
+            _log_writer = LogWriterService(**kwargs)
+            # Do not lose the logs still queued on exit
+            atexit.register(_log_writer.flush)
+
+        return _log_writer
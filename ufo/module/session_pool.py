@@ -2,11 +2,15 @@
 # Licensed under the MIT License.
 
 
+import asyncio
 import json
 import logging
 import os
 import platform
-from typing import List, Optional, TYPE_CHECKING
+import time
+import traceback
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, List, Optional, TYPE_CHECKING
 
 from config.config_loader import get_ufo_config
 from ufo.module.basic import BaseSession
@@ -28,23 +32,204 @@ ufo_config = get_ufo_config()
 
 class SessionPool:
     """
-    The manager for the UFO clients.
+    The manager for the UFO clients. Sessions run concurrently, bounded by a maximum
+    number in flight, while sessions driving the same device run one at a time.
     """
 
-    def __init__(self, session_list: List[BaseSession]) -> None:
+    def __init__(
+        self,
+        session_list: List[BaseSession],
+        max_concurrency: Optional[int] = None,
+        session_timeout: Optional[float] = None,
+        device_key: Optional[Callable[[BaseSession], Hashable]] = None,
+    ) -> None:
         """
         Initialize a batch UFO client.
+        :param session_list: The sessions to run.
+        :param max_concurrency: The maximum number of sessions in flight, MAX_CONCURRENT_SESSIONS by default.
+        :param session_timeout: The time limit (seconds) of each session, SESSION_TIMEOUT by default. 0 for no limit.
+        :param device_key: Maps a session to the device it drives, default_device_key by default.
         """
 
         self._session_list = session_list
+        self.max_concurrency = max(
+            1, max_concurrency or ufo_config.system.max_concurrent_sessions
+        )
+        self.session_timeout = (
+            session_timeout
+            if session_timeout is not None
+            else ufo_config.system.session_timeout
+        )
+        self.device_key = device_key or self.default_device_key
+        self.logger = logging.getLogger(__name__)
+
+        self.results: List[Dict[str, Any]] = []
+        self.metrics = {
+            "total": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "cancelled": 0,
+            "in_flight": 0,
+            "max_in_flight": 0,
+            "elapsed": 0.0,
+        }
+        self._tasks: List[asyncio.Task] = []
+        self._start_time: Optional[float] = None
 
-    async def run_all(self) -> None:
+    @staticmethod
+    def default_device_key(session: BaseSession) -> Hashable:
+        """
+        Get the device a session drives: service sessions drive the device behind
+        their task protocol, mobile sessions the Android device attached to this
+        machine, and all other sessions its desktop.
+        :param session: The session.
+        :return: The device key.
+        """
+        task_protocol = getattr(session, "task_protocol", None)
+        if task_protocol is not None:
+            return ("remote", id(task_protocol))
+        if isinstance(session, MobileSession):
+            return ("local", "mobile")
+        return ("local", "desktop")
+
+    async def run_all(self) -> List[Dict[str, Any]]:
         """
-        Run the batch UFO client.
+        Run the batch UFO client. Exceptions of a session are not raised: they are
+        recorded in its outcome ("failed", with the error) and the other sessions keep
+        running.
+        :return: The outcome of each session, in the order of the session list.
         """
 
-        for session in self.session_list:
-            await session.run()
+        sessions = list(self.session_list)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        device_locks: Dict[Hashable, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+        self.results = [
+            {"id": session.id, "status": "pending", "duration": 0.0}
+            for session in sessions
+        ]
+        self.metrics["total"] = len(sessions)
+        self._start_time = time.monotonic()
+
+        self._tasks = [
+            asyncio.create_task(
+                self._run_session(
+                    session,
+                    self.results[index],
+                    semaphore,
+                    device_locks[self.device_key(session)],
+                )
+            )
+            for index, session in enumerate(sessions)
+        ]
+
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            self.cancel()
+            self.metrics["elapsed"] = time.monotonic() - self._start_time
+            self.logger.info(
+                f"Session pool finished: {self.metrics['completed']} completed, "
+                f"{self.metrics['failed']} failed, {self.metrics['timed_out']} timed out, "
+                f"{self.metrics['cancelled']} cancelled, "
+                f"{self.get_metrics()['sessions_per_hour']:.1f} sessions/hour"
+            )
+
+        return self.results
+
+    async def _run_session(
+        self,
+        session: BaseSession,
+        result: Dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        device_lock: asyncio.Lock,
+    ) -> None:
+        """
+        Run a session once its device is free and a slot is available.
+        :param session: The session to run.
+        :param result: The outcome record of the session to fill.
+        :param semaphore: Bounds the sessions in flight.
+        :param device_lock: Held while the session drives its device.
+        """
+        start = None
+        try:
+            async with device_lock, semaphore:
+                self.metrics["in_flight"] += 1
+                self.metrics["max_in_flight"] = max(
+                    self.metrics["max_in_flight"], self.metrics["in_flight"]
+                )
+                start = time.monotonic()
+                try:
+                    if self.session_timeout:
+                        await asyncio.wait_for(session.run(), self.session_timeout)
+                    else:
+                        await session.run()
+                finally:
+                    self.metrics["in_flight"] -= 1
+            result["status"] = "completed"
+        except asyncio.TimeoutError:
+            result["status"] = "timed_out"
+            self.logger.warning(
+                f"Session {session.id} timed out after {self.session_timeout} seconds"
+            )
+        except asyncio.CancelledError:
+            result["status"] = "cancelled"
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"] = str(e)
+            self.logger.error(
+                f"Session {session.id} failed: {str(e)}\n{traceback.format_exc()}"
+            )
+        finally:
+            if start is not None:
+                result["duration"] = time.monotonic() - start
+
+        self.metrics[result["status"]] += 1
+        self._report_progress(session, result)
+
+    def _report_progress(self, session: BaseSession, result: Dict[str, Any]) -> None:
+        """
+        Log the outcome of a session and the throughput so far.
+        :param session: The finished session.
+        :param result: The outcome record of the session.
+        """
+        metrics = self.get_metrics()
+        self.logger.info(
+            f"Session {session.id} {result['status']} in {result['duration']:.1f} s "
+            f"({metrics['finished']}/{metrics['total']} finished, "
+            f"{metrics['sessions_per_hour']:.1f} sessions/hour)"
+        )
+
+    def cancel(self) -> None:
+        """
+        Cancel the running and pending sessions.
+        """
+        for task in self._tasks:
+            if not task.done():
+                task.cancel()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get the progress and throughput of the pool.
+        :return: The metrics, including the sessions finished per hour.
+        """
+        metrics = dict(self.metrics)
+        metrics["finished"] = (
+            metrics["completed"]
+            + metrics["failed"]
+            + metrics["timed_out"]
+            + metrics["cancelled"]
+        )
+        elapsed = (
+            time.monotonic() - self._start_time
+            if self._start_time is not None and not metrics["elapsed"]
+            else metrics["elapsed"]
+        )
+        metrics["sessions_per_hour"] = (
+            metrics["finished"] * 3600 / elapsed if elapsed else 0.0
+        )
+        return metrics
 
     @property
     def session_list(self) -> List[BaseSession]:
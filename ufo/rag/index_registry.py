@@ -0,0 +1,337 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Process-wide registry of FAISS vector stores shared by the retrievers.
+
+Every agent used to load its own copy of the offline docs, experience and demonstration
+indexes from disk. The registry loads each index folder once and hands out shared,
+read-only handles to it:
+
+- Indexes are loaded lazily on the first acquire and keyed by path and modification time.
+- Handles are reference counted; unused indexes are evicted least recently used first
+  once more than RAG_INDEX_CACHE_SIZE are loaded.
+- The index files can be memory-mapped (RAG_INDEX_MMAP) instead of read into RAM.
+- When the files of an index change, e.g. after new experience is saved, the next search
+  through a handle reloads the index.
+"""
+
+import logging
+import os
+import pickle
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 8
+
+# The files saved by langchain's FAISS.save_local
+INDEX_FILES = ("index.faiss", "index.pkl")
+
+Signature = Tuple[Tuple[str, int, int], ...]
+
+
+def index_signature(path: str) -> Optional[Signature]:
+    """
+    Get the signature of an index folder: the modification time and size of its files.
+    :param path: The index folder.
+    :return: The signature, or None if the index does not exist.
+    """
+    signature = []
+    for name in INDEX_FILES:
+        try:
+            stat = os.stat(os.path.join(path, name))
+        except OSError:
+            return None
+        signature.append((name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def load_faiss_index(path: str, mmap: bool = False) -> Any:
+    """
+    Load a FAISS vector store saved by FAISS.save_local, as FAISS.load_local does, with
+    the option to memory-map the index file.
+    :param path: The index folder.
+    :param mmap: Whether to memory-map the index file instead of reading it into memory.
+    :return: The vector store.
+    """
+    import faiss
+    from langchain_community.vectorstores import FAISS
+
+    from ufo.utils import get_hugginface_embedding
+
+    index_file = os.path.join(path, "index.faiss")
+    index = None
+
+    if mmap:
+        try:
+            index = faiss.read_index(index_file, faiss.IO_FLAG_MMAP)
+        except Exception as e:
+            logger.warning(
+                f"Failed to memory-map the index {index_file}, reading it instead: {e}"
+            )
+
+    if index is None:
+        index = faiss.read_index(index_file)
+
+    with open(os.path.join(path, "index.pkl"), "rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)
+
+    return FAISS(get_hugginface_embedding(), index, docstore, index_to_docstore_id)
+
+
+@dataclass
+class IndexEntry:
+    """
+    A loaded index and its bookkeeping.
+    """
+
+    path: str
+    signature: Signature
+    store: Any
+    ref_count: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class SharedIndex:
+    """
+    Read-only handle to an index in the registry. The handle holds a reference to the
+    index until it is closed or garbage collected, and follows reloads of the index.
+    """
+
+    def __init__(self, registry: "IndexRegistry", entry: IndexEntry) -> None:
+        """
+        Create a handle. Use IndexRegistry.acquire instead.
+        :param registry: The registry owning the index.
+        :param entry: The index entry, with a reference already taken for this handle.
+        """
+        self.path = entry.path
+        self._registry = registry
+        self._entry = entry
+        self._closed = False
+        # Release the reference if the handle is dropped without being closed
+        self._finalizer = weakref.finalize(self, registry._release, entry)
+
+    @property
+    def store(self) -> Any:
+        """
+        The current vector store of the index, reloaded if its files have changed.
+        """
+        if self._closed:
+            raise ValueError(f"The index handle of {self.path} is closed.")
+
+        entry = self._registry._refresh(self._entry)
+        if entry is not self._entry:
+            # Move the reference of this handle to the reloaded index
+            self._finalizer.detach()
+            self._registry._release(self._entry)
+            self._entry = entry
+            self._finalizer = weakref.finalize(self, self._registry._release, entry)
+        return entry.store
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Any]:
+        """
+        Search the documents most similar to the query.
+        :param query: The query text.
+        :param k: The number of documents to return.
+        :return: The most similar documents.
+        """
+        return self.store.similarity_search(query, k, **kwargs)
+
+    def similarity_search_by_vector(
+        self, embedding: List[float], k: int = 4, **kwargs: Any
+    ) -> List[Any]:
+        """
+        Search the documents most similar to an embedding.
+        :param embedding: The query embedding.
+        :param k: The number of documents to return.
+        :return: The most similar documents.
+        """
+        return self.store.similarity_search_by_vector(embedding, k, **kwargs)
+
+    def close(self) -> None:
+        """
+        Release the reference of this handle.
+        """
+        if not self._closed:
+            self._closed = True
+            self._finalizer()
+
+
+class IndexRegistry:
+    """
+    Reference-counted, LRU-evicted registry of loaded indexes, keyed by path.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        mmap: bool = False,
+        loader: Callable[[str, bool], Any] = load_faiss_index,
+    ) -> None:
+        """
+        Create an index registry.
+        :param max_entries: The number of indexes kept loaded. Indexes in use are never evicted.
+        :param mmap: Whether to memory-map the index files.
+        :param loader: Loads the vector store of an index folder, given the path and mmap flag.
+        """
+        self.max_entries = max_entries
+        self.mmap = mmap
+        self._loader = loader
+        self._entries: "OrderedDict[str, IndexEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.metrics = {"loads": 0, "hits": 0, "reloads": 0, "evictions": 0}
+
+    def acquire(self, path: str) -> Optional[SharedIndex]:
+        """
+        Get a shared handle to the index saved in a folder, loading it if needed.
+        :param path: The index folder.
+        :return: The handle, or None if the index cannot be loaded.
+        """
+        key = os.path.realpath(path)
+
+        with self._lock:
+            try:
+                entry = self._get_entry(key)
+            except Exception as e:
+                logger.warning(f"Failed to load the index from {path}, error: {e}.")
+                return None
+            if entry is None:
+                logger.warning(f"No index found at {path}.")
+                return None
+
+            entry.ref_count += 1
+            return SharedIndex(self, entry)
+
+    def _get_entry(self, key: str) -> Optional[IndexEntry]:
+        """
+        Get the up-to-date entry of an index, loading or reloading it if needed.
+        Must be called with the lock held.
+        :param key: The real path of the index folder.
+        :return: The entry, or None if the index does not exist.
+        """
+        signature = index_signature(key)
+        if signature is None:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.signature == signature:
+            self.metrics["hits"] += 1
+        else:
+            if entry is not None:
+                logger.info(f"Index files of {key} changed, reloading.")
+                self.metrics["reloads"] += 1
+            else:
+                logger.info(f"Loading index from {key}...")
+                self.metrics["loads"] += 1
+            # A replaced entry stays alive for the handles still holding it
+            entry = IndexEntry(key, signature, self._loader(key, self.mmap))
+            self._entries[key] = entry
+
+        entry.last_used = time.monotonic()
+        self._entries.move_to_end(key)
+        self._evict()
+        return entry
+
+    def _refresh(self, entry: IndexEntry) -> IndexEntry:
+        """
+        Get the up-to-date entry for a handle, reloading the index if its files changed.
+        :param entry: The entry held by the handle.
+        :return: The entry to use, with a reference taken if it differs from the given one.
+        """
+        with self._lock:
+            try:
+                current = self._get_entry(entry.path)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to reload the index from {entry.path}, keeping the loaded one: {e}"
+                )
+                return entry
+
+            if current is None or current is entry:
+                return entry
+
+            current.ref_count += 1
+            return current
+
+    def _release(self, entry: IndexEntry) -> None:
+        """
+        Release a reference to an entry.
+        :param entry: The entry.
+        """
+        with self._lock:
+            entry.ref_count = max(0, entry.ref_count - 1)
+            self._evict()
+
+    def _evict(self) -> None:
+        """
+        Evict the least recently used indexes not in use, down to max_entries.
+        Must be called with the lock held.
+        """
+        excess = len(self._entries) - self.max_entries
+        if excess <= 0:
+            return
+
+        for key in list(self._entries):
+            if excess <= 0:
+                break
+            if self._entries[key].ref_count == 0:
+                del self._entries[key]
+                self.metrics["evictions"] += 1
+                excess -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the registry statistics.
+        :return: The load, hit, reload and eviction counts and the loaded indexes.
+        """
+        with self._lock:
+            return {
+                **self.metrics,
+                "loaded": {
+                    key: entry.ref_count for key, entry in self._entries.items()
+                },
+            }
+
+    def clear(self) -> None:
+        """
+        Drop all loaded indexes. Open handles keep their index until they are closed.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+_index_registry: Optional[IndexRegistry] = None
+_index_registry_lock = threading.Lock()
+
+
+def get_index_registry() -> IndexRegistry:
+    """
+    Get the process-wide index registry configured by RAG_INDEX_CACHE_SIZE and
+    RAG_INDEX_MMAP in the RAG configuration.
+    :return: The registry.
+    """
+    global _index_registry
+
+    with _index_registry_lock:
+        if _index_registry is None:
+            max_entries, mmap = DEFAULT_MAX_ENTRIES, False
+
+            try:
+                from config.config_loader import get_ufo_config
+
+                rag_config = get_ufo_config().rag
+                max_entries = rag_config.index_cache_size
+                mmap = rag_config.index_mmap
+            except Exception:
+                # Without a UFO configuration, the defaults apply
+                pass
+
+            _index_registry = IndexRegistry(max_entries=max_entries, mmap=mmap)
+
+        return _index_registry
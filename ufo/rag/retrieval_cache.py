@@ -0,0 +1,93 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Small in-memory TTL cache of retrieval results.
+
+The agent retrieves knowledge for its subtask at every step, and a subtask usually spans
+several steps. Results are cached by (query, source, top_k) for a short time, so the
+repeated steps of one subtask skip retrieval entirely.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Tuple
+
+DEFAULT_TTL = 300
+DEFAULT_MAX_ENTRIES = 256
+
+
+class RetrievalCache:
+    """
+    Thread-safe TTL cache with least recently used eviction.
+    """
+
+    def __init__(
+        self, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES
+    ) -> None:
+        """
+        Create a retrieval cache.
+        :param ttl: The time (seconds) a result stays valid, 0 disables the cache.
+        :param max_entries: The max number of cached results.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Whether results are cached.
+        """
+        return self.ttl > 0
+
+    def lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a cached result. Empty results are cached too, so a hit is reported
+        separately from the value.
+        :param key: The key, e.g. (query, source, top_k).
+        :return: Whether the key was found, and the cached result.
+        """
+        if not self.enabled:
+            return False, None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Cache a result.
+        :param key: The key.
+        :param value: The result.
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Drop all cached results.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
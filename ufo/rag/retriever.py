@@ -3,11 +3,11 @@
 
 from abc import ABC, abstractmethod
 import logging
-
-from langchain_community.vectorstores import FAISS
+from typing import List, Optional
 
 from ufo.config import get_offline_learner_indexer_config
 from ufo.rag import web_search
+from ufo.rag.index_registry import get_index_registry
 from ufo.utils import get_hugginface_embedding
 
 logger = logging.getLogger(__name__)
@@ -37,6 +37,16 @@ class RetrieverFactory:
             raise ValueError("Invalid retriever type: {}".format(retriever_type))
 
 
+def embed_query(query: str) -> List[float]:
+    """
+    Embed a query with the embedding model shared by all the retrievers, so the
+    embedding can be computed once and passed to each of them.
+    :param query: The query text.
+    :return: The embedding of the query.
+    """
+    return get_hugginface_embedding().embed_query(query)
+
+
 class Retriever(ABC):
     """
     Class to retrieve documents.
@@ -59,18 +69,30 @@ class Retriever(ABC):
         """
         pass
 
-    def retrieve(self, query: str, top_k: int, filter=None):
+    def retrieve(
+        self,
+        query: str,
+        top_k: int,
+        filter=None,
+        embedding: Optional[List[float]] = None,
+    ):
         """
         Retrieve the document from the given query.
         :param query: The query to retrieve the document from.
         :param top_k: The number of documents to retrieve.
         :filter: The filter to apply to the retrieved documents.
+        :param embedding: The precomputed embedding of the query, to avoid embedding it again.
         :return: The document from the given query.
         """
         if not self.indexer:
             return []
 
-        results = self.indexer.similarity_search(query, top_k, filter=filter)
+        if embedding is not None:
+            results = self.indexer.similarity_search_by_vector(
+                embedding, top_k, filter=filter
+            )
+        else:
+            results = self.indexer.similarity_search(query, top_k, filter=filter)
 
         if not results:
             return []
@@ -116,16 +138,8 @@ class OfflineDocRetriever(Retriever):
         else:
             return None
 
-        try:
-            db = FAISS.load_local(
-                path, get_hugginface_embedding(), allow_dangerous_deserialization=True
-            )
-            return db
-        except Exception as e:
-            logger.warning(
-                f"Failed to load experience indexer from {path}, error: {e}."
-            )
-            return None
+        # Shared read-only handle, the index is loaded once per process
+        return get_index_registry().acquire(path)
 
 
 class ExperienceRetriever(Retriever):
@@ -146,18 +160,8 @@ class ExperienceRetriever(Retriever):
         :param db_path: The path to the database.
         """
 
-        try:
-            db = FAISS.load_local(
-                db_path,
-                get_hugginface_embedding(),
-                allow_dangerous_deserialization=True,
-            )
-            return db
-        except Exception as e:
-            logger.warning(
-                f"Failed to load experience indexer from {db_path}, error: {e}."
-            )
-            return None
+        # Shared read-only handle, the index is loaded once per process
+        return get_index_registry().acquire(db_path)
 
 
 class OnlineDocRetriever(Retriever):
@@ -216,15 +220,5 @@ class DemonstrationRetriever(Retriever):
         :db_path: The path to the database.
         """
 
-        try:
-            db = FAISS.load_local(
-                db_path,
-                get_hugginface_embedding(),
-                allow_dangerous_deserialization=True,
-            )
-            return db
-        except Exception as e:
-            logger.warning(
-                f"Failed to load experience indexer from {db_path}, error: {e}."
-            )
-            return None
+        # Shared read-only handle, the index is loaded once per process
+        return get_index_registry().acquire(db_path)
@@ -38,6 +38,27 @@ def parse_args():
         action="store_true",
         help="Run the server in local mode (default: False)",
     )
+    parser.add_argument(
+        "--codecs",
+        dest="codecs",
+        type=str,
+        default=None,
+        help="Preferred AIP wire codecs for clients that offer them, comma-separated (json, orjson, msgpack). Default: json",
+    )
+    parser.add_argument(
+        "--compression",
+        dest="compression",
+        type=str,
+        default=None,
+        help="Preferred AIP message compressions for clients that offer them, comma-separated (zstd, deflate), or 'none' to disable. Default: none",
+    )
+    parser.add_argument(
+        "--compression-threshold",
+        dest="compression_threshold",
+        type=int,
+        default=None,
+        help="Minimum size in bytes of the AIP messages to compress (default: 16384)",
+    )
     return parser.parse_args()
 
 
@@ -64,6 +85,8 @@ import uvicorn
 from fastapi import FastAPI, WebSocket, Query
 from starlette.status import WS_1008_POLICY_VIOLATION
 
+from aip.protocol.compression import DEFAULT_COMPRESSION_THRESHOLD
+
 from ufo.server.services.api import create_api_router
 from ufo.server.services.session_manager import SessionManager
 from ufo.server.services.client_connection_manager import ClientConnectionManager
@@ -89,7 +112,24 @@ api_router = create_api_router(session_manager, client_manager, _api_key)
 app.include_router(api_router)
 
 # Initialize WebSocket handler
-ws_handler = UFOWebSocketHandler(client_manager, session_manager, cli_args.local if cli_args else False)
+ws_handler = UFOWebSocketHandler(
+    client_manager,
+    session_manager,
+    cli_args.local if cli_args else False,
+    codec_preference=(
+        cli_args.codecs.split(",") if cli_args and cli_args.codecs else None
+    ),
+    compression_preference=(
+        ([] if cli_args.compression == "none" else cli_args.compression.split(","))
+        if cli_args and cli_args.compression
+        else None
+    ),
+    compression_threshold=(
+        cli_args.compression_threshold
+        if cli_args and cli_args.compression_threshold is not None
+        else DEFAULT_COMPRESSION_THRESHOLD
+    ),
+)
 
 
 @app.websocket("/ws")
@@ -2,16 +2,29 @@ import asyncio
 import logging
 import uuid
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Dict, List, Optional, Union
 
 from fastapi import WebSocket, WebSocketDisconnect
 
+from aip.protocol.attachments import parse_binary_metadata
+from aip.protocol.codecs import MessageCodec, negotiate_codec
+from aip.protocol.compression import (
+    DEFAULT_COMPRESSION_THRESHOLD,
+    PayloadCompressor,
+    negotiate_compressor,
+)
 from aip.protocol.registration import RegistrationProtocol
 from aip.protocol.heartbeat import HeartbeatProtocol
 from aip.protocol.device_info import DeviceInfoProtocol
 from aip.protocol.task_execution import TaskExecutionProtocol
 from aip.transport.websocket import WebSocketTransport
-from aip.messages import ClientMessage, ClientMessageType, ClientType, ServerMessage
+from aip.messages import (
+    ClientCapability,
+    ClientMessage,
+    ClientMessageType,
+    ClientType,
+    ServerMessage,
+)
 from ufo.module.dispatcher import WebSocketCommandDispatcher
 from ufo.server.services.session_manager import SessionManager, SessionOwnershipError
 from ufo.server.services.client_connection_manager import (
@@ -78,16 +91,26 @@ class UFOWebSocketHandler:
         client_manager: ClientConnectionManager,
         session_manager: SessionManager,
         local: bool = False,
+        codec_preference: Optional[List[str]] = None,
+        compression_preference: Optional[List[str]] = None,
+        compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
     ):
         """
         Initializes the WebSocket handler.
         :param client_manager: The client connection manager.
         :param session_manager: The session manager.
         :param local: Whether running in local mode with client auto-connect.
+        :param codec_preference: Preferred AIP wire codecs, in order, for clients offering codecs.
+        :param compression_preference: Preferred AIP message compressions, in order, for clients offering compression.
+            None or an empty list (the default) disables compression.
+        :param compression_threshold: Minimum size (bytes) of the messages to compress.
         """
         self.client_manager = client_manager
         self.session_manager = session_manager
         self.local = local
+        self.codec_preference = codec_preference
+        self.compression_preference = compression_preference
+        self.compression_threshold = compression_threshold
         self.logger = logging.getLogger(self.__class__.__name__)
 
         # NOTE: per-connection AIP protocol instances are intentionally
@@ -136,6 +159,12 @@ class UFOWebSocketHandler:
             else "windows"
         )
 
+        # Record the optional protocol features the client advertised, so that
+        # sessions driving this client only use what it supports.
+        ctx.task_protocol.peer_capabilities = set(
+            (reg_info.metadata or {}).get("capabilities") or []
+        )
+
         # Register client
         client_id = reg_info.client_id
         if client_type == ClientType.CONSTELLATION:
@@ -166,8 +195,37 @@ class UFOWebSocketHandler:
                 pass
             raise ValueError(str(dup_err)) from dup_err
 
+        # Pick the wire codec for clients that offer codecs; others stay on JSON.
+        offered_codecs = (reg_info.metadata or {}).get("codecs")
+        codec = (
+            negotiate_codec(offered_codecs, self.codec_preference)
+            if offered_codecs
+            else None
+        )
+
+        # Pick the message compression for clients that offer compression, if enabled
+        compression = (
+            negotiate_compressor(
+                (reg_info.metadata or {}).get("compression"),
+                self.compression_preference,
+            )
+            if self.compression_preference
+            else None
+        )
+
         # Send registration confirmation using AIP protocol
-        await self._send_registration_confirmation(ctx)
+        await self._send_registration_confirmation(ctx, codec, compression)
+
+        # Switch to the negotiated codec and compression only after the (JSON) confirmation
+        for protocol in (
+            ctx.registration_protocol,
+            ctx.heartbeat_protocol,
+            ctx.device_info_protocol,
+            ctx.task_protocol,
+        ):
+            if codec is not None:
+                protocol.codec = codec
+            protocol.set_compression(compression, self.compression_threshold)
 
         # Log successful connection
         self._log_client_connection(client_id, client_type)
@@ -242,15 +300,25 @@ class UFOWebSocketHandler:
             raise ValueError(error_msg)
 
     async def _send_registration_confirmation(
-        self, ctx: ConnectionContext
+        self,
+        ctx: ConnectionContext,
+        codec: Optional[MessageCodec] = None,
+        compression: Optional[PayloadCompressor] = None,
     ) -> None:
         """
         Send successful registration confirmation to client using AIP RegistrationProtocol.
         :param ctx: The per-connection context whose registration
             protocol is used to send the confirmation.
+        :param codec: The wire codec chosen for the connection, if negotiated.
+        :param compression: The message compression chosen for the connection, if negotiated.
         """
         self.logger.info("[WS] [AIP] Sending registration confirmation...")
-        await ctx.registration_protocol.send_registration_confirmation()
+        await ctx.registration_protocol.send_registration_confirmation(
+            capabilities=[ClientCapability.BINARY_ATTACHMENTS.value],
+            codec=codec.name if codec is not None else None,
+            compression=compression.name if compression is not None else None,
+            compression_threshold=self.compression_threshold,
+        )
         self.logger.info("[WS] [AIP] Registration confirmation sent")
 
     async def _send_error_response(
@@ -363,8 +431,48 @@ class UFOWebSocketHandler:
             # from claiming a different ``client_id`` or ``client_type``
             # (role) at the message layer.
             client_id = ctx.registered_client_id
+            # Metadata of the binary frame expected next (binary attachments)
+            binary_metadata: Optional[Dict[str, Any]] = None
             while True:
-                msg = await websocket.receive_text()
+                frame = await websocket.receive()
+                if frame["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(
+                        frame.get("code", 1000), frame.get("reason")
+                    )
+
+                # Binary attachments are stored in order, before the message
+                # referencing them is dispatched. Other binary frames are
+                # messages encoded with the negotiated codec. Senders keep the
+                # metadata and data frames of an attachment adjacent; a frame
+                # of another size is handled as a message rather than stored.
+                if frame.get("bytes") is not None:
+                    expected_size = (binary_metadata or {}).get("size")
+                    if binary_metadata is not None and expected_size in (
+                        None,
+                        len(frame["bytes"]),
+                    ):
+                        ctx.task_protocol.store_attachment(
+                            binary_metadata, frame["bytes"]
+                        )
+                        binary_metadata = None
+                        continue
+                    if binary_metadata is not None:
+                        self.logger.warning(
+                            f"[WS] Binary frame of {len(frame['bytes'])} bytes does not "
+                            f"match attachment {binary_metadata.get('attachment_id')}"
+                        )
+                        binary_metadata = None
+                    msg = frame["bytes"]
+                else:
+                    msg = frame.get("text")
+                    if msg is None:
+                        continue
+
+                    metadata = parse_binary_metadata(msg)
+                    if metadata is not None:
+                        binary_metadata = metadata
+                        continue
+
                 # NOTE: each dispatched task closes over the connection's
                 # *local* ``ctx``. Even though ``self`` is shared between
                 # WebSockets, ``ctx`` is private to this loop iteration's
@@ -384,7 +492,7 @@ class UFOWebSocketHandler:
 
     async def handle_message(
         self,
-        msg: str,
+        msg: Union[str, bytes],
         ctx: Optional[ConnectionContext] = None,
         *,
         registered_client_id: Optional[str] = None,
@@ -410,7 +518,8 @@ class UFOWebSocketHandler:
         were sent on shared handler-level protocol fields that a later
         connection had overwritten.
 
-        :param msg: The raw JSON message received from the client.
+        :param msg: The raw message received from the client (JSON text, or
+            bytes encoded with the negotiated codec).
         :param ctx: The per-connection context bound to the originating
             websocket. Production callers (:meth:`handler`) always pass
             this; the legacy keyword-only ``registered_*`` parameters
@@ -440,7 +549,11 @@ class UFOWebSocketHandler:
         client_id = registered_client_id
 
         try:
-            data = ClientMessage.model_validate_json(msg)
+            if isinstance(msg, str) or ctx.task_protocol is None:
+                # Without a negotiated protocol, bytes can only be JSON
+                data = ClientMessage.model_validate_json(msg)
+            else:
+                data = ctx.task_protocol.decode_message(msg, ClientMessage)
 
             # ---------- Authoritative identity/role binding ----------
             # Reject any message that does not match the identity that
@@ -0,0 +1,101 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Request Log Image Deduplication Tool
+
+Converts the request logs written before DEDUPLICATE_LOG_IMAGES to the deduplicated format:
+every base64 image of request.log is stored once under request_images/, named by its
+SHA-256, and the log references it. The trajectory parsers read both formats.
+
+Usage:
+    # Convert every log directory under logs/
+    python -m ufo.tools.dedupe_request_logs logs
+
+    # Convert specific log directories
+    python -m ufo.tools.dedupe_request_logs logs/task_1 logs/task_2
+"""
+
+import argparse
+import os
+from typing import Iterator, List
+
+from rich.console import Console
+from rich.table import Table
+
+from ufo.module.log_writer import ZSTD_SUFFIX
+from ufo.trajectory.image_blobs import REQUEST_LOG_FILE, deduplicate_request_log
+
+console = Console()
+
+
+def find_log_dirs(paths: List[str]) -> Iterator[str]:
+    """
+    Find the log directories with a request log.
+    :param paths: The log directories, or directories to search recursively.
+    :return: The log directories.
+    """
+    names = {REQUEST_LOG_FILE, REQUEST_LOG_FILE + ZSTD_SUFFIX}
+    for path in paths:
+        for root, _, files in os.walk(path):
+            if names.intersection(files):
+                yield root
+
+
+def format_size(size: int) -> str:
+    """
+    Format a size in bytes.
+    :param size: The size in bytes.
+    :return: The human-readable size.
+    """
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+
+
+def main() -> None:
+    """
+    Convert the request logs and report the disk savings.
+    """
+    parser = argparse.ArgumentParser(
+        description="Store the images of request logs once and reference them."
+    )
+    parser.add_argument("paths", nargs="+", help="Log directories or their parents")
+    args = parser.parse_args()
+
+    table = Table(title="Request log deduplication")
+    table.add_column("Log directory")
+    table.add_column("Before", justify="right")
+    table.add_column("After", justify="right")
+    table.add_column("Saved", justify="right")
+
+    total_before = total_after = 0
+    for log_dir in find_log_dirs(args.paths):
+        try:
+            before, after = deduplicate_request_log(log_dir)
+        except Exception as e:
+            console.print(f"[red]Failed to convert {log_dir}: {e}[/red]")
+            continue
+
+        total_before += before
+        total_after += after
+        saved = 1 - after / before if before else 0
+        table.add_row(log_dir, format_size(before), format_size(after), f"{saved:.0%}")
+
+    if not total_before:
+        console.print("No request logs found.")
+        return
+
+    table.add_row(
+        "Total",
+        format_size(total_before),
+        format_size(total_after),
+        f"{1 - total_after / total_before:.0%}",
+        style="bold",
+    )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
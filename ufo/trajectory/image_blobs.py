@@ -0,0 +1,258 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""
+Content-addressed storage of the images of the request logs.
+
+A request log record holds the base64 screenshots of the step in image_list, and the same
+images again in the prompt. With deduplication, every image is written once under the
+request_images directory of the log, named by the SHA-256 of its bytes, and the record
+holds a reference in its place:
+
+    "blob:request_images/<sha256>.png"
+
+resolve and load_request_log put the data URLs back, so readers see the original records.
+The images repeated across steps (e.g. the last screenshot) are stored once as well.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from ufo.module.log_writer import ZSTD_SUFFIX, FileWriter, read_log_lines
+
+BLOB_DIR = "request_images"
+
+BLOB_PREFIX = "blob:"
+
+REQUEST_LOG_FILE = "request.log"
+
+# Shorter data URLs are left inline, the reference would not be much shorter
+MIN_IMAGE_LENGTH = 256
+
+_DATA_URL = re.compile(r"^data:image/(png|jpeg|webp|gif);base64,")
+
+_BLOB_REF = re.compile(
+    "^" + BLOB_PREFIX + BLOB_DIR + r"/([0-9a-f]{64})\.(png|jpeg|webp|gif)$"
+)
+
+
+def is_image_ref(value: Any) -> bool:
+    """
+    Check whether a value is a reference to a stored image.
+    :param value: The value.
+    :return: Whether it is an image reference.
+    """
+    return isinstance(value, str) and _BLOB_REF.match(value) is not None
+
+
+class ImageBlobStore:
+    """
+    The image blobs of a log directory.
+    """
+
+    def __init__(self, log_path: str, min_length: int = MIN_IMAGE_LENGTH) -> None:
+        """
+        Create the image store of a log directory.
+        :param log_path: The log directory.
+        :param min_length: The min length of the data URLs stored as blobs.
+        """
+        self.log_path = log_path
+        self.blob_path = os.path.join(log_path, BLOB_DIR)
+        self.min_length = min_length
+
+        # The blob names known to exist, so they are not checked again
+        self._stored = set()
+        self._lock = threading.Lock()
+
+    def externalize(self, record: Any) -> Any:
+        """
+        Replace the data URLs of a record with references to stored images.
+        :param record: The JSON-like record, not modified.
+        :return: The record with image references.
+        """
+        # The same image string often appears several times in one record
+        refs: Dict[int, str] = {}
+
+        def visit(value: Any) -> Any:
+            if isinstance(value, str):
+                if len(value) < self.min_length or not _DATA_URL.match(value):
+                    return value
+                if id(value) not in refs:
+                    refs[id(value)] = self.put(value)
+                return refs[id(value)]
+            if isinstance(value, dict):
+                return {key: visit(item) for key, item in value.items()}
+            if isinstance(value, (list, tuple)):
+                return [visit(item) for item in value]
+            return value
+
+        return visit(record)
+
+    def put(self, data_url: str) -> str:
+        """
+        Store an image given as a data URL.
+        :param data_url: The data URL.
+        :return: The image reference, or the data URL if it cannot be stored exactly.
+        """
+        match = _DATA_URL.match(data_url)
+        if match is None:
+            return data_url
+
+        encoded = data_url[match.end() :]
+        try:
+            data = base64.b64decode(encoded, validate=True)
+        except ValueError:
+            return data_url
+
+        # Only canonical base64 can be restored to the same string
+        if base64.b64encode(data).decode("ascii") != encoded:
+            return data_url
+
+        name = f"{hashlib.sha256(data).hexdigest()}.{match.group(1)}"
+
+        with self._lock:
+            if name not in self._stored:
+                path = os.path.join(self.blob_path, name)
+                if not os.path.exists(path):
+                    os.makedirs(self.blob_path, exist_ok=True)
+                    # Write then rename, so a blob is never seen half written
+                    temp_path = f"{path}.{threading.get_ident()}.tmp"
+                    with open(temp_path, "wb") as f:
+                        f.write(data)
+                    os.replace(temp_path, path)
+                self._stored.add(name)
+
+        return f"{BLOB_PREFIX}{BLOB_DIR}/{name}"
+
+    def resolve(self, record: Any, cache: Optional[Dict[str, str]] = None) -> Any:
+        """
+        Replace the image references of a record with their data URLs.
+        :param record: The record, not modified.
+        :param cache: The data URLs already loaded, by reference, shared across records.
+        :return: The record with data URLs. Missing images are left as references.
+        """
+        if cache is None:
+            cache = {}
+
+        def visit(value: Any) -> Any:
+            if isinstance(value, str):
+                if not value.startswith(BLOB_PREFIX):
+                    return value
+                match = _BLOB_REF.match(value)
+                if match is None:
+                    return value
+                if value not in cache:
+                    name = f"{match.group(1)}.{match.group(2)}"
+                    path = os.path.join(self.blob_path, name)
+                    if not os.path.exists(path):
+                        return value
+                    with open(path, "rb") as f:
+                        encoded = base64.b64encode(f.read()).decode("ascii")
+                    cache[value] = f"data:image/{match.group(2)};base64,{encoded}"
+                return cache[value]
+            if isinstance(value, dict):
+                return {key: visit(item) for key, item in value.items()}
+            if isinstance(value, list):
+                return [visit(item) for item in value]
+            return value
+
+        return visit(record)
+
+
+def load_request_log(
+    log_path: str, resolve_images: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Load the records of the request log of a log directory, plain or zstd-compressed.
+    :param log_path: The log directory.
+    :param resolve_images: Whether to replace the image references with their data URLs.
+    :return: The records, skipping the lines that are not valid JSON.
+    """
+    request_log_path = os.path.join(log_path, REQUEST_LOG_FILE)
+    if not os.path.exists(request_log_path) and not os.path.exists(
+        request_log_path + ZSTD_SUFFIX
+    ):
+        return []
+
+    store = ImageBlobStore(log_path)
+    cache: Dict[str, str] = {}
+    records = []
+
+    for line in read_log_lines(request_log_path):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        records.append(store.resolve(record, cache) if resolve_images else record)
+
+    return records
+
+
+def deduplicate_request_log(log_path: str) -> Tuple[int, int]:
+    """
+    Convert the request log of a log directory to image references, in place.
+    :param log_path: The log directory.
+    :return: The size in bytes of the request log and its images before and after.
+    """
+    request_log_path = os.path.join(log_path, REQUEST_LOG_FILE)
+    compression = None
+    if not os.path.exists(request_log_path):
+        request_log_path += ZSTD_SUFFIX
+        compression = "zstd"
+
+    store = ImageBlobStore(log_path)
+    before = os.path.getsize(request_log_path) + _directory_size(store.blob_path)
+
+    temp_path = request_log_path + ".dedup"
+    if compression:
+        temp_path += ZSTD_SUFFIX
+    writer = FileWriter(
+        temp_path,
+        mode="w",
+        compression=compression,
+        async_write=False,
+        image_store=store,
+    )
+
+    lines = []
+    for line in read_log_lines(request_log_path):
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            record = None
+
+        # Lines that are not records are kept as they are
+        if not isinstance(record, (dict, list)):
+            record = line
+        lines.append(writer.format(record))
+
+        if len(lines) >= 64:
+            writer.append(lines)
+            lines = []
+
+    if lines:
+        writer.append(lines)
+
+    os.replace(writer.file_path, request_log_path)
+    after = os.path.getsize(request_log_path) + _directory_size(store.blob_path)
+
+    return before, after
+
+
+def _directory_size(path: str) -> int:
+    """
+    Get the total size of the files of a directory.
+    :param path: The directory.
+    :return: The size in bytes, 0 if it does not exist.
+    """
+    if not os.path.isdir(path):
+        return 0
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
@@ -6,7 +6,8 @@ import logging
 import os
 import re
 import sys
-from typing import Any, Dict, List, Optional
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
 
 from PIL import Image
 from rich.console import Console
@@ -14,18 +15,78 @@ from rich.console import Console
 sys.path.append(os.path.join(os.path.dirname(__file__), "../.."))
 
 import ufo.utils
+from ufo.trajectory.image_blobs import load_request_log
 
 logger = logging.getLogger(__name__)
 console = Console()
 
 
+class LazyScreenshots(Mapping):
+    """
+    The screenshots of a step by log key. Each screenshot is decoded on first access,
+    so a step costs nothing until its images are used.
+    """
+
+    def __init__(self, paths: Dict[str, Optional[str]]) -> None:
+        """
+        :param paths: The screenshot file paths by log key, None if the step has none.
+        """
+        self._paths = paths
+        self._images: Dict[str, Optional[Image.Image]] = {}
+
+    def __getitem__(self, key: str) -> Optional[Image.Image]:
+        if key not in self._images:
+            path = self._paths[key]
+            self._images[key] = (
+                Trajectory.load_screenshot(path) if path is not None else None
+            )
+        return self._images[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def path(self, key: str) -> Optional[str]:
+        """
+        Get the file path of a screenshot.
+        :param key: The log key of the screenshot.
+        :return: The file path, or None if the step has no such screenshot.
+        """
+        return self._paths.get(key)
+
+    def is_loaded(self, key: str) -> bool:
+        """
+        Check whether a screenshot has been decoded.
+        :param key: The log key of the screenshot.
+        :return: Whether the screenshot has been decoded.
+        """
+        return key in self._images
+
+    def data_url(self, key: str) -> str:
+        """
+        Encode a screenshot as a data URL, from its file unless it is already decoded.
+        :param key: The log key of the screenshot.
+        :return: The data URL, the empty image if the step has no such screenshot.
+        """
+        path = self._paths.get(key)
+        if path is None or self.is_loaded(key):
+            return ufo.utils.encode_image(self.get(key))
+        return ufo.utils.encode_image_from_path(path)
+
+
 class Trajectory:
     """
     A class to structure the trajectory data.
+    The steps are parsed on demand: iter_steps streams them from the response log, and
+    their screenshots are only decoded when accessed.
     """
 
     _response_file = "response.log"
     _evaluation_file = "evaluation.log"
+    _request_file = "request.log"
+    _index_file = "response.log.index"
 
     _screenshot_keys = [
         "clean_screenshot_path",
@@ -46,36 +107,51 @@ class Trajectory:
             raise ValueError(
                 f"The response file '{self._response_file_path}' does not exist."
             )
-        self._step_log = self._load_response_data()
+        self._step_log: Optional[List[Dict[str, Any]]] = None
         self._evaluation_log = self._load_evaluation_data()
-        self._structured_data = self._load_all_data()
+        self._structured_data: Optional[Dict[str, Any]] = None
+        self._request_log: Optional[List[Dict[str, Any]]] = None
+        self._step_index: Optional[Dict[str, Any]] = None
         self.logger = logging.getLogger(__name__)
 
-    def _load_response_data(self) -> List[Dict[str, Any]]:
+    def iter_steps(self, agent_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
         """
-        Load the textual data from the file.
-        :return: The textual data.
+        Stream the steps of the response log, without keeping them.
+        :param agent_type: Only yield the steps of this agent type, e.g. "AppAgent".
+        :return: The steps, with their screenshots decoded on first access.
         """
-
-        step_data = []
-
         with open(self.response_file_path, "r", encoding="utf-8") as file:
-            textual_logs = file.readlines()
-
-        for log in textual_logs:
-            try:
-                log = log.strip()
-                step_log = json.loads(log)
-                step_log[self._step_screenshot_key] = self._load_step_screenshots(
-                    step_log
-                )
+            for line in file:
+                step_log = self._parse_step(line)
+                if step_log is None:
+                    continue
+                if agent_type is not None and step_log.get("agent_type") != agent_type:
+                    continue
+                yield step_log
+
+    def _parse_step(self, line: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse a line of the response log into a step.
+        :param line: The line.
+        :return: The step, or None if the line is not a step.
+        """
+        try:
+            step_log = json.loads(line.strip())
+        except json.JSONDecodeError:
+            return None
 
-            except json.JSONDecodeError:
-                continue
+        if not isinstance(step_log, dict):
+            return None
 
-            step_data.append(step_log)
+        step_log[self._step_screenshot_key] = self._load_step_screenshots(step_log)
+        return step_log
 
-        return step_data
+    def _load_response_data(self) -> List[Dict[str, Any]]:
+        """
+        Load the textual data from the file.
+        :return: The textual data.
+        """
+        return list(self.iter_steps())
 
     def _load_all_data(self) -> Dict[str, Any]:
         """
@@ -83,8 +159,8 @@ class Trajectory:
         :return: The data.
         """
         data = {
-            "StepLog": self._load_response_data(),
-            "EvaluationLog": self._load_evaluation_data(),
+            "StepLog": self.step_log,
+            "EvaluationLog": self.evaluation_log,
             "RoundScreenshots": self.round_screenshots,
             "FinalScreenshotPath": self.final_screenshot_path,
             "FinalScreenshotImage": self.final_screenshot_image,
@@ -105,47 +181,150 @@ class Trajectory:
             image = None
         return image
 
-    def _load_single_screenshot(
-        self, step_log: Dict[str, Any], key: str
-    ) -> Optional[Image.Image]:
+    def _screenshot_file_path(self, step_log: Dict[str, Any], key: str) -> Optional[str]:
         """
-        Load a single screenshot from the file.
+        Get the file path of a screenshot of a step.
         :param step_log: The step log.
         :param key: The key to the screenshot.
-        :return: The screenshot data.
+        :return: The file path, or None if the step has no such screenshot file.
         """
         screenshot_log_path = step_log.get(key)
 
         # Skip None and empty strings (empty string causes os.path.join to
         # return the directory itself, leading to "is a directory" errors)
-        if screenshot_log_path is not None and screenshot_log_path.strip():
+        if isinstance(screenshot_log_path, str) and screenshot_log_path.strip():
             screenshot_file_name = os.path.basename(screenshot_log_path)
             if not screenshot_file_name:
                 return None
             screenshot_file_path = os.path.join(self.file_path, screenshot_file_name)
 
             if os.path.isfile(screenshot_file_path):
-                screenshot = self.load_screenshot(screenshot_file_path)
-                return screenshot
+                return screenshot_file_path
             else:
                 logger.warning(f"Screenshot file not found at {screenshot_file_path}.")
 
         return None
 
-    def _load_step_screenshots(
-        self, step_log: Dict[str, Any]
-    ) -> Dict[str, Image.Image]:
+    def _load_single_screenshot(
+        self, step_log: Dict[str, Any], key: str
+    ) -> Optional[Image.Image]:
         """
-        Load the screenshot data from the file.
+        Load a single screenshot from the file.
         :param step_log: The step log.
+        :param key: The key to the screenshot.
         :return: The screenshot data.
         """
-        screenshot_data = {
-            key: self._load_single_screenshot(step_log, key)
-            for key in self._screenshot_keys
-        }
+        screenshot_file_path = self._screenshot_file_path(step_log, key)
+        if screenshot_file_path is None:
+            return None
+        return self.load_screenshot(screenshot_file_path)
 
-        return screenshot_data
+    def _load_step_screenshots(self, step_log: Dict[str, Any]) -> LazyScreenshots:
+        """
+        Locate the screenshots of a step, to be decoded on first access.
+        :param step_log: The step log.
+        :return: The screenshot data.
+        """
+        return LazyScreenshots(
+            {
+                key: self._screenshot_file_path(step_log, key)
+                for key in self._screenshot_keys
+            }
+        )
+
+    @property
+    def step_index(self) -> Dict[str, Any]:
+        """
+        The byte offsets and agent types of the steps in the response log, for random access.
+        Read from the index file if there is one, and extended with the steps appended since.
+        :return: The step index.
+        """
+        size = os.path.getsize(self.response_file_path)
+
+        if self._step_index is None:
+            self._step_index = self._read_step_index()
+
+        index = self._step_index
+        if index is None or index["size"] > size:
+            index = {"version": 1, "size": 0, "offsets": [], "agent_types": []}
+
+        if index["size"] < size:
+            with open(self.response_file_path, "rb") as file:
+                file.seek(index["size"])
+                offset = index["size"]
+                for line in file:
+                    # A partial last line is indexed once it is complete
+                    if not line.endswith(b"\n") and offset + len(line) == size:
+                        break
+                    try:
+                        step_log = json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        step_log = None
+                    if isinstance(step_log, dict):
+                        index["offsets"].append(offset)
+                        index["agent_types"].append(step_log.get("agent_type"))
+                    offset += len(line)
+            index["size"] = offset
+
+        self._step_index = index
+        return index
+
+    @property
+    def step_index_path(self) -> str:
+        """
+        :return: The file path to the step index.
+        """
+        return os.path.join(self.file_path, self._index_file)
+
+    def _read_step_index(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the step index file.
+        :return: The step index, or None if there is no valid index file.
+        """
+        if not os.path.exists(self.step_index_path):
+            return None
+        try:
+            with open(self.step_index_path, "r", encoding="utf-8") as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(index, dict) or index.get("version") != 1:
+            return None
+        return index
+
+    def save_step_index(self) -> str:
+        """
+        Write the step index file next to the response log.
+        :return: The file path to the step index.
+        """
+        index = self.step_index
+        temp_path = self.step_index_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(index, file)
+        os.replace(temp_path, self.step_index_path)
+        return self.step_index_path
+
+    @property
+    def step_count(self) -> int:
+        """
+        :return: The number of steps in the response log.
+        """
+        return len(self.step_index["offsets"])
+
+    def get_step(self, position: int) -> Dict[str, Any]:
+        """
+        Load a single step by its position in the response log, using the step index.
+        :param position: The position of the step, negative to count from the end.
+        :return: The step, with its screenshots decoded on first access.
+        """
+        offsets = self.step_index["offsets"]
+        offset = offsets[position]
+
+        with open(self.response_file_path, "rb") as file:
+            file.seek(offset)
+            line = file.readline()
+
+        return self._parse_step(line.decode("utf-8"))
 
     def _load_evaluation_data(self) -> Dict[str, Any]:
         """
@@ -231,9 +410,10 @@ class Trajectory:
         """
         :return: The request data.
         """
-        if len(self.step_log) == 0:
+        first_step = next(self.iter_steps(), None)
+        if first_step is None:
             return None
-        return self.step_log[0].get("request")
+        return first_step.get("request")
 
     @classmethod
     def get_subtask(cls, folder_path: str, round_number: int) -> int:
@@ -274,8 +454,10 @@ class Trajectory:
     @property
     def step_log(self) -> List[Dict[str, Any]]:
         """
-        :return: The step log.
+        :return: The step log, loaded on first access. Prefer iter_steps for large logs.
         """
+        if self._step_log is None:
+            self._step_log = self._load_response_data()
         return self._step_log
 
     @property
@@ -285,6 +467,15 @@ class Trajectory:
         """
         return self._evaluation_log
 
+    @property
+    def request_log(self) -> List[Dict[str, Any]]:
+        """
+        :return: The request log, loaded on first access, with the stored images resolved.
+        """
+        if self._request_log is None:
+            self._request_log = load_request_log(self.file_path)
+        return self._request_log
+
     @property
     def host_agent_log(self) -> Dict[str, Any]:
         """
@@ -366,6 +557,8 @@ class Trajectory:
         """
         :return: The structured data of the entire trajectory.
         """
+        if self._structured_data is None:
+            self._structured_data = self._load_all_data()
         return self._structured_data
 
     def to_markdown(
@@ -386,7 +579,27 @@ class Trajectory:
         :param key_shown: The keys to show at each step.
         """
 
-        if len(self.step_log) == 0:
+        # One pass over the steps: the summary is counted while the steps are rendered
+        first_step = None
+        steps, rounds = [], []
+        host_agent_steps = app_agent_steps = 0
+        step_sections = []
+
+        for data in self.iter_steps():
+            if first_step is None:
+                first_step = data
+            if isinstance(data.get("Step"), int):
+                steps.append(data["Step"])
+            if isinstance(data.get("Round"), int):
+                rounds.append(data["Round"])
+
+            if data.get("agent_type") == "HostAgent":
+                host_agent_steps += 1
+            elif data.get("agent_type") == "AppAgent":
+                app_agent_steps += 1
+                step_sections.append(self._step_to_markdown(data, key_shown))
+
+        if first_step is None:
             logger.warning(
                 "No step data to export to markdown. The trajectory appears to be empty."
             )
@@ -412,11 +625,13 @@ class Trajectory:
 
             # Add summary information
             file.write("## Summary\n\n")
-            file.write(f"- **Request**: {self.request or 'Not specified'}\n")
-            file.write(f"- **Total Steps**: {self.step_number}\n")
-            file.write(f"- **Total Rounds**: {self.round_number}\n")
-            file.write(f"- **Host Agent Steps**: {len(self.host_agent_log)}\n")
-            file.write(f"- **App Agent Steps**: {len(self.app_agent_log)}\n\n")
+            file.write(
+                f"- **Request**: {first_step.get('request') or 'Not specified'}\n"
+            )
+            file.write(f"- **Total Steps**: {max(steps) + 1 if steps else 0}\n")
+            file.write(f"- **Total Rounds**: {max(rounds) + 1 if rounds else 0}\n")
+            file.write(f"- **Host Agent Steps**: {host_agent_steps}\n")
+            file.write(f"- **App Agent Steps**: {app_agent_steps}\n\n")
 
             file.write("## Evaluation Results\n\n")
             if self.evaluation_log:
@@ -427,39 +642,46 @@ class Trajectory:
 
             file.write("\n")
 
-            for data in self.app_agent_log:
-                step = data.get("session_step")
-                file.write(f"### Step {step}:\n")
-                for key, value in data.items():
-                    if key in key_shown:
-                        if key == "action":
-                            if len(value) > 0:
-                                file.write(
-                                    f"- **Action**: {value[0].get('action_string')}\n"
-                                )
-                                file.write(f"- **Result**: {value[0].get('result')}\n")
-                            else:
-                                file.write(f"- **Action**: None\n")
-                        else:
-                            file.write(f"- **{key.title()}**: {value}\n")
-                file.write("\n")
-
-                annotated_screenshot_filename = os.path.basename(
-                    data.get("annotated_screenshot_path", "")
-                )
-                selected_control_screenshot_filename = os.path.basename(
-                    data.get("selected_control_screenshot_path", "")
-                )
-
-                file.write(
-                    f'<div style="display: flex; justify-content: center;">\n'
-                    f'  <img src="{os.path.join("./", annotated_screenshot_filename)}" width="45%" />\n'
-                    f'  <img src="{os.path.join("./", selected_control_screenshot_filename)}" width="45%" />\n'
-                    f"</div>\n\n"
-                )
+            file.writelines(step_sections)
 
         console.print(f"✅ Markdown file saved to {output_path}.", style="green")
 
+    @staticmethod
+    def _step_to_markdown(data: Dict[str, Any], key_shown: List[str]) -> str:
+        """
+        Render an app agent step as markdown.
+        :param data: The step.
+        :param key_shown: The keys to show.
+        :return: The markdown of the step.
+        """
+        lines = [f"### Step {data.get('session_step')}:\n"]
+        for key, value in data.items():
+            if key in key_shown:
+                if key == "action":
+                    if len(value) > 0:
+                        lines.append(f"- **Action**: {value[0].get('action_string')}\n")
+                        lines.append(f"- **Result**: {value[0].get('result')}\n")
+                    else:
+                        lines.append(f"- **Action**: None\n")
+                else:
+                    lines.append(f"- **{key.title()}**: {value}\n")
+        lines.append("\n")
+
+        annotated_screenshot_filename = os.path.basename(
+            data.get("annotated_screenshot_path", "")
+        )
+        selected_control_screenshot_filename = os.path.basename(
+            data.get("selected_control_screenshot_path", "")
+        )
+
+        lines.append(
+            f'<div style="display: flex; justify-content: center;">\n'
+            f'  <img src="{os.path.join("./", annotated_screenshot_filename)}" width="45%" />\n'
+            f'  <img src="{os.path.join("./", selected_control_screenshot_filename)}" width="45%" />\n'
+            f"</div>\n\n"
+        )
+        return "".join(lines)
+
 
 if __name__ == "__main__":
 
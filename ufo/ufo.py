@@ -71,7 +71,11 @@ async def main():
     )
 
     clients = SessionPool(sessions)
-    await clients.run_all()
+    results = await clients.run_all()
+
+    # Session errors are recorded by the pool rather than raised; still exit with an error
+    if any(result["status"] in ("failed", "timed_out") for result in results):
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":